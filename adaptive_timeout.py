@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-endpoint timeouts and hedging delays.
+
+A fixed timeout is wrong for every endpoint at once: generous enough for
+the slowest state GIS server, it lets a hung request on a fast one hold a
+lookup for the full 10 seconds. This module keeps a rolling latency
+histogram per endpoint (GIS layer URL, pipeline source) and derives:
+
+- timeout: p99 x ADAPTIVE_TIMEOUT_MULTIPLIER, clamped to [minimum, default]
+- hedge delay: p95 - after that long an idempotent GET is sent again and
+  the first response wins (limited to HEDGE_BUDGET_RATIO of requests so
+  a slow server isn't hit with double load)
+
+Endpoints with fewer than ADAPTIVE_MIN_SAMPLES recent requests use the
+caller's default timeout and are never hedged.
+
+Usage:
+    from adaptive_timeout import get_adaptive_timeouts
+    
+    timeouts = get_adaptive_timeouts()
+    timeout = timeouts.timeout(url, default=10)
+    hedge_after = timeouts.hedge_delay(url)
+    ...
+    timeouts.observe(url, elapsed_ms)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from monitoring.histogram import LatencyHistogram
+
+ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.getenv('ADAPTIVE_TIMEOUT_MULTIPLIER', '1.5'))
+
+# Never cut a request off sooner than this (seconds)
+ADAPTIVE_TIMEOUT_MIN = float(os.getenv('ADAPTIVE_TIMEOUT_MIN', '1.0'))
+
+# Recent requests needed before an endpoint's own percentiles are trusted
+ADAPTIVE_MIN_SAMPLES = int(os.getenv('ADAPTIVE_MIN_SAMPLES', '20'))
+
+# Percentiles cover the current and previous window (5-10 minutes)
+ADAPTIVE_WINDOW_SECONDS = float(os.getenv('ADAPTIVE_WINDOW_SECONDS', '300'))
+
+# Set to 0 to disable hedged requests
+HEDGING_ENABLED = os.getenv('HEDGING_ENABLED', '1') == '1'
+
+# At most this share of an endpoint's requests may be hedged
+HEDGE_BUDGET_RATIO = float(os.getenv('HEDGE_BUDGET_RATIO', '0.1'))
+
+# Don't hedge sooner than this (seconds) - duplicates of fast calls buy nothing
+HEDGE_MIN_DELAY = float(os.getenv('HEDGE_MIN_DELAY', '0.05'))
+
+_timeouts = None
+_timeouts_lock = threading.Lock()
+
+
+class _EndpointStats:
+    __slots__ = ('current', 'previous', 'window_start', 'requests', 'hedges')
+    
+    def __init__(self, now: float):
+        self.current = LatencyHistogram()
+        self.previous = LatencyHistogram()
+        self.window_start = now
+        self.requests = 0
+        self.hedges = 0
+    
+    def rotate(self, now: float) -> None:
+        if now - self.window_start < ADAPTIVE_WINDOW_SECONDS:
+            return
+        # A quiet endpoint may skip several windows - don't carry stale data
+        stale = now - self.window_start >= 2 * ADAPTIVE_WINDOW_SECONDS
+        self.previous = LatencyHistogram() if stale else self.current
+        self.current = LatencyHistogram()
+        self.window_start = now
+        self.requests = 0
+        self.hedges = 0
+    
+    def recent(self) -> LatencyHistogram:
+        return LatencyHistogram().merge(self.previous).merge(self.current)
+
+
+class AdaptiveTimeouts:
+    """Rolling per-endpoint latency and the timeouts derived from it."""
+    
+    def __init__(self):
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._lock = threading.Lock()
+    
+    def _stats(self, endpoint: str) -> _EndpointStats:
+        now = time.time()
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats(now)
+        stats.rotate(now)
+        return stats
+    
+    def observe(self, endpoint: str, latency_ms: float) -> None:
+        """
+        Record one request.
+        
+        Args:
+            endpoint: GIS layer URL, source name, ...
+            latency_ms: Elapsed time; for a timed-out request, the timeout
+                        (so a hanging server raises its own percentiles)
+        """
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.current.observe(latency_ms)
+            stats.requests += 1
+    
+    def timeout(self, endpoint: str, default: float, minimum: float = ADAPTIVE_TIMEOUT_MIN) -> float:
+        """
+        Timeout in seconds for the next request to an endpoint.
+        
+        Args:
+            endpoint: As passed to observe()
+            default: Fixed timeout used until there is enough data; also
+                     the upper bound
+            minimum: Lower bound
+        """
+        with self._lock:
+            recent = self._stats(endpoint).recent()
+        if recent.count < ADAPTIVE_MIN_SAMPLES:
+            return default
+        adaptive = recent.percentile(0.99) / 1000 * ADAPTIVE_TIMEOUT_MULTIPLIER
+        return min(default, max(minimum, adaptive))
+    
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """
+        Seconds to wait before sending a hedged duplicate, or None.
+        
+        The duplicate itself must still be cleared with acquire_hedge().
+        """
+        if not HEDGING_ENABLED:
+            return None
+        with self._lock:
+            recent = self._stats(endpoint).recent()
+        if recent.count < ADAPTIVE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_DELAY, recent.percentile(0.95) / 1000)
+    
+    def acquire_hedge(self, endpoint: str) -> bool:
+        """Take one hedge from the endpoint's budget; False if it's used up."""
+        with self._lock:
+            stats = self._stats(endpoint)
+            if stats.hedges >= max(1, stats.requests) * HEDGE_BUDGET_RATIO:
+                return False
+            stats.hedges += 1
+            return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Recent percentiles and hedge counts per endpoint."""
+        with self._lock:
+            snapshot = {
+                endpoint: (stats.recent(), stats.requests, stats.hedges)
+                for endpoint, stats in self._endpoints.items()
+            }
+        return {
+            endpoint: {**recent.summary(), 'window_requests': requests, 'window_hedges': hedges}
+            for endpoint, (recent, requests, hedges) in snapshot.items()
+        }
+
+
+def get_adaptive_timeouts() -> AdaptiveTimeouts:
+    """Get the process-wide AdaptiveTimeouts."""
+    global _timeouts
+    if _timeouts is None:
+        with _timeouts_lock:
+            if _timeouts is None:
+                _timeouts = AdaptiveTimeouts()
+    return _timeouts
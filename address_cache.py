@@ -1,17 +1,32 @@
 """
 Address-level caching for utility lookups.
 Stores confirmed utility mappings to improve accuracy over time.
+
+The file is shared by every gunicorn worker: reads pick up other workers'
+writes (reloaded when the file changes) and confirmations are applied as
+a locked read-modify-write, so concurrent workers don't drop each other's
+entries.
 """
 
 import json
 import os
 import hashlib
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, Dict, List
 from pathlib import Path
 
+# fcntl is POSIX-only; without it confirmations are only serialized per process
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
 CACHE_FILE = Path(__file__).parent / "data" / "address_cache.json"
+LOCK_FILE = CACHE_FILE.with_suffix(".lock")
 _cache = None
+_cache_mtime = None
 
 
 def _normalize_address(address: str) -> str:
@@ -53,11 +68,34 @@ def _get_zip_key(address: str) -> Optional[str]:
     return match.group(1) if match else None
 
 
+def _file_mtime() -> Optional[float]:
+    try:
+        return CACHE_FILE.stat().st_mtime
+    except OSError:
+        return None
+
+
+@contextmanager
+def _locked():
+    """Exclusive lock across workers for a read-modify-write of the cache file."""
+    if not FCNTL_AVAILABLE:
+        yield
+        return
+    LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
 def load_cache() -> Dict:
-    """Load address cache from disk."""
-    global _cache
-    if _cache is None:
-        if CACHE_FILE.exists():
+    """Load address cache from disk (again if another worker changed it)."""
+    global _cache, _cache_mtime
+    mtime = _file_mtime()
+    if _cache is None or mtime != _cache_mtime:
+        if mtime is not None:
             try:
                 with open(CACHE_FILE, 'r') as f:
                     _cache = json.load(f)
@@ -72,17 +110,21 @@ def load_cache() -> Dict:
                     "description": "User-confirmed utility mappings"
                 }
             }
+        _cache_mtime = mtime
     return _cache
 
 
 def save_cache():
-    """Save address cache to disk."""
-    global _cache
+    """Save address cache to disk (atomically, so readers never see a partial file)."""
+    global _cache, _cache_mtime
     if _cache:
         _cache["_metadata"]["last_updated"] = datetime.now().isoformat()
         CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, 'w') as f:
+        tmp_file = CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
             json.dump(_cache, f, indent=2)
+        os.replace(tmp_file, CACHE_FILE)
+        _cache_mtime = _file_mtime()
 
 
 def get_cached_utilities(address: str) -> Optional[Dict]:
@@ -178,6 +220,15 @@ def cache_confirmation(
         website: Utility website
         zip_code: ZIP code (extracted from address if not provided)
     """
+    with _locked():
+        _apply_confirmation(address, utility_type, utility_name, phone, website, zip_code)
+
+
+def _apply_confirmation(address, utility_type, utility_name, phone, website, zip_code):
+    """Record a confirmation on the latest file contents and write it back."""
+    global _cache
+    # Another worker may have written since our last read
+    _cache = None
     cache = load_cache()
     cache_key = _get_cache_key(address)
     zip_code = zip_code or _get_zip_key(address)
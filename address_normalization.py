@@ -199,6 +199,22 @@ def normalize_address(raw_address: str) -> Dict:
     return result
 
 
+def address_cache_key(address: str) -> str:
+    """
+    Cache key for an address: its USPS-normalized form, so trivially
+    different spellings ("123 Main Street" / "123 main st.") share an entry.
+    
+    Falls back to upper-cased, whitespace-collapsed input when the address
+    can't be parsed.
+    """
+    if not address:
+        return ''
+    normalized = normalize_address(address)
+    if normalized.get('valid') and normalized.get('normalized'):
+        return normalized['normalized']
+    return re.sub(r'\s+', ' ', address.upper()).strip()
+
+
 def extract_address_components(address: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]:
     """
     Extract city, state, and ZIP from an address string.
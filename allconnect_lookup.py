@@ -12,7 +12,7 @@ from typing import Optional, Dict, List
 from urllib.parse import quote
 from datetime import datetime, timedelta
 
-import requests
+import http_client
 from bs4 import BeautifulSoup
 
 # BrightData Web Unlocker configuration
@@ -114,17 +114,17 @@ def lookup_allconnect(zip_code: str, city: str = None, state: str = None) -> Opt
         # Try direct first (faster), fall back to proxy if blocked
         try:
             print(f"  AllConnect: Fetching {url}")
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_client.get(url, headers=headers, timeout=15)
             if response.status_code == 403 or response.status_code == 429:
                 print(f"  AllConnect: Direct blocked ({response.status_code}), trying proxy...")
                 import urllib3
                 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-                response = requests.get(url, headers=headers, proxies=proxies, timeout=30, verify=False)
+                response = http_client.get(url, headers=headers, proxies=proxies, timeout=30, verify=False)
         except Exception as direct_err:
             print(f"  AllConnect: Direct failed ({direct_err}), trying proxy...")
             import urllib3
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            response = requests.get(url, headers=headers, proxies=proxies, timeout=30, verify=False)
+            response = http_client.get(url, headers=headers, proxies=proxies, timeout=30, verify=False)
         
         if response.status_code != 200:
             print(f"AllConnect: HTTP {response.status_code} for {url}")
@@ -299,7 +299,7 @@ def get_city_state_from_zip(zip_code: str) -> tuple:
     """Get city and state from ZIP code."""
     try:
         url = f"https://api.zippopotam.us/us/{zip_code}"
-        response = requests.get(url, timeout=5)
+        response = http_client.get(url, timeout=5)
         if response.status_code == 200:
             data = response.json()
             places = data.get('places', [])
@@ -14,12 +14,15 @@ from utility_lookup_v1 import lookup_utilities_by_address, lookup_utility_json,
 # Resident Guide feature
 from guide.guide_api import guide_bp, set_db_connection as set_guide_db_connection
 from state_utility_verification import check_problem_area, add_problem_area, load_problem_areas
-from special_districts import lookup_special_district, format_district_for_response, get_available_states, has_special_district_data
+from special_districts import lookup_special_district, lookup_many, format_district_for_response, get_available_states, has_special_district_data
 from utility_scrapers import get_available_scrapers, get_scrapers_for_state, verify_with_utility_api_sync
 from cross_validation import cross_validate, SourceResult, format_for_response as format_cv_response, get_disagreements, providers_match
 from municipal_utilities import get_all_municipal_utilities, lookup_municipal_electric, get_municipal_stats
 from address_cache import cache_confirmation, get_cached_utilities, get_cache_stats
 from provider_id_matcher import get_provider_id, match_provider
+from monitoring.metrics import render_prometheus, get_latency_percentiles
+from monitoring.tracing import begin_trace, span
+from circuit_breaker import breaker_states
 
 # Load service check URLs
 _service_check_urls = None
@@ -61,43 +64,59 @@ def get_service_check_url(utility_name: str) -> str:
     return None
 from datetime import datetime, timedelta
 from functools import wraps
+import base64
 import hashlib
 import hmac
 import json
 import os
+import queue
 import re
 import secrets
+import sqlite3
 import time
 from functools import lru_cache
 
 from logging_config import get_logger
+from ttl_cache import TTLCache
+from shared_cache import get_shared_cache
+from geocode_cache import geocode_cache_stats
+from census_batch_geocoder import geocode_addresses
+from address_normalization import address_cache_key
+from result_store import get_result_store, provenance
 logger = get_logger("api")
 
-# Simple in-memory cache for address lookups (TTL: 1 hour)
-_address_cache = {}
+# In-memory LRU cache for address lookups (TTL: 1 hour), shared by request threads
 _cache_ttl = 3600  # 1 hour
+_address_cache = TTLCache(
+    max_entries=int(os.getenv('ADDRESS_CACHE_MAX_ENTRIES', '10000')),
+    max_bytes=int(os.getenv('ADDRESS_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+    ttl=_cache_ttl,
+    name='address_lookup'
+)
+
+def _lookup_cache_key(address, utilities_key):
+    """Cache key from the normalized address, so spelling variants share an entry."""
+    return f"{address_cache_key(address)}|{utilities_key}"
 
 def get_cached_result(address, utilities_key):
-    """Get cached result if not expired."""
-    cache_key = f"{address}|{utilities_key}"
-    if cache_key in _address_cache:
-        result, timestamp = _address_cache[cache_key]
-        if time.time() - timestamp < _cache_ttl:
-            return result
-        else:
-            del _address_cache[cache_key]
-    return None
+    """Get cached result if not expired (this worker first, then the shared cache)."""
+    key = _lookup_cache_key(address, utilities_key)
+    result = _address_cache.get(key)
+    if result is None:
+        shared = get_shared_cache()
+        if shared is not None:
+            result = shared.get('lookup', key)
+            if result is not None:
+                _address_cache.set(key, result)
+    return result
 
 def set_cached_result(address, utilities_key, result):
-    """Cache a result."""
-    cache_key = f"{address}|{utilities_key}"
-    _address_cache[cache_key] = (result, time.time())
-    # Limit cache size to 10000 entries
-    if len(_address_cache) > 10000:
-        # Remove oldest entries
-        sorted_keys = sorted(_address_cache.keys(), key=lambda k: _address_cache[k][1])
-        for k in sorted_keys[:1000]:
-            del _address_cache[k]
+    """Cache a result for this worker and every other worker."""
+    key = _lookup_cache_key(address, utilities_key)
+    _address_cache.set(key, result)
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.set('lookup', key, result, ttl=_cache_ttl)
 
 # Feedback storage
 FEEDBACK_DIR = os.path.join(os.path.dirname(__file__), 'data', 'feedback')
@@ -384,6 +403,104 @@ def revoke_api_key():
 
 # ============ Batch Lookup Endpoint ============
 
+def format_batch_result(address, result, selected_utilities):
+    """Shape a lookup_utilities_by_address result as a batch response item."""
+    geocoded = result.get('_geocoded', {})
+    city = geocoded.get('city')
+    state = geocoded.get('state')
+    
+    utilities = {}
+    
+    if 'electric' in selected_utilities and result.get('electric'):
+        electric = result['electric']
+        if isinstance(electric, list):
+            utilities['electric'] = [format_utility(e, 'electric', city, state) for e in electric]
+        else:
+            utilities['electric'] = [format_utility(electric, 'electric', city, state)]
+    
+    if 'gas' in selected_utilities and result.get('gas'):
+        gas = result['gas']
+        if isinstance(gas, list):
+            utilities['gas'] = [format_utility(g, 'gas', city, state) for g in gas]
+        else:
+            utilities['gas'] = [format_utility(gas, 'gas', city, state)]
+    
+    if 'water' in selected_utilities and result.get('water'):
+        water = result['water']
+        if isinstance(water, list):
+            utilities['water'] = [format_utility(w, 'water', city, state) for w in water]
+        else:
+            utilities['water'] = [format_utility(water, 'water', city, state)]
+    
+    if 'internet' in selected_utilities and result.get('internet'):
+        utilities['internet'] = result['internet']
+    
+    if 'trash' in selected_utilities and result.get('trash'):
+        trash = result['trash']
+        if isinstance(trash, list):
+            utilities['trash'] = [format_utility(t, 'trash', city, state) for t in trash]
+        else:
+            utilities['trash'] = [format_utility(trash, 'trash', city, state)]
+    
+    if 'sewer' in selected_utilities and result.get('sewer'):
+        sewer = result['sewer']
+        if isinstance(sewer, list):
+            utilities['sewer'] = [format_utility(s, 'sewer', city, state) for s in sewer]
+        else:
+            utilities['sewer'] = [format_utility(sewer, 'sewer', city, state)]
+    
+    return {
+        'address': address,
+        'location': result.get('location', {}),
+        'utilities': utilities,
+        'status': 'success'
+    }
+
+
+def compute_batch_result(address, selected_utilities, geo_result=None):
+    """
+    Run the lookup for one batch address.
+    
+    Returns:
+        (response, provenance) - provenance as recorded in the result
+        store - or None if the address could not be geocoded
+    """
+    result = lookup_utilities_by_address(
+        address, 
+        verify_with_serp=False, 
+        selected_utilities=selected_utilities,
+        geo_result=geo_result
+    )
+    if not result:
+        return None
+    return format_batch_result(address, result, selected_utilities), provenance(result, selected_utilities)
+
+
+def get_stored_result(address, utilities_key):
+    """A current result from the durable store (also warms the TTL caches)."""
+    store = get_result_store()
+    if store is None:
+        return None
+    try:
+        response = store.get(address, utilities_key)
+    except sqlite3.Error as e:
+        logger.warning(f"Result store read failed: {e}")
+        return None
+    if response is not None:
+        set_cached_result(address, utilities_key, response)
+    return response
+
+
+def put_stored_result(address, utilities_key, response, result_provenance):
+    store = get_result_store()
+    if store is None:
+        return
+    try:
+        store.put(address, utilities_key, response, result_provenance)
+    except sqlite3.Error as e:
+        logger.warning(f"Result store write failed: {e}")
+
+
 @app.route('/api/lookup/batch', methods=['POST'])
 @require_api_key
 def lookup_batch():
@@ -423,76 +540,31 @@ def lookup_batch():
     
     utilities_key = ','.join(sorted(selected_utilities))
     
+    # Geocode every address that neither the caches nor the result store
+    # can answer - one Census batch upload instead of a round trip per address
+    uncached = [
+        a for a in addresses
+        if get_cached_result(a, utilities_key) is None and get_stored_result(a, utilities_key) is None
+    ]
+    geo_results = geocode_addresses(uncached) if uncached else {}
+    
     def process_single_address(address):
         """Process a single address and return result."""
         try:
-            # Check cache first
+            # Check cache first (stored results were copied into it above)
             cached = get_cached_result(address, utilities_key)
             if cached:
-                cached['_cached'] = True
-                return cached
+                # Copy - the cached dict is shared with other request threads
+                return dict(cached, address=address, _cached=True)
             
-            result = lookup_utilities_by_address(
-                address, 
-                verify_with_serp=False, 
-                selected_utilities=selected_utilities
-            )
-            if not result:
+            computed = compute_batch_result(address, selected_utilities, geo_results.get(address))
+            if not computed:
                 return {'address': address, 'status': 'error', 'error': 'Could not geocode'}
+            response, result_provenance = computed
             
-            geocoded = result.get('_geocoded', {})
-            city = geocoded.get('city')
-            state = geocoded.get('state')
-            
-            utilities = {}
-            
-            if 'electric' in selected_utilities and result.get('electric'):
-                electric = result['electric']
-                if isinstance(electric, list):
-                    utilities['electric'] = [format_utility(e, 'electric', city, state) for e in electric]
-                else:
-                    utilities['electric'] = [format_utility(electric, 'electric', city, state)]
-            
-            if 'gas' in selected_utilities and result.get('gas'):
-                gas = result['gas']
-                if isinstance(gas, list):
-                    utilities['gas'] = [format_utility(g, 'gas', city, state) for g in gas]
-                else:
-                    utilities['gas'] = [format_utility(gas, 'gas', city, state)]
-            
-            if 'water' in selected_utilities and result.get('water'):
-                water = result['water']
-                if isinstance(water, list):
-                    utilities['water'] = [format_utility(w, 'water', city, state) for w in water]
-                else:
-                    utilities['water'] = [format_utility(water, 'water', city, state)]
-            
-            if 'internet' in selected_utilities and result.get('internet'):
-                utilities['internet'] = result['internet']
-            
-            if 'trash' in selected_utilities and result.get('trash'):
-                trash = result['trash']
-                if isinstance(trash, list):
-                    utilities['trash'] = [format_utility(t, 'trash', city, state) for t in trash]
-                else:
-                    utilities['trash'] = [format_utility(trash, 'trash', city, state)]
-            
-            if 'sewer' in selected_utilities and result.get('sewer'):
-                sewer = result['sewer']
-                if isinstance(sewer, list):
-                    utilities['sewer'] = [format_utility(s, 'sewer', city, state) for s in sewer]
-                else:
-                    utilities['sewer'] = [format_utility(sewer, 'sewer', city, state)]
-            
-            response = {
-                'address': address,
-                'location': result.get('location', {}),
-                'utilities': utilities,
-                'status': 'success'
-            }
-            
-            # Cache the result
+            # Cache the result, and keep it for the next time the portfolio comes in
             set_cached_result(address, utilities_key, response)
+            put_stored_result(address, utilities_key, response, result_provenance)
             
             return response
         except Exception as e:
@@ -533,12 +605,14 @@ def lookup():
         verify = data.get('verify', False)
         # Parse utilities parameter - default excludes internet (slow Playwright)
         utilities_param = data.get('utilities', 'electric,gas,water')
+        trace_requested = str(data.get('trace', '')).lower() in ('1', 'true')
     else:
         address = request.args.get('address')
         # SERP verification disabled by default - should_skip_serp handles confidence-based verification
         verify = request.args.get('verify', 'false').lower() == 'true'
         # Parse utilities parameter - default excludes internet (slow Playwright)
         utilities_param = request.args.get('utilities', 'electric,gas,water')
+        trace_requested = request.args.get('trace', '').lower() in ('1', 'true')
     
     # Parse comma-separated utilities into list
     selected_utilities = [u.strip().lower() for u in utilities_param.split(',')]
@@ -547,11 +621,18 @@ def lookup():
         logger.warning("Lookup request missing address")
         return jsonify({'error': 'Address is required'}), 400
     
+    # Per-stage span tree: returned with ?trace=1, exported when TRACE_EXPORT is set
+    trace = begin_trace('api.lookup', force=trace_requested, address=address, utilities=utilities_param)
     try:
         start_time = time.time()
         logger.info("Lookup request", extra={"address": address, "utilities": utilities_param})
-        result = lookup_utilities_by_address(address, verify_with_serp=verify, selected_utilities=selected_utilities)
+        # One geocode for the utilities and the internet lookup
+        location = geocode_address(address, include_geography=True)
+        result = lookup_utilities_by_address(
+            address, verify_with_serp=verify, selected_utilities=selected_utilities, geo_result=location
+        ) if location else None
         if not result:
+            trace.finish()
             return jsonify({'error': 'Could not geocode address'}), 404
         
         # Format response
@@ -675,7 +756,8 @@ def lookup():
         
         # Internet - only if selected (call lookup_internet_only directly)
         if 'internet' in selected_utilities:
-            internet = lookup_internet_only(address)
+            with span('internet'):
+                internet = lookup_internet_only(address, geo_result=location)
             if internet and internet.get('providers'):
                 response['utilities']['internet'] = format_internet_providers(internet)
                 if internet.get('has_fiber'):
@@ -701,9 +783,13 @@ def lookup():
         
         duration_ms = int((time.time() - start_time) * 1000)
         logger.info("Lookup completed", extra={"address": address, "duration_ms": duration_ms, "state": state})
+        trace.finish()
+        if trace_requested:
+            response['trace'] = trace.to_dict()
         return jsonify(response)
         
     except Exception as e:
+        trace.finish()
         logger.error("Lookup failed", extra={"address": address, "error": str(e)})
         return jsonify({'error': str(e)}), 500
 
@@ -1012,8 +1098,14 @@ def format_internet_providers(internet_data):
 @app.route('/api/health', methods=['GET'])
 @limiter.exempt
 def health():
-    """Health check endpoint."""
-    return jsonify({'status': 'ok', 'version': '2026-01-21-dereg-v7'})
+    """Health check endpoint (plus this worker's dependency circuit breakers)."""
+    dependencies = breaker_states()
+    return jsonify({
+        'status': 'ok',
+        'version': '2026-01-21-dereg-v7',
+        'open_circuits': [name for name, state in dependencies.items() if state['state'] != 'closed'],
+        'dependencies': dependencies,
+    })
 
 
 @app.route('/api/rate-limit', methods=['GET'])
@@ -1029,6 +1121,46 @@ def rate_limit_status():
     })
 
 
+@app.route('/api/metrics', methods=['GET'])
+@limiter.exempt
+def metrics():
+    """
+    Latency histograms (all workers) in Prometheus text format.
+    
+    ?format=json returns p50/p95/p99 per utility type, source and GIS host instead.
+    """
+    if request.args.get('format') == 'json':
+        return jsonify(get_latency_percentiles())
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+# Utility types /api/lookup/stream sends an event for (besides internet)
+STREAM_UTILITY_TYPES = ('electric', 'gas', 'water', 'sewer')
+
+# Shown when a streamed utility type has no provider
+STREAM_EMPTY_NOTES = {
+    'electric': 'No electric provider found',
+    'gas': 'No gas provider found',
+    'water': 'No water provider found - may be private well',
+    'sewer': 'No sewer provider found - may be septic',
+}
+
+
+def _stream_utility_event(utility, value, city, state):
+    """SSE payload for one utility type's lookup result."""
+    if not value:
+        return {'event': utility, 'data': None, 'note': STREAM_EMPTY_NOTES[utility]}
+    
+    primary = value[0] if isinstance(value, list) else value
+    if utility == 'gas' and primary.get('_no_service'):
+        return {'event': 'gas', 'data': None, 'note': 'No piped natural gas service - area may use propane'}
+    
+    formatted = format_utility(primary, utility, city, state)
+    if utility in ('electric', 'gas'):
+        formatted['confidence'] = primary.get('_confidence') or 'high'
+    return {'event': utility, 'data': formatted}
+
+
 @app.route('/api/lookup/stream', methods=['GET', 'POST'])
 @require_api_key
 def lookup_stream():
@@ -1045,6 +1177,9 @@ def lookup_stream():
     - internet: Internet providers (slow, last)
     - complete: All done
     - error: If something fails
+    
+    Electric/gas/water/sewer are sent in the order they resolve. Every
+    event except status/error has latency_ms (time since the request).
     """
     if request.method == 'POST':
         data = request.get_json()
@@ -1061,111 +1196,85 @@ def lookup_stream():
     
     def generate():
         """Generator that yields SSE events as utilities are found."""
+        start_time = time.time()
+        
+        def event(payload):
+            # Every result event carries ms since the request started
+            if payload.get('event') not in ('status', 'error'):
+                payload['latency_ms'] = int((time.time() - start_time) * 1000)
+            return f"data: {json.dumps(payload)}\n\n"
+        
         try:
             # Step 1: Geocode (fast)
-            yield f"data: {json.dumps({'event': 'status', 'message': 'Geocoding address...'})}\n\n"
+            yield event({'event': 'status', 'message': 'Geocoding address...'})
             
             location = geocode_address(address, include_geography=True)
             if not location:
-                yield f"data: {json.dumps({'event': 'error', 'message': 'Could not geocode address'})}\n\n"
+                yield event({'event': 'error', 'message': 'Could not geocode address'})
                 return
             
-            yield f"data: {json.dumps({'event': 'geocode', 'data': location})}\n\n"
+            yield event({'event': 'geocode', 'data': location})
             
-            lat = location.get('lat')
-            lon = location.get('lon')
             city = location.get('city')
-            county = location.get('county')
             state = location.get('state')
-            zip_code = location.get('zip_code', '')
             
             # Step 2: Look up ALL utilities concurrently
-            yield f"data: {json.dumps({'event': 'status', 'message': 'Looking up utility providers...'})}\n\n"
+            yield event({'event': 'status', 'message': 'Looking up utility providers...'})
             
             non_internet_utilities = [u for u in selected_utilities if u != 'internet']
-            v2_result = None
-            internet_result = None
+            streamed = [u for u in non_internet_utilities if u in STREAM_UTILITY_TYPES]
+            
+            # lookup_utilities_by_address reports each type from its worker
+            # thread as soon as it resolves; the generator drains the queue
+            completed = queue.Queue()
             
-            # Run electric/gas/water and internet lookups concurrently
             with ThreadPoolExecutor(max_workers=2) as executor:
-                futures = {}
+                utilities_future = None
+                internet_future = None
                 
                 if non_internet_utilities:
                     # SERP verification disabled for speed - should_skip_serp was causing delays
-                    futures['utilities'] = executor.submit(
+                    utilities_future = executor.submit(
                         lookup_utilities_by_address, address, 
-                        selected_utilities=non_internet_utilities, verify_with_serp=False
+                        selected_utilities=non_internet_utilities, verify_with_serp=False,
+                        geo_result=location,
+                        on_result=lambda utility, value: completed.put((utility, value))
                     )
                 
                 if 'internet' in selected_utilities:
-                    futures['internet'] = executor.submit(lookup_internet_only, address)
+                    # Both lookups reuse the geocode above instead of repeating it
+                    internet_future = executor.submit(lookup_internet_only, address, geo_result=location)
                 
-                # Collect results as they complete
-                for future in as_completed(futures.values()):
-                    pass  # Just wait for all to complete
+                pending = set(streamed)
+                while pending:
+                    try:
+                        utility, value = completed.get(timeout=0.5)
+                    except queue.Empty:
+                        if utilities_future.done() and completed.empty():
+                            break  # Lookup failed before reporting everything
+                        continue
+                    if utility in pending:
+                        pending.discard(utility)
+                        yield event(_stream_utility_event(utility, value, city, state))
                 
-                if 'utilities' in futures:
-                    v2_result = futures['utilities'].result()
-                if 'internet' in futures:
-                    internet_result = futures['internet'].result()
-            
-            # Stream electric result
-            if 'electric' in selected_utilities:
-                electric = v2_result.get('electric') if v2_result else None
-                if electric:
-                    primary = electric[0] if isinstance(electric, list) else electric
-                    raw_confidence = primary.get('_confidence') or 'high'
-                    formatted = format_utility(primary, 'electric', city, state)
-                    formatted['confidence'] = raw_confidence
-                    yield f"data: {json.dumps({'event': 'electric', 'data': formatted})}\n\n"
-                else:
-                    yield f"data: {json.dumps({'event': 'electric', 'data': None, 'note': 'No electric provider found'})}\n\n"
+                # Types the lookup never reported
+                for utility in streamed:
+                    if utility in pending:
+                        yield event(_stream_utility_event(utility, None, city, state))
             
-            # Stream gas result
-            if 'gas' in selected_utilities:
-                gas = v2_result.get('gas') if v2_result else None
-                if gas:
-                    primary = gas[0] if isinstance(gas, list) else gas
-                    if primary.get('_no_service'):
-                        yield f"data: {json.dumps({'event': 'gas', 'data': None, 'note': 'No piped natural gas service - area may use propane'})}\n\n"
+                # Stream internet result (slowest - always last)
+                if internet_future is not None:
+                    internet_result = internet_future.result()
+                    if internet_result:
+                        yield event({'event': 'internet', 'data': format_internet_providers(internet_result)})
                     else:
-                        raw_confidence = primary.get('_confidence') or 'high'
-                        formatted = format_utility(primary, 'gas', city, state)
-                        formatted['confidence'] = raw_confidence
-                        yield f"data: {json.dumps({'event': 'gas', 'data': formatted})}\n\n"
-                else:
-                    yield f"data: {json.dumps({'event': 'gas', 'data': None, 'note': 'No gas provider found'})}\n\n"
-            
-            # Stream water result
-            if 'water' in selected_utilities:
-                water = v2_result.get('water') if v2_result else None
-                if water:
-                    primary = water[0] if isinstance(water, list) else water
-                    yield f"data: {json.dumps({'event': 'water', 'data': format_utility(primary, 'water', city, state)})}\n\n"
-                else:
-                    yield f"data: {json.dumps({'event': 'water', 'data': None, 'note': 'No water provider found - may be private well'})}\n\n"
-            
-            # Stream sewer result
-            if 'sewer' in selected_utilities:
-                sewer = v2_result.get('sewer') if v2_result else None
-                if sewer:
-                    primary = sewer[0] if isinstance(sewer, list) else sewer
-                    yield f"data: {json.dumps({'event': 'sewer', 'data': format_utility(primary, 'sewer', city, state)})}\n\n"
-                else:
-                    yield f"data: {json.dumps({'event': 'sewer', 'data': None, 'note': 'No sewer provider found - may be septic'})}\n\n"
-            
-            # Stream internet result
-            if 'internet' in selected_utilities:
-                if internet_result:
-                    yield f"data: {json.dumps({'event': 'internet', 'data': format_internet_providers(internet_result)})}\n\n"
-                else:
-                    yield f"data: {json.dumps({'event': 'internet', 'data': None, 'note': 'Could not retrieve internet data'})}\n\n"
+                        yield event({'event': 'internet', 'data': None, 'note': 'Could not retrieve internet data'})
             
             # Done!
-            yield f"data: {json.dumps({'event': 'complete', 'message': 'Lookup complete'})}\n\n"
+            yield event({'event': 'complete', 'message': 'Lookup complete'})
             
         except Exception as e:
-            yield f"data: {json.dumps({'event': 'error', 'message': str(e)})}\n\n"
+            yield event({'event': 'error', 'message': str(e)})
     
     return Response(
         generate(),
@@ -1763,7 +1872,12 @@ def confirm_utility():
 @app.route('/api/cache/stats', methods=['GET'])
 def cache_stats():
     """Get address cache statistics."""
-    return jsonify(get_cache_stats())
+    stats = get_cache_stats()
+    stats['lookup_cache'] = _address_cache.stats()
+    stats['geocode_cache'] = geocode_cache_stats()
+    shared = get_shared_cache()
+    stats['shared_cache'] = shared.stats() if shared is not None else None
+    return jsonify(stats)
 
 
 @app.route('/api/feedback/<feedback_id>/reject', methods=['POST'])
@@ -1919,6 +2033,53 @@ def list_unapplied_corrections():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/corrections/mirror/refresh', methods=['POST'])
+@limiter.exempt
+def refresh_corrections_mirror():
+    """
+    Sync the in-memory Airtable corrections mirror now (this worker).
+    
+    Requires admin secret. Body: {"full": true} to re-read the whole table.
+    Other workers pick changes up on their next scheduled sync.
+    """
+    data = request.get_json(silent=True) or {}
+    admin_secret = data.get('admin_secret') or request.headers.get('X-Admin-Secret')
+    expected_secret = os.getenv('ADMIN_SECRET', 'utility-admin-2026')
+    if admin_secret != expected_secret:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    from pipeline.sources.corrections_mirror import get_corrections_mirror
+    try:
+        return jsonify(get_corrections_mirror().refresh(full=bool(data.get('full'))))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 502
+
+
+@app.route('/api/webhooks/airtable/corrections', methods=['POST'])
+@limiter.exempt
+def airtable_corrections_webhook():
+    """
+    Airtable webhook ping for the utility_corrections table.
+    
+    Verified with the webhook's MAC secret (AIRTABLE_WEBHOOK_SECRET, base64
+    as returned when the webhook was created). Only wakes the sync thread -
+    the notification itself carries no record data.
+    """
+    mac_secret = os.getenv('AIRTABLE_WEBHOOK_SECRET')
+    if not mac_secret:
+        return jsonify({'error': 'Webhook not configured'}), 404
+    
+    expected = 'hmac-sha256=' + hmac.new(
+        base64.b64decode(mac_secret), request.get_data(), hashlib.sha256
+    ).hexdigest()
+    if not hmac.compare_digest(request.headers.get('X-Airtable-Content-MAC', ''), expected):
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    from pipeline.sources.corrections_mirror import get_corrections_mirror
+    get_corrections_mirror().request_sync()
+    return '', 204
+
+
 # =============================================================================
 # PROBLEM AREAS REGISTRY
 # =============================================================================
@@ -2089,6 +2250,56 @@ def lookup_special_district_endpoint():
         return jsonify(response)
 
 
+@app.route('/api/special-districts/lookup', methods=['POST'])
+def lookup_special_districts_bulk():
+    """
+    Look up special districts for many coordinates in one call.
+    
+    Request body:
+    {
+        "state": "TX",
+        "service": "water",  // optional, default: water
+        "points": [{"lat": 29.76, "lon": -95.36}, ...]
+    }
+    
+    Response:
+    {
+        "results": [{"found": true, "district": {...}}, {"found": false}, ...],
+        "summary": {"total": 2, "found": 1}
+    }
+    """
+    data = request.get_json(silent=True) or {}
+    state = (data.get('state') or '').upper()
+    service = data.get('service', 'water')
+    points = data.get('points') or []
+    
+    if not state:
+        return jsonify({'error': 'state is required'}), 400
+    if not isinstance(points, list) or not points:
+        return jsonify({'error': 'points array required'}), 400
+    if len(points) > 10000:
+        return jsonify({'error': 'Maximum 10000 points per request'}), 400
+    
+    try:
+        coordinates = [(float(p['lat']), float(p['lon'])) for p in points]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'each point needs numeric lat and lon'}), 400
+    
+    districts = lookup_many(coordinates, state, service)
+    results = []
+    for district in districts:
+        if district:
+            district = dict(district, match_method='coordinates', _confidence='high')
+            results.append({'found': True, 'district': format_district_for_response(district)})
+        else:
+            results.append({'found': False})
+    
+    return jsonify({
+        'results': results,
+        'summary': {'total': len(results), 'found': sum(1 for d in districts if d)}
+    })
+
+
 # =============================================================================
 # UTILITY SCRAPERS
 # =============================================================================
@@ -2387,7 +2598,7 @@ def lookup_municipal():
 # LEADGEN ENDPOINTS
 # =============================================================================
 
-import requests
+import http_client
 import string
 import random
 from datetime import datetime, timedelta
@@ -2424,7 +2635,7 @@ def resolve_ref_code_to_email(ref_code):
         # First try LeadGen_Companies table by ref_id
         url = airtable_url(LEADGEN_COMPANIES_TABLE_ID)
         params = {'filterByFormula': f"{{ref_id}}='{ref_code}'", 'maxRecords': 1}
-        resp = requests.get(url, headers=get_airtable_headers(), params=params, timeout=10)
+        resp = http_client.get(url, headers=get_airtable_headers(), params=params, timeout=10)
         if resp.status_code == 200:
             records = resp.json().get('records', [])
             if records:
@@ -2434,7 +2645,7 @@ def resolve_ref_code_to_email(ref_code):
         # Fallback to LeadGen_RefCodes table by ref_code
         url = airtable_url(LEADGEN_REFCODES_TABLE_ID)
         params = {'filterByFormula': f"{{ref_code}}='{ref_code}'"}
-        resp = requests.get(url, headers=get_airtable_headers(), params=params, timeout=10)
+        resp = http_client.get(url, headers=get_airtable_headers(), params=params, timeout=10)
         if resp.status_code == 200:
             records = resp.json().get('records', [])
             if records:
@@ -2480,7 +2691,7 @@ def count_recent_lookups(email=None, ip_address=None):
         formula = f"AND(IS_AFTER({{created_at}}, '{twenty_four_hours_ago}'), OR({','.join(conditions)}))"
         params = {'filterByFormula': formula}
         
-        resp = requests.get(url, headers=get_airtable_headers(), params=params, timeout=10)
+        resp = http_client.get(url, headers=get_airtable_headers(), params=params, timeout=10)
         if resp.status_code == 200:
             return len(resp.json().get('records', []))
     except Exception as e:
@@ -2507,7 +2718,7 @@ def log_leadgen_lookup(ref_code, email, ip_address, address, utilities, results,
                 'source': 'cold_email' if ref_code else source
             }
         }
-        requests.post(url, headers=get_airtable_headers(), json=data, timeout=10)
+        http_client.post(url, headers=get_airtable_headers(), json=data, timeout=10)
     except Exception as e:
         logger.error(f"Error logging leadgen lookup: {e}")
 
@@ -2681,7 +2892,7 @@ def leadgen_resolve_ref():
         # First try LeadGen_Companies table (new HubSpot-synced data)
         url = airtable_url(LEADGEN_COMPANIES_TABLE_ID)
         params = {'filterByFormula': f"{{ref_id}}='{ref_code}'", 'maxRecords': 1}
-        resp = requests.get(url, headers=get_airtable_headers(), params=params, timeout=10)
+        resp = http_client.get(url, headers=get_airtable_headers(), params=params, timeout=10)
         
         if resp.status_code == 200:
             records = resp.json().get('records', [])
@@ -2708,7 +2919,7 @@ def leadgen_resolve_ref():
         # Fallback to LeadGen_RefCodes table (legacy/manual entries)
         url = airtable_url(LEADGEN_REFCODES_TABLE_ID)
         params = {'filterByFormula': f"{{ref_code}}='{ref_code}'", 'maxRecords': 1}
-        resp = requests.get(url, headers=get_airtable_headers(), params=params, timeout=10)
+        resp = http_client.get(url, headers=get_airtable_headers(), params=params, timeout=10)
         
         if resp.status_code == 200:
             records = resp.json().get('records', [])
@@ -2768,14 +2979,14 @@ def leadgen_track_cta():
             'maxRecords': 1
         }
         
-        resp = requests.get(url, headers=get_airtable_headers(), params=params, timeout=10)
+        resp = http_client.get(url, headers=get_airtable_headers(), params=params, timeout=10)
         if resp.status_code == 200:
             records = resp.json().get('records', [])
             if records:
                 record_id = records[0]['id']
                 # Update cta_clicked
                 update_url = f"{url}/{record_id}"
-                requests.patch(update_url, headers=get_airtable_headers(), 
+                http_client.patch(update_url, headers=get_airtable_headers(), 
                              json={'fields': {'cta_clicked': True}}, timeout=10)
         
         return jsonify({'success': True})
@@ -2819,7 +3030,7 @@ def leadgen_generate_ref():
                 'created_at': datetime.utcnow().isoformat()
             }
         }
-        resp = requests.post(url, headers=get_airtable_headers(), json=data, timeout=10)
+        resp = http_client.post(url, headers=get_airtable_headers(), json=data, timeout=10)
         
         if resp.status_code in [200, 201]:
             return jsonify({
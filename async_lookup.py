@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Asyncio runtime for the lookup pipeline.
+
+Provides:
+- One shared aiohttp session per event loop for ArcGIS point queries
+- run_with_arcgis_prefetch(): runs an existing sync lookup function while
+  its _query_arcgis_point calls are served from responses fetched on the
+  event loop, so the ~80 query_* functions in gis_utility_lookup.py get an
+  async path without being rewritten
+- run_blocking(): runs blocking work (CSV/JSON matching, AI selection) on
+  one bounded thread pool and keeps the time it spent waiting for a
+  thread out of the calling source's budget (see WorkClock)
+- A background event loop that lets sync callers (Flask threads, scripts)
+  drive the async engine without creating a loop per request
+
+Usage:
+    from async_lookup import run_with_arcgis_prefetch, run_sync
+    
+    result = await run_with_arcgis_prefetch(lookup_electric_utility_gis, lat, lon, state)
+    result = run_sync(some_coroutine())
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from gis_utility_lookup import (
+    API_TIMEOUT,
+    ArcGISPrefetch,
+    _arcgis_prefetch,
+    _arcgis_point_params,
+    _first_feature_attributes,
+    _gis_cache_key,
+    _gis_cache_set,
+    _track_gis_latency,
+)
+from adaptive_timeout import get_adaptive_timeouts
+from circuit_breaker import CircuitOpenError, breaker_for_url
+from singleflight import AsyncSingleFlight
+
+# aiohttp is optional - without it the async API still works, but GIS
+# calls block a worker thread just like the sync path
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Connection limits for the shared session (total / per ArcGIS host)
+ASYNC_MAX_CONNECTIONS = int(os.getenv('ASYNC_MAX_CONNECTIONS', '1000'))
+ASYNC_MAX_CONNECTIONS_PER_HOST = int(os.getenv('ASYNC_MAX_CONNECTIONS_PER_HOST', '100'))
+
+# Record/fetch rounds before falling back to blocking calls. Each round
+# fetches the next query of the fallback chain (e.g. state API -> HIFLD).
+ARCGIS_PREFETCH_ROUNDS = int(os.getenv('ARCGIS_PREFETCH_ROUNDS', '6'))
+
+# Threads for the blocking parts of lookups (CSV/JSON matching, AI
+# selection, SERP verification) - sized for the lookups in flight, each of
+# which keeps a few sources and its selection stage busy at a time
+ASYNC_WORKER_THREADS = int(os.getenv('ASYNC_WORKER_THREADS', '256'))
+
+# aiohttp sessions are bound to the loop that created them
+_sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+_background_loop = None
+_background_lock = threading.Lock()
+
+_blocking_executor = None
+_blocking_lock = threading.Lock()
+
+
+# =============================================================================
+# SHARED SESSION
+# =============================================================================
+
+def get_async_session() -> "aiohttp.ClientSession":
+    """Get or create the shared aiohttp session for the running event loop."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=ASYNC_MAX_CONNECTIONS,
+            limit_per_host=ASYNC_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=300,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+        )
+        _sessions[loop] = session
+    return session
+
+
+async def close_async_session() -> None:
+    """Close the shared session for the running event loop (for shutdown)."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+# =============================================================================
+# BLOCKING WORK
+# =============================================================================
+
+class WorkClock:
+    """
+    Time a source has spent working, not waiting for a thread.
+    
+    LookupPipeline gives every source query one of these; run_blocking()
+    stops it while the work is queued for the executor, so a backed-up
+    pool doesn't turn into source timeouts and inflated latency.
+    """
+    
+    def __init__(self):
+        self.started = time.time()
+        self.waited = 0.0
+        self.queued_since: Optional[float] = None
+    
+    @property
+    def queued(self) -> bool:
+        return self.queued_since is not None
+    
+    def elapsed(self) -> float:
+        """Seconds of work so far (frozen while queued)."""
+        end = self.queued_since if self.queued_since is not None else time.time()
+        return end - self.started - self.waited
+
+
+# Clock of the source query running in this context (None outside one)
+_work_clock: contextvars.ContextVar = contextvars.ContextVar('work_clock', default=None)
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """The bounded pool every lookup's blocking work runs on."""
+    global _blocking_executor
+    if _blocking_executor is None:
+        with _blocking_lock:
+            if _blocking_executor is None:
+                _blocking_executor = ThreadPoolExecutor(
+                    max_workers=ASYNC_WORKER_THREADS,
+                    thread_name_prefix='async-lookup'
+                )
+    return _blocking_executor
+
+
+async def run_blocking(func: Callable[..., Any], *args, clock: Optional[WorkClock] = None, **kwargs) -> Any:
+    """
+    Run a blocking call on the bounded executor (asyncio.to_thread with a
+    fixed pool).
+    
+    The calling source's WorkClock (or `clock`) is stopped until a thread
+    picks the call up. Cancelling the awaiting task before then drops the
+    call without it ever taking a thread.
+    """
+    clock = clock or _work_clock.get()
+    context = contextvars.copy_context()
+    
+    def run():
+        if clock is not None and clock.queued_since is not None:
+            clock.waited += time.time() - clock.queued_since
+            clock.queued_since = None
+        return context.run(func, *args, **kwargs)
+    
+    if clock is not None:
+        clock.queued_since = time.time()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_blocking_executor(), run)
+    finally:
+        if clock is not None and clock.queued_since is not None:
+            # Cancelled while queued
+            clock.waited += time.time() - clock.queued_since
+            clock.queued_since = None
+
+
+# =============================================================================
+# ARCGIS
+# =============================================================================
+
+_arcgis_flight = AsyncSingleFlight('arcgis_async')
+
+
+async def fetch_arcgis_point(url: str, lat: float, lon: float, out_fields: str = "*") -> Optional[Dict]:
+    """
+    Async equivalent of gis_utility_lookup._query_arcgis_point.
+    
+    Concurrent fetches of the same point on the shared loop share one request.
+    
+    Returns:
+        First matching feature's attributes, or None
+    """
+    attributes, shared = await _arcgis_flight.do(
+        _gis_cache_key(url, lat, lon, out_fields),
+        _fetch_arcgis_point, url, lat, lon, out_fields
+    )
+    return dict(attributes) if shared and attributes else attributes
+
+
+async def _hedged(
+    request: Callable[[], Awaitable[Any]],
+    hedge_after: Optional[float],
+    allow_hedge: Callable[[], bool]
+) -> Any:
+    """
+    Await request(); if it takes longer than hedge_after (and allow_hedge()
+    agrees), start a second one and return whichever succeeds first (the
+    other is cancelled).
+    """
+    primary = asyncio.ensure_future(request())
+    if not hedge_after:
+        return await primary
+    
+    done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+    if done or not allow_hedge():
+        return await primary
+    
+    pending = {primary, asyncio.ensure_future(request())}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _fetch_arcgis_point(url: str, lat: float, lon: float, out_fields: str) -> Optional[Dict]:
+    params = _arcgis_point_params(lat, lon, out_fields)
+    
+    # Same adaptive timeout and p95 hedging as the sync path
+    timeouts = get_adaptive_timeouts()
+    timeout = timeouts.timeout(url, default=API_TIMEOUT)
+    
+    # Same per-host circuit breaker as http_client
+    breaker = breaker_for_url(url)
+    
+    async def request():
+        if not breaker.allow():
+            raise CircuitOpenError(f"{breaker.name} circuit open")
+        session = get_async_session()
+        try:
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status in (429, 500, 502, 503, 504):
+                    breaker.record_failure(f"HTTP {response.status}")
+                else:
+                    breaker.record_success()
+                # Some ArcGIS servers return JSON as text/plain
+                return await response.json(content_type=None)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            breaker.record_failure(type(e).__name__)
+            raise
+        except asyncio.CancelledError:
+            # The losing side of a hedge - let the next call probe instead
+            breaker.release()
+            raise
+    
+    start = time.time()
+    try:
+        data = await _hedged(request, timeouts.hedge_delay(url), lambda: timeouts.acquire_hedge(url))
+        attributes = _first_feature_attributes(data)
+    except Exception as e:
+        print(f"GIS API error ({url[:50]}...): {e}")
+        return None
+    finally:
+        timeouts.observe(url, min((time.time() - start), timeout) * 1000)
+        _track_gis_latency(url, start)
+    
+    # Share the answer with other workers (SQLite/Redis call - keep it off the loop)
+    if 'error' not in data:
+        await asyncio.to_thread(_gis_cache_set, url, lat, lon, out_fields, attributes)
+    return attributes
+
+
+async def run_with_arcgis_prefetch(
+    func: Callable[..., Any],
+    *args,
+    max_rounds: int = ARCGIS_PREFETCH_ROUNDS,
+    **kwargs
+) -> Any:
+    """
+    Run a sync lookup function with its ArcGIS queries fetched on the loop.
+    
+    Each round runs `func` in a worker thread in recording mode: queries
+    already fetched are answered from memory, new ones are recorded and
+    treated as "no result". The first recorded query - the one a plain
+    sync call would make next - is then fetched on the shared session and
+    `func` runs again. When a round records nothing, every query it made
+    was answered from real responses, so its return value is the same as
+    a plain sync call.
+    
+    Queries after the first are only there because the recorded miss sent
+    `func` down its fallback chain, so they aren't fetched: a layer that
+    answers stops the chain just like the sync path, and HIFLD and the
+    other national layers are only hit when the state layer misses.
+    
+    Args:
+        func: Sync function (e.g. lookup_electric_utility_gis or a
+              DataSource.query bound method)
+        max_rounds: Record/fetch rounds before any remaining queries are
+                    made as ordinary blocking calls
+    
+    Returns:
+        Whatever `func` returns
+    """
+    if not AIOHTTP_AVAILABLE:
+        return await run_blocking(func, *args, **kwargs)
+    
+    prefetch = ArcGISPrefetch()
+    token = _arcgis_prefetch.set(prefetch)
+    try:
+        for _ in range(max_rounds):
+            prefetch.missing.clear()
+            result = await run_blocking(func, *args, **kwargs)
+            if not prefetch.missing:
+                return result
+            
+            key = next(iter(prefetch.missing))
+            prefetch.responses[key] = await fetch_arcgis_point(*key)
+        
+        # Still discovering queries - let the last pass make them directly
+        prefetch.recording = False
+        return await run_blocking(func, *args, **kwargs)
+    finally:
+        _arcgis_prefetch.reset(token)
+
+
+# =============================================================================
+# SYNC BRIDGE
+# =============================================================================
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the event loop thread used by run_sync()."""
+    global _background_loop
+    if _background_loop is None:
+        with _background_lock:
+            if _background_loop is None:
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(get_blocking_executor())
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name='async-lookup-loop',
+                    daemon=True
+                )
+                thread.start()
+                _background_loop = loop
+    return _background_loop
+
+
+def run_sync(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared background loop and wait for its result.
+    
+    All sync callers share one loop (and therefore one connection pool),
+    so concurrent Flask requests multiplex their GIS traffic instead of
+    each opening its own.
+    
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait before raising concurrent.futures.TimeoutError
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+    return future.result(timeout=timeout)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Columnar, memory-mapped store of FCC BDC internet providers by census block.
+
+bdc_internet_new.db keeps one row per block, provider and technology
+(hundreds of millions of rows nationwide), and neighbouring blocks almost
+always repeat the same offers. This store dictionary-encodes at three levels:
+
+    names    provider name strings                    -> name id
+    plans    (name id, technology, down, up, low lat) -> plan id
+    sets     sorted tuple of plan ids                 -> set id
+
+so a block is just (GEOID as uint64, set id as uint32). The block GEOIDs
+are sorted and searched with bisect straight off the mmap. A lookup
+touches a few pages and no Python objects are built for blocks that
+aren't asked for. Tracts (first 11 GEOID digits) get the same treatment
+with the best speeds per provider and technology in the tract, matching
+the tract_providers fallback table.
+
+File layout (little-endian, sections 8-byte aligned):
+    b'BDCSTOR1' | uint32 header length | JSON header | sections
+    The JSON header lists each section's offset, length and array type.
+
+Build with scripts/build_bdc_store.py; bdc_internet_lookup uses the store
+when the file exists and the SQLite database otherwise. The header records
+the size and mtime of the database it was built from; once the database
+is reloaded the store no longer matches and lookups go to SQLite until
+the store is rebuilt.
+
+Usage:
+    from bdc_block_store import get_block_store
+    
+    store = get_block_store()
+    rows = store.lookup_block('481130001001000')   # None if not in the store
+    # [(provider_name, technology, max_down, max_up, low_latency), ...]
+"""
+
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+
+BDC_STORE_PATH = os.getenv(
+    'BDC_STORE_PATH',
+    os.path.join(os.path.dirname(__file__), 'bdc_blocks.bin')
+)
+
+MAGIC = b'BDCSTOR1'
+FORMAT_VERSION = 1
+
+# Section name -> array typecode
+SECTIONS = {
+    'plan_name': 'I',
+    'plan_tech': 'B',
+    'plan_down': 'd',
+    'plan_up': 'd',
+    'plan_low_latency': 'B',
+    'set_start': 'I',
+    'set_plans': 'I',
+    'block_geoid': 'Q',
+    'block_set': 'I',
+    'tract_geoid': 'Q',
+    'tract_set': 'I',
+}
+
+Row = Tuple[str, str, float, float, int]
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _speed(value: float):
+    """Speeds are stored as doubles; give integral ones back as int like SQLite did."""
+    return int(value) if value.is_integer() else value
+
+
+class _Encoder:
+    """Dictionary-encodes plans and plan sets while the builder streams rows."""
+    
+    def __init__(self):
+        self.names: Dict[str, int] = {}
+        self.plans: Dict[Tuple, int] = {}
+        self.sets: Dict[Tuple[int, ...], int] = {}
+        self.columns = {name: array(code) for name, code in SECTIONS.items()}
+        self.columns['set_start'].append(0)
+    
+    def plan_set(self, offers: Dict[Tuple[str, int], List[float]]) -> int:
+        """Set id for {(provider name, tech): [down, up, low latency]}."""
+        plan_ids = []
+        for (name, tech), (down, up, low_latency) in offers.items():
+            name_id = self.names.setdefault(name, len(self.names))
+            plan = (name_id, tech, float(down or 0), float(up or 0), 1 if low_latency else 0)
+            plan_id = self.plans.get(plan)
+            if plan_id is None:
+                plan_id = self.plans[plan] = len(self.plans)
+                for column, value in zip(('plan_name', 'plan_tech', 'plan_down', 'plan_up', 'plan_low_latency'), plan):
+                    self.columns[column].append(value)
+            plan_ids.append(plan_id)
+        
+        key = tuple(sorted(plan_ids))
+        set_id = self.sets.get(key)
+        if set_id is None:
+            set_id = self.sets[key] = len(self.sets)
+            self.columns['set_plans'].extend(key)
+            self.columns['set_start'].append(len(self.columns['set_plans']))
+        return set_id
+
+
+def _source_signature(path: str) -> Optional[Dict[str, int]]:
+    """Size and mtime of the source database (hashing gigabytes is too slow), or None."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _merge_offer(offers: Dict, name: str, tech: int, down, up, low_latency) -> None:
+    """Keep the best down/up/low-latency per (provider, technology)."""
+    best = offers.get((name, tech))
+    if best is None:
+        offers[(name, tech)] = [down or 0, up or 0, low_latency or 0]
+    else:
+        best[0] = max(best[0], down or 0)
+        best[1] = max(best[1], up or 0)
+        best[2] = max(best[2], low_latency or 0)
+
+
+def build_block_store(source_db: str, output: str = BDC_STORE_PATH,
+                      rows: Optional[Iterable[Tuple]] = None) -> Dict[str, int]:
+    """
+    Build the store from the BDC SQLite database.
+    
+    Streams `providers` in block order, so memory is bounded by the
+    dictionaries (names, plans, sets) and two arrays per block, not by the
+    row count. Written to a temporary file and renamed into place.
+    
+    Args:
+        source_db: bdc_internet_new.db (providers table)
+        output: Store file to write
+        rows: (block_geoid, provider_name, technology, max_down, max_up,
+              low_latency) sorted by block_geoid - instead of reading source_db
+    
+    Returns:
+        Counts: blocks, tracts, sets, plans, names, rows, skipped
+    """
+    conn = None
+    source_signature = None
+    if rows is None:
+        # Taken before reading, so a reload during the build leaves the store stale
+        source_signature = _source_signature(source_db)
+        conn = sqlite3.connect(source_db)
+        rows = conn.execute('''
+            SELECT block_geoid, provider_name, technology, max_down, max_up, low_latency
+            FROM providers
+            ORDER BY block_geoid
+        ''')
+    
+    encoder = _Encoder()
+    columns = encoder.columns
+    counts = {'rows': 0, 'skipped': 0}
+    tract, tract_offers = None, {}
+    try:
+        for block_geoid, block_rows in groupby(rows, key=lambda row: row[0]):
+            block_geoid = str(block_geoid)
+            if len(block_geoid) != 15 or not block_geoid.isdigit():
+                counts['skipped'] += sum(1 for _ in block_rows)
+                continue
+            
+            offers: Dict = {}
+            for _, name, tech, down, up, low_latency in block_rows:
+                counts['rows'] += 1
+                _merge_offer(offers, name, int(tech), down, up, low_latency)
+            
+            geoid = int(block_geoid)
+            columns['block_geoid'].append(geoid)
+            columns['block_set'].append(encoder.plan_set(offers))
+            
+            if geoid // 10000 != tract:
+                if tract_offers:
+                    columns['tract_geoid'].append(tract)
+                    columns['tract_set'].append(encoder.plan_set(tract_offers))
+                tract, tract_offers = geoid // 10000, {}
+            for (name, tech), (down, up, low_latency) in offers.items():
+                _merge_offer(tract_offers, name, tech, down, up, low_latency)
+        if tract_offers:
+            columns['tract_geoid'].append(tract)
+            columns['tract_set'].append(encoder.plan_set(tract_offers))
+    finally:
+        if conn is not None:
+            conn.close()
+    
+    names = '\0'.join(sorted(encoder.names, key=encoder.names.get)).encode('utf-8')
+    _write_store(output, names, columns, {
+        'source': os.path.basename(source_db) if source_db else None,
+        'source_signature': source_signature,
+        'built_at': datetime.now().isoformat(),
+    })
+    
+    counts.update(
+        blocks=len(columns['block_geoid']), tracts=len(columns['tract_geoid']),
+        sets=len(encoder.sets), plans=len(encoder.plans), names=len(encoder.names)
+    )
+    return counts
+
+
+def _write_store(output: str, names: bytes, columns: Dict[str, array], meta: Dict) -> None:
+    sections = [('names', 'B', names)] + [
+        (name, SECTIONS[name], columns[name].tobytes()) for name in SECTIONS
+    ]
+    
+    # Lay out the sections after a header whose size depends on the offsets -
+    # reserve generously and pad the JSON to it
+    header = dict(meta, version=FORMAT_VERSION, byteorder=sys.byteorder, sections={})
+    reserve = 4096
+    offset = reserve
+    for name, typecode, data in sections:
+        header['sections'][name] = {'offset': offset, 'length': len(data), 'type': typecode}
+        offset += (len(data) + 7) // 8 * 8
+    header_bytes = json.dumps(header).encode('utf-8')
+    if len(MAGIC) + 4 + len(header_bytes) > reserve:
+        raise ValueError("Store header too large")
+    
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<I', len(header_bytes)) + header_bytes)
+        for name, _, data in sections:
+            f.seek(header['sections'][name]['offset'])
+            f.write(data)
+        f.truncate(offset)
+    os.replace(tmp_path, output)
+
+
+class BlockStore:
+    """A store file mapped read-only; safe to share between threads."""
+    
+    def __init__(self, path: str = BDC_STORE_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a BDC block store")
+        (header_length,) = struct.unpack_from('<I', self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._mmap[start:start + header_length])
+        if self.header.get('version') != FORMAT_VERSION or self.header.get('byteorder') != sys.byteorder:
+            raise ValueError(f"{path}: unsupported store format")
+        
+        buffer = memoryview(self._mmap)
+        self._views = {}
+        for name, section in self.header['sections'].items():
+            view = buffer[section['offset']:section['offset'] + section['length']]
+            self._views[name] = view.cast(section['type']) if section['type'] != 'B' else view
+        
+        # Provider names are the only part decoded up front (a few thousand strings)
+        names = bytes(self._views['names']).decode('utf-8')
+        self.names = names.split('\0') if names else []
+        self._stale_warned = False
+    
+    def matches_source(self, source_db: str) -> bool:
+        """
+        Whether the store was built from source_db as it is on disk now.
+        
+        True when source_db doesn't exist (the store is all there is).
+        """
+        current = _source_signature(source_db)
+        if current is None or current == self.header.get('source_signature'):
+            return True
+        if not self._stale_warned:
+            self._stale_warned = True
+            print(f"[bdc-store] {self.path} is stale - using {source_db} (rebuild the store)")
+        return False
+    
+    def _find(self, keys: memoryview, key: int) -> Optional[int]:
+        i = bisect_left(keys, key)
+        return i if i < len(keys) and keys[i] == key else None
+    
+    def _set_rows(self, set_id: int) -> List[Row]:
+        v = self._views
+        rows = []
+        for i in range(v['set_start'][set_id], v['set_start'][set_id + 1]):
+            plan = v['set_plans'][i]
+            rows.append((
+                self.names[v['plan_name'][plan]],
+                str(v['plan_tech'][plan]),
+                _speed(v['plan_down'][plan]),
+                _speed(v['plan_up'][plan]),
+                v['plan_low_latency'][plan],
+            ))
+        return rows
+    
+    def lookup_block(self, block_geoid: str) -> Optional[List[Row]]:
+        """(provider, technology, down, up, low latency) rows for a block, or None."""
+        if len(block_geoid) != 15 or not block_geoid.isdigit():
+            return None
+        i = self._find(self._views['block_geoid'], int(block_geoid))
+        return None if i is None else self._set_rows(self._views['block_set'][i])
+    
+    def lookup_tract(self, tract_geoid: str) -> Optional[List[Row]]:
+        """Best offer per provider and technology across an 11-digit tract, or None."""
+        if len(tract_geoid) != 11 or not tract_geoid.isdigit():
+            return None
+        i = self._find(self._views['tract_geoid'], int(tract_geoid))
+        return None if i is None else self._set_rows(self._views['tract_set'][i])
+    
+    def stats(self) -> Dict:
+        return {
+            'path': self.path,
+            'bytes': len(self._mmap),
+            'blocks': len(self._views['block_geoid']),
+            'tracts': len(self._views['tract_geoid']),
+            'sets': len(self._views['set_start']) - 1,
+            'plans': len(self._views['plan_name']),
+            'names': len(self.names),
+            'built_at': self.header.get('built_at'),
+            'source_signature': self.header.get('source_signature'),
+        }
+
+
+def get_block_store() -> Optional[BlockStore]:
+    """Get the process-wide store, or None if the file doesn't exist or can't be read."""
+    global _store
+    if _store is None:
+        if not os.path.exists(BDC_STORE_PATH):
+            return None
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = BlockStore(BDC_STORE_PATH)
+                except (OSError, ValueError) as e:
+                    print(f"[bdc-store] cannot open {BDC_STORE_PATH}: {e}")
+                    _store = False
+    return _store or None
@@ -1,13 +1,26 @@
 """
-Fast internet provider lookup using local SQLite BDC database.
+Fast internet provider lookup using local FCC BDC data.
+
+Served from the columnar block store (bdc_block_store.py) when it has
+been built from the database as it is now, else from SQLite through a per-thread read-only,
+memory-mapped handle (db_pool.sqlite_readonly). When a block has no
+rows, the tract-level aggregate table built by build_tract_table()
+answers with one indexed lookup instead of a LIKE scan over the tract's
+blocks.
 """
 
 import sqlite3
 import os
 from typing import Optional, Dict, List
 
+from bdc_block_store import get_block_store
+from db_pool import discard_sqlite_handle, sqlite_readonly, sqlite_table_exists
+
 DB_PATH = os.path.join(os.path.dirname(__file__), 'bdc_internet_new.db')
 
+# Per-tract provider/technology aggregate (see build_tract_table)
+TRACT_TABLE = 'tract_providers'
+
 # Technology code mapping from FCC BDC
 TECHNOLOGY_CODES = {
     '10': 'DSL',
@@ -24,11 +37,54 @@ TECHNOLOGY_CODES = {
 
 def get_available_states() -> List[str]:
     """Check if the BDC database is available."""
-    if os.path.exists(DB_PATH):
+    if os.path.exists(DB_PATH) or get_block_store() is not None:
         return ['ALL']  # Full nationwide coverage
     return []
 
 
+def _store_rows(store, block_geoid: str) -> List[tuple]:
+    """Provider rows for a block from the columnar store, tract-level if the block is missing."""
+    rows = store.lookup_block(block_geoid)
+    if rows is None and len(block_geoid) >= 11:
+        rows = store.lookup_tract(block_geoid[:11])
+        if rows:
+            print(f"  BDC: No exact block match, using tract-level data ({len(rows)} records)")
+    return rows or []
+
+
+def _sqlite_rows(block_geoid: str) -> List[tuple]:
+    """Provider rows for a block from SQLite, tract-level if the block has none."""
+    conn = sqlite_readonly(DB_PATH)
+    
+    # Try exact block match first
+    rows = conn.execute('''
+        SELECT provider_name, technology, max_down, max_up, low_latency
+        FROM providers
+        WHERE block_geoid = ?
+    ''', (block_geoid,)).fetchall()
+    
+    # If no exact match, try tract-level match (first 11 digits)
+    # This handles cases where geocoder returns a slightly different block suffix
+    if not rows and len(block_geoid) >= 11:
+        tract_prefix = block_geoid[:11]
+        if sqlite_table_exists(conn, DB_PATH, TRACT_TABLE):
+            rows = conn.execute(f'''
+                SELECT provider_name, technology, max_down, max_up, low_latency
+                FROM {TRACT_TABLE}
+                WHERE tract_geoid = ?
+            ''', (tract_prefix,)).fetchall()
+        else:
+            rows = conn.execute('''
+                SELECT provider_name, technology, max_down, max_up, low_latency
+                FROM providers
+                WHERE block_geoid LIKE ?
+                LIMIT 1000
+            ''', (tract_prefix + '%',)).fetchall()
+        if rows:
+            print(f"  BDC: No exact block match, using tract-level data ({len(rows)} records)")
+    return rows
+
+
 def lookup_internet_by_block(block_geoid: str) -> Optional[Dict]:
     """
     Look up internet providers by census block GEOID.
@@ -39,37 +95,17 @@ def lookup_internet_by_block(block_geoid: str) -> Optional[Dict]:
     Returns:
         Dict with providers list or None if not found
     """
-    if not os.path.exists(DB_PATH):
+    store = get_block_store()
+    if store is not None and not store.matches_source(DB_PATH):
+        store = None
+    if store is None and not os.path.exists(DB_PATH):
         return None
     
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Try exact block match first
-        cursor.execute('''
-            SELECT provider_name, technology, max_down, max_up, low_latency
-            FROM providers
-            WHERE block_geoid = ?
-        ''', (block_geoid,))
-        
-        rows = cursor.fetchall()
-        
-        # If no exact match, try tract-level match (first 11 digits)
-        # This handles cases where geocoder returns a slightly different block suffix
-        if not rows and len(block_geoid) >= 11:
-            tract_prefix = block_geoid[:11]
-            cursor.execute('''
-                SELECT provider_name, technology, max_down, max_up, low_latency
-                FROM providers
-                WHERE block_geoid LIKE ?
-                LIMIT 1000
-            ''', (tract_prefix + '%',))
-            rows = cursor.fetchall()
-            if rows:
-                print(f"  BDC: No exact block match, using tract-level data ({len(rows)} records)")
-        
-        conn.close()
+        if store is not None:
+            rows = _store_rows(store, block_geoid)
+        else:
+            rows = _sqlite_rows(block_geoid)
         
         if not rows:
             return {'providers': [], 'provider_count': 0, 'block_geoid': block_geoid}
@@ -106,11 +142,50 @@ def lookup_internet_by_block(block_geoid: str) -> Optional[Dict]:
             'source': 'fcc_bdc_local'
         }
         
+    except sqlite3.Error as e:
+        print(f"BDC lookup error: {e}")
+        discard_sqlite_handle(DB_PATH)
+        return None
     except Exception as e:
         print(f"BDC lookup error: {e}")
         return None
 
 
+def build_tract_table(db_path: str = DB_PATH) -> int:
+    """
+    (Re)build the tract-level aggregate used when a block has no rows.
+    
+    One row per tract, provider and technology with the best speeds
+    offered anywhere in the tract.
+    
+    Args:
+        db_path: BDC SQLite file (opened read-write)
+    
+    Returns:
+        Rows in the aggregate table
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(f'''
+            DROP TABLE IF EXISTS {TRACT_TABLE};
+            CREATE TABLE {TRACT_TABLE} AS
+            SELECT
+                substr(block_geoid, 1, 11) AS tract_geoid,
+                provider_name,
+                technology,
+                MAX(max_down) AS max_down,
+                MAX(max_up) AS max_up,
+                MAX(low_latency) AS low_latency
+            FROM providers
+            GROUP BY substr(block_geoid, 1, 11), provider_name, technology;
+            CREATE INDEX idx_{TRACT_TABLE}_tract ON {TRACT_TABLE}(tract_geoid);
+        ''')
+        conn.commit()
+        return conn.execute(f'SELECT COUNT(*) FROM {TRACT_TABLE}').fetchone()[0]
+    finally:
+        conn.close()
+
+
 def lookup_internet_fast(address: str) -> Optional[Dict]:
     """
     Fast internet lookup - requires block_geoid to be passed separately.
@@ -390,7 +390,7 @@ def _openai_format_name(raw_name: str) -> Optional[str]:
         return None
     
     try:
-        import requests
+        import http_client
         
         prompt = f"""Format this utility company name for display. Make it readable and professional.
 Rules:
@@ -402,7 +402,7 @@ Rules:
 Input: {raw_name}
 Output (just the formatted name, nothing else):"""
 
-        response = requests.post(
+        response = http_client.post(
             "https://api.openai.com/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {api_key}",
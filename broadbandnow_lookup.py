@@ -11,7 +11,7 @@ import os
 from typing import Optional, Dict, List
 from urllib.parse import quote
 
-import requests
+import http_client
 
 # BrightData Web Unlocker configuration
 BRIGHTDATA_PROXY_HOST = "brd.superproxy.io"
@@ -94,17 +94,17 @@ def lookup_broadbandnow(zip_code: str, city: str = None, state: str = None) -> O
         # Try direct first (faster), fall back to proxy if blocked
         try:
             print(f"  BroadbandNow: Fetching {url}")
-            response = requests.get(url, headers=headers, timeout=15)
+            response = http_client.get(url, headers=headers, timeout=15)
             if response.status_code == 403 or response.status_code == 429:
                 print(f"  BroadbandNow: Direct blocked ({response.status_code}), trying proxy...")
                 import urllib3
                 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-                response = requests.get(url, headers=headers, proxies=proxies, timeout=30, verify=False)
+                response = http_client.get(url, headers=headers, proxies=proxies, timeout=30, verify=False)
         except Exception as direct_err:
             print(f"  BroadbandNow: Direct failed ({direct_err}), trying proxy...")
             import urllib3
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            response = requests.get(url, headers=headers, proxies=proxies, timeout=30, verify=False)
+            response = http_client.get(url, headers=headers, proxies=proxies, timeout=30, verify=False)
         
         if response.status_code != 200:
             print(f"BroadbandNow: HTTP {response.status_code} for {url}")
@@ -192,7 +192,7 @@ def get_city_state_from_zip(zip_code: str) -> tuple:
     try:
         # Try Census geocoder
         url = f"https://geocoding.geo.census.gov/geocoder/geographies/onelineaddress?address={zip_code}&benchmark=Public_AR_Current&vintage=Current_Current&format=json"
-        response = requests.get(url, timeout=10)
+        response = http_client.get(url, timeout=10)
         data = response.json()
         
         matches = data.get('result', {}).get('addressMatches', [])
@@ -207,7 +207,7 @@ def get_city_state_from_zip(zip_code: str) -> tuple:
     # Fallback: try a simple ZIP lookup service
     try:
         url = f"https://api.zippopotam.us/us/{zip_code}"
-        response = requests.get(url, timeout=5)
+        response = http_client.get(url, timeout=5)
         if response.status_code == 200:
             data = response.json()
             places = data.get('places', [])
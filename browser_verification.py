@@ -22,7 +22,7 @@ from typing import Optional, Dict, List, Tuple
 from enum import Enum
 
 from playwright.async_api import async_playwright, Page, Browser, TimeoutError as PlaywrightTimeout
-import requests
+import http_client
 from urllib.parse import quote
 
 # BrightData proxy for SERP
@@ -106,7 +106,7 @@ def find_utility_website(utility_name: str, state: str = None) -> Optional[str]:
     try:
         search_url = f"https://www.google.com/search?q={quote(query)}"
         
-        response = requests.get(
+        response = http_client.get(
             search_url,
             proxies=proxies,
             headers=headers,
@@ -171,13 +171,13 @@ def verify_url_accessible(url: str, timeout: int = 5) -> bool:
         headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         }
-        response = requests.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        response = http_client.head(url, headers=headers, timeout=timeout, allow_redirects=True)
         # Accept 200-399 as valid (includes redirects that resolved)
         return 200 <= response.status_code < 400
     except Exception:
         # If HEAD fails, try GET (some servers don't support HEAD)
         try:
-            response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+            response = http_client.get(url, headers=headers, timeout=timeout, allow_redirects=True)
             return 200 <= response.status_code < 400
         except Exception:
             return False
@@ -220,7 +220,7 @@ def find_service_check_url_via_serp(utility_name: str, city: str, state: str) ->
         try:
             search_url = f"https://www.google.com/search?q={quote(query)}"
             
-            response = requests.get(
+            response = http_client.get(
                 search_url,
                 proxies=proxies,
                 headers=headers,
@@ -24,6 +24,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from utility_lookup import lookup_utilities_by_address
+from census_batch_geocoder import geocode_addresses
 
 
 def find_address_column(headers: List[str]) -> Optional[str]:
@@ -69,25 +70,16 @@ def find_optional_columns(headers: List[str]) -> Dict[str, Optional[str]]:
     return result
 
 
-def lookup_single_address(
+def build_full_address(
     row: Dict,
     address_col: str,
-    optional_cols: Dict[str, Optional[str]],
-    utilities: List[str],
-    row_num: int
-) -> Dict:
-    """Lookup utilities for a single address."""
+    optional_cols: Dict[str, Optional[str]]
+) -> str:
+    """Address column plus any separate city/state/zip columns it lacks."""
     address = row.get(address_col, '').strip()
-    
     if not address:
-        return {
-            '_row_num': row_num,
-            '_status': 'error',
-            '_error': 'Empty address',
-            **row
-        }
+        return ''
     
-    # Build full address if we have separate columns
     city = row.get(optional_cols.get('city', ''), '').strip() if optional_cols.get('city') else None
     state = row.get(optional_cols.get('state', ''), '').strip() if optional_cols.get('state') else None
     zip_code = row.get(optional_cols.get('zip', ''), '').strip() if optional_cols.get('zip') else None
@@ -100,11 +92,38 @@ def lookup_single_address(
         full_address += f", {state}"
     if zip_code and zip_code not in address:
         full_address += f" {zip_code}"
+    return full_address
+
+
+def lookup_single_address(
+    row: Dict,
+    address_col: str,
+    optional_cols: Dict[str, Optional[str]],
+    utilities: List[str],
+    row_num: int,
+    geo_result: Optional[Dict] = None
+) -> Dict:
+    """
+    Lookup utilities for a single address.
+    
+    Args:
+        geo_result: Geocode from the batch stage (skips per-address geocoding)
+    """
+    full_address = build_full_address(row, address_col, optional_cols)
+    
+    if not full_address:
+        return {
+            '_row_num': row_num,
+            '_status': 'error',
+            '_error': 'Empty address',
+            **row
+        }
     
     try:
         result = lookup_utilities_by_address(
             address=full_address,
-            selected_utilities=utilities
+            selected_utilities=utilities,
+            geo_result=geo_result
         )
         
         if not result:
@@ -251,6 +270,12 @@ def process_csv(
     
     start_time = time.time()
     
+    # Geocode all rows in one Census batch; only misses are geocoded one by one
+    full_addresses = [build_full_address(row, address_col, optional_cols) for row in rows]
+    geo_results = geocode_addresses(full_addresses)
+    print(f"Geocoded {sum(1 for g in geo_results.values() if g)}/{len(geo_results)} addresses "
+          f"in {time.time() - start_time:.1f}s")
+    
     # Use ThreadPoolExecutor for parallel processing
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {}
@@ -263,7 +288,8 @@ def process_csv(
                 address_col,
                 optional_cols,
                 utilities,
-                i + 1
+                i + 1,
+                geo_results.get(full_addresses[i])
             )
             futures[future] = i + 1
             
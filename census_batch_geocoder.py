@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Batch geocoding stage for bulk lookups (/api/lookup/batch, bulk_lookup.py).
+
+Geocoding each address separately costs one Census round trip per
+address. The Census geocoder's batch endpoint takes up to 10,000
+addresses per upload, so a 500-address batch needs a single request.
+Only the addresses Census can't match fall through to the per-address
+Google -> Nominatim -> city centroid tiers of geocode_address.
+
+Results have the same shape as geocode_address(..., include_geography=True)
+and go into the geocode cache, so later lookups for the same addresses
+skip geocoding entirely. The batch response has no place names, so city
+and county come from the Census geographies at each match's coordinates
+(once per census block, like geocode_with_census: Incorporated Place,
+else County Subdivision). A match whose place couldn't be resolved is
+returned without a city and not cached.
+
+Usage:
+    from census_batch_geocoder import geocode_addresses
+    
+    geo_results = geocode_addresses(addresses)
+    result = lookup_utilities_by_address(address, geo_result=geo_results[address])
+"""
+
+import csv
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import http_client
+from geocode_cache import get_cached_geocode, set_cached_geocode
+from gis_utility_lookup import FIPS_TO_STATE
+from shared_cache import get_shared_cache
+from ttl_cache import TTLCache
+from utility_lookup_v1 import geocode_address
+
+CENSUS_BATCH_URL = "https://geocoding.geo.census.gov/geocoder/geographies/addressbatch"
+CENSUS_COORDINATES_URL = "https://geocoding.geo.census.gov/geocoder/geographies/coordinates"
+
+# Census accepts up to 10,000 addresses per upload, but large uploads take
+# minutes server-side - smaller ones finish within the read timeout
+CENSUS_BATCH_SIZE = int(os.getenv('CENSUS_BATCH_SIZE', '1000'))
+
+# /api/lookup/batch uploads synchronously, so this must stay well below the
+# gunicorn worker timeout (--timeout 120 in the Dockerfile)
+CENSUS_BATCH_TIMEOUT = (10, int(os.getenv('CENSUS_BATCH_TIMEOUT', '60')))
+
+# Concurrent per-address fallbacks (Google/Nominatim) for batch misses
+FALLBACK_WORKERS = int(os.getenv('GEOCODE_FALLBACK_WORKERS', '16'))
+
+# Places of a block only change with new Census boundaries
+BLOCK_PLACE_TTL = 30 * 24 * 3600
+
+# Block GEOID -> {'city', 'county'}, filled on demand
+_block_places = TTLCache(
+    max_entries=int(os.getenv('BLOCK_PLACE_CACHE_MAX_ENTRIES', '100000')),
+    ttl=BLOCK_PLACE_TTL,
+    name='block_places'
+)
+
+_LAST_PART = re.compile(r'^([A-Za-z .]+?)\.?\s*(\d{5})?(?:-\d{4})?$')
+
+
+def _split_address(address: str) -> Tuple[str, str, str, str]:
+    """
+    Split a one-line address into the batch file's street/city/state/ZIP.
+    
+    Addresses that don't look like "street, city, state zip" go in the
+    street column whole; Census still tries to match them.
+    """
+    parts = [p.strip() for p in address.split(',') if p.strip()]
+    if parts and parts[-1].upper() in ('USA', 'US', 'UNITED STATES'):
+        parts = parts[:-1]
+    
+    if len(parts) >= 3:
+        match = _LAST_PART.match(parts[-1])
+        if match:
+            return ', '.join(parts[:-2]), parts[-2], match.group(1).strip(), match.group(2) or ''
+        # "street, city, state, zip"
+        if len(parts) >= 4 and re.fullmatch(r'\d{5}(?:-\d{4})?', parts[-1]):
+            return ', '.join(parts[:-3]), parts[-3], parts[-2], parts[-1][:5]
+    return address, '', '', ''
+
+
+def _build_batch_file(addresses: List[str]) -> str:
+    """CSV upload: Unique ID, Street address, City, State, ZIP."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for i, address in enumerate(addresses):
+        writer.writerow([i, *_split_address(address)])
+    return buffer.getvalue()
+
+
+def _places_for_block(block_geoid: str, lat: float, lon: float) -> Optional[Dict]:
+    """
+    City and county of a census block, as geocode_with_census reports them.
+    
+    Looked up once per block from the Census coordinates endpoint and kept
+    in the shared cache; None if the lookup failed.
+    """
+    places = _block_places.get(block_geoid)
+    if places is not None:
+        return places
+    
+    shared = get_shared_cache()
+    places = shared.get('block_places', block_geoid) if shared is not None else None
+    if places is None:
+        try:
+            response = http_client.get(CENSUS_COORDINATES_URL, params={
+                'x': lon,
+                'y': lat,
+                'benchmark': 'Public_AR_Current',
+                'vintage': 'Census2020_Current',
+                'layers': 'Counties,Incorporated Places,County Subdivisions',
+                'format': 'json',
+            }, timeout=10)
+            response.raise_for_status()
+            geo = response.json().get('result', {}).get('geographies', {})
+        except Exception as e:
+            print(f"  Place lookup error ({block_geoid}): {e}")
+            return None
+        counties = geo.get('Counties', [])
+        cities = geo.get('Incorporated Places', []) or geo.get('County Subdivisions', [])
+        places = {
+            'city': cities[0].get('BASENAME') if cities else None,
+            'county': counties[0].get('BASENAME') if counties else None,
+        }
+        if shared is not None:
+            shared.set('block_places', block_geoid, places, ttl=BLOCK_PLACE_TTL)
+    
+    _block_places.set(block_geoid, places)
+    return places
+
+
+def _resolve_places(results: Dict[str, Optional[Dict]]) -> Set[str]:
+    """
+    Fill in city and county of batch matches, one lookup per distinct block.
+    
+    Returns:
+        Addresses whose place was resolved (safe to cache)
+    """
+    by_block: Dict[str, List[str]] = {}
+    for address, result in results.items():
+        if result and result.get('block_geoid'):
+            by_block.setdefault(result['block_geoid'], []).append(address)
+    if not by_block:
+        return set()
+    
+    def resolve(block_geoid):
+        first = results[by_block[block_geoid][0]]
+        return block_geoid, _places_for_block(block_geoid, first['lat'], first['lon'])
+    
+    resolved = set()
+    with ThreadPoolExecutor(max_workers=min(FALLBACK_WORKERS, len(by_block))) as executor:
+        for block_geoid, places in executor.map(resolve, by_block):
+            if places is None:
+                continue
+            for address in by_block[block_geoid]:
+                results[address].update(places)
+                resolved.add(address)
+    return resolved
+
+
+def _parse_match(address: str, row: List[str]) -> Optional[Dict]:
+    """
+    Convert one batch response row into a geocode_with_census()-style result.
+    
+    Row: id, input, Match/No_Match/Tie, Exact/Non_Exact, matched address,
+         "lon,lat", TIGER line id, side, state FIPS, county FIPS, tract, block
+    """
+    if len(row) < 6 or row[2] != 'Match':
+        return None
+    
+    matched_address = row[4]
+    try:
+        lon, lat = (float(v) for v in row[5].split(','))
+    except ValueError:
+        return None
+    
+    zip_match = re.search(r'\b(\d{5})(?:-\d{4})?\s*$', matched_address)
+    zip_code = zip_match.group(1) if zip_match else None
+    
+    # Same check as geocode_address: a match in another postal region is wrong
+    input_zip = re.search(r'\b(\d{5})(?:-\d{4})?\b', address)
+    if input_zip and zip_code and input_zip.group(1)[:3] != zip_code[:3]:
+        return None
+    
+    state_fips, county_fips, tract, block = (row[8:12] + [''] * 4)[:4]
+    block_geoid = f"{state_fips}{county_fips}{tract}{block}" if state_fips and block else None
+    
+    return {
+        "lon": lon,
+        "lat": lat,
+        "matched_address": matched_address,
+        # Filled in by _resolve_places (the response has no place names)
+        "city": None,
+        "county": None,
+        "state": FIPS_TO_STATE.get(state_fips),
+        "zip_code": zip_code,
+        "source": "Census",
+        "block_geoid": block_geoid,
+    }
+
+
+def geocode_census_batch(addresses: List[str]) -> Dict[str, Optional[Dict]]:
+    """
+    Geocode addresses with Census batch uploads.
+    
+    Args:
+        addresses: One-line addresses (any number - split into uploads of
+                   CENSUS_BATCH_SIZE)
+    
+    Returns:
+        {address: result or None}. Addresses missing from the dict were not
+        answered (the upload failed) and should be geocoded individually.
+        Matches carry '_place_resolved' (False if the city lookup failed).
+    """
+    results = {}
+    for start in range(0, len(addresses), CENSUS_BATCH_SIZE):
+        chunk = addresses[start:start + CENSUS_BATCH_SIZE]
+        try:
+            response = http_client.post(
+                CENSUS_BATCH_URL,
+                data={'benchmark': 'Public_AR_Current', 'vintage': 'Census2020_Current'},
+                files={'addressFile': ('addresses.csv', _build_batch_file(chunk), 'text/csv')},
+                timeout=CENSUS_BATCH_TIMEOUT,
+            )
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Census batch geocode failed ({len(chunk)} addresses): {e}")
+            continue
+        
+        for row in csv.reader(io.StringIO(response.text)):
+            try:
+                address = chunk[int(row[0])]
+            except (ValueError, IndexError):
+                continue
+            results[address] = _parse_match(address, row)
+    
+    resolved = _resolve_places(results)
+    for address, result in results.items():
+        if result:
+            result['_place_resolved'] = address in resolved
+    return results
+
+
+def geocode_addresses(addresses: Iterable[str]) -> Dict[str, Optional[Dict]]:
+    """
+    Geocode many addresses: cache, then Census batch, then per-address fallbacks.
+    
+    Args:
+        addresses: One-line addresses (duplicates are geocoded once)
+    
+    Returns:
+        {address: geocode_address(address, include_geography=True)-style
+        result, or None if no geocoder could place it}
+    """
+    results = {}
+    pending = []
+    for address in dict.fromkeys(a for a in addresses if a):
+        hit, result = get_cached_geocode(address, include_geography=True)
+        if hit:
+            results[address] = result
+        else:
+            pending.append(address)
+    
+    if not pending:
+        return results
+    
+    batch = geocode_census_batch(pending)
+    fallback = []
+    for address in pending:
+        result = batch.get(address)
+        if result:
+            # Without its place the result can't stand in for the single
+            # geocoder's (filter_by_city matches on it), so it isn't cached
+            if result.pop('_place_resolved', False):
+                set_cached_geocode(address, True, result)
+            results[address] = result
+        else:
+            fallback.append(address)
+    
+    if fallback:
+        print(f"Census batch matched {len(pending) - len(fallback)}/{len(pending)}, "
+              f"geocoding {len(fallback)} individually")
+        
+        def geocode_one(address):
+            # Census already said no match - go straight to Google/Nominatim
+            return geocode_address(address, include_geography=True, skip_census=address in batch)
+        
+        with ThreadPoolExecutor(max_workers=min(FALLBACK_WORKERS, len(fallback))) as executor:
+            for address, result in zip(fallback, executor.map(geocode_one, fallback)):
+                results[address] = result
+    
+    return results
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Circuit breakers for outbound dependencies (GIS servers, geocoders,
+Airtable, OpenAI, Google search).
+
+When a dependency goes down every lookup still calls it and waits for the
+timeout. A breaker per dependency watches the failure rate over a rolling
+window; once it trips, calls fail immediately with CircuitOpenError for
+CIRCUIT_OPEN_SECONDS, then a single probe request is let through
+(half-open). A successful probe closes the circuit, a failed one opens it
+again.
+
+http_client applies a breaker to every request by host, so all pooled
+outbound calls are covered. ArcGIS Online hosts (services*.arcgis.com)
+serve thousands of unrelated organisations, so their breakers are keyed
+by org and service instead. OpenAI SDK calls don't go through
+http_client and are wrapped with get_breaker('openai').call(...). CircuitOpenError is a requests
+ConnectionError, so existing `except requests.RequestException` handlers
+treat it like the outage it stands for.
+
+Usage:
+    from circuit_breaker import get_breaker, breaker_states
+    
+    breaker = get_breaker('airtable')
+    if breaker.allow():
+        try:
+            ...
+            breaker.record_success()
+        except Exception:
+            breaker.record_failure()
+            raise
+    
+    breaker_states()    # for /api/health
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+# Set to 0 to never short-circuit calls
+CIRCUIT_BREAKERS_ENABLED = os.getenv('CIRCUIT_BREAKERS_ENABLED', '1') == '1'
+
+# Trip when at least this share of recent calls failed...
+CIRCUIT_FAILURE_RATE = float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5'))
+
+# ...out of at least this many calls in the window
+CIRCUIT_MIN_CALLS = int(os.getenv('CIRCUIT_MIN_CALLS', '5'))
+
+CIRCUIT_WINDOW_SECONDS = float(os.getenv('CIRCUIT_WINDOW_SECONDS', '60'))
+
+# How long an open circuit rejects calls before probing
+CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', '30'))
+
+# Friendly dependency names for the hosts every lookup talks to; other
+# hosts (state and county GIS servers) get a breaker per host
+HOST_DEPENDENCIES = {
+    'geocoding.geo.census.gov': 'census_geocoder',
+    'maps.googleapis.com': 'google_geocoder',
+    'nominatim.openstreetmap.org': 'nominatim',
+    'api.airtable.com': 'airtable',
+    'api.openai.com': 'openai',
+    'www.google.com': 'google_search',
+}
+
+# Shared ArcGIS Online hosts: https://services3.arcgis.com/<orgId>/arcgis/rest/services/<name>/...
+ARCGIS_ONLINE_HOST = re.compile(r'^services\d*\.arcgis\.com$')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+_breakers: Dict[str, 'CircuitBreaker'] = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with half-open probing."""
+    
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = CIRCUIT_FAILURE_RATE,
+        min_calls: int = CIRCUIT_MIN_CALLS,
+        window_seconds: float = CIRCUIT_WINDOW_SECONDS,
+        open_seconds: float = CIRCUIT_OPEN_SECONDS
+    ):
+        """
+        Args:
+            name: Dependency name (reported on /api/health)
+            failure_rate: Failure share that trips the circuit
+            min_calls: Calls needed in the window before it can trip
+            window_seconds: Rolling window for the failure rate
+            open_seconds: Time an open circuit rejects calls before a probe
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        
+        self._state = CLOSED
+        self._outcomes: deque = deque()  # (timestamp, ok)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._rejected = 0
+        self._trips = 0
+        self._last_failure: Optional[str] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.time())
+    
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+    
+    def allow(self) -> bool:
+        """
+        Whether a call may go ahead now.
+        
+        In half-open state only one probe call is allowed at a time; its
+        outcome must be reported with record_success/record_failure.
+        """
+        if not CIRCUIT_BREAKERS_ENABLED:
+            return True
+        with self._lock:
+            state = self._current_state(time.time())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+            return False
+    
+    def record_success(self) -> None:
+        with self._lock:
+            now = time.time()
+            if self._current_state(now) == HALF_OPEN:
+                # Probe succeeded - start over with a clean window
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+                return
+            self._add(now, True)
+    
+    def record_failure(self, error: Optional[str] = None) -> None:
+        with self._lock:
+            now = time.time()
+            self._last_failure = error
+            state = self._current_state(now)
+            if state == HALF_OPEN:
+                self._open(now)
+                return
+            if state == OPEN:
+                return
+            self._add(now, False)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if (len(self._outcomes) >= self.min_calls and
+                    failures / len(self._outcomes) >= self.failure_rate):
+                self._open(now)
+    
+    def release(self) -> None:
+        """Give up an allowed call without an outcome (e.g. it was cancelled)."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+    
+    def _add(self, now: float, ok: bool) -> None:
+        self._outcomes.append((now, ok))
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+    
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._probe_in_flight = False
+        self._trips += 1
+        print(f"[circuit] {self.name} OPEN for {self.open_seconds:.0f}s ({self._last_failure})")
+    
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run func through the breaker; any exception counts as a failure.
+        
+        Raises:
+            CircuitOpenError: the circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit open")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record_failure(str(e))
+            raise
+        self.record_success()
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            state = self._current_state(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                'state': state,
+                'window_calls': calls,
+                'window_failures': failures,
+                'rejected': self._rejected,
+                'trips': self._trips,
+                'open_for_s': round(max(0.0, self.open_seconds - (now - self._opened_at)), 1) if state == OPEN else 0,
+                'last_failure': self._last_failure,
+            }
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get or create the process-wide breaker for a dependency."""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = _breakers[name] = CircuitBreaker(name)
+    return breaker
+
+
+def dependency_for_url(url: str) -> str:
+    """Dependency name for a request URL (friendly name, host, or ArcGIS Online org/service)."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    if ARCGIS_ONLINE_HOST.match(host):
+        parts = [p for p in parsed.path.split('/') if p]
+        # One org's service failing says nothing about the other tenants
+        if len(parts) >= 5 and parts[1:4] == ['arcgis', 'rest', 'services']:
+            return f"{host}/{parts[0]}/{parts[4]}"
+        if parts:
+            return f"{host}/{parts[0]}"
+    return HOST_DEPENDENCIES.get(host, host)
+
+
+def breaker_for_url(url: str) -> CircuitBreaker:
+    return get_breaker(dependency_for_url(url))
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """State of every breaker created so far in this process."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.stats() for b in sorted(breakers, key=lambda b: b.name)}
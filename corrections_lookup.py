@@ -9,6 +9,8 @@ import os
 from datetime import datetime
 from typing import Optional, Dict, List
 
+from result_store import invalidate_results
+
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data', 'corrections.db')
 
 def get_connection():
@@ -84,6 +86,17 @@ def init_db():
     conn.commit()
     conn.close()
 
+def _invalidate_ai_decisions(utility_type: str, state: Optional[str], zip_code: Optional[str]):
+    """Cached AI selector decisions and stored batch results for the area may contradict a new correction."""
+    try:
+        from pipeline.ai_selector import invalidate_ai_decisions
+        invalidate_ai_decisions(utility_type, state, zip_code)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"Warning: AI decision invalidation failed: {e}")
+    invalidate_results(utility_type, state, zip_code)
+
 def add_correction(
     utility_type: str,
     correct_provider: str,
@@ -132,6 +145,7 @@ def add_correction(
         
         conn.commit()
         conn.close()
+        _invalidate_ai_decisions(utility_type, state, zip_code)
         
         return {
             'status': 'updated',
@@ -159,6 +173,7 @@ def add_correction(
         
         conn.commit()
         conn.close()
+        _invalidate_ai_decisions(utility_type, state, zip_code)
         
         return {
             'status': 'created',
@@ -325,9 +340,15 @@ def approve_correction(correction_id: int) -> bool:
     ''', (datetime.now().isoformat(), datetime.now().isoformat(), correction_id))
     
     success = cursor.rowcount > 0
+    row = None
+    if success:
+        cursor.execute('SELECT utility_type, state, zip_code FROM corrections WHERE id = ?', (correction_id,))
+        row = cursor.fetchone()
     conn.commit()
     conn.close()
     
+    if row:
+        _invalidate_ai_decisions(row['utility_type'], row['state'], row['zip_code'])
     return success
 
 def reject_correction(correction_id: int) -> bool:
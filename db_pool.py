@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Pooled database connections for the lookup path.
+
+Internet lookups used to open a new psycopg2 connection to DATABASE_URL
+(TCP + TLS + auth, usually slower than the query itself) and a new
+sqlite3 connection to the BDC file on every call. This module keeps
+them open:
+
+- PostgreSQL: one psycopg2 ThreadedConnectionPool per process. Each
+  connection remembers the statements it has PREPAREd, so hot queries
+  are parsed and planned once per connection.
+- SQLite: one read-only, memory-mapped handle per thread per file.
+  sqlite3 caches compiled statements on the handle, so reusing it is
+  what makes repeated queries prepared.
+
+Usage:
+    from db_pool import pg_connection, pg_execute_prepared, sqlite_readonly
+    
+    with pg_connection() as conn:
+        row = pg_execute_prepared(
+            conn, 'internet_block',
+            'SELECT providers FROM internet_providers WHERE block_geoid = $1',
+            (block_geoid,)
+        ).fetchone()
+    
+    rows = sqlite_readonly(DB_PATH).execute(sql, params).fetchall()
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+# Try to import psycopg2 for the PostgreSQL pool
+try:
+    import psycopg2
+    from psycopg2.extensions import connection as _PGConnection
+    from psycopg2.pool import ThreadedConnectionPool
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+# Connections kept open per process, and the most that may be open at once
+PG_POOL_MIN = int(os.getenv('PG_POOL_MIN', '1'))
+PG_POOL_MAX = int(os.getenv('PG_POOL_MAX', '10'))
+
+# Seconds to wait for a free pooled connection before giving up
+PG_POOL_WAIT = float(os.getenv('PG_POOL_WAIT', '2'))
+
+PG_CONNECT_TIMEOUT = int(os.getenv('PG_CONNECT_TIMEOUT', '5'))
+
+# Memory-map up to this many bytes of each read-only SQLite file
+SQLITE_MMAP_BYTES = int(os.getenv('SQLITE_MMAP_BYTES', str(256 * 1024 * 1024)))
+
+_pg_pool = None
+_pg_pool_pid = None
+_pg_slots: Optional[threading.BoundedSemaphore] = None
+_pg_lock = threading.Lock()
+
+_sqlite_local = threading.local()
+_sqlite_tables: Dict[Tuple[str, str], bool] = {}
+
+
+if PSYCOPG2_AVAILABLE:
+    class _PooledConnection(_PGConnection):
+        """psycopg2 connection that tracks its prepared statements and known tables."""
+        
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Lookups are single read-only statements - no transaction to hold open
+            self.autocommit = True
+            self.prepared = set()
+            self.tables: Dict[str, bool] = {}
+
+
+def get_pg_pool():
+    """
+    Get the process-wide PostgreSQL pool.
+    
+    Returns:
+        ThreadedConnectionPool, or None if DATABASE_URL is unset or
+        psycopg2 isn't installed
+    """
+    global _pg_pool, _pg_pool_pid, _pg_slots
+    database_url = os.environ.get('DATABASE_URL')
+    if not PSYCOPG2_AVAILABLE or not database_url:
+        return None
+    
+    # Pooled sockets must not cross a fork (gunicorn preload)
+    if _pg_pool is None or _pg_pool_pid != os.getpid():
+        with _pg_lock:
+            if _pg_pool is None or _pg_pool_pid != os.getpid():
+                _pg_pool = ThreadedConnectionPool(
+                    PG_POOL_MIN, PG_POOL_MAX, database_url,
+                    connect_timeout=PG_CONNECT_TIMEOUT,
+                    connection_factory=_PooledConnection
+                )
+                _pg_slots = threading.BoundedSemaphore(PG_POOL_MAX)
+                _pg_pool_pid = os.getpid()
+    return _pg_pool
+
+
+@contextmanager
+def pg_connection() -> Iterator[Any]:
+    """
+    Borrow a pooled PostgreSQL connection.
+    
+    Connections that fail with a connection-level error are closed
+    instead of returned to the pool.
+    
+    Raises:
+        RuntimeError: No pool (see get_pg_pool) or no free connection
+            within PG_POOL_WAIT seconds
+    """
+    pool = get_pg_pool()
+    if pool is None:
+        raise RuntimeError("PostgreSQL not configured (DATABASE_URL / psycopg2)")
+    slots = _pg_slots
+    if not slots.acquire(timeout=PG_POOL_WAIT):
+        raise RuntimeError(f"No free PostgreSQL connection after {PG_POOL_WAIT}s")
+    
+    conn = None
+    broken = False
+    try:
+        conn = pool.getconn()
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    finally:
+        if conn is not None:
+            pool.putconn(conn, close=broken or bool(conn.closed))
+        slots.release()
+
+
+def pg_execute_prepared(conn, name: str, sql: str, params: Sequence[Any] = ()):
+    """
+    Run a statement through a server-side prepared statement.
+    
+    Args:
+        conn: Connection from pg_connection()
+        name: Statement name (unique per SQL text)
+        sql: Statement using $1, $2, ... placeholders
+        params: Parameter values
+    
+    Returns:
+        Cursor positioned on the results
+    """
+    cursor = conn.cursor()
+    if name not in conn.prepared:
+        cursor.execute(f"PREPARE {name} AS {sql}")
+        conn.prepared.add(name)
+    if params:
+        cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", tuple(params))
+    else:
+        cursor.execute(f"EXECUTE {name}")
+    return cursor
+
+
+def pg_table_exists(conn, table: str) -> bool:
+    """Whether a table exists, checked once per connection."""
+    if table not in conn.tables:
+        cursor = conn.cursor()
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", (table,))
+        conn.tables[table] = bool(cursor.fetchone()[0])
+    return conn.tables[table]
+
+
+def sqlite_readonly(path: str) -> sqlite3.Connection:
+    """
+    This thread's read-only, memory-mapped handle on a SQLite file.
+    
+    Args:
+        path: Database file (must exist)
+    
+    Returns:
+        sqlite3 connection - don't close it, it is reused
+    """
+    local = _sqlite_local
+    if getattr(local, 'pid', None) != os.getpid():
+        local.handles, local.pid = {}, os.getpid()
+    
+    conn = local.handles.get(path)
+    if conn is None:
+        conn = sqlite3.connect(Path(path).resolve().as_uri() + '?mode=ro', uri=True)
+        conn.execute(f'PRAGMA mmap_size = {SQLITE_MMAP_BYTES}')
+        local.handles[path] = conn
+    return conn
+
+
+def discard_sqlite_handle(path: str) -> None:
+    """Close this thread's handle on path (e.g. after the file was replaced)."""
+    handles = getattr(_sqlite_local, 'handles', {})
+    conn = handles.pop(path, None)
+    if conn is not None:
+        conn.close()
+    for key in [key for key in _sqlite_tables if key[0] == path]:
+        _sqlite_tables.pop(key, None)
+
+
+def sqlite_table_exists(conn: sqlite3.Connection, path: str, table: str) -> bool:
+    """Whether a table exists in the file at path, checked once per process."""
+    key = (path, table)
+    if key not in _sqlite_tables:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        _sqlite_tables[key] = row is not None
+    return _sqlite_tables[key]
@@ -9,6 +9,7 @@ API Docs: https://echo.epa.gov/tools/web-services/facility-search-water
 """
 
 import requests
+import http_client
 from typing import Optional, Dict, List
 import time
 
@@ -71,7 +72,7 @@ def lookup_wastewater_facilities(
         # Call the CWA (Clean Water Act) facility search
         url = f"{ECHO_API_BASE}/cwa_rest_services.get_facilities"
         
-        response = requests.get(url, params=params, timeout=15)
+        response = http_client.get(url, params=params, timeout=15)
         response.raise_for_status()
         
         data = response.json()
@@ -120,7 +121,7 @@ def lookup_wastewater_facilities(
         # Also try minor facilities if no major ones found
         if not facilities:
             params["p_maj"] = "N"
-            response = requests.get(url, params=params, timeout=15)
+            response = http_client.get(url, params=params, timeout=15)
             if response.status_code == 200:
                 data = response.json()
                 results = data.get("Results", {})
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Parallel, resumable export of the aggregated BDC table to PostgreSQL.
+
+export_streamed.py pushes block_providers_agg through one SQLite cursor
+and execute_values upserts on a single core. This exporter splits the
+work by state (the 2-digit FIPS prefix of block_geoid) across processes.
+Each shard:
+
+- streams its GEOID range from SQLite (an index range scan)
+- COPYs batches FROM STDIN into its own staging table, one commit and
+  one checkpoint per batch
+- merges the staging table into internet_providers in a single
+  INSERT ... ON CONFLICT once the whole shard is loaded, then drops it
+
+Checkpoints are per shard (export_checkpoints/<prefix>.json), so a rerun
+resumes every unfinished shard where it stopped and skips finished ones.
+A batch that was committed but not checkpointed is copied again; the
+merge keeps one row per block, so that is harmless.
+
+Usage:
+    DATABASE_URL=postgresql://... python export_parallel.py
+    python export_parallel.py --workers 8 --batch-size 50000
+    python export_parallel.py --shards 06,48     # only CA and TX
+    python export_parallel.py --reset            # forget checkpoints, start over
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Configuration
+SQLITE_PATH = 'bdc_internet_new.db'
+SOURCE_TABLE = 'block_providers_agg'
+TARGET_TABLE = 'internet_providers'
+CHECKPOINT_DIR = 'export_checkpoints'
+BATCH_SIZE = 50000
+NUM_WORKERS = min(8, os.cpu_count() or 1)
+REPORT_INTERVAL = 15  # seconds between overall progress lines
+MAX_RETRIES = 5
+INITIAL_BACKOFF = 2  # seconds
+
+
+def shard_range(prefix: str) -> Tuple[str, str]:
+    """[low, high) block_geoid bounds for a 2-digit state FIPS prefix."""
+    # ':' sorts right after '9', so every GEOID starting with prefix is below it
+    return prefix, prefix + ':'
+
+
+def shard_prefixes(sqlite_path: str) -> List[str]:
+    """State FIPS prefixes that have rows, found with one index probe per prefix."""
+    conn = sqlite3.connect(f'file:{sqlite_path}?mode=ro', uri=True)
+    try:
+        prefixes = []
+        for i in range(100):
+            low, high = shard_range(f'{i:02d}')
+            row = conn.execute(
+                f"SELECT 1 FROM {SOURCE_TABLE} WHERE block_geoid >= ? AND block_geoid < ? LIMIT 1",
+                (low, high)
+            ).fetchone()
+            if row:
+                prefixes.append(low)
+        return prefixes
+    finally:
+        conn.close()
+
+
+def iter_shard_batches(
+    sqlite_conn: sqlite3.Connection,
+    prefix: str,
+    after: Optional[str] = None,
+    batch_size: int = BATCH_SIZE
+) -> Iterator[List[Tuple[str, str]]]:
+    """Yield (block_geoid, providers_json) batches of one shard in GEOID order."""
+    low, high = shard_range(prefix)
+    cursor = sqlite_conn.execute(
+        f"""
+        SELECT block_geoid, providers_json FROM {SOURCE_TABLE}
+        WHERE block_geoid >= ? AND block_geoid < ? AND block_geoid > ?
+        ORDER BY block_geoid
+        """,
+        (low, high, after or '')
+    )
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        yield batch
+
+
+def _copy_field(value: str) -> str:
+    """Escape a value for COPY text format."""
+    return (value.replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copy_rows(cursor, table: str, rows: List[Tuple[str, str]]) -> None:
+    """COPY (block_geoid, providers) rows into a table FROM STDIN."""
+    buffer = io.StringIO()
+    for block_geoid, providers_json in rows:
+        buffer.write(f'{_copy_field(str(block_geoid))}\t{_copy_field(providers_json)}\n')
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} (block_geoid, providers) FROM STDIN", buffer)
+
+
+def checkpoint_path(prefix: str) -> str:
+    return os.path.join(CHECKPOINT_DIR, f'{prefix}.json')
+
+
+def load_checkpoint(prefix: str) -> Dict:
+    """Shard checkpoint: last_block, rows, seconds, done."""
+    path = checkpoint_path(prefix)
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {'last_block': None, 'rows': 0, 'seconds': 0.0, 'done': False}
+
+
+def save_checkpoint(prefix: str, checkpoint: Dict) -> None:
+    """Atomically save a shard checkpoint using tmp file + rename."""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=CHECKPOINT_DIR)
+    try:
+        with os.fdopen(tmp_fd, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, checkpoint_path(prefix))
+    except:
+        os.unlink(tmp_path)
+        raise
+
+
+def get_pg_connection(pg_url: str):
+    """Get PostgreSQL connection with retry logic and exponential backoff."""
+    import psycopg2
+    backoff = INITIAL_BACKOFF
+    for attempt in range(MAX_RETRIES):
+        try:
+            conn = psycopg2.connect(pg_url, connect_timeout=30)
+            conn.autocommit = False
+            return conn
+        except psycopg2.OperationalError as e:
+            print(f"  Connection attempt {attempt + 1}/{MAX_RETRIES} failed: {e}")
+            if attempt < MAX_RETRIES - 1:
+                time.sleep(backoff)
+                backoff *= 2
+    raise Exception(f"Failed to connect to PostgreSQL after {MAX_RETRIES} retries")
+
+
+def ensure_table_exists(pg_conn) -> None:
+    """Create target table if it doesn't exist."""
+    with pg_conn.cursor() as cur:
+        cur.execute(f'''
+            CREATE TABLE IF NOT EXISTS {TARGET_TABLE} (
+                block_geoid TEXT PRIMARY KEY,
+                providers JSONB NOT NULL
+            )
+        ''')
+    pg_conn.commit()
+
+
+def export_shard(prefix: str, sqlite_path: str, pg_url: str, batch_size: int) -> Dict:
+    """
+    Export one state shard (runs in a worker process).
+    
+    Returns:
+        The shard's final checkpoint
+    """
+    checkpoint = load_checkpoint(prefix)
+    if checkpoint['done']:
+        return checkpoint
+    
+    stage = f'{TARGET_TABLE}_stage_{prefix}'
+    sqlite_conn = sqlite3.connect(f'file:{sqlite_path}?mode=ro', uri=True)
+    pg_conn = get_pg_connection(pg_url)
+    try:
+        with pg_conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL", (stage,))
+            stage_exists = cur.fetchone()[0]
+            if checkpoint['last_block'] and not stage_exists:
+                print(f"[shard {prefix}] staging table missing - restarting shard")
+                checkpoint = {'last_block': None, 'rows': 0, 'seconds': 0.0, 'done': False}
+            # No indexes or constraints on the staging table - COPY just appends
+            cur.execute(f"CREATE TABLE IF NOT EXISTS {stage} (block_geoid TEXT, providers TEXT)")
+            if not checkpoint['last_block']:
+                cur.execute(f"TRUNCATE {stage}")
+        pg_conn.commit()
+        
+        for batch in iter_shard_batches(sqlite_conn, prefix, checkpoint['last_block'], batch_size):
+            start = time.time()
+            with pg_conn.cursor() as cur:
+                copy_rows(cur, stage, batch)
+            pg_conn.commit()
+            checkpoint['last_block'] = batch[-1][0]
+            checkpoint['rows'] += len(batch)
+            checkpoint['seconds'] += time.time() - start
+            save_checkpoint(prefix, checkpoint)
+        
+        # Final merge: one row per block (a re-copied batch can appear twice)
+        start = time.time()
+        with pg_conn.cursor() as cur:
+            cur.execute(f"""
+                INSERT INTO {TARGET_TABLE} (block_geoid, providers)
+                SELECT DISTINCT ON (block_geoid) block_geoid, providers::jsonb
+                FROM {stage}
+                ORDER BY block_geoid
+                ON CONFLICT (block_geoid) DO UPDATE SET providers = EXCLUDED.providers
+            """)
+            cur.execute(f"DROP TABLE {stage}")
+        pg_conn.commit()
+        checkpoint['merge_seconds'] = round(time.time() - start, 1)
+        checkpoint['done'] = True
+        save_checkpoint(prefix, checkpoint)
+        
+        rate = checkpoint['rows'] / checkpoint['seconds'] if checkpoint['seconds'] else 0
+        print(f"[shard {prefix}] done: {checkpoint['rows']:,} rows, {rate:,.0f} rows/s copy, "
+              f"{checkpoint['merge_seconds']}s merge")
+        return checkpoint
+    finally:
+        sqlite_conn.close()
+        pg_conn.close()
+
+
+def report_progress(prefixes: List[str], started: float, rows_at_start: int) -> None:
+    """One overall progress line from the shard checkpoints."""
+    checkpoints = [load_checkpoint(prefix) for prefix in prefixes]
+    rows = sum(c['rows'] for c in checkpoints)
+    done = sum(1 for c in checkpoints if c['done'])
+    elapsed = time.time() - started
+    rate = (rows - rows_at_start) / elapsed if elapsed > 0 else 0
+    print(f"Exported {rows:,} rows | {done}/{len(prefixes)} shards merged | {rate:,.0f} rows/s")
+
+
+def export_parallel(sqlite_path: str, pg_url: str, workers: int = NUM_WORKERS,
+                    batch_size: int = BATCH_SIZE, shards: Optional[List[str]] = None) -> bool:
+    """Export every shard with a process pool; True if all shards finished."""
+    conn = sqlite3.connect(f'file:{sqlite_path}?mode=ro', uri=True)
+    has_source = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (SOURCE_TABLE,)
+    ).fetchone()
+    conn.close()
+    if not has_source:
+        print(f"ERROR: {SOURCE_TABLE} table not found!")
+        print(f"Run: sqlite3 {sqlite_path} < create_aggregated_table.sql")
+        return False
+    
+    prefixes = shards or shard_prefixes(sqlite_path)
+    pending = [prefix for prefix in prefixes if not load_checkpoint(prefix)['done']]
+    print(f"{len(prefixes)} shards, {len(pending)} to export with {workers} workers")
+    if not pending:
+        return True
+    
+    pg_conn = get_pg_connection(pg_url)
+    ensure_table_exists(pg_conn)
+    pg_conn.close()
+    
+    started = time.time()
+    rows_at_start = sum(load_checkpoint(prefix)['rows'] for prefix in prefixes)
+    failed = []
+    # Largest states first would be ideal; FIPS order is close enough and stable
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(export_shard, prefix, sqlite_path, pg_url, batch_size): prefix
+            for prefix in pending
+        }
+        remaining = set(futures)
+        while remaining:
+            finished, remaining = wait(remaining, timeout=REPORT_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in finished:
+                try:
+                    future.result()
+                except Exception as e:
+                    failed.append(futures[future])
+                    print(f"[shard {futures[future]}] FAILED: {e} (rerun to resume)")
+            report_progress(prefixes, started, rows_at_start)
+    
+    if failed:
+        print(f"Failed shards: {', '.join(sorted(failed))}")
+        return False
+    return True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sqlite', default=SQLITE_PATH, help='Source SQLite database')
+    parser.add_argument('--workers', type=int, default=NUM_WORKERS, help='Worker processes')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows per COPY batch')
+    parser.add_argument('--shards', help='Comma-separated state FIPS prefixes (default: all)')
+    parser.add_argument('--reset', action='store_true', help='Delete checkpoints and start over')
+    args = parser.parse_args()
+    
+    pg_url = os.environ.get('DATABASE_URL')
+    if not pg_url:
+        sys.exit("DATABASE_URL is required")
+    if args.reset and os.path.exists(CHECKPOINT_DIR):
+        shutil.rmtree(CHECKPOINT_DIR)
+    
+    start_time = time.time()
+    success = export_parallel(
+        args.sqlite, pg_url, args.workers, args.batch_size,
+        shards=args.shards.split(',') if args.shards else None
+    )
+    elapsed = time.time() - start_time
+    
+    print(f"\nElapsed time: {elapsed/60:.1f} minutes")
+    if success:
+        print("Rebuild the tract fallback: python scripts/build_internet_tract_tables.py --postgres-only")
+    sys.exit(0 if success else 1)
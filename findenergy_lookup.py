@@ -27,6 +27,7 @@ from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote, urljoin
 
 import requests
+import http_client
 from bs4 import BeautifulSoup
 
 # Data directories
@@ -107,7 +108,7 @@ def _make_request(url: str, timeout: int = 10) -> Optional[requests.Response]:
     """Make a rate-limited request with browser headers."""
     _rate_limit()
     try:
-        response = requests.get(url, headers=BROWSER_HEADERS, timeout=timeout)
+        response = http_client.get(url, headers=BROWSER_HEADERS, timeout=timeout)
         if response.status_code == 200:
             return response
         elif response.status_code == 403:
@@ -217,7 +218,7 @@ def query_findenergy_serp(
         for attempt in range(3):
             try:
                 timeout = 20 + (attempt * 10)  # 20s, 30s, 40s
-                response = requests.get(
+                response = http_client.get(
                     search_url,
                     proxies=proxies,
                     headers=BROWSER_HEADERS,
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Geocode result cache keyed by normalized address.
+
+geocode_address walks Census -> Google -> Nominatim -> city centroid on
+every call, and the same address is often geocoded several times per
+request (utilities and internet run in parallel) and across requests.
+This cache is checked before any network call.
+
+Entries live in a per-process TTLCache in front of the cross-worker
+shared cache (shared_cache.py), so they survive restarts and are shared
+by every gunicorn worker. Each entry keeps the geocoder result plus its
+census block GEOID, coordinates and provider tier; low-precision tiers
+(city/ZIP centroids) and failures expire sooner so a new-construction
+address is retried once the geocoders know it.
+
+Usage:
+    from geocode_cache import get_cached_geocode, set_cached_geocode
+    
+    hit, result = get_cached_geocode(address, include_geography=True)
+    if not hit:
+        result = ...geocode...
+        set_cached_geocode(address, True, result)
+"""
+
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from address_normalization import address_cache_key
+from shared_cache import get_shared_cache
+from ttl_cache import TTLCache
+
+# Exact geocodes (Census/Google/Nominatim rooftop or interpolated)
+GEOCODE_CACHE_TTL = int(os.getenv('GEOCODE_CACHE_TTL', str(30 * 24 * 3600)))
+
+# City/ZIP centroid fallbacks - retry the real geocoders daily
+GEOCODE_FALLBACK_TTL = int(os.getenv('GEOCODE_FALLBACK_TTL', str(24 * 3600)))
+
+# Addresses no geocoder could place (kept short - a network outage looks the same)
+GEOCODE_NEGATIVE_TTL = int(os.getenv('GEOCODE_NEGATIVE_TTL', '600'))
+
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv('GEOCODE_CACHE_MAX_ENTRIES', '50000'))
+
+# Provider tiers that are only an approximate location
+FALLBACK_SOURCES = {'Census_CityFallback', 'Census_ZIPFallback'}
+
+_local = TTLCache(
+    max_entries=GEOCODE_CACHE_MAX_ENTRIES,
+    ttl=GEOCODE_CACHE_TTL,
+    name='geocode'
+)
+
+
+def _cache_key(address: str, include_geography: bool) -> str:
+    # Census returns city/county/block only on the geographies endpoint
+    return f"{address_cache_key(address)}|{'geo' if include_geography else 'loc'}"
+
+
+def _ttl_for(result: Optional[Dict]) -> int:
+    if result is None:
+        return GEOCODE_NEGATIVE_TTL
+    if result.get('source') in FALLBACK_SOURCES:
+        return GEOCODE_FALLBACK_TTL
+    return GEOCODE_CACHE_TTL
+
+
+def _get_entry(key: str) -> Optional[Dict]:
+    entry = _local.get(key)
+    if entry is not None:
+        return entry
+    
+    shared = get_shared_cache()
+    entry = shared.get('geocode', key) if shared is not None else None
+    if entry is not None:
+        remaining = entry.get('expires_at', 0) - time.time()
+        if remaining <= 0:
+            return None
+        _local.set(key, entry, ttl=remaining)
+    return entry
+
+
+def get_cached_geocode(address: str, include_geography: bool = False) -> Tuple[bool, Optional[Dict]]:
+    """
+    Look up a geocode result.
+    
+    A result cached with geography also answers a plain location request.
+    
+    Args:
+        address: Address as given by the caller (normalized for the key)
+        include_geography: Whether city/county/block_geoid are needed
+    
+    Returns:
+        (hit, result) - result is None for a cached failure; a copy, so
+        callers may modify it
+    """
+    if not address:
+        return False, None
+    
+    keys = [_cache_key(address, True)]
+    if not include_geography:
+        keys.append(_cache_key(address, False))
+    
+    for key in keys:
+        entry = _get_entry(key)
+        if entry is not None:
+            result = entry.get('result')
+            return True, dict(result) if result is not None else None
+    return False, None
+
+
+def set_cached_geocode(address: str, include_geography: bool, result: Optional[Dict]) -> None:
+    """
+    Store a geocode result (None records that every geocoder failed).
+    
+    Args:
+        address: Address as given by the caller
+        include_geography: Whether the result came from a geography lookup
+        result: geocode_address() result, or None
+    """
+    if not address:
+        return
+    
+    ttl = _ttl_for(result)
+    now = time.time()
+    entry = {
+        'result': dict(result) if result is not None else None,
+        'block_geoid': result.get('block_geoid') if result else None,
+        'lat': result.get('lat') if result else None,
+        'lon': result.get('lon') if result else None,
+        'source': result.get('source') if result else None,
+        'cached_at': now,
+        'expires_at': now + ttl,
+    }
+    key = _cache_key(address, include_geography)
+    _local.set(key, entry, ttl=ttl)
+    
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.set('geocode', key, entry, ttl=ttl)
+
+
+def clear_geocode_cache() -> None:
+    """Drop this process's entries (the shared cache is left alone)."""
+    _local.clear()
+
+
+def geocode_cache_stats() -> Dict:
+    """Counters for this process's geocode cache."""
+    return _local.stats()
@@ -5,7 +5,7 @@ Falls back through multiple geocoders and uses consensus when available.
 """
 
 import os
-import requests
+import http_client
 import math
 from typing import Dict, Optional, List, Tuple
 from urllib.parse import quote
@@ -38,7 +38,7 @@ def geocode_census(address: str) -> Optional[Dict]:
             "format": "json"
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -76,7 +76,7 @@ def geocode_nominatim(address: str) -> Optional[Dict]:
             "User-Agent": "UtilityLookup/1.0"
         }
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_client.get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -111,7 +111,7 @@ def geocode_google(address: str) -> Optional[Dict]:
             "key": api_key
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -152,7 +152,7 @@ def geocode_smarty(address: str) -> Optional[Dict]:
             "candidates": 1
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -10,13 +10,38 @@ Integrates with the main lookup pipeline as an additional data source.
 
 import json
 import os
+from collections.abc import Mapping
 from typing import Dict, Optional, Tuple
 
+from reference_snapshot import get_snapshot
+
 # Cache for boundary data (by utility type)
 _boundary_cache: Dict[str, Dict] = {}
 _geocoded_cache: Dict[str, Dict] = {}
 
 
+class _SnapshotBoundaries(Mapping):
+    """ZIP -> analysis view over snapshot rows, same selection as the JSON index."""
+    
+    def __init__(self, analyses_by_zip: Mapping):
+        self._analyses = analyses_by_zip
+    
+    def __getitem__(self, zip_code: str) -> Dict:
+        # Last analysis with a boundary wins, as when indexing the list
+        if not zip_code or zip_code == 'None':
+            raise KeyError(zip_code)
+        for analysis in reversed(self._analyses[zip_code]):
+            if analysis.get('boundary'):
+                return analysis
+        raise KeyError(zip_code)
+    
+    def __iter__(self):
+        return (zip_code for zip_code in self._analyses if zip_code in self)
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
 def load_boundary_data(utility_type: str = 'electric') -> Dict:
     """Load geographic boundary analysis data for a specific utility type."""
     global _boundary_cache
@@ -26,6 +51,13 @@ def load_boundary_data(utility_type: str = 'electric') -> Dict:
     
     filepath = os.path.join(os.path.dirname(__file__), 'data', f'geographic_boundary_analysis_{utility_type}.json')
     
+    # The snapshot already groups analyses by ZIP - read them per lookup
+    snapshot = get_snapshot()
+    table = snapshot.table(f'geographic_boundary_analysis_{utility_type}', filepath) if snapshot else None
+    if table is not None:
+        _boundary_cache[utility_type] = _SnapshotBoundaries(table.get('zip_analyses', {}))
+        return _boundary_cache[utility_type]
+    
     if not os.path.exists(filepath):
         _boundary_cache[utility_type] = {}
         return _boundary_cache[utility_type]
@@ -11,15 +11,40 @@ Data sources:
 - HIFLD baseline (when downloaded locally)
 """
 
-import requests
+import http_client
+import hashlib
 import json
 import os
-from typing import Dict, Optional, List
+import contextvars
+import time
+from typing import Dict, Optional, List, Tuple
 from functools import lru_cache
+from urllib.parse import urlparse
 
 # Timeout for API requests
 API_TIMEOUT = 10
 
+# Local snapshots of service-territory layers (scripts/ingest_territories.py)
+try:
+    from territory_index import get_territory_index
+    TERRITORY_INDEX_AVAILABLE = True
+except ImportError:
+    TERRITORY_INDEX_AVAILABLE = False
+
+from adaptive_timeout import get_adaptive_timeouts
+from shared_cache import get_shared_cache
+from singleflight import SingleFlight
+
+# Per-host latency histograms (optional)
+try:
+    from monitoring.metrics import track_gis_latency
+except ImportError:
+    def track_gis_latency(*args, **kwargs): pass
+
+# Live ArcGIS answers are shared across workers for this long (territories
+# change rarely; set to 0 to disable)
+GIS_CACHE_TTL = int(os.getenv('GIS_CACHE_TTL', str(7 * 24 * 3600)))
+
 # State FIPS to abbreviation mapping
 FIPS_TO_STATE = {
     "01": "AL", "02": "AK", "04": "AZ", "05": "AR", "06": "CA",
@@ -36,6 +61,108 @@ FIPS_TO_STATE = {
 }
 
 
+class ArcGISPrefetch:
+    """
+    Per-lookup table of ArcGIS point responses fetched ahead of time.
+    
+    The async engine (async_lookup.py) installs one of these around a sync
+    lookup function. While recording, _query_arcgis_point answers from
+    `responses` and notes any query it has not seen in `missing`, in call
+    order (returning None for it), so the engine can fetch the next one
+    and re-run.
+    """
+    
+    def __init__(self):
+        self.responses: Dict[Tuple, Optional[Dict]] = {}
+        self.missing: Dict[Tuple, None] = {}
+        self.recording = True
+
+
+# Active prefetch table for the current lookup (None = plain blocking calls)
+_arcgis_prefetch: contextvars.ContextVar = contextvars.ContextVar('arcgis_prefetch', default=None)
+
+
+def _arcgis_point_params(lat: float, lon: float, out_fields: str = "*") -> Dict[str, str]:
+    """Build the query string for an ArcGIS point-in-polygon request."""
+    return {
+        "where": "1=1",
+        "geometry": f"{lon},{lat}",
+        "geometryType": "esriGeometryPoint",
+        "inSR": "4326",
+        "spatialRel": "esriSpatialRelIntersects",
+        "outFields": out_fields,
+        "returnGeometry": "false",
+        "f": "json"
+    }
+
+
+def _first_feature_attributes(data: Dict) -> Optional[Dict]:
+    """Return the first feature's attributes from an ArcGIS query response."""
+    if data.get("features") and len(data["features"]) > 0:
+        return data["features"][0]["attributes"]
+    return None
+
+
+def _gis_endpoint(url: str) -> str:
+    """
+    Layer a query URL hits, e.g. services3.arcgis.com/<org>/arcgis/rest/services/<name>/FeatureServer/0.
+    
+    Most layers share a handful of ArcGIS Online hosts, so the host alone
+    would merge unrelated layers into one latency series.
+    """
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/')
+    if path.endswith('/query'):
+        path = path[:-len('/query')]
+    return f"{parsed.netloc}{path}"
+
+
+def _track_gis_latency(url: str, start: float) -> None:
+    """Record a live ArcGIS request in the latency histogram for its layer."""
+    try:
+        track_gis_latency(_gis_endpoint(url), (time.time() - start) * 1000)
+    except Exception:
+        pass
+
+
+def _gis_cache_key(url: str, lat: float, lon: float, out_fields: str) -> str:
+    """Shared-cache key for a point query (coordinates rounded to ~10cm)."""
+    raw = f"{url}|{lat:.6f}|{lon:.6f}|{out_fields}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _gis_cache_get(url: str, lat: float, lon: float, out_fields: str) -> Tuple[bool, Optional[Dict]]:
+    """
+    Look up a point query in the shared cache.
+    
+    Returns:
+        (hit, attributes) - attributes may be None for a cached "no feature"
+    """
+    cache = get_shared_cache() if GIS_CACHE_TTL > 0 else None
+    if cache is None:
+        return False, None
+    entry = cache.get('gis', _gis_cache_key(url, lat, lon, out_fields))
+    if entry is None:
+        return False, None
+    return True, entry.get('attributes')
+
+
+def _gis_cache_set(url: str, lat: float, lon: float, out_fields: str, attributes: Optional[Dict]) -> None:
+    """Store the answer to a successful point query (None = no feature there)."""
+    cache = get_shared_cache() if GIS_CACHE_TTL > 0 else None
+    if cache is None:
+        return
+    cache.set(
+        'gis',
+        _gis_cache_key(url, lat, lon, out_fields),
+        {'attributes': attributes},
+        ttl=GIS_CACHE_TTL
+    )
+
+
+_arcgis_flight = SingleFlight('arcgis')
+
+
 def _query_arcgis_point(url: str, lat: float, lon: float, out_fields: str = "*") -> Optional[Dict]:
     """
     Generic ArcGIS REST API point-in-polygon query.
@@ -49,27 +176,68 @@ def _query_arcgis_point(url: str, lat: float, lon: float, out_fields: str = "*")
     Returns:
         First matching feature's attributes, or None
     """
-    params = {
-        "where": "1=1",
-        "geometry": f"{lon},{lat}",
-        "geometryType": "esriGeometryPoint",
-        "inSR": "4326",
-        "spatialRel": "esriSpatialRelIntersects",
-        "outFields": out_fields,
-        "returnGeometry": "false",
-        "f": "json"
-    }
+    # Snapshotted layers are answered in-process; the live API is the fallback
+    if TERRITORY_INDEX_AVAILABLE:
+        index = get_territory_index()
+        if index is not None and index.covers(url):
+            return index.query(url, lat, lon, out_fields)
+    
+    # Answered recently by any worker
+    hit, attributes = _gis_cache_get(url, lat, lon, out_fields)
+    if hit:
+        return attributes
+    
+    prefetch = _arcgis_prefetch.get()
+    if prefetch is not None:
+        key = (url, lat, lon, out_fields)
+        if key in prefetch.responses:
+            return prefetch.responses[key]
+        if prefetch.recording:
+            prefetch.missing[key] = None
+            return None
     
+    # Concurrent lookups of the same point share one request
+    attributes, shared = _arcgis_flight.do(
+        _gis_cache_key(url, lat, lon, out_fields),
+        _fetch_arcgis_point, url, lat, lon, out_fields
+    )
+    return dict(attributes) if shared and attributes else attributes
+
+
+def _fetch_arcgis_point(url: str, lat: float, lon: float, out_fields: str) -> Optional[Dict]:
+    """
+    Live point query; successful answers go into the shared cache.
+    
+    The timeout adapts to the layer's recent p99 (API_TIMEOUT until there
+    is enough data), and a request slower than the layer's p95 is hedged.
+    """
+    params = _arcgis_point_params(lat, lon, out_fields)
+    
+    timeouts = get_adaptive_timeouts()
+    timeout = timeouts.timeout(url, default=API_TIMEOUT)
+    start = time.time()
     try:
-        response = requests.get(url, params=params, timeout=API_TIMEOUT)
+        response, _hedged = http_client.hedged_get(
+            url,
+            hedge_after=timeouts.hedge_delay(url),
+            allow_hedge=lambda: timeouts.acquire_hedge(url),
+            params=params,
+            timeout=timeout
+        )
         data = response.json()
-        
-        if data.get("features") and len(data["features"]) > 0:
-            return data["features"][0]["attributes"]
-        return None
+        attributes = _first_feature_attributes(data)
     except Exception as e:
         print(f"GIS API error ({url[:50]}...): {e}")
         return None
+    finally:
+        # A timed-out request is recorded at its timeout
+        timeouts.observe(url, min((time.time() - start), timeout) * 1000)
+        _track_gis_latency(url, start)
+    
+    # Error payloads come back as HTTP 200 - only cache real answers
+    if 'error' not in data:
+        _gis_cache_set(url, lat, lon, out_fields, attributes)
+    return attributes
 
 
 # =============================================================================
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for all outbound GIS, geocoder, SERP and API calls.
+
+Every lookup talks to the same handful of hosts (ArcGIS Online, Census,
+Google, OpenAI, Airtable). Bare requests.get() opens a fresh TCP+TLS
+connection per call; going through this module reuses keep-alive
+connections from per-host pools instead.
+
+Provides:
+- One process-wide requests.Session with tuned HTTPAdapter pools
+- Retry with backoff for connection errors and 429/5xx on idempotent calls
+- A default (connect, read) timeout for callers that don't pass one
+- get/post/patch helpers with the same signature as requests.*
+- hedged_get: re-send a slow idempotent GET so a hung first request
+  doesn't fail the call
+- A circuit breaker per dependency (circuit_breaker.py): calls to a host
+  that keeps failing fail fast with CircuitOpenError instead of waiting
+  for the timeout
+
+Usage:
+    import http_client
+    
+    response = http_client.get(url, params=params, timeout=10)
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from circuit_breaker import CircuitOpenError, breaker_for_url
+
+# Number of distinct hosts to keep a connection pool for
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '64'))
+
+# Keep-alive connections per host (should cover concurrent lookups per worker)
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '64'))
+
+# Retries for connection failures and throttling/5xx responses
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.3'))
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# (connect, read) timeout applied when the caller doesn't set one
+DEFAULT_TIMEOUT = (
+    float(os.getenv('HTTP_CONNECT_TIMEOUT', '3.05')),
+    float(os.getenv('HTTP_READ_TIMEOUT', '15')),
+)
+
+# Threads running the duplicates of slow hedged GETs (the first request
+# runs in the caller's thread)
+HTTP_HEDGE_WORKERS = int(os.getenv('HTTP_HEDGE_WORKERS', '64'))
+
+_session = None
+_session_lock = threading.Lock()
+_hedge_executor = None
+_hedge_timer = None
+
+
+class _DefaultTimeoutSession(requests.Session):
+    """
+    Session that fills in DEFAULT_TIMEOUT when no timeout is given and
+    routes every request through its dependency's circuit breaker (the
+    host, or the org/service on shared ArcGIS Online hosts).
+    """
+    
+    def request(self, method, url, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = DEFAULT_TIMEOUT
+        
+        breaker = breaker_for_url(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{breaker.name} circuit open - skipping {method} {url[:80]}")
+        try:
+            response = super().request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            breaker.record_failure(type(e).__name__)
+            raise
+        except Exception:
+            # Not the dependency's fault (bad URL, invalid arguments)
+            breaker.record_success()
+            raise
+        
+        # Throttling and server errors count against the dependency; other
+        # 4xx mean it's up and answering
+        if response.status_code in RETRY_STATUS_CODES:
+            breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            breaker.record_success()
+        return response
+
+
+def _build_retry() -> Retry:
+    """Retry policy: connection errors and 429/5xx, idempotent methods only."""
+    return Retry(
+        total=HTTP_RETRIES,
+        connect=HTTP_RETRIES,
+        # A read timeout already cost the caller its full budget - don't repeat it
+        read=0,
+        status=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def create_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    retry: Optional[Retry] = None
+) -> requests.Session:
+    """
+    Build a pooled session.
+    
+    Args:
+        pool_connections: Number of host pools to cache
+        pool_maxsize: Keep-alive connections kept per host
+        retry: Retry policy (default: _build_retry())
+    
+    Returns:
+        requests.Session with pooled, retrying adapters mounted for http/https
+    """
+    session = _DefaultTimeoutSession()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry or _build_retry(),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
+    # The session is shared by every caller - never carry cookies between them
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get or create the process-wide pooled session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """requests.get() over the shared pooled session."""
+    return get_session().get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """requests.post() over the shared pooled session (not retried)."""
+    return get_session().post(url, **kwargs)
+
+
+def patch(url: str, **kwargs) -> requests.Response:
+    """requests.patch() over the shared pooled session (not retried)."""
+    return get_session().patch(url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    """requests.head() over the shared pooled session."""
+    return get_session().head(url, **kwargs)
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _session_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(
+                    max_workers=HTTP_HEDGE_WORKERS, thread_name_prefix='http-hedge'
+                )
+    return _hedge_executor
+
+
+class _HedgeTimer:
+    """
+    Sends the duplicates of slow hedged GETs from one thread (a
+    threading.Timer per request would start a thread per GIS query).
+    """
+    
+    def __init__(self):
+        self._heap = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._thread_pid = None
+    
+    def schedule(self, delay: float, callback: Callable[[], None]) -> Dict:
+        """Run callback after delay seconds; handle.pop('callback', None) cancels it."""
+        handle = {'callback': callback}
+        with self._cond:
+            if self._thread_pid != os.getpid():
+                # First use in this process (again after a fork)
+                self._thread_pid = os.getpid()
+                threading.Thread(target=self._run, name='http-hedge-timer', daemon=True).start()
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), handle))
+            self._cond.notify()
+        return handle
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                _, _, handle = heapq.heappop(self._heap)
+            # Whoever pops the callback first (timer or caller) owns it
+            callback = handle.pop('callback', None)
+            if callback is not None:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"[http] hedge failed: {e}")
+
+
+def _get_hedge_timer() -> _HedgeTimer:
+    global _hedge_timer
+    if _hedge_timer is None:
+        with _session_lock:
+            if _hedge_timer is None:
+                _hedge_timer = _HedgeTimer()
+    return _hedge_timer
+
+
+def hedged_get(
+    url: str,
+    hedge_after: Optional[float] = None,
+    allow_hedge: Optional[Callable[[], bool]] = None,
+    **kwargs
+) -> Tuple[requests.Response, bool]:
+    """
+    GET that sends a duplicate request if the first is slow.
+    
+    The first request runs in the calling thread, so hedge_after and the
+    caller's latency measurements start when it is actually sent. Only the
+    duplicate goes to the hedge pool; it answers when the first request
+    fails or times out, and is otherwise left to finish in the background
+    (its connection returns to the pool). Only use this for idempotent
+    queries.
+    
+    Args:
+        url: Request URL
+        hedge_after: Seconds to wait before sending the duplicate (None =
+                     plain get())
+        allow_hedge: Called once the first request is late; return False
+                     to keep waiting on it instead (e.g. hedge budget spent)
+        **kwargs: As for requests.get()
+    
+    Returns:
+        (response, hedged) - hedged is True if the duplicate answered
+    """
+    if not hedge_after:
+        return get(url, **kwargs), False
+    
+    duplicate = []
+    
+    def send_duplicate():
+        if allow_hedge is None or allow_hedge():
+            duplicate.append(_get_hedge_executor().submit(get, url, **kwargs))
+    
+    handle = _get_hedge_timer().schedule(hedge_after, send_duplicate)
+    try:
+        return get(url, **kwargs), False
+    except Exception as error:
+        # Not sent yet (first request failed fast) or refused by allow_hedge
+        if handle.pop('callback', None) is not None or not duplicate:
+            raise
+        try:
+            return duplicate[0].result(), True
+        except Exception:
+            raise error
+    finally:
+        handle.pop('callback', None)
+    
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Monitoring module for utility lookup system.
 
-Provides metrics tracking, alerting, and observability.
+Provides metrics tracking, request tracing, alerting, and observability.
 """
 
 from .metrics import (
@@ -9,13 +9,28 @@ from .metrics import (
     get_metrics_summary,
     get_current_metrics,
     flush_metrics,
+    track_source_latency,
+    track_gis_latency,
+    render_prometheus,
+    get_latency_percentiles,
     LookupTimer,
 )
+from .histogram import LatencyHistogram
+from .tracing import begin_trace, span, traced, propagate
 
 __all__ = [
     'track_lookup',
     'get_metrics_summary',
     'get_current_metrics',
     'flush_metrics',
+    'track_source_latency',
+    'track_gis_latency',
+    'render_prometheus',
+    'get_latency_percentiles',
     'LookupTimer',
+    'LatencyHistogram',
+    'begin_trace',
+    'span',
+    'traced',
+    'propagate',
 ]
@@ -0,0 +1,116 @@
+"""
+Fixed-bucket latency histograms.
+
+Bucket bounds are log-linear (1, 2, 3, 5, 7.5 x each power of ten, from
+1 ms to 100 s), so every histogram has the same layout and two of them -
+from different time windows or different gunicorn workers - merge by
+adding counts. Percentiles are interpolated within a bucket, which keeps
+p95/p99 within one bucket width of the true value without storing raw
+samples.
+
+Usage:
+    from monitoring.histogram import LatencyHistogram
+    
+    hist = LatencyHistogram()
+    hist.observe(123.4)          # milliseconds
+    hist.percentile(0.95)
+    hist.merge(other_hist)
+"""
+
+from typing import Dict, List, Optional
+
+# Upper bounds in milliseconds; the last bucket (+Inf) catches the rest
+BUCKET_BOUNDS_MS: List[float] = [
+    step * 10 ** exp
+    for exp in range(5)
+    for step in (1, 2, 3, 5, 7.5)
+] + [100000]
+
+
+class LatencyHistogram:
+    """Counts of latencies per fixed bucket, plus their sum."""
+    
+    __slots__ = ('counts', 'sum', 'count')
+    
+    def __init__(self):
+        # One count per bound plus the +Inf bucket (not cumulative)
+        self.counts: List[int] = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value_ms: float) -> None:
+        """Record one latency in milliseconds."""
+        index = len(BUCKET_BOUNDS_MS)
+        for i, bound in enumerate(BUCKET_BOUNDS_MS):
+            if value_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.sum += value_ms
+        self.count += 1
+    
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Add another histogram's counts into this one (returns self)."""
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.sum += other.sum
+        self.count += other.count
+        return self
+    
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile (q in 0..1), in milliseconds.
+        
+        Returns 0 for an empty histogram. Values in the +Inf bucket are
+        reported as the largest finite bound.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= rank:
+                if i >= len(BUCKET_BOUNDS_MS):
+                    return float(BUCKET_BOUNDS_MS[-1])
+                lower = BUCKET_BOUNDS_MS[i - 1] if i > 0 else 0.0
+                upper = BUCKET_BOUNDS_MS[i]
+                return lower + (upper - lower) * (rank - seen) / c
+            seen += c
+        return float(BUCKET_BOUNDS_MS[-1])
+    
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+    
+    def cumulative_counts(self) -> List[int]:
+        """Counts of values <= each bound, then the total (Prometheus 'le' buckets)."""
+        cumulative = []
+        running = 0
+        for c in self.counts:
+            running += c
+            cumulative.append(running)
+        return cumulative
+    
+    def summary(self) -> Dict[str, float]:
+        """Count, mean and percentiles for JSON endpoints."""
+        return {
+            'count': self.count,
+            'avg_ms': round(self.mean(), 1),
+            'p50_ms': round(self.percentile(0.50), 1),
+            'p95_ms': round(self.percentile(0.95), 1),
+            'p99_ms': round(self.percentile(0.99), 1),
+        }
+    
+    def to_dict(self) -> Dict:
+        return {'counts': list(self.counts), 'sum': self.sum, 'count': self.count}
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> Optional['LatencyHistogram']:
+        """Rebuild from to_dict() output; None if the bucket layout differs."""
+        counts = data.get('counts') or []
+        if len(counts) != len(BUCKET_BOUNDS_MS) + 1:
+            return None
+        hist = cls()
+        hist.counts = [int(c) for c in counts]
+        hist.sum = float(data.get('sum', 0.0))
+        hist.count = int(data.get('count', sum(hist.counts)))
+        return hist
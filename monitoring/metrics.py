@@ -6,6 +6,8 @@ Provides metrics tracking for utility lookups:
 - Source usage tracking
 - Confidence score distribution
 - Error rate monitoring
+- Latency histograms per utility type, per pipeline source and per
+  ArcGIS layer, exported in Prometheus text format (all workers merged)
 
 Usage:
     from monitoring.metrics import track_lookup, get_metrics_summary
@@ -15,9 +17,13 @@ Usage:
 
     # Get summary
     summary = get_metrics_summary()
+    
+    # Prometheus scrape body
+    text = render_prometheus()
 """
 
 import json
+import os
 import time
 import threading
 from datetime import datetime, timedelta
@@ -27,8 +33,35 @@ from collections import defaultdict
 from dataclasses import dataclass, field, asdict
 import logging
 
+from .histogram import BUCKET_BOUNDS_MS, LatencyHistogram
+
 logger = logging.getLogger(__name__)
 
+# How often each worker publishes its histograms for the others to merge
+METRICS_PUBLISH_INTERVAL = float(os.getenv('METRICS_PUBLISH_INTERVAL', '15'))
+
+# Snapshots of workers that stopped publishing this long ago are deleted
+METRICS_WORKER_MAX_AGE = float(os.getenv('METRICS_WORKER_MAX_AGE', str(24 * 3600)))
+
+# Histogram families: name -> (help text, label names)
+HISTOGRAM_METRICS = {
+    'lookup': (
+        'utility_lookup_duration_seconds',
+        'Utility lookup latency per utility type',
+        ('utility_type',),
+    ),
+    'source': (
+        'utility_source_query_duration_seconds',
+        'Pipeline data source query latency (SourceResult.query_time_ms)',
+        ('utility_type', 'source'),
+    ),
+    'gis': (
+        'utility_gis_request_duration_seconds',
+        'Live ArcGIS point query latency per layer',
+        ('endpoint',),
+    ),
+}
+
 
 @dataclass
 class MetricsBucket:
@@ -48,7 +81,7 @@ class MetricsBucket:
     lookups_by_source: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
     
     # Latency (in ms)
-    latencies: List[float] = field(default_factory=list)
+    latency_histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
     
     # Confidence scores
     confidence_scores: List[int] = field(default_factory=list)
@@ -92,6 +125,12 @@ class MetricsCollector:
         
         # Now create the bucket
         self._current_bucket = self._create_bucket()
+        
+        # Cumulative histograms since process start: (kind, label values) -> histogram
+        self._histograms: Dict[tuple, LatencyHistogram] = {}
+        self._workers_dir = self._metrics_dir / 'workers'
+        self._workers_dir.mkdir(parents=True, exist_ok=True)
+        self._last_publish = 0.0
     
     def _create_bucket(self) -> MetricsBucket:
         """Create a new metrics bucket for the current time window."""
@@ -144,7 +183,8 @@ class MetricsCollector:
             
             bucket.total_lookups += 1
             bucket.lookups_by_type[utility_type] += 1
-            bucket.latencies.append(latency_ms)
+            bucket.latency_histogram.observe(latency_ms)
+            self._observe('lookup', (utility_type,), latency_ms)
             
             if result and result.get('NAME'):
                 bucket.successful_lookups += 1
@@ -167,6 +207,28 @@ class MetricsCollector:
                         'timestamp': datetime.now().isoformat()
                     })
     
+        self._maybe_publish()
+    
+    def observe_latency(self, kind: str, labels: tuple, latency_ms: float):
+        """
+        Record a latency in one of the HISTOGRAM_METRICS families.
+        
+        Args:
+            kind: 'lookup', 'source' or 'gis'
+            labels: Label values, in HISTOGRAM_METRICS order
+            latency_ms: Time taken in milliseconds
+        """
+        with self._metrics_lock:
+            self._observe(kind, labels, latency_ms)
+        self._maybe_publish()
+    
+    def _observe(self, kind: str, labels: tuple, latency_ms: float):
+        key = (kind, tuple(str(v) for v in labels))
+        hist = self._histograms.get(key)
+        if hist is None:
+            hist = self._histograms[key] = LatencyHistogram()
+        hist.observe(latency_ms)
+    
     def get_current_metrics(self) -> Dict:
         """Get metrics for the current time window."""
         with self._metrics_lock:
@@ -188,7 +250,7 @@ class MetricsCollector:
     
     def _bucket_to_dict(self, bucket: MetricsBucket) -> Dict:
         """Convert a bucket to a dictionary with computed statistics."""
-        latencies = bucket.latencies
+        latency = bucket.latency_histogram
         confidences = bucket.confidence_scores
         
         return {
@@ -203,12 +265,7 @@ class MetricsCollector:
             ),
             'lookups_by_type': dict(bucket.lookups_by_type),
             'lookups_by_source': dict(bucket.lookups_by_source),
-            'latency': {
-                'avg_ms': sum(latencies) / len(latencies) if latencies else 0,
-                'p50_ms': sorted(latencies)[len(latencies) // 2] if latencies else 0,
-                'p95_ms': sorted(latencies)[int(len(latencies) * 0.95)] if len(latencies) > 1 else 0,
-                'max_ms': max(latencies) if latencies else 0,
-            },
+            'latency': latency.summary(),
             'confidence': {
                 'avg': sum(confidences) / len(confidences) if confidences else 0,
                 'min': min(confidences) if confidences else 0,
@@ -227,11 +284,15 @@ class MetricsCollector:
         total_lookups = sum(h['total_lookups'] for h in historical) + current['total_lookups']
         total_success = sum(h['successful_lookups'] for h in historical) + current['successful_lookups']
         
-        all_latencies = []
-        for h in historical:
-            # We don't have raw latencies in historical, so use averages
-            if h['latency']['avg_ms'] > 0:
-                all_latencies.append(h['latency']['avg_ms'])
+        # Histograms share one bucket layout, so the hour's percentiles come
+        # from the merged counts rather than an average of averages
+        cutoff = datetime.now() - timedelta(hours=1)
+        hour_latency = LatencyHistogram()
+        with self._metrics_lock:
+            for bucket in self._historical_buckets + [self._current_bucket]:
+                if datetime.fromisoformat(bucket.window_start) >= cutoff:
+                    hour_latency.merge(bucket.latency_histogram)
+        latency = hour_latency.summary()
         
         return {
             'current_window': current,
@@ -239,11 +300,105 @@ class MetricsCollector:
                 'total_lookups': total_lookups,
                 'successful_lookups': total_success,
                 'success_rate': total_success / total_lookups * 100 if total_lookups > 0 else 0,
-                'avg_latency_ms': sum(all_latencies) / len(all_latencies) if all_latencies else 0,
+                'avg_latency_ms': latency['avg_ms'],
+                'p95_latency_ms': latency['p95_ms'],
+                'p99_latency_ms': latency['p99_ms'],
             },
             'buckets_count': len(historical) + 1,
         }
     
+    # -------------------------------------------------------------------------
+    # Cross-worker histograms
+    # -------------------------------------------------------------------------
+    
+    def _snapshot(self) -> List[Dict]:
+        with self._metrics_lock:
+            return [
+                {'kind': kind, 'labels': list(labels), **hist.to_dict()}
+                for (kind, labels), hist in self._histograms.items()
+            ]
+    
+    def _maybe_publish(self):
+        """Write this worker's histograms for other workers' /api/metrics, at most every interval."""
+        now = time.time()
+        if now - self._last_publish < METRICS_PUBLISH_INTERVAL:
+            return
+        self._last_publish = now
+        self.publish()
+    
+    def publish(self):
+        """Write this worker's cumulative histograms to data/metrics/workers/<pid>.json."""
+        path = self._workers_dir / f"{os.getpid()}.json"
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self._snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not publish metrics snapshot: {e}")
+    
+    def merged_histograms(self) -> Dict[tuple, LatencyHistogram]:
+        """This worker's live histograms merged with every other worker's last snapshot."""
+        merged: Dict[tuple, LatencyHistogram] = {}
+        
+        def add(kind, labels, hist):
+            key = (kind, tuple(labels))
+            if key in merged:
+                merged[key].merge(hist)
+            else:
+                merged[key] = LatencyHistogram().merge(hist)
+        
+        for entry in self._snapshot():
+            add(entry['kind'], entry['labels'], LatencyHistogram.from_dict(entry))
+        
+        own = f"{os.getpid()}.json"
+        now = time.time()
+        for path in self._workers_dir.glob('*.json'):
+            if path.name == own:
+                continue
+            try:
+                if now - path.stat().st_mtime > METRICS_WORKER_MAX_AGE:
+                    path.unlink()
+                    continue
+                with open(path, 'r') as f:
+                    entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            for entry in entries:
+                hist = LatencyHistogram.from_dict(entry)
+                if hist is not None and entry.get('kind') in HISTOGRAM_METRICS:
+                    add(entry['kind'], entry.get('labels', []), hist)
+        
+        return merged
+    
+    def render_prometheus(self) -> str:
+        """All histograms in Prometheus text exposition format (seconds)."""
+        histograms = self.merged_histograms()
+        lines = []
+        for kind, (name, help_text, label_names) in HISTOGRAM_METRICS.items():
+            series = sorted((labels, hist) for (k, labels), hist in histograms.items() if k == kind)
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                label_str = ','.join(
+                    f'{label}="{_escape_label(value)}"' for label, value in zip(label_names, labels)
+                )
+                prefix = f"{label_str}," if label_str else ''
+                cumulative = hist.cumulative_counts()
+                for bound, count in zip(BUCKET_BOUNDS_MS, cumulative):
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound / 1000:g}"}} {count}')
+                lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {cumulative[-1]}')
+                lines.append(f"{name}_sum{{{label_str}}} {hist.sum / 1000:.6f}")
+                lines.append(f"{name}_count{{{label_str}}} {hist.count}")
+        return '\n'.join(lines) + '\n'
+    
+    def latency_percentiles(self) -> Dict[str, Dict]:
+        """p50/p95/p99 per histogram series (all workers), for JSON endpoints."""
+        result: Dict[str, Dict] = {}
+        for (kind, labels), hist in sorted(self.merged_histograms().items()):
+            result.setdefault(kind, {})['/'.join(labels)] = hist.summary()
+        return result
+    
     def flush_to_disk(self):
         """Flush current metrics to disk."""
         with self._metrics_lock:
@@ -268,6 +423,10 @@ class MetricsCollector:
             logger.info(f"Flushed metrics to {metrics_file}")
 
 
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
 # Global collector instance
 _collector = MetricsCollector()
 
@@ -297,6 +456,33 @@ def track_lookup(
     _collector.track_lookup(utility_type, result, latency_ms, source, error)
 
 
+def track_source_latency(utility_type: str, source: str, latency_ms: float):
+    """
+    Track one pipeline data source query.
+    
+    Args:
+        utility_type: 'electric', 'gas', or 'water'
+        source: DataSource.name
+        latency_ms: SourceResult.query_time_ms
+    """
+    _collector.observe_latency('source', (utility_type, source), latency_ms)
+
+
+def track_gis_latency(endpoint: str, latency_ms: float):
+    """Track one live ArcGIS request to a layer (host and service path, see gis_utility_lookup._gis_endpoint)."""
+    _collector.observe_latency('gis', (endpoint,), latency_ms)
+
+
+def render_prometheus() -> str:
+    """Latency histograms of all workers in Prometheus text format."""
+    return _collector.render_prometheus()
+
+
+def get_latency_percentiles() -> Dict[str, Dict]:
+    """p50/p95/p99 per utility type, source and GIS layer (all workers)."""
+    return _collector.latency_percentiles()
+
+
 def get_metrics_summary() -> Dict:
     """Get a summary of current metrics."""
     return _collector.get_summary()
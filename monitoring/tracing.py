@@ -0,0 +1,256 @@
+"""
+Lightweight request tracing for the lookup pipeline.
+
+A trace is a tree of spans (name, start, duration, attributes) covering
+one request: geocode tiers, each DataSource.query, cross-validation, the
+AI selector, enrichment and SERP verification. Spans are only recorded
+while a trace is active, so instrumented code costs a context-variable
+read when tracing is off.
+
+Exporters (TRACE_EXPORT, comma-separated):
+- json: append each finished trace as one JSON line to TRACE_FILE
+- otel: replay the span tree through the OpenTelemetry API (the SDK and
+  exporter are configured by the deployment, e.g. opentelemetry-instrument)
+
+Usage:
+    from monitoring.tracing import begin_trace, span
+    
+    trace = begin_trace('api.lookup', force=True, address=address)
+    with span('geocode', tier='census') as s:
+        ...
+        s.set_attribute('matched', True)
+    trace.finish()
+    trace.to_dict()    # span tree for ?trace=1
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# OpenTelemetry is optional - only needed for the 'otel' exporter
+try:
+    from opentelemetry import trace as otel_trace
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+# Exporters for every request (empty = trace only when a request asks for it)
+TRACE_EXPORT = {e.strip() for e in os.getenv('TRACE_EXPORT', '').split(',') if e.strip()}
+
+TRACE_FILE = Path(os.getenv(
+    'TRACE_FILE',
+    Path(__file__).parent.parent / 'data' / 'traces' / 'traces.jsonl'
+))
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('trace_span', default=None)
+_file_lock = threading.Lock()
+
+
+class Span:
+    """One timed stage; children are spans started while this one was current."""
+    
+    __slots__ = ('name', 'attributes', 'start', 'end', 'children', 'trace_id', 'span_id', '_lock')
+    
+    def __init__(self, name: str, trace_id: str, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.children: List['Span'] = []
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        # Sources run in parallel threads and add children concurrently
+        self._lock = threading.Lock()
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+    
+    def finish(self) -> None:
+        if self.end is None:
+            self.end = time.time()
+    
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.time()
+        return (end - self.start) * 1000
+    
+    def _add_child(self, child: 'Span') -> None:
+        with self._lock:
+            self.children.append(child)
+    
+    def to_dict(self, origin: Optional[float] = None) -> Dict:
+        """Span tree with start offsets relative to the root (ms)."""
+        origin = self.start if origin is None else origin
+        with self._lock:
+            children = sorted(self.children, key=lambda c: c.start)
+        data = {
+            'name': self.name,
+            'start_ms': round((self.start - origin) * 1000, 1),
+            'duration_ms': round(self.duration_ms, 1),
+        }
+        if self.end is None:
+            data['unfinished'] = True
+        if self.attributes:
+            data['attributes'] = self.attributes
+        if children:
+            data['children'] = [c.to_dict(origin) for c in children]
+        return data
+
+
+class _NoopSpan:
+    """Stand-in yielded by span() when no trace is active."""
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Root span of one request plus its export settings."""
+    
+    def __init__(self, root: Optional[Span], token=None):
+        self.root = root
+        self._token = token
+        self._finished = False
+    
+    @property
+    def active(self) -> bool:
+        return self.root is not None
+    
+    def finish(self) -> None:
+        """End the root span, deactivate the trace and export it (idempotent)."""
+        if self._finished or self.root is None:
+            self._finished = True
+            return
+        self._finished = True
+        self.root.finish()
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Finished from another context - just clear it
+            _current_span.set(None)
+        _export(self.root)
+    
+    def to_dict(self) -> Optional[Dict]:
+        if self.root is None:
+            return None
+        return {'trace_id': self.root.trace_id, **self.root.to_dict()}
+
+
+def begin_trace(name: str, force: bool = False, **attributes) -> Trace:
+    """
+    Start a trace for the current request.
+    
+    Args:
+        name: Root span name (e.g. 'api.lookup')
+        force: Record even if no exporter is configured (?trace=1)
+        **attributes: Root span attributes
+    
+    Returns:
+        Trace - call finish() when the request is done; inactive (records
+        nothing) unless forced or TRACE_EXPORT is set
+    """
+    if not force and not TRACE_EXPORT:
+        return Trace(None)
+    root = Span(name, uuid.uuid4().hex, attributes)
+    return Trace(root, _current_span.set(root))
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a stage as a child of the current span.
+    
+    Exceptions are recorded in the 'error' attribute and re-raised.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield _NOOP_SPAN
+        return
+    
+    current = Span(name, parent.trace_id, attributes)
+    parent._add_child(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set_attribute('error', str(e) or type(e).__name__)
+        raise
+    finally:
+        current.finish()
+        _current_span.reset(token)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def propagate(func: Callable) -> Callable:
+    """
+    Bind func to the caller's trace context for a thread pool.
+    
+    ThreadPoolExecutor doesn't carry context variables into its threads;
+    submit propagate(func) instead of func so spans nest under the caller.
+    """
+    if _current_span.get() is None:
+        return func
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def _export(root: Span) -> None:
+    if 'json' in TRACE_EXPORT:
+        _export_json(root)
+    if 'otel' in TRACE_EXPORT and OTEL_AVAILABLE:
+        _export_otel(root)
+
+
+def _export_json(root: Span) -> None:
+    line = json.dumps({
+        'trace_id': root.trace_id,
+        'timestamp': root.start,
+        **root.to_dict(),
+    }, default=str)
+    try:
+        TRACE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock, open(TRACE_FILE, 'a') as f:
+            f.write(line + '\n')
+    except OSError as e:
+        print(f"Trace export failed: {e}")
+
+
+def _export_otel(root: Span) -> None:
+    tracer = otel_trace.get_tracer('utility-lookup')
+    
+    def emit(s: Span, parent_context=None):
+        otel_span = tracer.start_span(
+            s.name,
+            context=parent_context,
+            start_time=int(s.start * 1e9),
+            attributes={k: v if isinstance(v, (str, bool, int, float)) else str(v)
+                        for k, v in s.attributes.items()},
+        )
+        child_context = otel_trace.set_span_in_context(otel_span)
+        for child in list(s.children):
+            emit(child, child_context)
+        otel_span.end(end_time=int((s.end or time.time()) * 1e9))
+    
+    try:
+        emit(root)
+    except Exception as e:
+        print(f"OpenTelemetry export failed: {e}")
@@ -3,11 +3,23 @@ Municipal utility lookup - city-owned utilities that aren't in federal databases
 
 Includes: electric, gas, water, trash, sewer
 Trash and sewer are typically provided by the same municipal entity as water.
+
+City, ZIP and county matching runs against hash indexes built per state
+on first use (see _SectionIndex) instead of scanning every city of the
+state on each lookup. The indexes return exactly what the
+original scans did - the first matching entry in file order - and
+MUNICIPAL_INDEX_MODE can switch back to the scans or run both:
+- index (default): hash lookups
+- scan: the original linear scans
+- verify: both; logs any difference and returns the scan result
 """
 
 import json
 import os
-from typing import Optional, Dict, List
+import threading
+from typing import Optional, Dict, List, Tuple
+
+from reference_snapshot import load_reference, to_plain
 
 MUNICIPAL_FILE = os.path.join(os.path.dirname(__file__), 'data', 'municipal_utilities.json')
 LONG_ISLAND_WATER_FILE = os.path.join(os.path.dirname(__file__), 'data', 'long_island_water_districts.json')
@@ -22,6 +34,8 @@ REMAINING_STATES_WATER_FILE = os.path.join(os.path.dirname(__file__), 'data', 'r
 REMAINING_STATES_ELECTRIC_FILE = os.path.join(os.path.dirname(__file__), 'data', 'remaining_states_electric.json')
 REMAINING_STATES_GAS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'remaining_states_gas.json')
 
+MUNICIPAL_INDEX_MODE = os.getenv('MUNICIPAL_INDEX_MODE', 'index')
+
 _municipal_data = None
 _long_island_water_data = None
 _socal_water_data = None
@@ -35,19 +49,198 @@ _remaining_states_water_data = None
 _remaining_states_electric_data = None
 _remaining_states_gas_data = None
 
+_municipal_index = None
+_municipal_index_lock = threading.Lock()
+
 
 def load_municipal_data() -> dict:
     """Load municipal utility data."""
     global _municipal_data
     if _municipal_data is None:
-        if os.path.exists(MUNICIPAL_FILE):
-            with open(MUNICIPAL_FILE, 'r') as f:
-                _municipal_data = json.load(f)
-        else:
-            _municipal_data = {'electric': {}, 'gas': {}, 'water': {}}
+        # Snapshot view (states decoded on first use) or the parsed JSON
+        _municipal_data = load_reference(
+            'municipal_utilities', MUNICIPAL_FILE,
+            default={'electric': {}, 'gas': {}, 'water': {}}
+        )
     return _municipal_data
 
 
+# =============================================================================
+# MATCHING INDEXES
+# =============================================================================
+
+# Electric utilities that also provide gas/water are matched separately
+_SERVICE_SECTIONS = {'electric': (None, 'gas', 'water')}
+
+
+def _section_entries(data: dict, section: str, state: str, service: str = None) -> List[Tuple[str, Dict]]:
+    """(name, utility) pairs of one state's section in file order."""
+    entries = list(data.get(section, {}).get(state, {}).items())
+    if service:
+        entries = [(name, utility) for name, utility in entries
+                   if service in utility.get('services', ['electric'])]
+    return entries
+
+
+class _SectionIndex:
+    """
+    Hash indexes over one state's entries in a section.
+    
+    Every map points to the position of the first entry with that key, so
+    "first match in file order" is a min() over a few dict lookups.
+    """
+    
+    __slots__ = ('entries', 'zips', 'names', 'name_lengths', '_substrings')
+    
+    def __init__(self, entries: List[Tuple[str, Dict]]):
+        self.entries = entries
+        self.zips: Dict[str, int] = {}
+        self.names: Dict[str, int] = {}
+        for position, (name, utility) in enumerate(entries):
+            for zip_code in utility.get('zip_codes', []):
+                self.zips.setdefault(zip_code, position)
+            self.names.setdefault(name.upper(), position)
+        self.name_lengths = sorted({len(name) for name in self.names})
+        # name substring -> position, only needed for partial county matches
+        self._substrings: Optional[Dict[str, int]] = None
+    
+    def first_zip(self, zip_code: str) -> Optional[int]:
+        return self.zips.get(zip_code)
+    
+    def first_name_within(self, value: str) -> Optional[int]:
+        """First entry whose upper-cased name is a substring of value."""
+        value_upper = value.upper()
+        best = None
+        # Look up every substring of value with the length of some name
+        for length in self.name_lengths:
+            if length > len(value_upper):
+                break
+            for start in range(len(value_upper) - length + 1):
+                position = self.names.get(value_upper[start:start + length])
+                if position is not None and (best is None or position < best):
+                    best = position
+        return best
+    
+    def first_name_equal(self, value: str) -> Optional[int]:
+        return self.names.get(value.upper())
+    
+    def first_name_overlapping(self, value: str) -> Optional[int]:
+        """First entry whose name is within value or contains it."""
+        if self._substrings is None:
+            substrings = {}
+            for name, position in self.names.items():
+                for start in range(len(name)):
+                    for end in range(start, len(name) + 1):
+                        key = name[start:end]
+                        if position < substrings.get(key, position + 1):
+                            substrings[key] = position
+            self._substrings = substrings
+        candidates = [p for p in (self.first_name_within(value), self._substrings.get(value.upper()))
+                      if p is not None]
+        return min(candidates) if candidates else None
+
+
+def _scan(kind: str, entries: List[Tuple[str, Dict]], value: str) -> Optional[int]:
+    """Original linear-scan semantics of each match kind."""
+    value_upper = value.upper()
+    for position, (name, utility) in enumerate(entries):
+        name_upper = name.upper()
+        if kind == 'zip':
+            matched = value in utility.get('zip_codes', [])
+        elif kind == 'name_within':
+            matched = name_upper in value_upper
+        elif kind == 'name_equal':
+            matched = name_upper == value_upper
+        else:
+            matched = name_upper in value_upper or value_upper in name_upper
+        if matched:
+            return position
+    return None
+
+
+def _get_section_index(data, section: str, state: str, service: str = None) -> _SectionIndex:
+    """
+    Index of one state's section, built on first use.
+    
+    Built lazily so a worker only decodes the states it serves (the data
+    may be a snapshot view); all indexes are dropped if the data object
+    is replaced.
+    """
+    global _municipal_index
+    if _municipal_index is None or _municipal_index[0] is not data:
+        with _municipal_index_lock:
+            if _municipal_index is None or _municipal_index[0] is not data:
+                _municipal_index = (data, {})
+    indexes = _municipal_index[1]
+    key = (section, state, service)
+    section_index = indexes.get(key)
+    if section_index is None:
+        section_index = indexes[key] = _SectionIndex(_section_entries(data, section, state, service))
+    return section_index
+
+
+def _find(kind: str, section: str, state: str, value: str, service: str = None) -> Optional[Tuple[str, Dict, int]]:
+    """
+    First entry of a state's section matching value.
+    
+    Args:
+        kind: 'zip' (in zip_codes), 'name_within' (name is a substring of
+              value), 'name_equal', or 'name_overlap' (either contains
+              the other)
+        section: 'electric', 'gas', 'water', 'county_electric', 'county_gas'
+        state: Upper-case state code
+        value: ZIP, city or county to match
+        service: Only electric entries that also provide this service
+    
+    Returns:
+        (name, utility, position) or None
+    """
+    data = load_municipal_data()
+    
+    if MUNICIPAL_INDEX_MODE in ('scan', 'verify'):
+        entries = _section_entries(data, section, state, service)
+        position = _scan(kind, entries, value)
+    
+    if MUNICIPAL_INDEX_MODE != 'scan':
+        section_index = _get_section_index(data, section, state, service)
+        indexed = {
+            'zip': section_index.first_zip,
+            'name_within': section_index.first_name_within,
+            'name_equal': section_index.first_name_equal,
+            'name_overlap': section_index.first_name_overlapping,
+        }[kind](value)
+        if MUNICIPAL_INDEX_MODE != 'verify':
+            entries = section_index.entries
+            position = indexed
+        elif indexed != position:
+            print(f"[municipal-index] mismatch {kind} {section}/{state}/{service} {value!r}: "
+                  f"index={indexed} scan={position}")
+    
+    if position is None:
+        return None
+    name, utility = entries[position]
+    return name, utility, position
+
+
+def _find_zip_or_city(section: str, state: str, zip_code: str = None, city: str = None,
+                      service: str = None) -> Optional[Tuple[str, Dict, bool]]:
+    """
+    First entry matching the ZIP or whose name is within the city.
+    
+    Same result as checking each entry for ZIP then city in file order.
+    
+    Returns:
+        (name, utility, matched_by_zip) or None
+    """
+    by_zip = _find('zip', section, state, zip_code, service) if zip_code else None
+    by_city = _find('name_within', section, state, city, service) if city else None
+    if by_zip and (not by_city or by_zip[2] <= by_city[2]):
+        return by_zip[0], by_zip[1], True
+    if by_city:
+        return by_city[0], by_city[1], False
+    return None
+
+
 def lookup_municipal_electric(state: str, city: str = None, zip_code: str = None, county: str = None) -> Optional[Dict]:
     """Check if city has municipal electric utility.
     
@@ -71,62 +264,62 @@ def lookup_municipal_electric(state: str, city: str = None, zip_code: str = None
             return remaining_result
     
     # Check by ZIP code first (most accurate)
-    if zip_code and state_data:
-        for city_name, utility in state_data.items():
-            if zip_code in utility.get('zip_codes', []):
-                return {
-                    'name': utility['name'],
-                    'phone': utility.get('phone'),
-                    'website': utility.get('website'),
-                    'city': city_name,
-                    'source': 'municipal_utility',
-                    'confidence': 'high',
-                    'note': utility.get('note', f"Municipal utility serving {city_name}")
-                }
+    match = _find('zip', 'electric', state_upper, zip_code) if zip_code and state_data else None
+    if match:
+        city_name, utility, _ = match
+        return {
+            'name': utility['name'],
+            'phone': utility.get('phone'),
+            'website': utility.get('website'),
+            'city': city_name,
+            'source': 'municipal_utility',
+            'confidence': 'high',
+            'note': utility.get('note', f"Municipal utility serving {city_name}")
+        }
     
-    # Fall back to city name match
-    if city and state_data:
-        city_upper = city.upper()
-        for city_name, utility in state_data.items():
-            if city_name.upper() == city_upper or city_name.upper() in city_upper:
-                return {
-                    'name': utility['name'],
-                    'phone': utility.get('phone'),
-                    'website': utility.get('website'),
-                    'city': city_name,
-                    'source': 'municipal_utility',
-                    'confidence': 'medium',
-                    'note': utility.get('note', f"Municipal utility serving {city_name}")
-                }
+    # Fall back to city name match (exact or contained in the city name)
+    match = _find('name_within', 'electric', state_upper, city) if city and state_data else None
+    if match:
+        city_name, utility, _ = match
+        return {
+            'name': utility['name'],
+            'phone': utility.get('phone'),
+            'website': utility.get('website'),
+            'city': city_name,
+            'source': 'municipal_utility',
+            'confidence': 'medium',
+            'note': utility.get('note', f"Municipal utility serving {city_name}")
+        }
     
     # COUNTY FALLBACK: If no city match, try county-level data
     county_data = data.get('county_electric', {}).get(state_upper, {})
     if county and county_data:
-        county_upper = county.upper()
         # Try exact match first
-        for county_name, utility in county_data.items():
-            if county_name.upper() == county_upper:
-                return {
-                    'name': utility['name'],
-                    'phone': utility.get('phone'),
-                    'website': utility.get('website'),
-                    'county': county_name,
-                    'source': 'county_electric_fallback',
-                    'confidence': 'medium',
-                    'note': utility.get('note', f"Electric utility serving {county_name} County")
-                }
+        match = _find('name_equal', 'county_electric', state_upper, county)
+        if match:
+            county_name, utility, _ = match
+            return {
+                'name': utility['name'],
+                'phone': utility.get('phone'),
+                'website': utility.get('website'),
+                'county': county_name,
+                'source': 'county_electric_fallback',
+                'confidence': 'medium',
+                'note': utility.get('note', f"Electric utility serving {county_name} County")
+            }
         # Try partial match (e.g., "Jefferson County" matches "Jefferson")
-        for county_name, utility in county_data.items():
-            if county_name.upper() in county_upper or county_upper in county_name.upper():
-                return {
-                    'name': utility['name'],
-                    'phone': utility.get('phone'),
-                    'website': utility.get('website'),
-                    'county': county_name,
-                    'source': 'county_electric_fallback',
-                    'confidence': 'low',
-                    'note': utility.get('note', f"Electric utility serving {county_name} County")
-                }
+        match = _find('name_overlap', 'county_electric', state_upper, county)
+        if match:
+            county_name, utility, _ = match
+            return {
+                'name': utility['name'],
+                'phone': utility.get('phone'),
+                'website': utility.get('website'),
+                'county': county_name,
+                'source': 'county_electric_fallback',
+                'confidence': 'low',
+                'note': utility.get('note', f"Electric utility serving {county_name} County")
+            }
     
     return None
 
@@ -140,109 +333,88 @@ def lookup_municipal_gas(state: str, city: str = None, zip_code: str = None, cou
     # but gas providers differ by borough (county)
     if state_upper == 'NY' and county:
         nyc_counties = ['KINGS', 'QUEENS', 'RICHMOND', 'BRONX', 'NEW YORK', 'NASSAU', 'SUFFOLK']
-        county_upper = county.upper()
-        if county_upper in nyc_counties:
-            county_data = data.get('county_gas', {}).get('NY', {})
-            for county_name, utility in county_data.items():
-                if county_name.upper() == county_upper:
-                    return {
-                        'name': utility['name'],
-                        'phone': utility.get('phone'),
-                        'website': utility.get('website'),
-                        'county': county_name,
-                        'source': 'county_gas_nyc',
-                        'confidence': 'verified',
-                        'note': f"Gas utility serving {county_name} County, NY"
-                    }
+        if county.upper() in nyc_counties:
+            match = _find('name_equal', 'county_gas', 'NY', county)
+            if match:
+                county_name, utility, _ = match
+                return {
+                    'name': utility['name'],
+                    'phone': utility.get('phone'),
+                    'website': utility.get('website'),
+                    'county': county_name,
+                    'source': 'county_gas_nyc',
+                    'confidence': 'verified',
+                    'note': f"Gas utility serving {county_name} County, NY"
+                }
     
     # FIRST: Check dedicated gas section (Texas Gas Service, Atmos, CenterPoint, etc.)
-    gas_data = data.get('gas', {}).get(state_upper, {})
+    # ZIP (most accurate) or city name, whichever entry comes first
+    match = _find_zip_or_city('gas', state_upper, zip_code, city)
+    if match:
+        city_name, utility, by_zip = match
+        return {
+            'name': utility['name'],
+            'phone': utility.get('phone'),
+            'website': utility.get('website'),
+            'city': city_name,
+            'source': 'municipal_gas_data',
+            'confidence': 'high' if by_zip else 'medium',
+            'note': utility.get('note', f"Gas utility serving {city_name}")
+        }
     
-    for city_name, utility in gas_data.items():
-        # Check ZIP first (most accurate)
-        if zip_code and zip_code in utility.get('zip_codes', []):
+    # SECOND: Check electric utilities that also provide gas (CPS Energy, Colorado Springs, etc.)
+    match = _find_zip_or_city('electric', state_upper, zip_code, city, service='gas')
+    if match:
+        city_name, utility, by_zip = match
+        if by_zip:
             return {
                 'name': utility['name'],
                 'phone': utility.get('phone'),
                 'website': utility.get('website'),
                 'city': city_name,
-                'source': 'municipal_gas_data',
+                'source': 'municipal_utility',
                 'confidence': 'high',
-                'note': utility.get('note', f"Gas utility serving {city_name}")
+                'note': f"Municipal utility providing gas service"
             }
+        return {
+            'name': utility['name'],
+            'phone': utility.get('phone'),
+            'website': utility.get('website'),
+            'city': city_name,
+            'source': 'municipal_utility',
+            'confidence': 'medium'
+        }
         
-        # Check city name
-        if city and city_name.upper() in city.upper():
+    # COUNTY FALLBACK: If no city match, try county-level gas data
+    county_data = data.get('county_gas', {}).get(state_upper, {})
+    if county and county_data:
+        # Try exact match first
+        match = _find('name_equal', 'county_gas', state_upper, county)
+        if match:
+            county_name, utility, _ = match
             return {
                 'name': utility['name'],
                 'phone': utility.get('phone'),
                 'website': utility.get('website'),
-                'city': city_name,
-                'source': 'municipal_gas_data',
+                'county': county_name,
+                'source': 'county_gas_fallback',
                 'confidence': 'medium',
-                'note': utility.get('note', f"Gas utility serving {city_name}")
-            }
-    
-    # SECOND: Check electric utilities that also provide gas (CPS Energy, Colorado Springs, etc.)
-    electric_data = data.get('electric', {}).get(state_upper, {})
-    
-    for city_name, utility in electric_data.items():
-        services = utility.get('services', ['electric'])
-        if 'gas' not in services:
-            continue
-        
-        # Check ZIP
-        if zip_code and zip_code in utility.get('zip_codes', []):
-            return {
-                'name': utility['name'],
-                'phone': utility.get('phone'),
-                'website': utility.get('website'),
-                'city': city_name,
-                'source': 'municipal_utility',
-                'confidence': 'high',
-                'note': f"Municipal utility providing gas service"
+                'note': utility.get('note', f"Gas utility serving {county_name} County")
             }
-        
-        # Check city name
-        if city and city_name.upper() in city.upper():
+        # Try partial match (e.g., "Jefferson County" matches "Jefferson")
+        match = _find('name_overlap', 'county_gas', state_upper, county)
+        if match:
+            county_name, utility, _ = match
             return {
                 'name': utility['name'],
                 'phone': utility.get('phone'),
                 'website': utility.get('website'),
-                'city': city_name,
-                'source': 'municipal_utility',
-                'confidence': 'medium'
+                'county': county_name,
+                'source': 'county_gas_fallback',
+                'confidence': 'low',
+                'note': utility.get('note', f"Gas utility serving {county_name} County")
             }
     
-    # COUNTY FALLBACK: If no city match, try county-level gas data
-    county_data = data.get('county_gas', {}).get(state_upper, {})
-    if county and county_data:
-        county_upper = county.upper()
-        # Try exact match first
-        for county_name, utility in county_data.items():
-            if county_name.upper() == county_upper:
-                return {
-                    'name': utility['name'],
-                    'phone': utility.get('phone'),
-                    'website': utility.get('website'),
-                    'county': county_name,
-                    'source': 'county_gas_fallback',
-                    'confidence': 'medium',
-                    'note': utility.get('note', f"Gas utility serving {county_name} County")
-                }
-        # Try partial match (e.g., "Jefferson County" matches "Jefferson")
-        for county_name, utility in county_data.items():
-            if county_name.upper() in county_upper or county_upper in county_name.upper():
-                return {
-                    'name': utility['name'],
-                    'phone': utility.get('phone'),
-                    'website': utility.get('website'),
-                    'county': county_name,
-                    'source': 'county_gas_fallback',
-                    'confidence': 'low',
-                    'note': utility.get('note', f"Gas utility serving {county_name} County")
-                }
-    
     return None
 
 
@@ -500,11 +672,7 @@ def load_remaining_states_water_data() -> dict:
     """Load remaining states water district data."""
     global _remaining_states_water_data
     if _remaining_states_water_data is None:
-        if os.path.exists(REMAINING_STATES_WATER_FILE):
-            with open(REMAINING_STATES_WATER_FILE, 'r') as f:
-                _remaining_states_water_data = json.load(f)
-        else:
-            _remaining_states_water_data = {}
+        _remaining_states_water_data = load_reference('remaining_states_water', REMAINING_STATES_WATER_FILE)
     return _remaining_states_water_data
 
 
@@ -558,11 +726,7 @@ def load_remaining_states_electric_data() -> dict:
     """Load remaining states electric co-op/municipal data."""
     global _remaining_states_electric_data
     if _remaining_states_electric_data is None:
-        if os.path.exists(REMAINING_STATES_ELECTRIC_FILE):
-            with open(REMAINING_STATES_ELECTRIC_FILE, 'r') as f:
-                _remaining_states_electric_data = json.load(f)
-        else:
-            _remaining_states_electric_data = {}
+        _remaining_states_electric_data = load_reference('remaining_states_electric', REMAINING_STATES_ELECTRIC_FILE)
     return _remaining_states_electric_data
 
 
@@ -616,11 +780,7 @@ def load_remaining_states_gas_data() -> dict:
     """Load remaining states gas utility data."""
     global _remaining_states_gas_data
     if _remaining_states_gas_data is None:
-        if os.path.exists(REMAINING_STATES_GAS_FILE):
-            with open(REMAINING_STATES_GAS_FILE, 'r') as f:
-                _remaining_states_gas_data = json.load(f)
-        else:
-            _remaining_states_gas_data = {}
+        _remaining_states_gas_data = load_reference('remaining_states_gas', REMAINING_STATES_GAS_FILE)
     return _remaining_states_gas_data
 
 
@@ -791,85 +951,47 @@ def lookup_municipal_water(state: str, city: str = None, zip_code: str = None, c
         return remaining_result
     
     # FIRST: Check dedicated water section (standalone water utilities)
-    water_data = data.get('water', {}).get(state_upper, {})
-    
-    for city_name, utility in water_data.items():
-        # Check ZIP first (most accurate)
-        if zip_code and zip_code in utility.get('zip_codes', []):
-            return {
-                'name': utility['name'],
-                'phone': utility.get('phone'),
-                'website': utility.get('website'),
-                'city': city_name,
-                'source': 'municipal_water_data',
-                'confidence': 'high',
-                'note': utility.get('note', f"Municipal water utility serving {city_name}")
-            }
-        
-        # Check city name
-        if city and city_name.upper() in city.upper():
-            return {
-                'name': utility['name'],
-                'phone': utility.get('phone'),
-                'website': utility.get('website'),
-                'city': city_name,
-                'source': 'municipal_water_data',
-                'confidence': 'medium',
-                'note': utility.get('note', f"Municipal water utility serving {city_name}")
-            }
+    # ZIP (most accurate) or city name, whichever entry comes first
+    match = _find_zip_or_city('water', state_upper, zip_code, city)
+    if match:
+        city_name, utility, by_zip = match
+        return {
+            'name': utility['name'],
+            'phone': utility.get('phone'),
+            'website': utility.get('website'),
+            'city': city_name,
+            'source': 'municipal_water_data',
+            'confidence': 'high' if by_zip else 'medium',
+            'note': utility.get('note', f"Municipal water utility serving {city_name}")
+        }
     
     # SECOND: Check electric utilities that also provide water (Austin Energy/Austin Water, OUC, etc.)
-    electric_data = data.get('electric', {}).get(state_upper, {})
-    
-    for city_name, utility in electric_data.items():
-        services = utility.get('services', ['electric'])
-        if 'water' not in services:
-            continue
-        
-        # Check ZIP
-        if zip_code and zip_code in utility.get('zip_codes', []):
-            # Use separate water provider info if available (e.g., Austin Water vs Austin Energy)
-            water_name = utility.get('water_provider', utility['name'])
-            water_phone = utility.get('water_phone', utility.get('phone'))
-            water_website = utility.get('water_website', utility.get('website'))
-            
-            return {
-                'name': water_name,
-                'phone': water_phone,
-                'website': water_website,
-                'city': city_name,
-                'source': 'municipal_utility',
-                'confidence': 'high'
-            }
-        
-        # Check city name
-        if city and city_name.upper() in city.upper():
-            water_name = utility.get('water_provider', utility['name'])
-            water_phone = utility.get('water_phone', utility.get('phone'))
-            water_website = utility.get('water_website', utility.get('website'))
-            
-            return {
-                'name': water_name,
-                'phone': water_phone,
-                'website': water_website,
-                'city': city_name,
-                'source': 'municipal_utility',
-                'confidence': 'medium'
-            }
+    match = _find_zip_or_city('electric', state_upper, zip_code, city, service='water')
+    if match:
+        city_name, utility, by_zip = match
+        # Use separate water provider info if available (e.g., Austin Water vs Austin Energy)
+        return {
+            'name': utility.get('water_provider', utility['name']),
+            'phone': utility.get('water_phone', utility.get('phone')),
+            'website': utility.get('water_website', utility.get('website')),
+            'city': city_name,
+            'source': 'municipal_utility',
+            'confidence': 'high' if by_zip else 'medium'
+        }
     
     return None
 
 
 def get_all_municipal_utilities(state: str = None) -> Dict:
-    """Get all municipal utilities, optionally filtered by state."""
+    """Get all municipal utilities, optionally filtered by state (plain dicts, JSON-ready)."""
     data = load_municipal_data()
     
     if state:
         return {
-            'electric': data.get('electric', {}).get(state.upper(), {}),
+            'electric': to_plain(data.get('electric', {}).get(state.upper(), {})),
         }
     
-    return data.get('electric', {})
+    return to_plain(data.get('electric', {}))
 
 
 def get_municipal_stats() -> Dict:
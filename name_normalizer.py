@@ -13,6 +13,8 @@ import hashlib
 from pathlib import Path
 from typing import Optional
 
+from circuit_breaker import get_breaker
+
 # In-memory cache for session
 _name_cache = {}
 
@@ -158,7 +160,8 @@ def _normalize_with_oapi(name: str) -> Optional[str]:
         import openai
         client = openai.OpenAI(api_key=api_key)
         
-        response = client.chat.completions.create(
+        response = get_breaker('openai').call(
+            client.chat.completions.create,
             model="gpt-4o-mini",
             messages=[
                 {
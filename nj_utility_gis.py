@@ -11,7 +11,7 @@ Covers all utility types from a single authoritative source:
 Source: https://mapsdep.nj.gov/arcgis/rest/services/Features/Utilities/MapServer
 """
 
-import requests
+import http_client
 from typing import Optional, Dict
 
 from logging_config import get_logger
@@ -49,7 +49,7 @@ def lookup_nj_electric(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -111,7 +111,7 @@ def lookup_nj_gas(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -7,16 +7,47 @@ Instead of rule-based selection with AI as tie-breaker, this flips the model:
 - AI makes the final decision with reasoning
 
 The data sources become advisors, the AI becomes the decision maker.
+
+Decisions are cached by candidate-set fingerprint (utility type, state,
+ZIP, sorted normalized candidate names and sources): every address in a
+ZIP that produces the same candidates gets the same answer without a
+2-5 second OpenAI call. Confident decisions are also shared with the
+rest of the 3-digit ZIP region, and a correction for a region drops its
+cached decisions.
 """
 
 import os
+import re
 import json
 import time
-from typing import List, Dict, Optional
+import hashlib
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
 from .interfaces import SourceResult, LookupContext, UtilityType
+from shared_cache import get_shared_cache
+from singleflight import SingleFlight
+from ttl_cache import TTLCache
+
+# How long an AI decision is reused (0 disables the cache)
+AI_DECISION_CACHE_TTL = int(os.getenv('AI_DECISION_CACHE_TTL', str(7 * 24 * 3600)))
+
+# Share decisions across workers through shared_cache (0 = per process only)
+AI_DECISION_CACHE_SHARED = os.getenv('AI_DECISION_CACHE_SHARED', '1') == '1'
+
+# Decisions at least this confident also answer other ZIPs in the same
+# 3-digit region with an identical candidate set
+AI_DECISION_REGION_MIN_CONFIDENCE = float(os.getenv('AI_DECISION_REGION_MIN_CONFIDENCE', '0.85'))
+
+# Other workers see a correction's invalidation within this many seconds
+AI_DECISION_GENERATION_TTL = 60
+
+_decision_cache = TTLCache(max_entries=20000, ttl=max(AI_DECISION_CACHE_TTL, 1), name='ai_selector')
+_generation_cache = TTLCache(max_entries=5000, ttl=AI_DECISION_GENERATION_TTL, name='ai_selector_gen')
+
+# Concurrent lookups with the same candidate set share one OpenAI call
+_decision_flight = SingleFlight('ai_selector')
 
 
 def _load_openai_key():
@@ -110,6 +141,66 @@ class AIDecision:
     selected_source: str
     reasoning: str
     all_candidates: List[Dict]
+    cached: bool = False  # True if reused from the decision cache
+
+
+def _normalize_candidate_name(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', ' ', (name or '').lower()).strip()
+
+
+def _generation_keys(utility_type: str, state: Optional[str], zip_code: Optional[str]) -> List[str]:
+    keys = [f"{utility_type}:state:{(state or '').upper()}"]
+    if zip_code:
+        keys.append(f"{utility_type}:zip3:{zip_code[:3]}")
+    return keys
+
+
+def _generation(utility_type: str, state: Optional[str], zip_code: Optional[str]) -> str:
+    """Invalidation counter for the area; bumped by invalidate_ai_decisions()."""
+    parts = []
+    shared = get_shared_cache() if AI_DECISION_CACHE_SHARED else None
+    for key in _generation_keys(utility_type, state, zip_code):
+        value = _generation_cache.get(key)
+        if value is None:
+            value = (shared.get('ai_selector_gen', key) if shared is not None else None) or 0
+            _generation_cache.set(key, value)
+        parts.append(str(value))
+    return '.'.join(parts)
+
+
+def invalidate_ai_decisions(utility_type: str, state: Optional[str] = None, zip_code: Optional[str] = None) -> None:
+    """
+    Drop cached AI decisions for an area after a correction lands.
+    
+    Args:
+        utility_type: 'electric', 'gas', or 'water'
+        state: State of the corrected address (drops the whole state's
+               decisions when no ZIP is known)
+        zip_code: ZIP of the corrected address (drops its 3-digit region)
+    """
+    keys = _generation_keys(utility_type, state, zip_code)
+    if zip_code:
+        keys = keys[1:]
+    shared = get_shared_cache() if AI_DECISION_CACHE_SHARED else None
+    for key in keys:
+        current = _generation_cache.get(key)
+        if current is None and shared is not None:
+            current = shared.get('ai_selector_gen', key)
+        value = int(current or 0) + 1
+        _generation_cache.set(key, value)
+        if shared is not None:
+            shared.set('ai_selector_gen', key, value)
+
+
+def _decision_keys(context: LookupContext, candidates: List[SourceResult]) -> Tuple[str, str]:
+    """(exact ZIP key, 3-digit region key) for a candidate set."""
+    fingerprint = hashlib.sha1(json.dumps(sorted(
+        [_normalize_candidate_name(c.utility_name), c.source_name] for c in candidates
+    )).encode()).hexdigest()[:16]
+    utility_type = context.utility_type.value
+    zip_code = context.zip_code or ''
+    base = f"{utility_type}:{(context.state or '').upper()}:{_generation(utility_type, context.state, zip_code)}"
+    return f"{base}:{zip_code}:{fingerprint}", f"{base}:{zip_code[:3]}*:{fingerprint}"
 
 
 class AISelector:
@@ -167,8 +258,89 @@ class AISelector:
                 all_candidates=[self._candidate_to_dict(c)]
             )
         
-        # Multiple candidates - let AI decide
-        return self._ai_select(context, valid_candidates)
+        # Multiple candidates - reuse a decision for the same candidate set,
+        # or wait for one already being made
+        keys = _decision_keys(context, valid_candidates)
+        decision, shared = _decision_flight.do(keys[0], self._decide, keys, context, valid_candidates)
+        if shared:
+            return AIDecision(
+                utility_name=decision.utility_name,
+                utility_type=decision.utility_type,
+                confidence=decision.confidence,
+                selected_source=decision.selected_source,
+                reasoning=decision.reasoning,
+                all_candidates=[self._candidate_to_dict(c) for c in valid_candidates],
+                cached=True
+            )
+        return decision
+    
+    def _decide(
+        self,
+        keys: Tuple[str, str],
+        context: LookupContext,
+        candidates: List[SourceResult]
+    ) -> AIDecision:
+        """Cached decision, else ask the AI and cache its answer."""
+        if AI_DECISION_CACHE_TTL > 0:
+            decision = self._get_cached_decision(keys, context, candidates)
+            if decision is not None:
+                return decision
+        
+        decision = self._ai_select(context, candidates)
+        if AI_DECISION_CACHE_TTL > 0 and self.api_key and not decision.reasoning.startswith('Fallback'):
+            self._store_decision(keys, decision)
+        return decision
+    
+    def _get_cached_decision(
+        self,
+        keys: Tuple[str, str],
+        context: LookupContext,
+        candidates: List[SourceResult]
+    ) -> Optional[AIDecision]:
+        """Cached decision for this candidate set (exact ZIP first, then region)."""
+        shared = get_shared_cache() if AI_DECISION_CACHE_SHARED else None
+        for key in keys:
+            cached = _decision_cache.get(key)
+            if cached is None and shared is not None:
+                cached = shared.get('ai_selector', key)
+                if cached is not None:
+                    _decision_cache.set(key, cached)
+            if cached is None:
+                continue
+            
+            selected = _normalize_candidate_name(cached['utility_name'])
+            for c in candidates:
+                if _normalize_candidate_name(c.utility_name) == selected:
+                    return AIDecision(
+                        utility_name=c.utility_name,
+                        utility_type=context.utility_type.value,
+                        confidence=cached['confidence'],
+                        selected_source=cached['selected_source'],
+                        reasoning=cached['reasoning'],
+                        all_candidates=[self._candidate_to_dict(c) for c in candidates],
+                        cached=True
+                    )
+        return None
+    
+    def _store_decision(self, keys: Tuple[str, str], decision: AIDecision):
+        """Cache for the exact ZIP, and for the region when confident."""
+        entry = {
+            'utility_name': decision.utility_name,
+            'selected_source': decision.selected_source,
+            'confidence': decision.confidence,
+            'reasoning': decision.reasoning,
+            'timestamp': time.time(),
+        }
+        exact_key, region_key = keys
+        store = [exact_key]
+        if decision.confidence >= AI_DECISION_REGION_MIN_CONFIDENCE:
+            store.append(region_key)
+        
+        shared = get_shared_cache() if AI_DECISION_CACHE_SHARED else None
+        for key in store:
+            _decision_cache.set(key, entry)
+            if shared is not None:
+                shared.set('ai_selector', key, entry, ttl=AI_DECISION_CACHE_TTL)
     
     def _ai_select(
         self,
@@ -193,9 +365,9 @@ class AISelector:
         prompt = self._build_prompt(context, candidates)
         
         try:
-            import requests
+            import http_client
             
-            response = requests.post(
+            response = http_client.post(
                 "https://api.openai.com/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
@@ -103,6 +103,9 @@ class PipelineResult:
     serp_verified: Optional[bool] = None
     serp_utility: Optional[str] = None
     
+    # AI selector decision reused from the candidate-set cache
+    ai_decision_cached: bool = False
+    
     # Debug/timing info
     all_results: List[SourceResult] = field(default_factory=list)
     timing_ms: int = 0
@@ -148,6 +151,7 @@ class PipelineResult:
             '_agreeing_sources': self.agreeing_sources,
             '_disagreeing_sources': self.disagreeing_sources,
             '_serp_verified': self.serp_verified,
+            '_ai_decision_cached': self.ai_decision_cached,
             '_timing_ms': self.timing_ms,
         }
 
@@ -196,6 +200,17 @@ class DataSource(ABC):
         """
         pass
     
+    async def aquery(self, context: LookupContext) -> Optional[SourceResult]:
+        """
+        Async version of query(), used by LookupPipeline.alookup().
+        
+        The default runs query() on the shared bounded worker pool. Sources
+        whose time is spent in network I/O override this to await it on
+        the event loop.
+        """
+        from async_lookup import run_blocking
+        return await run_blocking(self.query, context)
+    
     def supports(self, utility_type: UtilityType) -> bool:
         """Check if this source supports the given utility type."""
         return utility_type in self.supported_types
@@ -4,6 +4,7 @@ Main pipeline orchestrator for utility lookups.
 Coordinates parallel queries to data sources, cross-validation, and result selection.
 """
 
+import asyncio
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 from typing import Dict, List, Optional, Tuple
@@ -19,6 +20,23 @@ from .interfaces import (
 )
 from .smart_selector import get_smart_selector, SmartSelector
 from .ai_selector import get_ai_selector, AISelector
+from adaptive_timeout import get_adaptive_timeouts
+
+# Per-source latency histograms and tracing spans (optional)
+try:
+    from monitoring.metrics import track_source_latency
+    from monitoring.tracing import span, propagate
+except ImportError:
+    def track_source_latency(*args, **kwargs): pass
+    class span:
+        def __init__(self, *args, **kwargs): pass
+        def __enter__(self): return self
+        def __exit__(self, *args): pass
+        def set_attribute(self, *args): pass
+    def propagate(func): return func
+
+# How often alookup checks whether a source waiting for a worker thread has started
+QUEUED_POLL_SECONDS = 0.05
 
 
 class LookupPipeline:
@@ -51,6 +69,10 @@ class LookupPipeline:
         self.enable_ai_selector = True     # NEW: AI-first selection (data sources as advisors)
         self.serp_confidence_threshold = 70
         
+        # Upper bound on waiting for sources; the actual budget adapts to
+        # the sources' recent query times (see _query_budget)
+        self.query_timeout = 3.0
+        
         # Initialize selectors
         self._smart_selector = None
         self._ai_selector = None
@@ -90,8 +112,44 @@ class LookupPipeline:
             return PipelineResult.empty(context.utility_type)
         
         # 2. Query all sources in parallel
-        results = self._query_parallel(applicable_sources, context)
+        with span('pipeline.lookup', utility_type=context.utility_type.value):
+            results = self._query_parallel(applicable_sources, context)
+            return self._resolve(results, context, start_time)
+    
+    async def alookup(self, context: LookupContext) -> PipelineResult:
+        """
+        Async version of lookup().
+        
+        Sources are queried through DataSource.aquery() on the running event
+        loop; the selection stages run on the bounded worker pool
+        (async_lookup.run_blocking) because the AI selector and SERP
+        verification make blocking HTTP calls.
+        
+        Args:
+            context: LookupContext with address/location info
+        
+        Returns:
+            PipelineResult with the best utility match
+        """
+        start_time = time.time()
+        
+        applicable_sources = [s for s in self.sources if s.supports(context.utility_type)]
         
+        if not applicable_sources:
+            return PipelineResult.empty(context.utility_type)
+        
+        with span('pipeline.lookup', utility_type=context.utility_type.value):
+            from async_lookup import run_blocking
+            results = await self._aquery_parallel(applicable_sources, context)
+            return await run_blocking(self._resolve, results, context, start_time)
+    
+    def _resolve(
+        self,
+        results: List[SourceResult],
+        context: LookupContext,
+        start_time: float
+    ) -> PipelineResult:
+        """Run stages 3-7 (validate, select, build, enrich, verify) on source results."""
         # Filter to valid results
         valid_results = [r for r in results if r.is_valid]
         
@@ -103,7 +161,8 @@ class LookupPipeline:
         
         # 3. Cross-validate if enabled (for reporting, not decision making)
         if self.enable_cross_validation and len(valid_results) > 1:
-            cv_result = self._cross_validate(valid_results)
+            with span('cross_validate', results=len(valid_results)):
+                cv_result = self._cross_validate(valid_results)
         else:
             cv_result = None
         
@@ -124,7 +183,10 @@ class LookupPipeline:
         # NEW: AI-first selection - AI evaluates ALL candidates with full context
         elif self._ai_selector and len(valid_results) > 1:
             # AI-first: Let AI evaluate all candidates and make the decision
-            ai_decision = self._ai_selector.select(context, valid_results)
+            with span('ai_selector.select', candidates=len(valid_results)) as s:
+                ai_decision = self._ai_selector.select(context, valid_results)
+                s.set_attribute('selected_source', ai_decision.selected_source)
+                s.set_attribute('cached', ai_decision.cached)
             
             # Find the matching source result
             primary = None
@@ -147,6 +209,7 @@ class LookupPipeline:
                 cv_result = {}
             cv_result['ai_selector_used'] = True
             cv_result['ai_selector_reasoning'] = ai_decision.reasoning
+            cv_result['ai_selector_cached'] = ai_decision.cached
             
         elif self._smart_selector and cv_result and not cv_result.get('sources_agreed', True):
             # Legacy: Use SmartSelector for disagreement resolution
@@ -176,9 +239,11 @@ class LookupPipeline:
         # 5. Build pipeline result
         result = self._build_result(primary, context, cv_result)
         result.all_results = results
+        result.ai_decision_cached = bool(cv_result and cv_result.get('ai_selector_cached'))
         
         # 6. Enrich with contact info and brand resolution
-        result = self._enrich(result, context)
+        with span('enrich'):
+            result = self._enrich(result, context)
         
         # 7. SERP verification - only when sources have a meaningful disagreement
         # Simple rule: clear majority = done, close split = ask the internet
@@ -188,7 +253,9 @@ class LookupPipeline:
             len(result.disagreeing_sources) >= len(result.agreeing_sources)  # True tie or minority wins
         )
         if needs_serp:
-            result = self._verify_with_serp(result, context)
+            with span('serp_verification') as s:
+                result = self._verify_with_serp(result, context)
+                s.set_attribute('verified', result.serp_verified)
         
         result.timing_ms = int((time.time() - start_time) * 1000)
         
@@ -210,45 +277,171 @@ class LookupPipeline:
         
         # Submit all queries
         for source in sources:
-            future = self.executor.submit(self._safe_query, source, context)
+            future = self.executor.submit(propagate(self._safe_query), source, context)
             futures[future] = source
         
         # Collect results as they complete
-        for future in as_completed(futures, timeout=3.0):
-            source = futures[future]
-            try:
-                result = future.result(timeout=0.1)
-                if result:
-                    results.append(result)
+        try:
+            for future in as_completed(futures, timeout=self._query_budget(sources)):
+                source = futures[future]
+                try:
+                    result = future.result(timeout=0.1)
+                    if result:
+                        results.append(result)
                     
-                    # Short-circuit: if we get a 95+ confidence result, we're done
-                    if result.confidence_score >= 95:
-                        # Cancel remaining futures
-                        for f in futures:
-                            if not f.done():
-                                f.cancel()
-                        break
+                        # Short-circuit: if we get a 95+ confidence result, we're done
+                        if result.confidence_score >= 95:
+                            # Cancel remaining futures
+                            for f in futures:
+                                if not f.done():
+                                    f.cancel()
+                            break
                         
-            except TimeoutError:
-                # Source took too long
-                results.append(SourceResult(
-                    source_name=source.name,
-                    utility_name=None,
-                    confidence_score=0,
-                    match_type='none',
-                    error='timeout'
-                ))
-            except Exception as e:
-                results.append(SourceResult(
-                    source_name=source.name,
-                    utility_name=None,
-                    confidence_score=0,
-                    match_type='none',
-                    error=str(e)
-                ))
+                except TimeoutError:
+                    # Source took too long
+                    results.append(SourceResult(
+                        source_name=source.name,
+                        utility_name=None,
+                        confidence_score=0,
+                        match_type='none',
+                        error='timeout'
+                    ))
+                except Exception as e:
+                    results.append(SourceResult(
+                        source_name=source.name,
+                        utility_name=None,
+                        confidence_score=0,
+                        match_type='none',
+                        error=str(e)
+                    ))
+        except TimeoutError:
+            # Budget spent - report the sources still running, keep the rest
+            for future, source in futures.items():
+                if not future.done():
+                    results.append(SourceResult(
+                        source_name=source.name,
+                        utility_name=None,
+                        confidence_score=0,
+                        match_type='none',
+                        error='timeout'
+                    ))
         
         return results
     
+    def _query_budget(self, sources: List[DataSource]) -> float:
+        """
+        Seconds to wait for sources: the slowest source's adaptive timeout
+        (recent p99 x 1.5), capped at query_timeout.
+        
+        When every source has been answering quickly, a hung server costs
+        its p99-based timeout instead of the full budget.
+        """
+        timeouts = get_adaptive_timeouts()
+        return max(
+            timeouts.timeout(f"source:{source.name}", default=self.query_timeout)
+            for source in sources
+        )
+    
+    async def _aquery_parallel(
+        self,
+        sources: List[DataSource],
+        context: LookupContext
+    ) -> List[SourceResult]:
+        """
+        Async version of _query_parallel().
+        
+        Same adaptive budget and 95+ confidence short-circuit; a source that
+        has worked for the whole budget is reported with error='timeout'.
+        The budget runs per source and only while its work is running, not
+        while it waits for a worker thread (see async_lookup.WorkClock).
+        """
+        from async_lookup import WorkClock
+        
+        clocks = {}
+        tasks = {}
+        for source in sources:
+            clock = WorkClock()
+            task = asyncio.ensure_future(self._asafe_query(source, context, clock))
+            clocks[task] = clock
+            tasks[task] = source
+        results = []
+        pending = set(tasks)
+        budget = self._query_budget(sources)
+        
+        try:
+            while pending:
+                expired = {task for task in pending if clocks[task].elapsed() >= budget}
+                for task in expired:
+                    task.cancel()
+                    results.append(SourceResult(
+                        source_name=tasks[task].name,
+                        utility_name=None,
+                        confidence_score=0,
+                        match_type='none',
+                        error='timeout'
+                    ))
+                pending -= expired
+                if not pending:
+                    break
+                
+                # Wake at the first running source's deadline; a queued
+                # source's clock is stopped, so poll until it gets a thread
+                wait = min(budget - clocks[task].elapsed() for task in pending)
+                if any(clocks[task].queued for task in pending):
+                    wait = min(wait, QUEUED_POLL_SECONDS)
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(wait, 0), return_when=asyncio.FIRST_COMPLETED
+                )
+                short_circuit = False
+                for task in done:
+                    result = task.result()
+                    if result:
+                        results.append(result)
+                        # Short-circuit: if we get a 95+ confidence result, we're done
+                        if result.confidence_score >= 95:
+                            short_circuit = True
+                if short_circuit:
+                    return results
+            return results
+        finally:
+            for task in pending:
+                task.cancel()
+        
+    async def _asafe_query(
+        self,
+        source: DataSource,
+        context: LookupContext,
+        clock
+    ) -> Optional[SourceResult]:
+        """
+        Async version of _safe_query().
+        
+        Times the query with `clock` (an async_lookup.WorkClock), so time
+        spent waiting for a worker thread isn't reported as source latency.
+        """
+        from async_lookup import _work_clock
+        _work_clock.set(clock)
+        try:
+            with span('source.query', source=source.name) as s:
+                result = await source.aquery(context)
+                self._annotate_span(s, result)
+            if result:
+                result.query_time_ms = int(clock.elapsed() * 1000)
+            return result
+        except Exception as e:
+            return SourceResult(
+                source_name=source.name,
+                utility_name=None,
+                confidence_score=0,
+                match_type='none',
+                error=str(e),
+                query_time_ms=int(clock.elapsed() * 1000)
+            )
+        finally:
+            # Also runs when the 3s budget cancels the task, so slow
+            # sources show up in the histogram at their cut-off time
+            self._track_latency(source, context, time.time() - clock.elapsed())
+    
     def _safe_query(
         self, 
         source: DataSource, 
@@ -257,7 +450,9 @@ class LookupPipeline:
         """Query a source with error handling and timing."""
         start = time.time()
         try:
-            result = source.query(context)
+            with span('source.query', source=source.name) as s:
+                result = source.query(context)
+                self._annotate_span(s, result)
             if result:
                 result.query_time_ms = int((time.time() - start) * 1000)
             return result
@@ -270,6 +465,23 @@ class LookupPipeline:
                 error=str(e),
                 query_time_ms=int((time.time() - start) * 1000)
             )
+        finally:
+            self._track_latency(source, context, start)
+    
+    @staticmethod
+    def _annotate_span(s, result: Optional[SourceResult]):
+        if result:
+            s.set_attribute('utility_name', result.utility_name)
+            s.set_attribute('confidence', result.confidence_score)
+    
+    def _track_latency(self, source: DataSource, context: LookupContext, start: float):
+        """Record the query time in the latency histogram and the adaptive budget."""
+        elapsed_ms = (time.time() - start) * 1000
+        get_adaptive_timeouts().observe(f"source:{source.name}", elapsed_ms)
+        try:
+            track_source_latency(context.utility_type.value, source.name, elapsed_ms)
+        except Exception:
+            pass
     
     def _cross_validate(self, results: List[SourceResult]) -> Dict:
         """
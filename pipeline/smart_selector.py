@@ -20,6 +20,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from .interfaces import SourceResult, PipelineResult, UtilityType, LookupContext
+from shared_cache import get_shared_cache
 
 
 def _load_openai_key():
@@ -55,6 +56,9 @@ def _load_openai_key():
 # Cache directory
 CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'smart_selector_cache')
 
+# How long a decision is reused; sources and corrections change under it
+SMART_SELECTOR_CACHE_TTL = int(os.getenv('SMART_SELECTOR_CACHE_TTL', str(7 * 24 * 3600)))
+
 
 @dataclass
 class SelectionResult:
@@ -103,6 +107,34 @@ class SmartSelector:
         with open(cache_file, 'w') as f:
             json.dump(self.cache, f, indent=2)
     
+    def _get_cached_decision(self, cache_key: str) -> Optional[Dict]:
+        """Unexpired decision from this process, else one made by another worker."""
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            if time.time() - cached.get('timestamp', 0) < SMART_SELECTOR_CACHE_TTL:
+                return cached
+            del self.cache[cache_key]
+        shared = get_shared_cache()
+        cached = shared.get('smart_selector', cache_key) if shared is not None else None
+        if cached is not None:
+            self.cache[cache_key] = cached
+        return cached
+    
+    def _store_decision(self, cache_key: str, decision: Dict):
+        """
+        Remember a decision for every worker.
+        
+        With a shared cache each decision is a single keyed write; the
+        whole-file rewrite is only the single-process fallback, since
+        workers rewriting decisions.json drop each other's entries.
+        """
+        self.cache[cache_key] = decision
+        shared = get_shared_cache()
+        if shared is not None:
+            shared.set('smart_selector', cache_key, decision, ttl=SMART_SELECTOR_CACHE_TTL)
+        else:
+            self._save_cache()
+    
     def _get_cache_key(self, zip_code: str, utility_type: str, source_names: List[str]) -> str:
         """Generate cache key for a decision."""
         # Use ZIP prefix + utility type + sorted source names
@@ -174,8 +206,8 @@ class SmartSelector:
             context.utility_type.value,
             [r.source_name for r in valid_results]
         )
-        if cache_key in self.cache:
-            cached = self.cache[cache_key]
+        cached = self._get_cached_decision(cache_key)
+        if cached is not None:
             # Verify cached utility is still in results
             for r in valid_results:
                 if self._normalize_name(r.utility_name) == self._normalize_name(cached.get('utility_name', '')):
@@ -194,7 +226,7 @@ class SmartSelector:
         result = self._llm_select(context, valid_results)
         
         # Cache the decision
-        self.cache[cache_key] = {
+        self._store_decision(cache_key, {
             'utility_name': result.utility_name,
             'confidence': result.confidence,
             'confidence_level': result.confidence_level,
@@ -202,8 +234,7 @@ class SmartSelector:
             'dissenting_sources': result.dissenting_sources,
             'reasoning': result.reasoning,
             'timestamp': time.time()
-        }
-        self._save_cache()
+        })
         
         return result
     
@@ -342,9 +373,9 @@ Respond in JSON format ONLY:
 {{"selected_utility": "exact utility name", "selected_source": "source_name", "confidence": 0.XX, "sources_agree": false, "dissenting_sources": ["sources", "that", "disagree"], "reasoning": "Your step-by-step reasoning explaining WHY this utility serves this address"}}"""
 
         try:
-            import requests
+            import http_client
             
-            response = requests.post(
+            response = http_client.post(
                 "https://api.openai.com/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {self.api_key}",
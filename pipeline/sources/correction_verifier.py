@@ -7,7 +7,7 @@ Uses the existing serp_verification.py module for BrightData Google searches.
 
 import os
 import sys
-import requests
+import http_client
 from typing import Dict, Optional
 from dataclasses import dataclass
 
@@ -144,7 +144,7 @@ def verify_and_update_correction(record_id: str) -> VerificationResult:
         raise ValueError("Airtable credentials not configured")
     
     # Fetch the record
-    response = requests.get(
+    response = http_client.get(
         f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{CORRECTIONS_TABLE}/{record_id}",
         headers={'Authorization': f'Bearer {AIRTABLE_API_KEY}'},
         timeout=10
@@ -174,7 +174,7 @@ def verify_and_update_correction(record_id: str) -> VerificationResult:
         }
     }
     
-    update_response = requests.patch(
+    update_response = http_client.patch(
         f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{CORRECTIONS_TABLE}/{record_id}",
         headers={
             'Authorization': f'Bearer {AIRTABLE_API_KEY}',
@@ -201,7 +201,7 @@ def verify_all_unverified_corrections() -> Dict[str, VerificationResult]:
         raise ValueError("Airtable credentials not configured")
     
     # Fetch unverified records
-    response = requests.get(
+    response = http_client.get(
         f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{CORRECTIONS_TABLE}",
         headers={'Authorization': f'Bearer {AIRTABLE_API_KEY}'},
         params={
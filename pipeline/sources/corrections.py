@@ -5,16 +5,19 @@ Works for ALL utility types (electric, gas, water, internet).
 Ground truth from actual tenants/residents.
 
 Sources:
-1. Airtable utility_corrections table (primary - synced from user feedback)
+1. Airtable utility_corrections table (primary - synced from user feedback,
+   read from the in-memory mirror in corrections_mirror.py)
 2. Local verified_addresses.json (fallback)
 """
 
 import json
-import os
-import requests
+import re
 from typing import List, Optional
 from pathlib import Path
 
+from pipeline.ai_selector import invalidate_ai_decisions
+from result_store import invalidate_results
+from pipeline.sources.corrections_mirror import get_corrections_mirror
 from pipeline.interfaces import (
     DataSource,
     UtilityType,
@@ -23,11 +26,6 @@ from pipeline.interfaces import (
     SOURCE_CONFIDENCE,
 )
 
-# Airtable configuration
-AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
-AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
-CORRECTIONS_TABLE = 'utility_corrections'
-
 
 class UserCorrectionSource(DataSource):
     """
@@ -120,40 +118,13 @@ class UserCorrectionSource(DataSource):
         return None
     
     def _query_airtable(self, zip_code: str, city: str, state: str, utility_type: str) -> Optional[SourceResult]:
-        """Query Airtable utility_corrections table for matching corrections."""
-        if not AIRTABLE_API_KEY or not AIRTABLE_BASE_ID:
-            return None
-        
+        """Match Airtable utility_corrections records from the in-memory mirror."""
         if not zip_code:
             return None
         
         try:
-            # Query by ZIP code and utility type
-            filter_formula = f"AND({{zip_code}} = '{zip_code}', {{utility_type}} = '{utility_type}')"
-            
-            response = requests.get(
-                f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{CORRECTIONS_TABLE}",
-                headers={'Authorization': f'Bearer {AIRTABLE_API_KEY}'},
-                params={'filterByFormula': filter_formula, 'maxRecords': 5},
-                timeout=5
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            records = response.json().get('records', [])
-            
-            if not records:
-                # Try city-level match if no ZIP match
-                filter_formula = f"AND({{city}} = '{city}', {{state}} = '{state}', {{utility_type}} = '{utility_type}')"
-                response = requests.get(
-                    f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{CORRECTIONS_TABLE}",
-                    headers={'Authorization': f'Bearer {AIRTABLE_API_KEY}'},
-                    params={'filterByFormula': filter_formula, 'maxRecords': 5},
-                    timeout=5
-                )
-                if response.status_code == 200:
-                    records = response.json().get('records', [])
+            # ZIP matches, falling back to city/state (synced in the background)
+            records = get_corrections_mirror().lookup(zip_code, city, state, utility_type)
             
             if not records:
                 return None
@@ -162,15 +133,15 @@ class UserCorrectionSource(DataSource):
             # Sort: verified first, then serp_verified, then by confidence_override
             sorted_records = sorted(
                 records,
-                key=lambda r: (
-                    r.get('fields', {}).get('verified', False),
-                    r.get('fields', {}).get('serp_verified', False),
-                    r.get('fields', {}).get('confidence_override', 0)
+                key=lambda fields: (
+                    fields.get('verified', False),
+                    fields.get('serp_verified', False),
+                    fields.get('confidence_override', 0)
                 ),
                 reverse=True
             )
             
-            fields = sorted_records[0].get('fields', {})
+            fields = sorted_records[0]
             correct_provider = fields.get('correct_provider')
             
             if not correct_provider:
@@ -209,7 +180,7 @@ class UserCorrectionSource(DataSource):
             )
             
         except Exception as e:
-            print(f"Airtable correction query error: {e}")
+            print(f"Airtable correction lookup error: {e}")
             return None
     
     def _load_corrections(self) -> dict:
@@ -328,6 +299,12 @@ class UserCorrectionSource(DataSource):
             # Clear cache
             cls.clear_cache()
             
+            # AI selector decisions and stored results for this ZIP region may now be wrong
+            location = re.search(r'\b([A-Z]{2})\s+(\d{5})\b', address_key)
+            if location:
+                invalidate_ai_decisions(utility_type, location.group(1), location.group(2))
+                invalidate_results(utility_type, location.group(1), location.group(2))
+            
             return True
             
         except Exception as e:
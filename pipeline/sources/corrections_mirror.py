@@ -0,0 +1,283 @@
+"""
+In-memory mirror of the Airtable utility_corrections table.
+
+UserCorrectionSource used to query Airtable on every lookup, once per
+utility type (and a second time for the city fallback) - ~300 ms and
+rate-limit exposure several times per request. Instead, a background
+thread in each worker pulls the table into memory and lookups read the
+ZIP and city indexes.
+
+Sync:
+- Incremental every CORRECTIONS_SYNC_INTERVAL seconds: only records
+  modified since the previous sync (LAST_MODIFIED_TIME() filter)
+- Full every CORRECTIONS_FULL_SYNC_SECONDS: the whole table, which also
+  drops records deleted in Airtable
+- On demand: refresh() (manual endpoint) or request_sync() (Airtable
+  webhook ping - wakes the background thread and returns immediately)
+
+Usage:
+    from pipeline.sources.corrections_mirror import get_corrections_mirror
+    
+    mirror = get_corrections_mirror()
+    records = mirror.lookup('75201', 'Dallas', 'TX', 'electric')
+    mirror.refresh(full=True)
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import http_client
+from pipeline.ai_selector import invalidate_ai_decisions
+from result_store import invalidate_results
+
+AIRTABLE_API_KEY = os.getenv('AIRTABLE_API_KEY')
+AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
+CORRECTIONS_TABLE = 'utility_corrections'
+
+CORRECTIONS_SYNC_INTERVAL = float(os.getenv('CORRECTIONS_SYNC_INTERVAL', '60'))
+CORRECTIONS_FULL_SYNC_SECONDS = float(os.getenv('CORRECTIONS_FULL_SYNC_SECONDS', '3600'))
+
+# Incremental syncs look back this much further than the last sync started,
+# to cover clock skew between us and Airtable
+CORRECTIONS_SYNC_OVERLAP = float(os.getenv('CORRECTIONS_SYNC_OVERLAP', '120'))
+
+# How long a lookup waits for the first sync after a worker starts
+CORRECTIONS_MIRROR_WAIT = float(os.getenv('CORRECTIONS_MIRROR_WAIT', '5'))
+
+# Matches per lookup (the live query used maxRecords=5)
+CORRECTIONS_MATCH_LIMIT = 5
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+
+def _zip_key(fields: Dict) -> Optional[Tuple[str, str]]:
+    zip_code = fields.get('zip_code')
+    utility_type = fields.get('utility_type')
+    if not zip_code or not utility_type:
+        return None
+    return (str(zip_code).strip(), utility_type)
+
+
+def _city_key(fields: Dict) -> Optional[Tuple[str, str, str]]:
+    city = fields.get('city')
+    state = fields.get('state')
+    utility_type = fields.get('utility_type')
+    if not city or not state or not utility_type:
+        return None
+    return (city, state, utility_type)
+
+
+class CorrectionsMirror:
+    """Airtable corrections held in memory and indexed by ZIP and city."""
+    
+    def __init__(self, api_key: Optional[str] = AIRTABLE_API_KEY, base_id: Optional[str] = AIRTABLE_BASE_ID):
+        """
+        Args:
+            api_key: Airtable API key
+            base_id: Airtable base holding the utility_corrections table
+        """
+        self.api_key = api_key
+        self.base_id = base_id
+        
+        # record id -> Airtable record ({'id', 'createdTime', 'fields'})
+        self._records: Dict[str, Dict] = {}
+        self._by_zip: Dict[Tuple, List[Dict]] = {}
+        self._by_city: Dict[Tuple, List[Dict]] = {}
+        
+        self._loaded = threading.Event()
+        # Set after the first sync attempt, even a failed one, so lookups
+        # only ever wait once while Airtable is unreachable
+        self._attempted = threading.Event()
+        self._wake = threading.Event()
+        self._sync_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread_pid: Optional[int] = None
+        self._full_requested = False
+        
+        self._last_sync_start: Optional[float] = None
+        self._last_full_sync = 0.0
+        self._last_sync: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._syncs = 0
+    
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key and self.base_id)
+    
+    def lookup(self, zip_code: str, city: str, state: str, utility_type: str) -> List[Dict]:
+        """
+        Corrections for a location: ZIP matches, else city/state matches.
+        
+        Returns:
+            Up to CORRECTIONS_MATCH_LIMIT records' fields (oldest first);
+            empty if Airtable isn't configured or nothing matches
+        """
+        if not self.configured:
+            return []
+        self._ensure_started()
+        if not self._attempted.is_set():
+            # Cold worker - give the first sync a moment rather than miss corrections
+            self._attempted.wait(CORRECTIONS_MIRROR_WAIT)
+        
+        records = self._by_zip.get((str(zip_code or '').strip(), utility_type))
+        if not records and city and state:
+            records = self._by_city.get((city, state, utility_type))
+        return [r.get('fields', {}) for r in (records or [])[:CORRECTIONS_MATCH_LIMIT]]
+    
+    def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """Sync now in the calling thread and return stats()."""
+        self.sync(full=full)
+        return self.stats()
+    
+    def request_sync(self, full: bool = False) -> None:
+        """Ask the background thread to sync as soon as possible."""
+        if full:
+            self._full_requested = True
+        self._ensure_started()
+        self._wake.set()
+    
+    def sync(self, full: bool = False) -> int:
+        """
+        Pull new and modified records from Airtable and rebuild the indexes.
+        
+        Args:
+            full: Fetch the whole table (also forgets deleted records)
+        
+        Returns:
+            Number of records fetched
+        """
+        if not self.configured:
+            return 0
+        
+        with self._sync_lock:
+            started = time.time()
+            full = full or self._last_sync_start is None
+            since = None if full else self._last_sync_start - CORRECTIONS_SYNC_OVERLAP
+            try:
+                fetched = self._fetch(since)
+            except Exception as e:
+                self._last_error = str(e)
+                self._attempted.set()
+                raise
+            
+            previous = self._records
+            records = {} if full else dict(previous)
+            for record in fetched:
+                records[record['id']] = record
+            
+            by_zip: Dict[Tuple, List[Dict]] = {}
+            by_city: Dict[Tuple, List[Dict]] = {}
+            for record in sorted(records.values(), key=lambda r: r.get('createdTime', '')):
+                fields = record.get('fields', {})
+                key = _zip_key(fields)
+                if key:
+                    by_zip.setdefault(key, []).append(record)
+                key = _city_key(fields)
+                if key:
+                    by_city.setdefault(key, []).append(record)
+            
+            # Swap in whole dicts - lookups read them without locking
+            self._records, self._by_zip, self._by_city = records, by_zip, by_city
+            
+            if self._loaded.is_set():
+                self._invalidate_changed(previous, records)
+            self._loaded.set()
+            self._attempted.set()
+            self._last_sync_start = started
+            self._last_sync = time.time()
+            if full:
+                self._last_full_sync = started
+            self._last_error = None
+            self._syncs += 1
+            return len(fetched)
+    
+    def _fetch(self, since: Optional[float]) -> List[Dict]:
+        """All records (or those modified after `since`), following pagination."""
+        params = {'pageSize': 100}
+        if since is not None:
+            cutoff = datetime.fromtimestamp(since, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            params['filterByFormula'] = f"IS_AFTER(LAST_MODIFIED_TIME(), '{cutoff}')"
+        
+        records = []
+        while True:
+            response = http_client.get(
+                f"https://api.airtable.com/v0/{self.base_id}/{CORRECTIONS_TABLE}",
+                headers={'Authorization': f'Bearer {self.api_key}'},
+                params=params,
+                timeout=10
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"Airtable corrections sync failed: HTTP {response.status_code}")
+            data = response.json()
+            records.extend(data.get('records', []))
+            if not data.get('offset'):
+                return records
+            params['offset'] = data['offset']
+    
+    def _invalidate_changed(self, previous: Dict[str, Dict], current: Dict[str, Dict]) -> None:
+        """Drop cached AI selector decisions and stored results wherever a correction changed."""
+        changed = []
+        for record_id in set(previous) | set(current):
+            before = previous.get(record_id, {}).get('fields')
+            after = current.get(record_id, {}).get('fields')
+            if before != after:
+                changed.extend(f for f in (before, after) if f)
+        for fields in changed:
+            if fields.get('utility_type') and fields.get('state'):
+                invalidate_ai_decisions(fields['utility_type'], fields['state'], fields.get('zip_code'))
+                invalidate_results(fields['utility_type'], fields['state'], fields.get('zip_code'))
+    
+    def _ensure_started(self) -> None:
+        """Start the sync thread in this process (again after a fork)."""
+        pid = os.getpid()
+        if self._thread_pid == pid:
+            return
+        with self._start_lock:
+            if self._thread_pid == pid:
+                return
+            thread = threading.Thread(
+                target=self._run,
+                name='corrections-mirror',
+                daemon=True
+            )
+            thread.start()
+            self._thread_pid = pid
+    
+    def _run(self) -> None:
+        while True:
+            full = self._full_requested or time.time() - self._last_full_sync >= CORRECTIONS_FULL_SYNC_SECONDS
+            self._full_requested = False
+            try:
+                count = self.sync(full=full)
+                if full:
+                    print(f"[corrections-mirror] full sync: {count} records")
+            except Exception as e:
+                print(f"[corrections-mirror] sync error: {e}")
+            self._wake.wait(CORRECTIONS_SYNC_INTERVAL)
+            self._wake.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'configured': self.configured,
+            'loaded': self._loaded.is_set(),
+            'records': len(self._records),
+            'zip_keys': len(self._by_zip),
+            'city_keys': len(self._by_city),
+            'syncs': self._syncs,
+            'last_sync_age_s': round(time.time() - self._last_sync, 1) if self._last_sync else None,
+            'last_error': self._last_error,
+        }
+
+
+def get_corrections_mirror() -> CorrectionsMirror:
+    """Get the process-wide CorrectionsMirror."""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = CorrectionsMirror()
+    return _mirror
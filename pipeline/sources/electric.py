@@ -72,6 +72,11 @@ class StateGISElectricSource(DataSource):
                 match_type='none',
                 error=str(e)
             )
+    
+    async def aquery(self, context: LookupContext) -> Optional[SourceResult]:
+        # State electric GIS queries are fetched on the shared async session
+        from async_lookup import run_with_arcgis_prefetch
+        return await run_with_arcgis_prefetch(self.query, context)
 
 
 class MunicipalElectricSource(DataSource):
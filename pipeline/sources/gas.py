@@ -201,6 +201,11 @@ class StateGISGasSource(DataSource):
                 match_type='none',
                 error=str(e)
             )
+    
+    async def aquery(self, context: LookupContext) -> Optional[SourceResult]:
+        # lookup_gas_utility_gis goes through _query_arcgis_point, so it can be prefetched
+        from async_lookup import run_with_arcgis_prefetch
+        return await run_with_arcgis_prefetch(self.query, context)
 
 
 class MunicipalGasSource(DataSource):
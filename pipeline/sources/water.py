@@ -15,6 +15,7 @@ import json
 from typing import List, Optional
 from pathlib import Path
 
+from circuit_breaker import get_breaker
 from pipeline.interfaces import (
     DataSource,
     UtilityType,
@@ -239,6 +240,11 @@ class StateGISWaterSource(DataSource):
                 match_type='none',
                 error=str(e)
             )
+    
+    async def aquery(self, context: LookupContext) -> Optional[SourceResult]:
+        # Water GIS layers are queried without tying up a thread per request
+        from async_lookup import run_with_arcgis_prefetch
+        return await run_with_arcgis_prefetch(self.query, context)
 
 
 class SpecialDistrictWaterSource(DataSource):
@@ -583,7 +589,8 @@ class TexasMUDSupplementalSource(DataSource):
             import openai
             client = openai.OpenAI(api_key=api_key)
             
-            response = client.chat.completions.create(
+            response = get_breaker('openai').call(
+                client.chat.completions.create,
                 model="gpt-4o-mini",
                 messages=[
                     {
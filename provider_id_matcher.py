@@ -10,6 +10,8 @@ import os
 import re
 from typing import Optional, Dict, Tuple
 
+from reference_snapshot import load_reference
+
 # Cache for loaded data
 _providers_cache = None
 _mappings_cache = None
@@ -179,8 +181,8 @@ def load_mappings() -> Dict[str, Dict]:
         return _mappings_cache
     
     if os.path.exists(MAPPINGS_FILE):
-        with open(MAPPINGS_FILE, 'r') as f:
-            _mappings_cache = json.load(f)
+        # Snapshot view (entries decoded on first use) or the parsed JSON
+        _mappings_cache = load_reference('provider_name_mappings', MAPPINGS_FILE)
         print(f"[ProviderMatcher] Loaded {len(_mappings_cache)} OpenAI mappings")
     else:
         _mappings_cache = {}
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Compact snapshot of the large data/*.json reference tables.
+
+Every gunicorn worker used to json.load municipal_utilities.json,
+remaining_states_*.json, geographic_boundary_analysis_*.json and
+provider_name_mappings.json into its own heap (~15 MB of JSON, several
+times that as Python objects) even though a lookup touches a handful of
+keys. scripts/build_reference_snapshot.py compiles them into one SQLite
+file, split into rows by key path (zlib-compressed JSON values):
+
+    remaining_states_gas.json   {"states": {"TX": {"75201": {...}}}}
+    row path                    states / TX / 75201  ->  {...}
+
+Workers open the file read-only and memory-mapped, so its pages live in
+the OS page cache shared by all processes, and only decode the rows they
+actually read. load_reference() returns a read-only Mapping that behaves
+like the parsed JSON for get/[]/in/iteration.
+
+A table whose source JSON changed since the snapshot was built (size or
+SHA-1 differs) is ignored and the JSON is loaded as before, so a stale
+snapshot never serves stale data.
+
+Usage:
+    from reference_snapshot import load_reference
+    
+    data = load_reference('remaining_states_gas', REMAINING_STATES_GAS_FILE)
+    data.get('states', {}).get('TX', {}).get('75201')
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from collections.abc import Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+SNAPSHOT_PATH = Path(os.getenv(
+    'REFERENCE_SNAPSHOT_PATH',
+    DATA_DIR / 'reference_snapshot.db'
+))
+
+# Set to 0 to always load the JSON files
+REFERENCE_SNAPSHOT_ENABLED = os.getenv('REFERENCE_SNAPSHOT_ENABLED', '1') == '1'
+
+# Memory-map up to this many bytes of the snapshot (shared page cache)
+SNAPSHOT_MMAP_BYTES = int(os.getenv('SNAPSHOT_MMAP_BYTES', str(256 * 1024 * 1024)))
+
+# Tables in the snapshot (name = data/<name>.json):
+#   depth: nested object levels that become row keys
+#   list_index: (list key, item field) - store a top-level list as rows
+#               keyed by that field, each row the list of items with it
+SNAPSHOT_SOURCES: Dict[str, Dict[str, Any]] = {
+    'municipal_utilities': {'depth': 2},
+    'remaining_states_electric': {'depth': 3},
+    'remaining_states_gas': {'depth': 3},
+    'remaining_states_water': {'depth': 3},
+    'provider_name_mappings': {'depth': 1},
+    'geographic_boundary_analysis_electric': {'depth': 1, 'list_index': ('zip_analyses', 'zip_code')},
+    'geographic_boundary_analysis_gas': {'depth': 1, 'list_index': ('zip_analyses', 'zip_code')},
+    'geographic_boundary_analysis_water': {'depth': 1, 'list_index': ('zip_analyses', 'zip_code')},
+}
+
+# Separates key path segments in the rows.path column
+PATH_SEPARATOR = '\x1f'
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def _file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _split_rows(value: Any, path: Tuple[str, ...], depth: int,
+                list_index: Optional[Tuple[str, str]]) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    """(key path, value) rows for one parsed JSON document."""
+    if list_index and path == (list_index[0],) and isinstance(value, list):
+        groups: Dict[str, List] = {}
+        for item in value:
+            key = item.get(list_index[1]) if isinstance(item, dict) else None
+            groups.setdefault(str(key), []).append(item)
+        for key, items in groups.items():
+            yield path + (key,), items
+    elif len(path) < depth and isinstance(value, dict) and value:
+        for key, child in value.items():
+            yield from _split_rows(child, path + (str(key),), depth, list_index)
+    else:
+        yield path, value
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+
+def _decode(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def build_snapshot(
+    output: Path = SNAPSHOT_PATH,
+    sources: Dict[str, Dict[str, Any]] = SNAPSHOT_SOURCES,
+    data_dir: Path = DATA_DIR
+) -> Dict[str, int]:
+    """
+    Compile the source JSON files into a snapshot.
+    
+    Written to a temporary file and renamed into place, so running workers
+    keep reading the old snapshot until they reopen.
+    
+    Args:
+        output: Snapshot file
+        sources: Table specs (see SNAPSHOT_SOURCES)
+        data_dir: Directory holding <name>.json
+    
+    Returns:
+        Rows written per table (missing source files are skipped)
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+    
+    counts = {}
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript('''
+            PRAGMA page_size = 4096;
+            CREATE TABLE sources (
+                name TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                sha1 TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                built_at TEXT NOT NULL
+            );
+            CREATE TABLE rows (
+                name TEXT NOT NULL,
+                path TEXT NOT NULL,
+                pos INTEGER NOT NULL,
+                value BLOB NOT NULL,
+                PRIMARY KEY (name, path)
+            ) WITHOUT ROWID;
+        ''')
+        for name, spec in sources.items():
+            source = Path(data_dir) / f'{name}.json'
+            if not source.exists():
+                continue
+            with open(source, 'r') as f:
+                document = json.load(f)
+            rows = (
+                (name, PATH_SEPARATOR.join(path), pos, _encode(value))
+                for pos, (path, value) in enumerate(
+                    _split_rows(document, (), spec.get('depth', 1), spec.get('list_index'))
+                )
+            )
+            cursor = conn.executemany('INSERT INTO rows VALUES (?, ?, ?, ?)', rows)
+            counts[name] = cursor.rowcount
+            conn.execute(
+                'INSERT INTO sources VALUES (?, ?, ?, ?, ?)',
+                (name, source.stat().st_size, _file_sha1(source), counts[name], datetime.now().isoformat())
+            )
+        conn.commit()
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+    os.replace(tmp_path, output)
+    return counts
+
+
+class SnapshotNode(Mapping):
+    """
+    Read-only view of one object in a snapshot table.
+    
+    Child objects that were split into rows are SnapshotNodes themselves;
+    everything else is decoded from its row on first access and kept.
+    """
+    
+    __slots__ = ('_snapshot', '_name', '_prefix', '_children', '_keys')
+    
+    def __init__(self, snapshot: 'ReferenceSnapshot', name: str, prefix: str = ''):
+        self._snapshot = snapshot
+        self._name = name
+        self._prefix = prefix
+        self._children: Dict[str, Any] = {}
+        self._keys: Optional[List[str]] = None
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._children[key]
+        except KeyError:
+            pass
+        if not isinstance(key, str):
+            raise KeyError(key)
+        path = self._prefix + key
+        value = self._snapshot._row(self._name, path)
+        if value is None:
+            if not self._snapshot._has_prefix(self._name, path + PATH_SEPARATOR):
+                raise KeyError(key)
+            child = SnapshotNode(self._snapshot, self._name, path + PATH_SEPARATOR)
+        else:
+            child = _decode(value)
+        self._children[key] = child
+        return child
+    
+    def _key_list(self) -> List[str]:
+        if self._keys is None:
+            keys = {}
+            for path, pos in self._snapshot._paths(self._name, self._prefix):
+                key = path[len(self._prefix):].split(PATH_SEPARATOR, 1)[0]
+                if key not in keys or pos < keys[key]:
+                    keys[key] = pos
+            self._keys = sorted(keys, key=keys.get)
+        return self._keys
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._key_list())
+    
+    def __len__(self) -> int:
+        return len(self._key_list())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """The whole subtree as ordinary dicts (e.g. for a JSON response)."""
+        return {key: to_plain(value) for key, value in self.items()}
+    
+    def __repr__(self) -> str:
+        return f"<SnapshotNode {self._name}:{self._prefix.replace(PATH_SEPARATOR, '/')}>"
+
+
+def to_plain(value: Any) -> Any:
+    """value with any snapshot views materialized as dicts."""
+    return value.to_dict() if isinstance(value, SnapshotNode) else value
+
+
+class ReferenceSnapshot:
+    """A snapshot file opened read-only, one connection per thread."""
+    
+    def __init__(self, path: Path = SNAPSHOT_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._sources: Optional[Dict[str, Tuple[int, str]]] = None
+    
+    def _conn(self) -> sqlite3.Connection:
+        local = self._local
+        # Connections must not cross a fork (gunicorn preload)
+        if getattr(local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+            conn.execute(f'PRAGMA mmap_size = {SNAPSHOT_MMAP_BYTES}')
+            local.conn, local.pid = conn, os.getpid()
+        return local.conn
+    
+    def _row(self, name: str, path: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            'SELECT value FROM rows WHERE name = ? AND path = ?', (name, path)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def _has_prefix(self, name: str, prefix: str) -> bool:
+        return self._conn().execute(
+            'SELECT 1 FROM rows WHERE name = ? AND path > ? AND path < ? LIMIT 1',
+            (name, prefix, prefix + '\U0010ffff')
+        ).fetchone() is not None
+    
+    def _paths(self, name: str, prefix: str) -> List[Tuple[str, int]]:
+        if not prefix:
+            return self._conn().execute('SELECT path, pos FROM rows WHERE name = ?', (name,)).fetchall()
+        return self._conn().execute(
+            'SELECT path, pos FROM rows WHERE name = ? AND path > ? AND path < ?',
+            (name, prefix, prefix + '\U0010ffff')
+        ).fetchall()
+    
+    def sources(self) -> Dict[str, Tuple[int, str]]:
+        """name -> (source size, source SHA-1) for every table."""
+        if self._sources is None:
+            self._sources = {
+                name: (size, sha1)
+                for name, size, sha1 in self._conn().execute('SELECT name, size, sha1 FROM sources')
+            }
+        return self._sources
+    
+    def table(self, name: str, source_path: Optional[str] = None) -> Optional[SnapshotNode]:
+        """
+        Root view of a table, or None if it isn't in the snapshot or the
+        source file at source_path has changed since the build.
+        """
+        built = self.sources().get(name)
+        if built is None:
+            return None
+        if source_path and os.path.exists(source_path):
+            size, sha1 = built
+            if os.path.getsize(source_path) != size or _file_sha1(Path(source_path)) != sha1:
+                print(f"[reference-snapshot] {name} is stale - loading JSON (rebuild the snapshot)")
+                return None
+        return SnapshotNode(self, name)
+
+
+def get_snapshot() -> Optional[ReferenceSnapshot]:
+    """Get the process-wide snapshot, or None if there isn't one."""
+    global _snapshot
+    if not REFERENCE_SNAPSHOT_ENABLED or not SNAPSHOT_PATH.exists():
+        return None
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = ReferenceSnapshot(SNAPSHOT_PATH)
+    return _snapshot
+
+
+def load_reference(name: str, source_path: str, default: Any = None) -> Any:
+    """
+    A reference table from the snapshot, else parsed from its JSON file.
+    
+    Args:
+        name: Table name (SNAPSHOT_SOURCES key)
+        source_path: The JSON file it was built from
+        default: Returned when neither exists (default: {})
+    
+    Returns:
+        SnapshotNode (read-only Mapping) or the parsed JSON
+    """
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        try:
+            table = snapshot.table(name, source_path)
+        except sqlite3.Error as e:
+            print(f"[reference-snapshot] unreadable ({e}) - loading JSON")
+            table = None
+        if table is not None:
+            return table
+    
+    if os.path.exists(source_path):
+        with open(source_path, 'r') as f:
+            return json.load(f)
+    return {} if default is None else default
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Durable store of batch lookup results, keyed by normalized address.
+
+Property managers resubmit the same portfolios every month, but the batch
+endpoint's caches only last an hour (api._address_cache, shared_cache)
+and address_cache.py only holds user-confirmed mappings. This store keeps
+every successful batch result with its provenance:
+
+    sources        where each utility's answer came from (_source)
+    confidence     each utility's confidence
+    data_versions  versions of the reference files behind the selected
+                   utility types (SHA-1 of data/*.json, size/mtime for
+                   large binaries) plus LOOKUP_VERSION
+
+A stored result is served only while the versions of its reference
+files still match the files on disk and it is younger than
+RESULT_STORE_MAX_AGE_DAYS (GIS layers and AI selection aren't covered by
+file hashes). User corrections live in databases and Airtable rather
+than versioned files, so wherever a correction lands
+invalidate_results() marks the entries for its ZIP (or state) and
+utility type stale. refresh_stale() recomputes just the entries that fail
+those checks - a new remaining_states_gas.json refreshes entries that
+include gas and leaves electric-only ones alone.
+
+SQLite in WAL mode (like shared_cache.SQLiteCache), one connection per
+thread, so every gunicorn worker on the host shares it.
+
+Usage:
+    from result_store import get_result_store, provenance
+    
+    store = get_result_store()
+    response = store.get(address, 'electric,gas,water')   # None if missing or stale
+    store.put(address, 'electric,gas,water', response, provenance(result, selected))
+    
+    # Nightly (scripts/refresh_result_store.py)
+    store.refresh_stale(compute)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from address_normalization import address_cache_key
+
+BASE_DIR = Path(__file__).parent
+DATA_DIR = BASE_DIR / 'data'
+
+RESULT_STORE_PATH = Path(os.getenv('RESULT_STORE_PATH', DATA_DIR / 'result_store.db'))
+
+# Set to 0 to stop serving and recording stored results
+RESULT_STORE_ENABLED = os.getenv('RESULT_STORE_ENABLED', '1') == '1'
+
+# Entries older than this are recomputed even if no reference file changed
+RESULT_STORE_MAX_AGE_DAYS = int(os.getenv('RESULT_STORE_MAX_AGE_DAYS', '90'))
+
+# Bump to recompute every entry after a change to the lookup logic itself
+LOOKUP_VERSION = os.getenv('RESULT_STORE_LOOKUP_VERSION', '1')
+
+# Current file versions are re-checked (stat, hash if changed) this often
+VERSION_CHECK_SECONDS = int(os.getenv('RESULT_STORE_VERSION_CHECK_SECONDS', '60'))
+
+# Files larger than this are versioned by size and mtime instead of SHA-1
+HASH_MAX_BYTES = 64 * 1024 * 1024
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('RESULT_STORE_SQLITE_BUSY_MS', '2000'))
+
+# Reference files behind each utility type (relative to the repo root;
+# missing files are simply left out of the versions)
+REFERENCE_FILES: Dict[str, List[str]] = {
+    'electric': [
+        'data/remaining_states_electric.json',
+        'data/geographic_boundary_analysis_electric.json',
+        'data/electric_zip_corrections.json',
+        'data/electric_cooperatives_supplemental.json',
+        'data/georgia_emcs.json',
+        'data/texas_territories.json',
+        'data/deregulated_markets.json',
+        'data/municipal_utilities.json',
+        'data/verified_provider_rules.json',
+        'data/sub_zip_provider_rules_50k.json',
+        'data/provider_name_mappings.json',
+        'data/zip_answers.db',
+        'data/tenant_hard_overrides.json',
+        'data/tenant_ai_context.json',
+        'data/verified_addresses.json',
+    ],
+    'gas': [
+        'data/remaining_states_gas.json',
+        'data/geographic_boundary_analysis_gas.json',
+        'data/gas_zip_corrections.json',
+        'data/gas_county_lookups.json',
+        'data/official_gas_utilities.json',
+        'data/municipal_utilities.json',
+        'data/verified_provider_rules.json',
+        'data/sub_zip_provider_rules_50k.json',
+        'data/provider_name_mappings.json',
+        'data/zip_answers.db',
+        'data/tenant_hard_overrides.json',
+        'data/tenant_ai_context.json',
+        'data/verified_addresses.json',
+    ],
+    'water': [
+        'data/remaining_states_water.json',
+        'data/geographic_boundary_analysis_water.json',
+        'data/water_zip_corrections.json',
+        'data/mud_supplemental.json',
+        'data/municipal_utilities.json',
+        'data/verified_provider_rules.json',
+        'data/sub_zip_provider_rules_50k.json',
+        'data/provider_name_mappings.json',
+        'data/zip_answers.db',
+        'data/tenant_hard_overrides.json',
+        'data/tenant_ai_context.json',
+        'data/verified_addresses.json',
+        'data/*_water_districts.json',
+    ],
+    'internet': [
+        'bdc_blocks.bin',
+        'bdc_internet_new.db',
+    ],
+    'trash': [],
+    'sewer': [],
+}
+
+_store = None
+_store_lock = threading.Lock()
+
+# path -> ((size, mtime_ns), version), so unchanged files are hashed once
+_file_versions: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_current_versions: Dict[str, Any] = {'checked_at': 0.0, 'versions': {}}
+_versions_lock = threading.Lock()
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(',', ':'), default=str).encode('utf-8'))
+
+
+def _decode(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def file_version(path: Path) -> Optional[str]:
+    """Content version of a reference file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _file_versions.get(str(path))
+    if cached and cached[0] == signature:
+        return cached[1]
+    
+    if stat.st_size > HASH_MAX_BYTES:
+        version = f"{stat.st_size}:{stat.st_mtime_ns // 1_000_000_000}"
+    else:
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        version = digest.hexdigest()[:16]
+    _file_versions[str(path)] = (signature, version)
+    return version
+
+
+def _reference_paths(utility_type: str) -> Iterable[Path]:
+    for pattern in REFERENCE_FILES.get(utility_type, []):
+        if '*' in pattern:
+            yield from sorted(BASE_DIR.glob(pattern))
+        else:
+            yield BASE_DIR / pattern
+
+
+def current_versions(utility_types: Iterable[str], refresh: bool = False) -> Dict[str, str]:
+    """
+    Versions of the reference files behind the given utility types.
+    
+    Args:
+        utility_types: e.g. ['electric', 'gas']
+        refresh: Re-check the files now instead of within VERSION_CHECK_SECONDS
+    
+    Returns:
+        {relative path: version, '_lookup': LOOKUP_VERSION}
+    """
+    with _versions_lock:
+        if refresh or time.time() - _current_versions['checked_at'] > VERSION_CHECK_SECONDS:
+            versions = {}
+            for utility_type in REFERENCE_FILES:
+                for path in _reference_paths(utility_type):
+                    version = file_version(path)
+                    if version:
+                        versions[str(path.relative_to(BASE_DIR))] = version
+            _current_versions.update(checked_at=time.time(), versions=versions)
+        all_versions = _current_versions['versions']
+    
+    wanted = {'_lookup': LOOKUP_VERSION}
+    for utility_type in utility_types:
+        for path in _reference_paths(utility_type):
+            name = str(path.relative_to(BASE_DIR))
+            if name in all_versions:
+                wanted[name] = all_versions[name]
+    return wanted
+
+
+def _primary(value: Any) -> Optional[Dict]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return value if isinstance(value, dict) else None
+
+
+def provenance(result: Dict, utility_types: Iterable[str]) -> Dict[str, Any]:
+    """
+    Provenance of a lookup_utilities_by_address result.
+    
+    Args:
+        result: The raw lookup result
+        utility_types: Types the lookup was asked for
+    
+    Returns:
+        {'sources': {type: source}, 'confidence': {type: confidence},
+         'data_versions': current_versions(utility_types)}
+    """
+    utility_types = list(utility_types)
+    sources, confidence = {}, {}
+    precomputed = (result.get('_metadata') or {}).get('precomputed_areas') or {}
+    for utility_type in utility_types:
+        value = _primary(result.get(utility_type))
+        if value is None:
+            if result.get(f'{utility_type}_no_service'):
+                sources[utility_type] = 'no_service'
+            continue
+        source = value.get('_source') or value.get('source')
+        if utility_type in precomputed:
+            source = f"precomputed:{precomputed[utility_type]}"
+        sources[utility_type] = source
+        confidence[utility_type] = value.get('_confidence', value.get('confidence'))
+    return {
+        'sources': sources,
+        'confidence': confidence,
+        'data_versions': current_versions(utility_types),
+    }
+
+
+class ResultStore:
+    """
+    Address-keyed result store in a local SQLite file.
+    
+    WAL mode lets every worker read while one writes; each thread keeps
+    its own connection since sqlite3 connections aren't thread-safe.
+    """
+    
+    def __init__(self, path: Path = RESULT_STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                address TEXT NOT NULL,
+                utilities TEXT NOT NULL,
+                response BLOB NOT NULL,
+                sources TEXT,
+                confidence TEXT,
+                data_versions TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                refreshed_at TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                state TEXT,
+                zip_code TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_results_zip ON results(zip_code)")
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: every statement is its own short transaction
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None,
+            )
+            conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    @staticmethod
+    def key(address: str, utilities_key: str) -> str:
+        return f"{address_cache_key(address)}|{utilities_key}"
+    
+    @staticmethod
+    def is_stale(data_versions: Dict[str, str], refreshed_at: str, utility_types: Iterable[str],
+                 max_age_days: int = RESULT_STORE_MAX_AGE_DAYS) -> bool:
+        """True if a reference file changed since the entry was computed, or it's too old."""
+        if datetime.now() - datetime.fromisoformat(refreshed_at) > timedelta(days=max_age_days):
+            return True
+        return data_versions != current_versions(utility_types)
+    
+    def get(self, address: str, utilities_key: str) -> Optional[Dict]:
+        """The stored response if present and still current, else None."""
+        row = self._connection().execute(
+            "SELECT response, data_versions, refreshed_at FROM results WHERE key = ?",
+            (self.key(address, utilities_key),)
+        ).fetchone()
+        if row is None:
+            return None
+        response, data_versions, refreshed_at = row
+        if self.is_stale(json.loads(data_versions), refreshed_at, utilities_key.split(',')):
+            return None
+        self._connection().execute(
+            "UPDATE results SET hits = hits + 1 WHERE key = ?", (self.key(address, utilities_key),)
+        )
+        return _decode(response)
+    
+    def put(self, address: str, utilities_key: str, response: Dict, provenance: Dict) -> None:
+        """Store (or replace) an address's response with its provenance."""
+        now = datetime.now().isoformat()
+        location = response.get('location') or {}
+        self._connection().execute("""
+            INSERT INTO results (key, address, utilities, response, sources, confidence,
+                                 data_versions, created_at, refreshed_at, state, zip_code)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                response = excluded.response,
+                sources = excluded.sources,
+                confidence = excluded.confidence,
+                data_versions = excluded.data_versions,
+                refreshed_at = excluded.refreshed_at,
+                state = excluded.state,
+                zip_code = excluded.zip_code
+        """, (
+            self.key(address, utilities_key), address, utilities_key, _encode(response),
+            json.dumps(provenance.get('sources') or {}, default=str),
+            json.dumps(provenance.get('confidence') or {}, default=str),
+            json.dumps(provenance.get('data_versions') or {}),
+            now, now, location.get('state'), (location.get('zip_code') or '')[:5] or None
+        ))
+    
+    def invalidate(self, utility_type: str, state: Optional[str] = None, zip_code: Optional[str] = None) -> int:
+        """
+        Mark the entries a correction may contradict as stale.
+        
+        They stop being served and refresh_stale() recomputes them.
+        
+        Args:
+            utility_type: Corrected utility type
+            state: State of the corrected address (the whole state's
+                   entries when no ZIP is known)
+            zip_code: ZIP of the corrected address
+        
+        Returns:
+            Entries invalidated
+        """
+        where = ["(',' || utilities || ',') LIKE ?"]
+        params = [f'%,{utility_type},%']
+        if zip_code:
+            where.append('zip_code = ?')
+            params.append(zip_code[:5])
+        elif state:
+            where.append('state = ?')
+            params.append(state.upper())
+        cursor = self._connection().execute(
+            f"UPDATE results SET data_versions = '{{}}' WHERE {' AND '.join(where)}", params
+        )
+        return cursor.rowcount
+    
+    def provenance(self, address: str, utilities_key: str) -> Optional[Dict]:
+        """Sources, confidence and data versions recorded for an address."""
+        row = self._connection().execute(
+            "SELECT sources, confidence, data_versions, created_at, refreshed_at, hits FROM results WHERE key = ?",
+            (self.key(address, utilities_key),)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'sources': json.loads(row[0] or '{}'),
+            'confidence': json.loads(row[1] or '{}'),
+            'data_versions': json.loads(row[2]),
+            'created_at': row[3],
+            'refreshed_at': row[4],
+            'hits': row[5],
+        }
+    
+    def refresh_stale(
+        self,
+        compute: Callable[[str, List[str]], Optional[Tuple[Dict, Dict]]],
+        limit: Optional[int] = None,
+        max_age_days: int = RESULT_STORE_MAX_AGE_DAYS
+    ) -> Dict[str, int]:
+        """
+        Recompute the entries whose reference data changed or that aged out.
+        
+        Args:
+            compute: compute(address, utility_types) -> (response, provenance),
+                     or None if the lookup failed (the old entry is kept)
+            limit: Recompute at most this many entries
+            max_age_days: Age beyond which an entry is recomputed regardless
+        
+        Returns:
+            Counts: checked, stale, refreshed, changed (response differs), failed
+        """
+        current_versions((), refresh=True)
+        counts = {'checked': 0, 'stale': 0, 'refreshed': 0, 'changed': 0, 'failed': 0}
+        rows = self._connection().execute(
+            "SELECT address, utilities, response, data_versions, refreshed_at FROM results"
+        ).fetchall()
+        for address, utilities_key, response, data_versions, refreshed_at in rows:
+            counts['checked'] += 1
+            utility_types = utilities_key.split(',')
+            if not self.is_stale(json.loads(data_versions), refreshed_at, utility_types, max_age_days):
+                continue
+            counts['stale'] += 1
+            if limit is not None and counts['refreshed'] + counts['failed'] >= limit:
+                continue
+            try:
+                computed = compute(address, utility_types)
+            except Exception as e:
+                print(f"[result-store] refresh failed for {address}: {e}")
+                computed = None
+            if not computed:
+                counts['failed'] += 1
+                continue
+            new_response, new_provenance = computed
+            self.put(address, utilities_key, new_response, new_provenance)
+            counts['refreshed'] += 1
+            if _decode(response).get('utilities') != new_response.get('utilities'):
+                counts['changed'] += 1
+        return counts
+    
+    def stats(self) -> Dict[str, Any]:
+        entries, hits = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM results"
+        ).fetchone()
+        return {'path': str(self.path), 'entries': entries, 'hits': hits}
+
+
+def invalidate_results(utility_type: str, state: Optional[str] = None, zip_code: Optional[str] = None) -> None:
+    """Stored results for the area may contradict a new correction (best effort)."""
+    store = get_result_store()
+    if store is None:
+        return
+    try:
+        store.invalidate(utility_type, state, zip_code)
+    except sqlite3.Error as e:
+        print(f"[result-store] invalidation failed: {e}")
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """Get the process-wide result store, or None if disabled or it can't be opened."""
+    global _store
+    if not RESULT_STORE_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = ResultStore(RESULT_STORE_PATH)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"[result-store] cannot open {RESULT_STORE_PATH}: {e}")
+                    _store = False
+    return _store or None
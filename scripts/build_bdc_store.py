@@ -0,0 +1,79 @@
+"""
+Build the columnar BDC block store (bdc_blocks.bin) from bdc_internet_new.db.
+
+Re-run after reloading the BDC SQLite data (or building its tract table);
+until then the store no longer matches the database and lookups use
+SQLite. Workers pick up the new file on restart. Removing the file makes
+bdc_internet_lookup use SQLite again.
+
+Usage:
+    python scripts/build_bdc_store.py
+    python scripts/build_bdc_store.py --source /data/bdc_internet_new.db --output /data/bdc_blocks.bin
+    python scripts/build_bdc_store.py --verify 20000   # compare sample blocks against SQLite
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bdc_block_store import BDC_STORE_PATH, BlockStore, build_block_store
+from bdc_internet_lookup import DB_PATH
+
+
+def verify(source: str, output: str, samples: int) -> int:
+    """Compare random blocks' best offers in the store with SQLite; returns mismatches."""
+    store = BlockStore(output)
+    conn = sqlite3.connect(source)
+    total = store.stats()['blocks']
+    mismatches = 0
+    for _ in range(min(samples, total)):
+        geoid = f"{store._views['block_geoid'][random.randrange(total)]:015d}"
+        expected = {
+            (name, str(tech)): (down or 0, up or 0, low_latency or 0)
+            for name, tech, down, up, low_latency in conn.execute('''
+                SELECT provider_name, technology, MAX(max_down), MAX(max_up), MAX(low_latency)
+                FROM providers WHERE block_geoid = ?
+                GROUP BY provider_name, technology
+            ''', (geoid,))
+        }
+        got = {(name, tech): (down, up, low_latency) for name, tech, down, up, low_latency in store.lookup_block(geoid)}
+        if got != expected:
+            mismatches += 1
+            print(f"  MISMATCH {geoid}")
+    conn.close()
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', default=DB_PATH, help='BDC SQLite database')
+    parser.add_argument('--output', default=BDC_STORE_PATH, help='Store file to write')
+    parser.add_argument('--verify', type=int, metavar='N', help='Check N random blocks against SQLite after building')
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.source):
+        sys.exit(f"{args.source} not found")
+    
+    start = time.time()
+    counts = build_block_store(args.source, args.output)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {args.output} ({size / 1e6:.1f} MB) in {time.time() - start:.1f}s")
+    print(f"  {counts['rows']:,} rows -> {counts['blocks']:,} blocks, {counts['tracts']:,} tracts, "
+          f"{counts['sets']:,} provider sets, {counts['plans']:,} plans, {counts['names']:,} providers")
+    if counts['skipped']:
+        print(f"  skipped {counts['skipped']:,} rows with malformed block GEOIDs")
+    
+    if args.verify:
+        mismatches = verify(args.source, args.output, args.verify)
+        print(f"Verified {args.verify:,} blocks: {mismatches} mismatches")
+        sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
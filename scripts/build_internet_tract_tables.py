@@ -0,0 +1,89 @@
+"""
+Build the tract-level internet provider tables.
+
+When a geocoded block has no BDC rows, the internet lookup falls back to
+the block's census tract (first 11 GEOID digits). Without these tables
+that fallback is a `block_geoid LIKE 'tract%'` scan; with them it is one
+primary-key lookup.
+
+- SQLite (bdc_internet_new.db): tract_providers, best speeds per tract,
+  provider and technology
+- PostgreSQL (DATABASE_URL): internet_providers_tract, the first block of
+  each tract and its providers (what the LIKE ... ORDER BY query returned)
+
+Re-run after reloading the BDC data.
+
+Usage:
+    python scripts/build_internet_tract_tables.py              # both, where available
+    python scripts/build_internet_tract_tables.py --sqlite-only
+    python scripts/build_internet_tract_tables.py --postgres-only
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bdc_internet_lookup import DB_PATH, build_tract_table
+
+POSTGRES_TRACT_SQL = """
+    DROP TABLE IF EXISTS internet_providers_tract_new;
+    CREATE TABLE internet_providers_tract_new AS
+    SELECT DISTINCT ON (left(block_geoid, 11))
+        left(block_geoid, 11) AS tract_geoid,
+        block_geoid,
+        providers
+    FROM internet_providers
+    ORDER BY left(block_geoid, 11), block_geoid;
+    ALTER TABLE internet_providers_tract_new ADD PRIMARY KEY (tract_geoid);
+    DROP TABLE IF EXISTS internet_providers_tract;
+    ALTER TABLE internet_providers_tract_new RENAME TO internet_providers_tract;
+    ALTER INDEX internet_providers_tract_new_pkey RENAME TO internet_providers_tract_pkey;
+"""
+
+
+def build_postgres(database_url: str) -> int:
+    """Rebuild internet_providers_tract in one transaction; returns its row count."""
+    import psycopg2
+    conn = psycopg2.connect(database_url)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(POSTGRES_TRACT_SQL)
+        cursor.execute("SELECT COUNT(*) FROM internet_providers_tract")
+        count = cursor.fetchone()[0]
+        conn.commit()
+        return count
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sqlite', default=DB_PATH, help='BDC SQLite file')
+    parser.add_argument('--sqlite-only', action='store_true', help='Skip PostgreSQL')
+    parser.add_argument('--postgres-only', action='store_true', help='Skip SQLite')
+    args = parser.parse_args()
+    
+    if not args.postgres_only:
+        if os.path.exists(args.sqlite):
+            start = time.time()
+            rows = build_tract_table(args.sqlite)
+            print(f"SQLite: {rows:,} tract rows in {args.sqlite} ({time.time() - start:.1f}s)")
+        else:
+            print(f"SQLite: {args.sqlite} not found, skipped")
+    
+    if not args.sqlite_only:
+        database_url = os.environ.get('DATABASE_URL')
+        if database_url:
+            start = time.time()
+            rows = build_postgres(database_url)
+            print(f"PostgreSQL: {rows:,} tracts in internet_providers_tract ({time.time() - start:.1f}s)")
+        else:
+            print("PostgreSQL: DATABASE_URL not set, skipped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Build data/reference_snapshot.db from the large data/*.json reference tables.
+
+Run after changing any of the source files (the Docker build runs it).
+Workers fall back to the JSON for any table whose source changed since
+the snapshot was built, so forgetting to rebuild costs memory, not
+correctness.
+
+Usage:
+    python scripts/build_reference_snapshot.py
+    python scripts/build_reference_snapshot.py --output /tmp/reference_snapshot.db
+    python scripts/build_reference_snapshot.py --check    # report stale tables
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reference_snapshot import (
+    DATA_DIR,
+    SNAPSHOT_PATH,
+    SNAPSHOT_SOURCES,
+    ReferenceSnapshot,
+    build_snapshot,
+)
+
+
+def check(path: Path) -> int:
+    """Print each table's status; returns the number of stale/missing tables."""
+    if not path.exists():
+        print(f"No snapshot at {path}")
+        return len(SNAPSHOT_SOURCES)
+    snapshot = ReferenceSnapshot(path)
+    problems = 0
+    for name in SNAPSHOT_SOURCES:
+        source = DATA_DIR / f'{name}.json'
+        if not source.exists():
+            print(f"  {name:45} no source file")
+        elif name not in snapshot.sources():
+            print(f"  {name:45} MISSING")
+            problems += 1
+        elif snapshot.table(name, str(source)) is None:
+            print(f"  {name:45} STALE")
+            problems += 1
+        else:
+            print(f"  {name:45} ok")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', type=Path, default=SNAPSHOT_PATH, help='Snapshot file to write')
+    parser.add_argument('--check', action='store_true', help='Only report stale or missing tables')
+    args = parser.parse_args()
+    
+    if args.check:
+        sys.exit(1 if check(args.output) else 0)
+    
+    start = time.time()
+    counts = build_snapshot(args.output)
+    for name, rows in counts.items():
+        source_size = (DATA_DIR / f'{name}.json').stat().st_size
+        print(f"  {name:45} {rows:7,} rows  ({source_size / 1e6:.1f} MB JSON)")
+    size = args.output.stat().st_size
+    print(f"Wrote {args.output} ({size / 1e6:.1f} MB) in {time.time() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
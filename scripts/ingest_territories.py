@@ -0,0 +1,176 @@
+"""
+Snapshot ArcGIS service-territory layers for the local territory index.
+
+Finds every layer gis_utility_lookup queries (state electric/gas/water
+APIs, HIFLD, EPA water boundaries), downloads all polygons + attributes
+and writes them to data/territories/ where territory_index.py serves
+point lookups in-process. Layers that fail to download keep using the
+live API.
+
+Usage:
+    python scripts/ingest_territories.py --list
+    python scripts/ingest_territories.py                      # all layers
+    python scripts/ingest_territories.py --layer <query url>  # one layer
+    python scripts/ingest_territories.py --only-missing --max-offset 0.0001
+"""
+
+import argparse
+import inspect
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+import gis_utility_lookup
+from territory_index import (
+    TERRITORY_DIR,
+    LocalTerritoryIndex,
+    esri_rings_to_geometry,
+    write_layer_snapshot,
+)
+
+# Features per objectIds request (most servers cap at 1000-2000 records)
+DEFAULT_CHUNK_SIZE = 200
+
+
+def discover_layers() -> list:
+    """
+    List the layer URLs gis_utility_lookup queries.
+    
+    Runs every query function in prefetch recording mode, so nothing is
+    sent over the network and each _query_arcgis_point call (including
+    fallback URLs) is captured.
+    """
+    functions = set(gis_utility_lookup.STATE_ELECTRIC_APIS.values())
+    functions.update(gis_utility_lookup.STATE_GAS_APIS.values())
+    for name, func in inspect.getmembers(gis_utility_lookup, inspect.isfunction):
+        if name.startswith('query_'):
+            functions.add(func)
+    
+    # Snapshotted layers would be answered locally and never recorded
+    gis_utility_lookup.TERRITORY_INDEX_AVAILABLE = False
+    
+    prefetch = gis_utility_lookup.ArcGISPrefetch()
+    token = gis_utility_lookup._arcgis_prefetch.set(prefetch)
+    try:
+        for func in functions:
+            try:
+                func(0.0, 0.0)
+            except Exception as e:
+                print(f"  skipped {func.__name__}: {e}")
+        for state in sorted(gis_utility_lookup.STATES_WITH_WATER_GIS):
+            try:
+                gis_utility_lookup.lookup_water_utility_gis(0.0, 0.0, state)
+            except Exception as e:
+                print(f"  skipped water {state}: {e}")
+    finally:
+        gis_utility_lookup._arcgis_prefetch.reset(token)
+    
+    return sorted({key[0] for key in prefetch.missing})
+
+
+def fetch_layer(url: str, chunk_size: int = DEFAULT_CHUNK_SIZE, max_offset: float = None) -> tuple:
+    """
+    Download every feature of an ArcGIS layer as shapely geometries.
+    
+    Pages by objectIds rather than resultOffset because older MapServer
+    layers don't support pagination.
+    
+    Returns:
+        (field_names, [{"attributes": {...}, "geometry": geometry}])
+    """
+    response = http_client.get(url, params={
+        'where': '1=1',
+        'returnIdsOnly': 'true',
+        'f': 'json',
+    }, timeout=60)
+    data = response.json()
+    if 'error' in data:
+        raise RuntimeError(data['error'].get('message', data['error']))
+    object_ids = sorted(data.get('objectIds') or [])
+    
+    fields = []
+    features = []
+    for start in range(0, len(object_ids), chunk_size):
+        chunk = object_ids[start:start + chunk_size]
+        params = {
+            'objectIds': ','.join(str(oid) for oid in chunk),
+            'outFields': '*',
+            'returnGeometry': 'true',
+            'outSR': '4326',
+            'f': 'json',
+        }
+        if max_offset:
+            params['maxAllowableOffset'] = str(max_offset)
+        
+        page = http_client.get(url, params=params, timeout=120).json()
+        if 'error' in page:
+            raise RuntimeError(page['error'].get('message', page['error']))
+        
+        if not fields:
+            fields = [f['name'] for f in page.get('fields', [])]
+        
+        for feature in page.get('features', []):
+            rings = (feature.get('geometry') or {}).get('rings')
+            if not rings:
+                continue
+            geometry = esri_rings_to_geometry(rings)
+            if geometry.is_empty:
+                continue
+            features.append({'attributes': feature.get('attributes', {}), 'geometry': geometry})
+        
+        print(f"    {min(start + chunk_size, len(object_ids))}/{len(object_ids)} features", end='\r')
+    
+    print()
+    return fields, features
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Snapshot utility territory layers for local lookups')
+    parser.add_argument('--list', action='store_true', help='List discovered layers and exit')
+    parser.add_argument('--layer', action='append', help='Layer query URL (repeatable, default: all)')
+    parser.add_argument('--output', default=str(TERRITORY_DIR), help='Snapshot directory')
+    parser.add_argument('--only-missing', action='store_true', help='Skip layers that already have a snapshot')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Features per request')
+    parser.add_argument('--max-offset', type=float, default=None,
+                        help='Server-side generalization in degrees (e.g. 0.0001 ~ 10m); default full detail')
+    args = parser.parse_args()
+    
+    layers = args.layer or discover_layers()
+    
+    if args.list:
+        for url in layers:
+            print(url)
+        print(f"\n{len(layers)} layers")
+        return
+    
+    existing = set(LocalTerritoryIndex(args.output).layer_urls) if args.only_missing else set()
+    
+    failed = []
+    for i, url in enumerate(layers, 1):
+        if url in existing:
+            continue
+        print(f"[{i}/{len(layers)}] {url}")
+        start = time.time()
+        try:
+            fields, features = fetch_layer(url, args.chunk_size, args.max_offset)
+            if not features:
+                print("    no polygon features - leaving layer on the live API")
+                continue
+            entry = write_layer_snapshot(args.output, url, fields, features)
+            print(f"    wrote {entry['file']} ({entry['feature_count']} features, {time.time() - start:.1f}s)")
+        except Exception as e:
+            print(f"    FAILED: {e}")
+            failed.append(url)
+    
+    if failed:
+        print(f"\n{len(failed)} layers failed (still served by the live API):")
+        for url in failed:
+            print(f"  {url}")
+
+
+if __name__ == '__main__':
+    main()
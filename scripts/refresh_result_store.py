@@ -0,0 +1,58 @@
+"""
+Recompute stale entries of the address-level result store.
+
+An entry is stale when a reference file behind its utility types changed
+since it was computed (remaining_states_gas.json, the ZIP answer table,
+the BDC store, ...), when LOOKUP_VERSION was bumped, or when it is older
+than RESULT_STORE_MAX_AGE_DAYS. Everything else is left as is, so a
+monthly data refresh only re-runs the addresses it can affect.
+
+Run nightly, or after loading new reference data, so the next portfolio
+upload is served from the store.
+
+Usage:
+    python scripts/refresh_result_store.py
+    python scripts/refresh_result_store.py --limit 5000
+    python scripts/refresh_result_store.py --max-age-days 30
+    python scripts/refresh_result_store.py --stats
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_store import RESULT_STORE_MAX_AGE_DAYS, RESULT_STORE_PATH, ResultStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store', default=str(RESULT_STORE_PATH), help='Result store file')
+    parser.add_argument('--limit', type=int, help='Recompute at most this many entries')
+    parser.add_argument('--max-age-days', type=int, default=RESULT_STORE_MAX_AGE_DAYS,
+                        help='Recompute entries older than this regardless of data changes')
+    parser.add_argument('--stats', action='store_true', help='Only print store stats')
+    args = parser.parse_args()
+    
+    store = ResultStore(args.store)
+    if args.stats:
+        print(store.stats())
+        return
+    
+    # The batch endpoint's lookup and formatting, so refreshed entries
+    # are exactly what a live batch request would have stored
+    from api import compute_batch_result
+    
+    start = time.time()
+    counts = store.refresh_stale(compute_batch_result, limit=args.limit, max_age_days=args.max_age_days)
+    print(f"Checked {counts['checked']:,} entries in {time.time() - start:.0f}s")
+    print(f"  stale:     {counts['stale']:,}")
+    print(f"  refreshed: {counts['refreshed']:,} ({counts['changed']:,} with a different answer)")
+    print(f"  failed:    {counts['failed']:,} (kept, retried next run)")
+
+
+if __name__ == '__main__':
+    main()
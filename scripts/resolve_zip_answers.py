@@ -0,0 +1,247 @@
+"""
+Resolve-the-country job: precompute answers for uniformly served areas.
+
+For each ZIP, lays a grid over its ZCTA polygon (Census TIGERweb), gets
+each point's county/place/block from the Census geocoder and runs the
+full lookup_utilities_by_address on it. Samples are grouped by ZIP and by
+census tract, and each area/type is classified uniform, split or unknown
+(see zip_answers.classify_area). The result is published to
+data/zip_answers.db, which the live lookup serves directly.
+
+Sample points can also come from a CSV (zip,lat,lon) or from a file of
+real addresses (one per line, geocoded as usual).
+
+Usage:
+    python scripts/resolve_zip_answers.py --zips 78701,75201 --grid 4
+    python scripts/resolve_zip_answers.py --zips-file top_zips.txt --workers 8
+    python scripts/resolve_zip_answers.py --points samples.csv
+    python scripts/resolve_zip_answers.py --addresses portfolio.txt --output /tmp/zip_answers.db
+    python scripts/resolve_zip_answers.py --stats
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+import zip_answers
+from zip_answers import (
+    ANSWER_TYPES,
+    ZIP_ANSWERS_PATH,
+    AnswerTable,
+    classify_area,
+    load_known_splits,
+    write_answer_table,
+)
+
+ZCTA_URL = "https://tigerweb.geo.census.gov/arcgis/rest/services/TIGERweb/tigerWMS_Census2020/MapServer/2/query"
+GEOGRAPHIES_URL = "https://geocoding.geo.census.gov/geocoder/geographies/coordinates"
+
+# Points per side of the sample grid laid over each ZCTA
+DEFAULT_GRID = 4
+
+
+def zcta_geometry(zip_code: str):
+    """ZCTA polygon for a ZIP as a shapely geometry, or None."""
+    from territory_index import esri_rings_to_geometry
+    response = http_client.get(ZCTA_URL, params={
+        "where": f"ZCTA5='{zip_code}'",
+        "outFields": "ZCTA5",
+        "returnGeometry": "true",
+        "outSR": "4326",
+        "f": "json"
+    }, timeout=30)
+    features = response.json().get("features", [])
+    if not features:
+        return None
+    return esri_rings_to_geometry(features[0]["geometry"]["rings"])
+
+
+def grid_points(geometry, size: int) -> List[Tuple[float, float]]:
+    """(lat, lon) points of a size x size grid that fall inside the geometry."""
+    from shapely.geometry import Point
+    min_x, min_y, max_x, max_y = geometry.bounds
+    points = []
+    for i in range(size):
+        for j in range(size):
+            x = min_x + (i + 0.5) * (max_x - min_x) / size
+            y = min_y + (j + 0.5) * (max_y - min_y) / size
+            if geometry.contains(Point(x, y)):
+                points.append((y, x))
+    if not points:
+        center = geometry.representative_point()
+        points.append((center.y, center.x))
+    return points
+
+
+def point_geography(lat: float, lon: float, zip_code: str) -> Optional[Dict]:
+    """A geocode_address-shaped result for a coordinate (Census geographies)."""
+    response = http_client.get(GEOGRAPHIES_URL, params={
+        "x": lon,
+        "y": lat,
+        "benchmark": "Public_AR_Current",
+        "vintage": "Census2020_Current",
+        "format": "json"
+    }, timeout=30)
+    geo = response.json().get("result", {}).get("geographies", {})
+    states = geo.get("States", [])
+    if not states:
+        return None
+    counties = geo.get("Counties", [])
+    places = geo.get("Incorporated Places", []) or geo.get("County Subdivisions", [])
+    blocks = geo.get("Census Blocks", [])
+    return {
+        "lat": lat,
+        "lon": lon,
+        "matched_address": f"ZIP {zip_code} sample point",
+        "city": places[0].get("BASENAME") if places else None,
+        "county": counties[0].get("BASENAME") if counties else None,
+        "state": states[0].get("STUSAB"),
+        "zip_code": zip_code,
+        "block_geoid": blocks[0].get("GEOID") if blocks else None,
+        "source": "grid"
+    }
+
+
+def resolve_sample(label: str, geo_result: Dict) -> Dict:
+    """Run the full lookup for one sample; returns its ZIP, tract and per-type answers."""
+    from utility_lookup_v1 import lookup_utilities_by_address
+    result = lookup_utilities_by_address(
+        label, selected_utilities=list(ANSWER_TYPES), geo_result=geo_result
+    ) or {}
+    block_geoid = geo_result.get("block_geoid") or ''
+    return {
+        "zip": (geo_result.get("zip_code") or geo_result.get("zip") or '')[:5],
+        "tract": block_geoid[:11] if len(block_geoid) >= 11 else None,
+        "answers": {t: (result.get(t), result.get(f"{t}_no_service")) for t in ANSWER_TYPES},
+    }
+
+
+def collect_samples(args) -> List[Tuple[str, Optional[Dict]]]:
+    """(label, geo_result or None) for every sample; None means geocode the label."""
+    samples = []
+    zips = []
+    if args.zips:
+        zips += [z.strip() for z in args.zips.split(',') if z.strip()]
+    if args.zips_file:
+        with open(args.zips_file, 'r') as f:
+            zips += [line.strip() for line in f if line.strip()]
+    for zip_code in zips:
+        try:
+            geometry = zcta_geometry(zip_code)
+        except Exception as e:
+            print(f"  {zip_code}: ZCTA fetch failed: {e}")
+            continue
+        if geometry is None:
+            print(f"  {zip_code}: no ZCTA polygon")
+            continue
+        for lat, lon in grid_points(geometry, args.grid):
+            samples.append((zip_code, lat, lon))
+    
+    if args.points:
+        with open(args.points, newline='') as f:
+            for row in csv.DictReader(f):
+                samples.append((row['zip'].zfill(5), float(row['lat']), float(row['lon'])))
+    
+    resolved: List[Tuple[str, Optional[Dict]]] = []
+    for zip_code, lat, lon in samples:
+        try:
+            geo_result = point_geography(lat, lon, zip_code)
+        except Exception as e:
+            print(f"  {zip_code} ({lat:.5f}, {lon:.5f}): geography failed: {e}")
+            continue
+        if geo_result:
+            label = f"{geo_result.get('city') or ''}, {geo_result['state']} {zip_code}".strip(', ')
+            resolved.append((label, geo_result))
+    
+    if args.addresses:
+        with open(args.addresses, 'r') as f:
+            resolved += [(line.strip(), None) for line in f if line.strip()]
+    return resolved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--zips', help='Comma-separated ZIPs to sample')
+    parser.add_argument('--zips-file', help='File with one ZIP per line')
+    parser.add_argument('--grid', type=int, default=DEFAULT_GRID, help='Grid points per side per ZIP')
+    parser.add_argument('--points', help='CSV of sample points (zip,lat,lon)')
+    parser.add_argument('--addresses', help='File of real addresses to sample, one per line')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent lookups')
+    parser.add_argument('--output', default=str(ZIP_ANSWERS_PATH), help='Answer table to write')
+    parser.add_argument('--stats', action='store_true', help='Only print stats of the existing table')
+    args = parser.parse_args()
+    
+    if args.stats:
+        print(AnswerTable(args.output).stats())
+        return
+    if not (args.zips or args.zips_file or args.points or args.addresses):
+        parser.error('give --zips, --zips-file, --points or --addresses')
+    
+    # Every sample must run the full lookup, not be answered from the old table
+    zip_answers.ZIP_ANSWERS_ENABLED = False
+    
+    start = time.time()
+    samples = collect_samples(args)
+    print(f"Resolving {len(samples)} sample points with {args.workers} workers...")
+    
+    by_area: Dict[str, Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+    area_zips: Dict[str, set] = defaultdict(set)
+    done = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {}
+        for label, geo_result in samples:
+            if geo_result is None:
+                from utility_lookup_v1 import geocode_address
+                geo_result = geocode_address(label, include_geography=True)
+                if not geo_result:
+                    continue
+            futures[executor.submit(resolve_sample, label, geo_result)] = label
+        for future in as_completed(futures):
+            try:
+                sample = future.result()
+            except Exception as e:
+                print(f"  {futures[future]}: lookup failed: {e}")
+                continue
+            areas = [f"zip:{sample['zip']}"] if sample['zip'] else []
+            if sample['tract']:
+                areas.append(f"tract:{sample['tract']}")
+            for area in areas:
+                area_zips[area].add(sample['zip'])
+                for utility_type, answer in sample['answers'].items():
+                    by_area[area][utility_type].append(answer)
+            done += 1
+            if done % 50 == 0:
+                print(f"  {done}/{len(futures)} samples ({done / (time.time() - start):.1f}/s)")
+    
+    known_splits = load_known_splits()
+    rows = []
+    summary: Dict[str, int] = defaultdict(int)
+    for area, per_type in by_area.items():
+        for utility_type, answers in per_type.items():
+            status, provider, answer = classify_area(
+                area, utility_type, answers, known_splits, zip_codes=area_zips[area] - {''}
+            )
+            rows.append((area, utility_type, status, provider, len(answers), answer))
+            summary[f"{area.split(':')[0]} {utility_type} {status}"] += 1
+    
+    count = write_answer_table(args.output, rows, meta={
+        'grid': args.grid,
+        'samples': done,
+        'seconds': round(time.time() - start, 1),
+    })
+    print(f"Wrote {count} area answers to {args.output} in {time.time() - start:.0f}s")
+    for key in sorted(summary):
+        print(f"  {key:30} {summary[key]}")
+
+
+if __name__ == '__main__':
+    main()
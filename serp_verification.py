@@ -24,7 +24,9 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 import requests
+import http_client
 from bs4 import BeautifulSoup
+from shared_cache import get_shared_cache
 
 # Configuration
 CACHE_DIR = os.path.join(os.path.dirname(__file__), 'data', 'serp_cache')
@@ -204,13 +206,20 @@ def get_cached_verification(city: str, state: str, zip_code: str, utility_type:
     cache_key = get_cache_key(city, state, zip_prefix, utility_type)
     cache_file = os.path.join(CACHE_DIR, f"{cache_key}.json")
     
-    if not os.path.exists(cache_file):
-        return None
+    # Shared cache first (results saved by any worker), then this host's files
+    shared = get_shared_cache()
+    cached = shared.get('serp', cache_key) if shared is not None else None
+    
+    if cached is None:
+        if not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
     
     try:
-        with open(cache_file, 'r') as f:
-            cached = json.load(f)
-        
         # Check if cache is still valid
         cached_time = datetime.fromisoformat(cached.get('timestamp', '2000-01-01'))
         if datetime.now() - cached_time > timedelta(days=CACHE_TTL_DAYS):
@@ -251,6 +260,10 @@ def save_to_cache(city: str, state: str, zip_code: str, utility_type: str, resul
         'notes': result.notes
     }
     
+    shared = get_shared_cache()
+    if shared is not None:
+        shared.set('serp', cache_key, cache_data, ttl=CACHE_TTL_DAYS * 24 * 3600)
+    
     with open(cache_file, 'w') as f:
         json.dump(cache_data, f, indent=2)
 
@@ -272,7 +285,7 @@ def search_google(query: str) -> Optional[str]:
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
-        response = requests.get(
+        response = http_client.get(
             search_url,
             proxies=proxies,
             timeout=10,
@@ -323,7 +336,7 @@ Reply with ONLY a JSON object:
             "max_tokens": 200
         }
         
-        response = requests.post(
+        response = http_client.post(
             "https://api.openai.com/v1/chat/completions",
             headers=headers,
             json=data,
@@ -12,6 +12,7 @@ Based on: sewer-utility-lookup-spec.md
 """
 
 import requests
+import http_client
 from typing import Optional, Dict, List
 import math
 import time
@@ -79,7 +80,7 @@ def lookup_texas_sewer_ccn(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(TX_SEWER_CCN_URL, params=params, timeout=10)
+        response = http_client.get(TX_SEWER_CCN_URL, params=params, timeout=10)
         response.raise_for_status()
         duration_ms = int((time.time() - start_time) * 1000)
         
@@ -157,7 +158,7 @@ def lookup_hifld_wastewater(lat: float, lon: float, radius_miles: float = 10) ->
             "f": "json"
         }
         
-        response = requests.get(HIFLD_WASTEWATER_URL, params=params, timeout=10)
+        response = http_client.get(HIFLD_WASTEWATER_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -246,7 +247,7 @@ def lookup_florida_flwmi(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(FL_FLWMI_URL, params=params, timeout=20)
+        response = http_client.get(FL_FLWMI_URL, params=params, timeout=20)
         response.raise_for_status()
         
         data = response.json()
@@ -326,7 +327,7 @@ def lookup_connecticut_sewer(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(CT_SEWER_URL, params=params, timeout=10)
+        response = http_client.get(CT_SEWER_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -397,7 +398,7 @@ def lookup_new_jersey_dep_ssa(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(NJ_DEP_SSA_URL, params=params, timeout=10)
+        response = http_client.get(NJ_DEP_SSA_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -457,7 +458,7 @@ def lookup_massachusetts_massdep(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(MA_MASSDEP_URL, params=params, timeout=10)
+        response = http_client.get(MA_MASSDEP_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -520,7 +521,7 @@ def lookup_washington_waswd(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(WA_WASWD_URL, params=params, timeout=10)
+        response = http_client.get(WA_WASWD_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -576,7 +577,7 @@ def lookup_california_water_district(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(CA_WATER_DISTRICTS_URL, params=params, timeout=10)
+        response = http_client.get(CA_WATER_DISTRICTS_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
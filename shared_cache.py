@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Cross-process result cache shared by every gunicorn worker.
+
+The in-process caches (api._address_cache, the SERP verification files,
+SmartSelector decisions) are per worker: a hot address is looked up once
+per worker instead of once per fleet, and workers writing the same JSON
+file overwrite each other. This module gives them one shared store.
+
+Backends:
+- Redis, when REDIS_URL is set and the redis package is installed
+  (shared across hosts)
+- SQLite in WAL mode otherwise (shared by all workers on one host)
+
+Values are JSON-serialized. Every operation is best effort: a backend
+error is logged and treated as a miss, never as a failed lookup.
+
+Usage:
+    from shared_cache import get_shared_cache
+    
+    cache = get_shared_cache()
+    cache.set('gis', key, value, ttl=86400)
+    value = cache.get('gis', key)    # None if missing or expired
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Try to import redis for multi-host deployments
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+# Set to 0 to keep every cache per process
+SHARED_CACHE_ENABLED = os.getenv('SHARED_CACHE_ENABLED', '1') == '1'
+
+SHARED_CACHE_PATH = Path(os.getenv(
+    'SHARED_CACHE_PATH',
+    Path(__file__).parent / 'data' / 'cache' / 'shared_cache.db'
+))
+
+# Prefix for Redis keys, so several deployments can share one Redis
+SHARED_CACHE_PREFIX = os.getenv('SHARED_CACHE_PREFIX', 'utility-lookup')
+
+# A cache round trip must stay far below the cost of the lookup it saves
+REDIS_SOCKET_TIMEOUT = float(os.getenv('SHARED_CACHE_REDIS_TIMEOUT', '0.25'))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SHARED_CACHE_SQLITE_BUSY_MS', '2000'))
+
+# Expired SQLite rows are purged every N writes
+SQLITE_PURGE_INTERVAL = 1000
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class SharedCache:
+    """
+    Namespaced key/value cache with per-entry TTL.
+    
+    Subclasses implement _get/_set/_delete on raw strings; this class adds
+    JSON (de)serialization, error isolation and per-namespace counters.
+    """
+    
+    backend = 'none'
+    
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._counter_lock = threading.Lock()
+        self._errors = 0
+    
+    def get(self, namespace: str, key: str) -> Any:
+        """Return the cached value, or None if missing, expired or unavailable."""
+        try:
+            raw = self._get(namespace, key)
+        except Exception as e:
+            self._error('get', e)
+            return None
+        self._count(namespace, 'hits' if raw is not None else 'misses')
+        if raw is None:
+            return None
+        return json.loads(raw)
+    
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value.
+        
+        Args:
+            namespace: Cache area (e.g. 'lookup', 'gis', 'serp')
+            key: Key within the namespace
+            value: JSON-serializable value
+            ttl: Seconds until the entry expires (None = never)
+        """
+        try:
+            self._set(namespace, key, json.dumps(value, default=str), ttl)
+            self._count(namespace, 'sets')
+        except Exception as e:
+            self._error('set', e)
+    
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove an entry if present."""
+        try:
+            self._delete(namespace, key)
+        except Exception as e:
+            self._error('delete', e)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Backend name and this process's per-namespace counters."""
+        with self._counter_lock:
+            namespaces = {name: dict(counts) for name, counts in self._counters.items()}
+        for counts in namespaces.values():
+            lookups = counts.get('hits', 0) + counts.get('misses', 0)
+            counts['hit_rate'] = round(counts.get('hits', 0) / lookups, 4) if lookups else 0.0
+        return {'backend': self.backend, 'errors': self._errors, 'namespaces': namespaces}
+    
+    def _count(self, namespace: str, counter: str) -> None:
+        with self._counter_lock:
+            counts = self._counters.setdefault(namespace, {'hits': 0, 'misses': 0, 'sets': 0})
+            counts[counter] += 1
+    
+    def _error(self, operation: str, error: Exception) -> None:
+        # Log the first few failures only - a down Redis would flood the log
+        self._errors += 1
+        if self._errors <= 5:
+            print(f"Shared cache {operation} failed ({self.backend}): {error}")
+    
+    def _get(self, namespace: str, key: str) -> Optional[str]:
+        raise NotImplementedError
+    
+    def _set(self, namespace: str, key: str, raw: str, ttl: Optional[float]) -> None:
+        raise NotImplementedError
+    
+    def _delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+
+class RedisCache(SharedCache):
+    """Shared cache in Redis; expiry is handled by Redis itself."""
+    
+    backend = 'redis'
+    
+    def __init__(self, url: str, prefix: str = SHARED_CACHE_PREFIX):
+        super().__init__()
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(
+            url,
+            socket_timeout=REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        )
+    
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:{key}"
+    
+    def _get(self, namespace: str, key: str) -> Optional[str]:
+        raw = self._client.get(self._key(namespace, key))
+        return raw.decode('utf-8') if raw is not None else None
+    
+    def _set(self, namespace: str, key: str, raw: str, ttl: Optional[float]) -> None:
+        if ttl is not None:
+            self._client.set(self._key(namespace, key), raw, px=max(1, int(ttl * 1000)))
+        else:
+            self._client.set(self._key(namespace, key), raw)
+    
+    def _delete(self, namespace: str, key: str) -> None:
+        self._client.delete(self._key(namespace, key))
+
+
+class SQLiteCache(SharedCache):
+    """
+    Shared cache in a local SQLite file.
+    
+    WAL mode lets every worker read while one writes; each thread keeps
+    its own connection since sqlite3 connections aren't thread-safe.
+    """
+    
+    backend = 'sqlite'
+    
+    def __init__(self, path: Path = SHARED_CACHE_PATH):
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+    
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: every statement is its own short transaction
+            conn = sqlite3.connect(
+                str(self.path),
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                isolation_level=None,
+            )
+            conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _get(self, namespace: str, key: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and time.time() >= expires_at:
+            return None
+        return value
+    
+    def _set(self, namespace: str, key: str, raw: str, ttl: Optional[float]) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, raw, expires_at)
+        )
+        self._writes += 1
+        if self._writes % SQLITE_PURGE_INTERVAL == 0:
+            conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+    
+    def _delete(self, namespace: str, key: str) -> None:
+        self._connection().execute(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        )
+    
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats['path'] = str(self.path)
+        return stats
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """
+    Get the process-wide shared cache.
+    
+    Returns:
+        RedisCache if REDIS_URL is set, else SQLiteCache; None if disabled
+        or the backend could not be opened
+    """
+    global _cache
+    if not SHARED_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    if REDIS_URL and REDIS_AVAILABLE:
+                        _cache = RedisCache(REDIS_URL)
+                    else:
+                        _cache = SQLiteCache(SHARED_CACHE_PATH)
+                except Exception as e:
+                    print(f"Shared cache unavailable: {e}")
+                    _cache = False
+    return _cache or None
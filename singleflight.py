@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Request coalescing ("single flight") for duplicate in-flight work.
+
+During batch runs and traffic spikes many requests geocode the same
+address, query the same GIS point or ask the AI selector about the same
+candidate set at the same moment. Caches don't help until the first
+call finishes. A SingleFlight lets the first caller for a key run the
+computation while concurrent callers with the same key wait for it and
+share its result (or its exception).
+
+Nothing is remembered after the call completes - pair it with a cache.
+
+Usage:
+    from singleflight import SingleFlight
+    
+    _flight = SingleFlight('geocode')
+    value, shared = _flight.do(key, expensive_function, arg1, arg2)
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key across threads."""
+    
+    def __init__(self, name: str = 'singleflight'):
+        """
+        Args:
+            name: Label reported in stats()
+        """
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+    
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run func(*args, **kwargs) once per key among concurrent callers.
+        
+        Args:
+            key: Identity of the work (callers with equal keys share one call)
+            func: The computation
+        
+        Returns:
+            (value, shared) - shared is True for callers that waited on
+            another caller's computation (never for the caller that ran it);
+            waiters get the same object, so copy it before modifying
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+                leader = True
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        
+        try:
+            call.value = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'name': self.name,
+                'in_flight': len(self._calls),
+                'executed': self._executed,
+                'coalesced': self._coalesced,
+            }
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent coroutines with the same key on one event loop.
+    
+    Waiters are shielded from each other: cancelling one waiter doesn't
+    cancel the shared computation.
+    """
+    
+    def __init__(self, name: str = 'singleflight'):
+        self.name = name
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self._executed = 0
+        self._coalesced = 0
+    
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Tuple[Any, bool]:
+        """Async version of SingleFlight.do(); func is a coroutine function."""
+        task = self._tasks.get(key)
+        if task is not None and task.get_loop() is not asyncio.get_running_loop():
+            # Left behind by a loop that was closed mid-call
+            task = None
+        shared = task is not None
+        if shared:
+            self._coalesced += 1
+        else:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._tasks[key] = task
+            self._executed += 1
+            task.add_done_callback(lambda t: self._tasks.pop(key) if self._tasks.get(key) is t else None)
+        return await asyncio.shield(task), shared
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'in_flight': len(self._tasks),
+            'executed': self._executed,
+            'coalesced': self._coalesced,
+        }
@@ -5,7 +5,7 @@ Handles tribal lands, military bases, unincorporated areas, and other special ca
 """
 
 import json
-import requests
+import http_client
 from typing import Dict, Optional, List
 from pathlib import Path
 
@@ -29,7 +29,7 @@ def lookup_census_geographies(lat: float, lon: float) -> Optional[Dict]:
             "format": "json"
         }
         
-        response = requests.get(CENSUS_GEOCODER_URL, params=params, timeout=15)
+        response = http_client.get(CENSUS_GEOCODER_URL, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
         
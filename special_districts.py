@@ -1,11 +1,17 @@
 """
 Special district lookup for water/sewer utilities.
 Handles MUDs (TX), CDDs (FL), Metro Districts (CO), etc.
+
+Coordinate lookups go through a per-state, per-service STRtree of the
+district polygons (built once on first use), so a point is only tested
+against the few districts whose bounding box contains it. lookup_many()
+resolves a whole list of points in one vectorized query.
 """
 
 import json
 import os
-from typing import Dict, List, Optional, Any
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 
 DISTRICTS_DIR = os.path.join(os.path.dirname(__file__), 'data', 'special_districts', 'processed')
 
@@ -13,12 +19,15 @@ DISTRICTS_DIR = os.path.join(os.path.dirname(__file__), 'data', 'special_distric
 _districts_by_state: Dict[str, List[dict]] = {}
 _zip_to_districts: Dict[str, List[str]] = {}
 _subdivision_to_district: Dict[str, str] = {}
-_prepared_polygons: Dict[str, Any] = {}
+_district_indexes: Dict[Tuple[str, str], '_DistrictIndex'] = {}
+_index_lock = threading.Lock()
 
 # Try to import shapely for polygon operations
 try:
-    from shapely.geometry import Point, shape
-    from shapely.prepared import prep
+    import numpy as np
+    import shapely
+    from shapely.geometry import shape
+    from shapely.strtree import STRtree
     SHAPELY_AVAILABLE = True
 except ImportError:
     SHAPELY_AVAILABLE = False
@@ -79,28 +88,69 @@ def load_subdivision_index() -> Dict[str, str]:
     return _subdivision_to_district
 
 
-def get_prepared_polygon(district: dict) -> Optional[Any]:
-    """Get or create a prepared polygon for fast point-in-polygon tests."""
+class _DistrictIndex:
+    """STRtree over the polygon districts of one state offering one service."""
+    
+    def __init__(self, districts: List[dict], service: str):
+        self.districts = []
+        geometries = []
+        for district in districts:
+            if service not in district.get('services', []):
+                continue
+            boundary = district.get('boundary', {})
+            if boundary.get('type') != 'polygon':
+                continue
+            try:
+                geometry = shape(boundary['data'])
+            except Exception as e:
+                print(f"Error creating polygon for {district['district_id']}: {e}")
+                continue
+            self.districts.append(district)
+            geometries.append(geometry)
+        
+        # Kept in file order: when districts overlap, the first one wins
+        self.geometries = np.array(geometries, dtype=object) if geometries else None
+        if self.geometries is not None:
+            shapely.prepare(self.geometries)
+            self.tree = STRtree(self.geometries)
+    
+    def lookup_many(self, points: Sequence[Tuple[float, float]]) -> List[Optional[dict]]:
+        """First district containing each (lat, lon), or None."""
+        results: List[Optional[dict]] = [None] * len(points)
+        if self.geometries is None or not points:
+            return results
+        
+        lats, lons = zip(*points)
+        geometries = shapely.points(lons, lats)  # shapely uses (x, y) = (lon, lat)
+        
+        # Bounding-box candidates from the tree, then exact tests against the
+        # prepared polygons for just those pairs
+        point_idx, district_idx = self.tree.query(geometries)
+        if len(point_idx):
+            inside = shapely.contains(self.geometries[district_idx], geometries[point_idx])
+            first: Dict[int, int] = {}
+            for p, d in zip(point_idx[inside].tolist(), district_idx[inside].tolist()):
+                if p not in first or d < first[p]:
+                    first[p] = d
+            for p, d in first.items():
+                results[p] = self.districts[d]
+        return results
+
+
+def get_district_index(state: str, service: str = 'water') -> Optional[_DistrictIndex]:
+    """Get the spatial index for a state's districts offering a service."""
     if not SHAPELY_AVAILABLE:
         return None
     
-    district_id = district['district_id']
-    
-    if district_id in _prepared_polygons:
-        return _prepared_polygons[district_id]
-    
-    boundary = district.get('boundary', {})
-    if boundary.get('type') != 'polygon':
-        return None
-    
-    try:
-        polygon = shape(boundary['data'])
-        prepared = prep(polygon)
-        _prepared_polygons[district_id] = prepared
-        return prepared
-    except Exception as e:
-        print(f"Error creating polygon for {district_id}: {e}")
-        return None
+    key = (state.upper(), service)
+    index = _district_indexes.get(key)
+    if index is None:
+        with _index_lock:
+            index = _district_indexes.get(key)
+            if index is None:
+                index = _DistrictIndex(load_state_districts(state), service)
+                _district_indexes[key] = index
+    return index
 
 
 def lookup_by_coordinates(lat: float, lon: float, state: str, service: str = 'water') -> Optional[dict]:
@@ -116,25 +166,30 @@ def lookup_by_coordinates(lat: float, lon: float, state: str, service: str = 'wa
     Returns:
         District dict if found, None otherwise
     """
-    if not SHAPELY_AVAILABLE:
-        return None
+    return lookup_many([(lat, lon)], state, service)[0]
     
-    districts = load_state_districts(state)
-    point = Point(lon, lat)  # Note: shapely uses (x, y) = (lon, lat)
     
-    for district in districts:
-        # Check if district provides the requested service
-        if service not in district.get('services', []):
-            continue
+def lookup_many(
+    points: Sequence[Tuple[float, float]],
+    state: str,
+    service: str = 'water'
+) -> List[Optional[dict]]:
+    """
+    Find the special district containing each of many points.
         
-        boundary = district.get('boundary', {})
+    Args:
+        points: (lat, lon) pairs
+        state: 2-letter state code
+        service: 'water' or 'sewer'
         
-        if boundary.get('type') == 'polygon':
-            prepared = get_prepared_polygon(district)
-            if prepared and prepared.contains(point):
-                return district
-    
-    return None
+    Returns:
+        One district dict (or None) per point, in input order
+    """
+    points = list(points)
+    index = get_district_index(state, service)
+    if index is None:
+        return [None] * len(points)
+    return index.lookup_many(points)
 
 
 def lookup_by_zip(zip_code: str, state: str, service: str = 'water') -> List[dict]:
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Local spatial index of utility service-territory polygons.
+
+Answers ArcGIS point-in-polygon queries in-process from layer snapshots
+taken by scripts/ingest_territories.py, so state GIS / HIFLD / EPA lookups
+don't need a live call to the state server. Layers that were never
+snapshotted (or failed to load) are reported as not covered and
+_query_arcgis_point falls back to the live API for them.
+
+Snapshot layout (data/territories/):
+    manifest.json           {layer_url: {"file", "feature_count", "fetched_at", ...}}
+    <layer_key>.json.gz     {"url", "fields", "features": [{"attributes", "wkb"}]}
+
+Usage:
+    from territory_index import get_territory_index
+    
+    index = get_territory_index()
+    if index and index.covers(url):
+        attributes = index.query(url, lat, lon, "NAME,STATE")
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Try to import shapely for the STRtree
+try:
+    import shapely
+    from shapely.geometry import Point, Polygon
+    from shapely.strtree import STRtree
+    SHAPELY_AVAILABLE = True
+except ImportError:
+    SHAPELY_AVAILABLE = False
+
+TERRITORY_DIR = Path(os.getenv(
+    'TERRITORY_INDEX_DIR',
+    Path(__file__).parent / 'data' / 'territories'
+))
+
+# Set to 0 to force every GIS query to the live API
+TERRITORY_INDEX_ENABLED = os.getenv('TERRITORY_INDEX_ENABLED', '1') == '1'
+
+MANIFEST_FILE = 'manifest.json'
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def layer_key(url: str) -> str:
+    """
+    Stable file name for a layer snapshot.
+    
+    Uses the service name plus layer id for readability and a short hash
+    of the full URL to keep different servers apart.
+    """
+    match = re.search(r'/services/(.+?)/(?:Feature|Map)Server/(\d+)', url, re.IGNORECASE)
+    if match:
+        slug = f"{match.group(1)}_{match.group(2)}"
+    else:
+        slug = 'layer'
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', slug).strip('_')[:60]
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]
+    return f"{slug}_{digest}"
+
+
+def esri_rings_to_geometry(rings: List[List[List[float]]]):
+    """
+    Convert Esri JSON polygon rings to a shapely geometry.
+    
+    Esri rings are clockwise for exterior rings and counter-clockwise for
+    holes; each hole belongs to the exterior ring that contains it.
+    """
+    exteriors = []
+    holes = []
+    for ring in rings:
+        if len(ring) < 4:
+            continue
+        polygon = Polygon(ring)
+        if polygon.exterior.is_ccw:
+            holes.append(polygon)
+        else:
+            exteriors.append(polygon)
+    
+    # Some servers don't follow the winding rule - treat everything as shells
+    if not exteriors:
+        exteriors, holes = holes, []
+    
+    shells = [[ext, []] for ext in exteriors]
+    for hole in holes:
+        point = hole.representative_point()
+        for shell in shells:
+            if shell[0].contains(point):
+                shell[1].append(hole.exterior.coords)
+                break
+    
+    polygons = [Polygon(ext.exterior.coords, interiors) for ext, interiors in shells]
+    if len(polygons) == 1:
+        return polygons[0].buffer(0) if not polygons[0].is_valid else polygons[0]
+    merged = shapely.MultiPolygon(polygons)
+    return merged if merged.is_valid else merged.buffer(0)
+
+
+class _Layer:
+    """One snapshotted layer: feature attributes plus an STRtree over geometries."""
+    
+    def __init__(self, path: Path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        self.url = data['url']
+        self.fields = data.get('fields', [])
+        self.attributes = [feature['attributes'] for feature in data['features']]
+        geometries = shapely.from_wkb([feature['wkb'] for feature in data['features']])
+        self.tree = STRtree(geometries)
+        
+        # ArcGIS matches outFields case-insensitively
+        self._field_lookup = {name.upper(): name for name in self.fields}
+    
+    def matches(self, lat: float, lon: float) -> List[int]:
+        """Indices of features containing the point, in snapshot order."""
+        hits = self.tree.query(Point(lon, lat), predicate='intersects')
+        return sorted(int(i) for i in hits)
+    
+    def select_fields(self, attributes: Dict, out_fields: str) -> Dict:
+        """Project a feature's attributes onto an ArcGIS outFields list."""
+        if not out_fields or out_fields.strip() == '*':
+            return dict(attributes)
+        selected = {}
+        for field in out_fields.split(','):
+            name = self._field_lookup.get(field.strip().upper())
+            if name is not None:
+                selected[name] = attributes.get(name)
+        return selected
+
+
+class LocalTerritoryIndex:
+    """
+    In-process point-in-polygon index over snapshotted ArcGIS layers.
+    
+    Layers are loaded on first use, so startup cost is only paid for the
+    layers a worker actually queries.
+    """
+    
+    def __init__(self, directory: Path = TERRITORY_DIR):
+        self.directory = Path(directory)
+        self._manifest = self._load_manifest()
+        self._layers: Dict[str, Optional[_Layer]] = {}
+        self._lock = threading.Lock()
+    
+    def _load_manifest(self) -> Dict:
+        path = self.directory / MANIFEST_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Territory index: could not read manifest: {e}")
+            return {}
+    
+    @property
+    def layer_urls(self) -> List[str]:
+        """URLs of all snapshotted layers."""
+        return list(self._manifest.keys())
+    
+    def covers(self, url: str) -> bool:
+        """True if the layer has a usable local snapshot."""
+        if url not in self._manifest:
+            return False
+        return self._get_layer(url) is not None
+    
+    def _get_layer(self, url: str) -> Optional[_Layer]:
+        if url in self._layers:
+            return self._layers[url]
+        with self._lock:
+            if url not in self._layers:
+                entry = self._manifest[url]
+                try:
+                    self._layers[url] = _Layer(self.directory / entry['file'])
+                except Exception as e:
+                    # Broken snapshot - leave this layer to the live API
+                    print(f"Territory index: failed to load {entry.get('file')}: {e}")
+                    self._layers[url] = None
+        return self._layers[url]
+    
+    def query(self, url: str, lat: float, lon: float, out_fields: str = "*") -> Optional[Dict]:
+        """
+        Local equivalent of _query_arcgis_point.
+        
+        Returns:
+            First matching feature's attributes (limited to out_fields), or None
+        """
+        layer = self._get_layer(url)
+        hits = layer.matches(lat, lon)
+        if not hits:
+            return None
+        return layer.select_fields(layer.attributes[hits[0]], out_fields)
+    
+    def query_all(self, url: str, lat: float, lon: float, out_fields: str = "*") -> List[Dict]:
+        """Attributes of every feature containing the point (overlapping territories)."""
+        layer = self._get_layer(url)
+        return [layer.select_fields(layer.attributes[i], out_fields) for i in layer.matches(lat, lon)]
+    
+    def stats(self) -> Dict:
+        """Snapshot ages and sizes, for health/debug endpoints."""
+        layers = {}
+        for url, entry in self._manifest.items():
+            layers[url] = {
+                'feature_count': entry.get('feature_count'),
+                'fetched_at': entry.get('fetched_at'),
+                'loaded': self._layers.get(url) is not None,
+            }
+        return {'directory': str(self.directory), 'layer_count': len(layers), 'layers': layers}
+
+
+def write_layer_snapshot(
+    directory: Path,
+    url: str,
+    fields: List[str],
+    features: List[Dict]
+) -> Dict:
+    """
+    Write one layer snapshot and register it in the manifest.
+    
+    Args:
+        directory: Snapshot directory
+        url: Layer query URL exactly as used by gis_utility_lookup
+        fields: Attribute field names of the layer
+        features: [{"attributes": {...}, "geometry": shapely geometry}]
+    
+    Returns:
+        The manifest entry for the layer
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    
+    filename = f"{layer_key(url)}.json.gz"
+    payload = {
+        'url': url,
+        'fields': fields,
+        'features': [
+            {'attributes': f['attributes'], 'wkb': shapely.to_wkb(f['geometry'], hex=True)}
+            for f in features
+        ],
+    }
+    with gzip.open(directory / filename, 'wt', encoding='utf-8') as f:
+        json.dump(payload, f)
+    
+    manifest_path = directory / MANIFEST_FILE
+    manifest = {}
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    
+    entry = {
+        'file': filename,
+        'feature_count': len(features),
+        'fetched_at': datetime.utcnow().isoformat() + 'Z',
+    }
+    manifest[url] = entry
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    
+    return entry
+
+
+def get_territory_index() -> Optional[LocalTerritoryIndex]:
+    """Get the process-wide index, or None if disabled/unavailable/empty."""
+    global _index
+    if not TERRITORY_INDEX_ENABLED or not SHAPELY_AVAILABLE:
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LocalTerritoryIndex()
+    return _index if _index.layer_urls else None
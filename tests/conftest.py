@@ -0,0 +1,25 @@
+"""
+Shared pytest fixtures.
+
+Keeps the cross-process shared cache (shared_cache.py) out of the real
+data/cache/shared_cache.db: every test gets an empty SQLite cache in its
+own temp directory, so runs neither read answers cached by the app nor
+leave test values behind for it.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_shared_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache, 'REDIS_URL', None)
+    monkeypatch.setattr(shared_cache, 'SHARED_CACHE_PATH', tmp_path / 'shared_cache.db')
+    monkeypatch.setattr(shared_cache, '_cache', None)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for adaptive per-endpoint timeouts and hedged requests.
+
+Run: pytest tests/test_adaptive_timeout.py -v
+"""
+
+import os
+import sys
+import threading
+import time
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+from adaptive_timeout import ADAPTIVE_MIN_SAMPLES, AdaptiveTimeouts
+from pipeline.interfaces import DataSource, LookupContext, SourceResult, UtilityType
+from pipeline.pipeline import LookupPipeline
+
+
+class SlowSource(DataSource):
+    """Takes `delay` seconds to answer."""
+    
+    def __init__(self, name, delay):
+        self._name = name
+        self.delay = delay
+    
+    @property
+    def name(self):
+        return self._name
+    
+    @property
+    def supported_types(self):
+        return [UtilityType.ELECTRIC]
+    
+    @property
+    def base_confidence(self):
+        return 70
+    
+    def query(self, context):
+        time.sleep(self.delay)
+        return SourceResult(source_name=self._name, utility_name='Oncor', confidence_score=70, match_type='point')
+
+
+class TestAdaptiveTimeouts:
+
+    def test_default_until_enough_samples(self):
+        timeouts = AdaptiveTimeouts()
+        for _ in range(ADAPTIVE_MIN_SAMPLES - 1):
+            timeouts.observe('layer', 200)
+        
+        assert timeouts.timeout('layer', default=10) == 10
+        assert timeouts.hedge_delay('layer') is None
+    
+    def test_timeout_follows_p99(self):
+        timeouts = AdaptiveTimeouts()
+        for _ in range(100):
+            timeouts.observe('fast', 400)
+            timeouts.observe('slow', 20000)
+        
+        assert 1.0 <= timeouts.timeout('fast', default=10) < 1.5
+        assert timeouts.timeout('slow', default=10) == 10
+        assert 0.3 <= timeouts.hedge_delay('fast') <= 0.5
+    
+    def test_hedge_budget(self):
+        timeouts = AdaptiveTimeouts()
+        for _ in range(30):
+            timeouts.observe('layer', 300)
+        
+        granted = [timeouts.acquire_hedge('layer') for _ in range(10)]
+        assert granted.count(True) == 3
+
+
+class TestHedgedGet:
+
+    def test_duplicate_answers_when_first_hangs(self, monkeypatch):
+        calls = []
+        lock = threading.Lock()
+        
+        def fake_get(url, **kwargs):
+            with lock:
+                calls.append(threading.current_thread())
+                first = len(calls) == 1
+            if first:
+                time.sleep(0.3)
+                raise requests.exceptions.ReadTimeout('hung')
+            time.sleep(0.01)
+            return 'fast'
+        
+        monkeypatch.setattr(http_client, 'get', fake_get)
+        start = time.time()
+        response, hedged = http_client.hedged_get('https://gis.example.com/query', hedge_after=0.05)
+        
+        assert (response, hedged) == ('fast', True)
+        assert time.time() - start < 0.6
+        # The first request ran in the caller's thread, only the duplicate in the pool
+        assert calls[0] is threading.current_thread() and calls[1] is not calls[0]
+    
+    def test_no_duplicate_for_a_prompt_answer(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(http_client, 'get', lambda url, **kwargs: calls.append(url) or 'ok')
+        
+        assert http_client.hedged_get('https://gis.example.com/query', hedge_after=0.05) == ('ok', False)
+        time.sleep(0.1)
+        assert len(calls) == 1
+
+
+class TestPipelineBudget:
+
+    def test_slow_source_reported_as_timeout(self):
+        pipeline = LookupPipeline([SlowSource('fast_gis', 0), SlowSource('hung_gis', 2)])
+        pipeline.query_timeout = 0.3
+        context = LookupContext(
+            lat=32.78, lon=-96.8, address='1 Main St, Dallas, TX 75201', city='Dallas',
+            county='Dallas', state='TX', zip_code='75201', utility_type=UtilityType.ELECTRIC
+        )
+        
+        results = pipeline._query_parallel(pipeline.sources, context)
+        
+        by_source = {r.source_name: r for r in results}
+        assert by_source['fast_gis'].utility_name == 'Oncor'
+        assert by_source['hung_gis'].error == 'timeout'
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the AISelector decision cache.
+
+Run: pytest tests/test_ai_selector_cache.py -v
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import ai_selector
+from pipeline.ai_selector import AIDecision, AISelector, invalidate_ai_decisions
+from pipeline.interfaces import LookupContext, SourceResult, UtilityType
+
+
+CANDIDATES = [
+    SourceResult(source_name='state_gis', utility_name='Oncor Electric Delivery', confidence_score=80, match_type='point'),
+    SourceResult(source_name='electric_coop', utility_name='CoServ Electric', confidence_score=75, match_type='point'),
+]
+
+
+def make_context(zip_code):
+    return LookupContext(
+        lat=33.0, lon=-96.9, address='1 Main St', city='Frisco', county='Denton',
+        state='TX', zip_code=zip_code, utility_type=UtilityType.ELECTRIC
+    )
+
+
+@pytest.fixture
+def selector(monkeypatch):
+    monkeypatch.setattr(ai_selector, 'AI_DECISION_CACHE_SHARED', False)
+    ai_selector._decision_cache.clear()
+    ai_selector._generation_cache.clear()
+    
+    selector = AISelector()
+    selector.api_key = 'test'
+    selector.calls = 0
+    selector.confidence = 0.9
+    
+    def fake_ai_select(context, candidates):
+        selector.calls += 1
+        return AIDecision(
+            utility_name='CoServ Electric', utility_type='electric', confidence=selector.confidence,
+            selected_source='electric_coop', reasoning='Co-op territory', all_candidates=[]
+        )
+    
+    monkeypatch.setattr(selector, '_ai_select', fake_ai_select)
+    return selector
+
+
+class TestAIDecisionCache:
+
+    def test_same_candidate_set_reuses_decision(self, selector):
+        first = selector.select(make_context('75034'), CANDIDATES)
+        second = selector.select(make_context('75034'), list(reversed(CANDIDATES)))
+        
+        assert selector.calls == 1
+        assert not first.cached
+        assert second.cached and second.utility_name == 'CoServ Electric'
+    
+    def test_confident_decisions_cover_the_zip_region(self, selector):
+        selector.select(make_context('75034'), CANDIDATES)
+        assert selector.select(make_context('75035'), CANDIDATES).cached
+        
+        selector.confidence = 0.6
+        selector.select(make_context('76201'), CANDIDATES)
+        assert not selector.select(make_context('76205'), CANDIDATES).cached
+    
+    def test_correction_invalidates_region(self, selector):
+        selector.select(make_context('75034'), CANDIDATES)
+        invalidate_ai_decisions('electric', 'TX', '75036')
+        
+        assert not selector.select(make_context('75034'), CANDIDATES).cached
+        assert selector.calls == 2
+
+    def test_only_waiters_on_a_concurrent_decision_are_cached(self, selector, monkeypatch):
+        started = threading.Event()
+        fake_ai_select = selector._ai_select
+        
+        def slow_ai_select(context, candidates):
+            started.set()
+            time.sleep(0.2)
+            return fake_ai_select(context, candidates)
+        
+        monkeypatch.setattr(selector, '_ai_select', slow_ai_select)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            first = executor.submit(selector.select, make_context('75034'), CANDIDATES)
+            started.wait()
+            others = [executor.submit(selector.select, make_context('75034'), CANDIDATES) for _ in range(2)]
+            leader, waiters = first.result(), [f.result() for f in others]
+        
+        assert selector.calls == 1
+        assert not leader.cached
+        assert all(w.cached for w in waiters)
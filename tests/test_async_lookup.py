@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the ArcGIS record/replay prefetch in async_lookup.py.
+
+The HTTP layer is faked, so these run offline.
+
+Run: pytest tests/test_async_lookup.py -v
+"""
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import async_lookup
+import gis_utility_lookup
+from gis_utility_lookup import _query_arcgis_point
+from pipeline.interfaces import DataSource, LookupContext, SourceResult, UtilityType
+from pipeline.pipeline import LookupPipeline
+
+STATE_URL = "https://example.com/state/FeatureServer/0/query"
+HIFLD_URL = "https://example.com/hifld/FeatureServer/0/query"
+
+
+def state_then_hifld(lat, lon):
+    """Shaped like the GIS lookups: state layer first, HIFLD if it misses."""
+    state = _query_arcgis_point(STATE_URL, lat, lon, "NAME")
+    if state:
+        return ('state', state['NAME'])
+    hifld = _query_arcgis_point(HIFLD_URL, lat, lon, "NAME")
+    return ('hifld', hifld['NAME']) if hifld else None
+
+
+@pytest.fixture
+def fake_arcgis(monkeypatch):
+    """Serve ArcGIS responses from a dict and record every fetch."""
+    if not async_lookup.AIOHTTP_AVAILABLE:
+        pytest.skip("aiohttp not installed")
+    
+    fetched = []
+    
+    def install(responses):
+        async def fake_fetch(url, lat, lon, out_fields="*"):
+            fetched.append(url)
+            return responses.get(url)
+        monkeypatch.setattr(async_lookup, 'fetch_arcgis_point', fake_fetch)
+    
+    def no_blocking_calls(*args, **kwargs):
+        raise AssertionError("blocking http_client.get used inside prefetch")
+    monkeypatch.setattr(gis_utility_lookup.http_client, 'get', no_blocking_calls)
+    # Answers cached by earlier runs would skip the fetches under test
+    monkeypatch.setattr(gis_utility_lookup, 'get_shared_cache', lambda: None)
+    
+    install.fetched = fetched
+    return install
+
+
+class TestArcGISPrefetch:
+
+    def test_replay_matches_sync_result(self, fake_arcgis):
+        fake_arcgis({STATE_URL: {'NAME': 'Oncor'}})
+        result = asyncio.run(async_lookup.run_with_arcgis_prefetch(state_then_hifld, 32.7, -96.8))
+        
+        assert result == ('state', 'Oncor')
+        # The state layer answered, so the fallback is never queried
+        assert fake_arcgis.fetched == [STATE_URL]
+    
+    def test_dependent_queries_fetched_in_later_rounds(self, fake_arcgis):
+        fake_arcgis({HIFLD_URL: {'NAME': 'HIFLD Electric'}})
+        result = asyncio.run(async_lookup.run_with_arcgis_prefetch(state_then_hifld, 32.7, -96.8))
+        
+        assert result == ('hifld', 'HIFLD Electric')
+        # Each query is fetched exactly once, in fallback order
+        assert fake_arcgis.fetched == [STATE_URL, HIFLD_URL]
+    
+    def test_prefetch_does_not_leak_out_of_the_call(self, fake_arcgis):
+        fake_arcgis({STATE_URL: {'NAME': 'Oncor'}})
+        asyncio.run(async_lookup.run_with_arcgis_prefetch(state_then_hifld, 32.7, -96.8))
+        
+        assert gis_utility_lookup._arcgis_prefetch.get() is None
+
+
+class SlowSource(DataSource):
+    """Blocking source that takes `delay` seconds of thread time."""
+    
+    def __init__(self, name, delay):
+        self._name = name
+        self.delay = delay
+    
+    @property
+    def name(self):
+        return self._name
+    
+    @property
+    def supported_types(self):
+        return [UtilityType.ELECTRIC]
+    
+    @property
+    def base_confidence(self):
+        return 80
+    
+    def query(self, context):
+        time.sleep(self.delay)
+        return SourceResult(source_name=self.name, utility_name='Oncor', confidence_score=80, match_type='point')
+
+
+class TestBlockingWork:
+
+    def test_queue_wait_is_not_source_time(self, monkeypatch):
+        # One thread: the second source waits ~0.2s for it, then works ~0.2s
+        monkeypatch.setattr(async_lookup, '_blocking_executor', ThreadPoolExecutor(max_workers=1))
+        pipeline = LookupPipeline()
+        pipeline.query_timeout = 0.3
+        sources = [SlowSource(f'slow_test_{i}_{time.time()}', 0.2) for i in range(2)]
+        context = LookupContext(lat=32.7, lon=-96.8, address='1 Main St', city='Dallas', county='Dallas',
+                                state='TX', zip_code='75201', utility_type=UtilityType.ELECTRIC)
+        
+        results = asyncio.run(pipeline._aquery_parallel(sources, context))
+        
+        assert [r.error for r in results] == [None, None]
+        assert all(r.query_time_ms < 300 for r in results)
+    
+    def test_source_working_past_its_budget_times_out(self, monkeypatch):
+        monkeypatch.setattr(async_lookup, '_blocking_executor', ThreadPoolExecutor(max_workers=2))
+        pipeline = LookupPipeline()
+        pipeline.query_timeout = 0.1
+        sources = [SlowSource(f'hung_test_{time.time()}', 0.5)]
+        context = LookupContext(lat=32.7, lon=-96.8, address='1 Main St', city='Dallas', county='Dallas',
+                                state='TX', zip_code='75201', utility_type=UtilityType.ELECTRIC)
+        
+        start = time.time()
+        results = asyncio.run(pipeline._aquery_parallel(sources, context))
+        
+        assert time.time() - start < 0.4
+        assert [r.error for r in results] == ['timeout']
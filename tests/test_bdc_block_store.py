@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar BDC block store.
+
+Run: pytest tests/test_bdc_block_store.py -v
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bdc_block_store
+import bdc_internet_lookup
+from bdc_block_store import BlockStore, build_block_store
+
+ROWS = [
+    ('481130001001000', 'AT&T', '50', 1000, 1000, 1),
+    ('481130001001000', 'Spectrum', '40', 300, 10, 1),
+    ('481130001001000', 'Spectrum', '40', 500, 20, 1),     # duplicate offer - best speeds kept
+    ('481130001002000', 'AT&T', '50', 1000, 1000, 1),
+    ('481130001002000', 'Spectrum', '40', 500, 20, 1),     # same offers as 1001000
+    ('481130002001000', 'Starlink', '72', 220.5, 25, 0),
+    ('48113000200BAD0', 'Nobody', '50', 1, 1, 0),
+]
+
+
+@pytest.fixture
+def source_db(tmp_path):
+    path = str(tmp_path / 'bdc.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE providers (block_geoid TEXT, provider_name TEXT, technology TEXT, '
+                 'max_down REAL, max_up REAL, low_latency INTEGER)')
+    conn.executemany('INSERT INTO providers VALUES (?, ?, ?, ?, ?, ?)', ROWS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestBlockStore:
+
+    def test_build_dictionary_encodes_repeated_offers(self, source_db, tmp_path):
+        counts = build_block_store(source_db, str(tmp_path / 'bdc.bin'))
+        
+        assert counts['blocks'] == 3 and counts['tracts'] == 2
+        assert counts['skipped'] == 1
+        # Both blocks of tract 48113000100 share one provider set, which is also the tract's
+        assert counts['sets'] == 2
+        assert counts['names'] == 3
+    
+    def test_block_and_tract_lookup(self, source_db, tmp_path):
+        build_block_store(source_db, str(tmp_path / 'bdc.bin'))
+        store = BlockStore(str(tmp_path / 'bdc.bin'))
+        
+        assert sorted(store.lookup_block('481130001001000')) == [
+            ('AT&T', '50', 1000, 1000, 1),
+            ('Spectrum', '40', 500, 20, 1),
+        ]
+        assert store.lookup_block('481130002001000') == [('Starlink', '72', 220.5, 25, 0)]
+        assert store.lookup_block('481130001003000') is None
+        assert store.lookup_block('not-a-geoid') is None
+        assert store.lookup_tract('48113000100') == sorted(store.lookup_block('481130001002000'))
+        assert store.lookup_tract('48113000300') is None
+    
+    def test_internet_lookup_prefers_store(self, source_db, tmp_path, monkeypatch):
+        build_block_store(source_db, str(tmp_path / 'bdc.bin'))
+        monkeypatch.setattr(bdc_block_store, 'BDC_STORE_PATH', str(tmp_path / 'bdc.bin'))
+        monkeypatch.setattr(bdc_block_store, '_store', None)
+        monkeypatch.setattr(bdc_internet_lookup, 'DB_PATH', str(tmp_path / 'missing.db'))
+        
+        result = bdc_internet_lookup.lookup_internet_by_block('481130001009999')
+        assert [p['name'] for p in result['providers']] == ['AT&T', 'Spectrum']
+        assert result['providers'][1]['technology'] == 'Cable'
+        assert bdc_internet_lookup.get_available_states() == ['ALL']
+
+    def test_store_older_than_database_falls_back_to_sqlite(self, source_db, tmp_path, monkeypatch):
+        build_block_store(source_db, str(tmp_path / 'bdc.bin'))
+        monkeypatch.setattr(bdc_block_store, 'BDC_STORE_PATH', str(tmp_path / 'bdc.bin'))
+        monkeypatch.setattr(bdc_block_store, '_store', None)
+        monkeypatch.setattr(bdc_internet_lookup, 'DB_PATH', source_db)
+        assert bdc_block_store.get_block_store().matches_source(source_db)
+        
+        # Reloaded data: Spectrum leaves the block
+        conn = sqlite3.connect(source_db)
+        conn.execute("DELETE FROM providers WHERE provider_name = 'Spectrum'")
+        conn.commit()
+        conn.close()
+        os.utime(source_db, ns=(0, 0))
+        
+        assert not bdc_block_store.get_block_store().matches_source(source_db)
+        result = bdc_internet_lookup.lookup_internet_by_block('481130001001000')
+        assert [p['name'] for p in result['providers']] == ['AT&T']
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the Census batch geocoding stage.
+
+The Census and fallback geocoders are faked, so these run offline.
+
+Run: pytest tests/test_census_batch_geocoder.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import census_batch_geocoder
+import geocode_cache
+from census_batch_geocoder import _parse_match, _resolve_places, _split_address, geocode_addresses
+
+MATCH_ROW = [
+    '0', '123 Main St, Austin, TX, 78701', 'Match', 'Exact',
+    '123 MAIN ST, AUSTIN, TX, 78701', '-97.7431,30.2672', '63951', 'L',
+    '48', '453', '001100', '1000',
+]
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(geocode_cache, 'get_shared_cache', lambda: None)
+    monkeypatch.setattr(census_batch_geocoder, 'get_shared_cache', lambda: None)
+    monkeypatch.setattr(census_batch_geocoder, '_places_for_block',
+                        lambda *args: {'city': 'Austin', 'county': 'Travis'})
+    geocode_cache.clear_geocode_cache()
+    yield
+    geocode_cache.clear_geocode_cache()
+
+
+class TestCensusBatch:
+
+    def test_split_address(self):
+        assert _split_address('123 Main St, Apt 4, Austin, TX 78701-1234') == ('123 Main St, Apt 4', 'Austin', 'TX', '78701')
+        assert _split_address('123 Main St, Austin, TX, 78701') == ('123 Main St', 'Austin', 'TX', '78701')
+    
+    def test_parse_match_has_single_geocoder_shape(self):
+        result = _parse_match('123 Main St, Austin, TX 78701', MATCH_ROW)
+        # City is the Census place of the block, not the postal city
+        assert _resolve_places({'123 Main St, Austin, TX 78701': result}) == {'123 Main St, Austin, TX 78701'}
+        
+        assert (result['lat'], result['lon']) == (30.2672, -97.7431)
+        assert result['state'] == 'TX' and result['city'] == 'Austin' and result['county'] == 'Travis'
+        assert result['zip_code'] == '78701'
+        assert result['block_geoid'] == '484530011001000'
+        # Match in a different postal region is rejected, like geocode_address does
+        assert _parse_match('123 Main St, Austin, TX 90210', MATCH_ROW) is None
+    
+    def test_only_misses_fall_through(self, monkeypatch):
+        matched = _parse_match('1 Main St, Austin, TX 78701', MATCH_ROW)
+        monkeypatch.setattr(census_batch_geocoder, 'geocode_census_batch', lambda addresses: {
+            '1 Main St, Austin, TX 78701': matched,
+            '2 New Rd, Austin, TX 78701': None,
+        })
+        calls = []
+        def fake_geocode(address, include_geography=False, skip_census=False):
+            calls.append((address, skip_census))
+            return {'lat': 1.0, 'lon': 2.0, 'source': 'Google'}
+        monkeypatch.setattr(census_batch_geocoder, 'geocode_address', fake_geocode)
+        
+        results = geocode_addresses(['1 Main St, Austin, TX 78701', '2 New Rd, Austin, TX 78701'])
+        
+        assert results['1 Main St, Austin, TX 78701']['source'] == 'Census'
+        assert results['2 New Rd, Austin, TX 78701']['source'] == 'Google'
+        assert calls == [('2 New Rd, Austin, TX 78701', True)]
+
+    def test_unresolved_place_is_not_cached(self, monkeypatch):
+        class FakeResponse:
+            text = ','.join(f'"{v}"' for v in MATCH_ROW) + '\n'
+            def raise_for_status(self):
+                pass
+        monkeypatch.setattr(census_batch_geocoder.http_client, 'post', lambda *a, **k: FakeResponse())
+        monkeypatch.setattr(census_batch_geocoder, '_places_for_block', lambda *args: None)
+        
+        results = geocode_addresses(['123 Main St, Austin, TX 78701'])
+        
+        assert results['123 Main St, Austin, TX 78701']['city'] is None
+        assert '_place_resolved' not in results['123 Main St, Austin, TX 78701']
+        assert geocode_cache.get_cached_geocode('123 Main St, Austin, TX 78701', True) == (False, None)
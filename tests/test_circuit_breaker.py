@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for per-dependency circuit breakers.
+
+Run: pytest tests/test_circuit_breaker.py -v
+"""
+
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import circuit_breaker
+import http_client
+from circuit_breaker import CircuitBreaker, CircuitOpenError, dependency_for_url
+
+
+class TestCircuitBreaker:
+
+    def test_trips_on_failure_rate(self):
+        breaker = CircuitBreaker('test', failure_rate=0.5, min_calls=4)
+        breaker.record_success()
+        breaker.record_failure('boom')
+        breaker.record_failure('boom')
+        # Only 3 calls so far - not enough to judge
+        assert breaker.state == 'closed'
+        breaker.record_failure('boom')
+        assert breaker.state == 'open'
+        assert breaker.allow() is False
+        assert breaker.stats()['rejected'] == 1
+    
+    def test_call_fails_fast_when_open(self):
+        breaker = CircuitBreaker('test', min_calls=1)
+        calls = []
+        
+        def failing():
+            calls.append(1)
+            raise ValueError('down')
+        
+        with pytest.raises(ValueError):
+            breaker.call(failing)
+        with pytest.raises(CircuitOpenError):
+            breaker.call(failing)
+        assert len(calls) == 1
+    
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker('test', min_calls=1, open_seconds=0.05)
+        breaker.record_failure('down')
+        assert breaker.allow() is False
+        time.sleep(0.06)
+        
+        # One probe at a time
+        assert breaker.state == 'half_open'
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+        
+        # Failed probe re-opens, successful probe closes
+        breaker.record_failure('still down')
+        assert breaker.state == 'open'
+        time.sleep(0.06)
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == 'closed'
+        assert breaker.stats()['window_calls'] == 0
+
+
+class TestHttpClientBreaker:
+
+    def test_open_host_is_not_called(self, monkeypatch):
+        sent = []
+        
+        def fake_request(self, method, url, **kwargs):
+            sent.append(url)
+            raise requests.exceptions.ConnectionError('refused')
+        
+        monkeypatch.setattr(requests.Session, 'request', fake_request)
+        monkeypatch.setattr(circuit_breaker, '_breakers', {})
+        monkeypatch.setitem(
+            circuit_breaker._breakers, 'airtable',
+            CircuitBreaker('airtable', min_calls=2, open_seconds=60)
+        )
+        
+        url = 'https://api.airtable.com/v0/base/table'
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                http_client.get(url)
+        # Tripped - the next call never reaches the network
+        with pytest.raises(CircuitOpenError):
+            http_client.get(url)
+        assert len(sent) == 2
+        assert circuit_breaker.breaker_states()['airtable']['state'] == 'open'
+
+    def test_arcgis_online_is_keyed_by_org_and_service(self, monkeypatch):
+        assert dependency_for_url('https://geocoding.geo.census.gov/geocoder/x') == 'census_geocoder'
+        assert dependency_for_url('https://gis.county.gov/arcgis/rest/services/Water/MapServer/0') == 'gis.county.gov'
+        assert dependency_for_url(
+            'https://services3.arcgis.com/AbC123/arcgis/rest/services/Electric_Territories/FeatureServer/0/query'
+        ) == 'services3.arcgis.com/AbC123/Electric_Territories'
+        
+        def fake_request(self, method, url, **kwargs):
+            raise requests.exceptions.ConnectionError('refused')
+        monkeypatch.setattr(requests.Session, 'request', fake_request)
+        monkeypatch.setattr(circuit_breaker, '_breakers', {})
+        
+        down = 'https://services.arcgis.com/OrgA/arcgis/rest/services/Gas/FeatureServer/0/query'
+        for _ in range(circuit_breaker.CIRCUIT_MIN_CALLS):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                http_client.get(down)
+        with pytest.raises(CircuitOpenError):
+            http_client.get(down)
+        # Another org on the same host still gets its requests sent
+        with pytest.raises(requests.exceptions.ConnectionError) as e:
+            http_client.get('https://services.arcgis.com/OrgB/arcgis/rest/services/Water/FeatureServer/0/query')
+        assert not isinstance(e.value, CircuitOpenError)
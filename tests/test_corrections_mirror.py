@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory Airtable corrections mirror.
+
+Run: pytest tests/test_corrections_mirror.py -v
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+from pipeline.interfaces import LookupContext, UtilityType
+from pipeline.sources import corrections_mirror
+from pipeline.sources.corrections import UserCorrectionSource
+from pipeline.sources.corrections_mirror import CorrectionsMirror
+
+
+class FakeResponse:
+    status_code = 200
+    
+    def __init__(self, data):
+        self._data = data
+    
+    def json(self):
+        return self._data
+
+
+def record(record_id, created, **fields):
+    return {'id': record_id, 'createdTime': created, 'fields': fields}
+
+
+class FakeAirtable:
+    """Serves a table in pages of two and records the requests."""
+    
+    def __init__(self, records):
+        self.records = records
+        self.requests = []
+    
+    def get(self, url, params=None, **kwargs):
+        params = dict(params or {})
+        self.requests.append(params)
+        start = int(params.get('offset', 0))
+        page = self.records[start:start + 2]
+        data = {'records': page}
+        if start + 2 < len(self.records):
+            data['offset'] = str(start + 2)
+        return FakeResponse(data)
+
+
+def make_mirror(monkeypatch, airtable):
+    monkeypatch.setattr(http_client, 'get', airtable.get)
+    mirror = CorrectionsMirror(api_key='key', base_id='base')
+    # No background thread in tests - sync() is called directly
+    monkeypatch.setattr(mirror, '_ensure_started', lambda: None)
+    return mirror
+
+
+class TestCorrectionsMirror:
+
+    def test_full_sync_indexes_zip_and_city(self, monkeypatch):
+        airtable = FakeAirtable([
+            record('rec1', '2026-01-01T00:00:00.000Z', zip_code='75201', city='Dallas', state='TX',
+                   utility_type='electric', correct_provider='Oncor'),
+            record('rec2', '2026-01-02T00:00:00.000Z', zip_code='75202', city='Dallas', state='TX',
+                   utility_type='electric', correct_provider='TXU'),
+            record('rec3', '2026-01-03T00:00:00.000Z', zip_code='75201', city='Dallas', state='TX',
+                   utility_type='gas', correct_provider='Atmos Energy'),
+        ])
+        mirror = make_mirror(monkeypatch, airtable)
+        
+        assert mirror.sync() == 3
+        # Followed the pagination offset
+        assert len(airtable.requests) == 2
+        assert 'filterByFormula' not in airtable.requests[0]
+        
+        assert [r['correct_provider'] for r in mirror.lookup('75201', 'Dallas', 'TX', 'electric')] == ['Oncor']
+        # No ZIP match - city/state fallback, oldest first
+        assert [r['correct_provider'] for r in mirror.lookup('75299', 'Dallas', 'TX', 'electric')] == ['Oncor', 'TXU']
+        assert mirror.lookup('10001', 'New York', 'NY', 'electric') == []
+    
+    def test_incremental_and_full_sync(self, monkeypatch):
+        airtable = FakeAirtable([
+            record('rec1', '2026-01-01T00:00:00.000Z', zip_code='75201', utility_type='electric', correct_provider='Oncor'),
+            record('rec2', '2026-01-02T00:00:00.000Z', zip_code='75202', utility_type='electric', correct_provider='TXU'),
+        ])
+        mirror = make_mirror(monkeypatch, airtable)
+        mirror.sync()
+        
+        # Incremental: only the modified record comes back, the rest is kept
+        airtable.records = [
+            record('rec1', '2026-01-01T00:00:00.000Z', zip_code='75201', utility_type='electric', correct_provider='CenterPoint'),
+        ]
+        mirror.sync()
+        assert 'LAST_MODIFIED_TIME()' in airtable.requests[-1]['filterByFormula']
+        assert mirror.lookup('75201', None, None, 'electric')[0]['correct_provider'] == 'CenterPoint'
+        assert mirror.lookup('75202', None, None, 'electric')[0]['correct_provider'] == 'TXU'
+        
+        # Full: records no longer in Airtable are dropped
+        mirror.sync(full=True)
+        assert mirror.lookup('75202', None, None, 'electric') == []
+        assert mirror.stats()['records'] == 1
+    
+    def test_source_reads_mirror_not_airtable(self, monkeypatch):
+        airtable = FakeAirtable([
+            record('rec1', '2026-01-01T00:00:00.000Z', zip_code='75201', utility_type='electric',
+                   correct_provider='Oncor', verified=True),
+        ])
+        mirror = make_mirror(monkeypatch, airtable)
+        mirror.sync()
+        monkeypatch.setattr(corrections_mirror, '_mirror', mirror)
+        requests_after_sync = len(airtable.requests)
+        
+        context = LookupContext(
+            lat=32.78, lon=-96.80, address='1 Main St, Dallas, TX 75201',
+            city='Dallas', county='Dallas', state='TX', zip_code='75201',
+            utility_type=UtilityType.ELECTRIC
+        )
+        result = UserCorrectionSource().query(context)
+        assert result.utility_name == 'Oncor'
+        assert result.confidence_score == 95
+        assert len(airtable.requests) == requests_after_sync
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for pooled database access and the tract-level internet fallback.
+
+Run: pytest tests/test_db_pool.py -v
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bdc_internet_lookup
+import db_pool
+from db_pool import pg_execute_prepared, sqlite_readonly
+
+ROWS = [
+    ('481130001001000', 'Spectrum', '40', 300, 10, 1),
+    ('481130001001000', 'AT&T', '50', 1000, 1000, 1),
+    ('481130001002000', 'AT&T', '50', 5000, 5000, 1),
+    ('481130001002000', 'Starlink', '72', 200, 20, 0),
+]
+
+
+@pytest.fixture
+def bdc_db(tmp_path, monkeypatch):
+    path = str(tmp_path / 'bdc.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE providers (block_geoid TEXT, provider_name TEXT, technology TEXT, '
+                 'max_down INTEGER, max_up INTEGER, low_latency INTEGER)')
+    conn.executemany('INSERT INTO providers VALUES (?, ?, ?, ?, ?, ?)', ROWS)
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(bdc_internet_lookup, 'DB_PATH', path)
+    # Exercise the SQLite path even where a block store has been built
+    monkeypatch.setattr(bdc_internet_lookup, 'get_block_store', lambda: None)
+    monkeypatch.setattr(db_pool, '_sqlite_tables', {})
+    return path
+
+
+class FakeCursor:
+    def __init__(self, log):
+        self.log = log
+    
+    def execute(self, sql, params=None):
+        self.log.append((sql, params))
+    
+    def fetchone(self):
+        return None
+
+
+class FakeConnection:
+    def __init__(self):
+        self.prepared = set()
+        self.log = []
+    
+    def cursor(self):
+        return FakeCursor(self.log)
+
+
+class TestDbPool:
+
+    def test_sqlite_handle_reused_per_thread_and_read_only(self, bdc_db):
+        conn = sqlite_readonly(bdc_db)
+        assert sqlite_readonly(bdc_db) is conn
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute('DELETE FROM providers')
+        
+        other = []
+        thread = threading.Thread(target=lambda: other.append(sqlite_readonly(bdc_db)))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+    
+    def test_statement_prepared_once_per_connection(self):
+        conn = FakeConnection()
+        for geoid in ('481130001001000', '481130001002000'):
+            pg_execute_prepared(conn, 'internet_block',
+                                'SELECT providers FROM internet_providers WHERE block_geoid = $1', (geoid,))
+        
+        statements = [sql for sql, _ in conn.log]
+        assert statements[0].startswith('PREPARE internet_block AS SELECT')
+        assert statements[1:] == ['EXECUTE internet_block (%s)'] * 2
+        assert conn.log[2][1] == ('481130001002000',)
+    
+    def test_tract_fallback_same_with_and_without_aggregate(self, bdc_db):
+        exact = bdc_internet_lookup.lookup_internet_by_block('481130001001000')
+        assert [p['name'] for p in exact['providers']] == ['AT&T', 'Spectrum']
+        
+        scanned = bdc_internet_lookup.lookup_internet_by_block('481130001009999')
+        
+        assert bdc_internet_lookup.build_tract_table(bdc_db) == 3
+        db_pool.discard_sqlite_handle(bdc_db)
+        aggregated = bdc_internet_lookup.lookup_internet_by_block('481130001009999')
+        
+        assert {p['name'] for p in aggregated['providers']} == {p['name'] for p in scanned['providers']}
+        # The aggregate keeps the tract's best plan per provider and technology
+        assert aggregated['providers'][0] == {
+            'name': 'AT&T', 'technology': 'Fiber', 'max_download_mbps': 5000,
+            'max_upload_mbps': 5000, 'low_latency': True,
+        }
+        assert bdc_internet_lookup.lookup_internet_by_block('999999999999999')['providers'] == []
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the parallel BDC exporter's sharding, COPY encoding and resume.
+
+PostgreSQL is replaced by a recording fake connection.
+
+Run: pytest tests/test_export_parallel.py -v
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export_parallel
+
+BLOCKS = [
+    ('060010001001000', '[{"name": "AT&T"}]'),
+    ('060010001002000', '[{"name": "Comcast"}]'),
+    ('060010001003000', '[{"name": "Sonic"}]'),
+    ('481130001001000', '[{"name": "Tab\\there"}]'),
+    ('990000000000000', '[]'),
+]
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def execute(self, sql, params=None):
+        self.conn.statements.append(' '.join(sql.split()))
+    
+    def fetchone(self):
+        return (self.conn.stage_exists,)
+    
+    def copy_expert(self, sql, buffer):
+        self.conn.copied.append(buffer.read())
+
+
+class FakePG:
+    def __init__(self, stage_exists=False):
+        self.stage_exists = stage_exists
+        self.statements = []
+        self.copied = []
+    
+    def cursor(self):
+        return FakeCursor(self)
+    
+    def commit(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    path = str(tmp_path / 'bdc.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE block_providers_agg (block_geoid TEXT, providers_json TEXT)')
+    conn.executemany('INSERT INTO block_providers_agg VALUES (?, ?)', BLOCKS)
+    conn.execute('CREATE INDEX idx_block_geoid ON block_providers_agg(block_geoid)')
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(export_parallel, 'CHECKPOINT_DIR', str(tmp_path / 'checkpoints'))
+    return path
+
+
+class TestExportParallel:
+
+    def test_shards_by_state_prefix(self, source):
+        assert export_parallel.shard_prefixes(source) == ['06', '48', '99']
+        
+        conn = sqlite3.connect(source)
+        batches = list(export_parallel.iter_shard_batches(conn, '06', after='060010001001000', batch_size=1))
+        assert batches == [[BLOCKS[1]], [BLOCKS[2]]]
+    
+    def test_copy_escapes_text_format(self):
+        pg = FakePG()
+        export_parallel.copy_rows(pg.cursor(), 'stage', [BLOCKS[3], ('1', 'a\\b\nc')])
+        assert pg.copied == ['481130001001000\t[{"name": "Tab\\\\there"}]\n1\ta\\\\b\\nc\n']
+    
+    def test_shard_resumes_from_checkpoint_then_merges(self, source, monkeypatch):
+        pg = FakePG(stage_exists=True)
+        monkeypatch.setattr(export_parallel, 'get_pg_connection', lambda url: pg)
+        export_parallel.save_checkpoint('06', {'last_block': '060010001001000', 'rows': 1, 'seconds': 0.1, 'done': False})
+        
+        checkpoint = export_parallel.export_shard('06', source, 'postgresql://test', batch_size=1)
+        
+        assert checkpoint['done'] and checkpoint['rows'] == 3
+        assert checkpoint['last_block'] == '060010001003000'
+        # Only the rows after the checkpoint were copied, and the stage wasn't truncated
+        assert [data.split('\t')[0] for data in pg.copied] == ['060010001002000', '060010001003000']
+        assert not any(s.startswith('TRUNCATE') for s in pg.statements)
+        assert any(s.startswith('INSERT INTO internet_providers') and 'DISTINCT ON' in s for s in pg.statements)
+        
+        # A finished shard is skipped
+        pg.copied.clear()
+        assert export_parallel.export_shard('06', source, 'postgresql://test', 1)['done']
+        assert pg.copied == []
+        with open(export_parallel.checkpoint_path('06')) as f:
+            assert json.load(f)['done'] is True
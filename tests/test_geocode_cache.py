@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the geocode result cache.
+
+Run: pytest tests/test_geocode_cache.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import geocode_cache
+from shared_cache import SQLiteCache
+
+CENSUS_RESULT = {
+    'lat': 30.2672, 'lon': -97.7431, 'source': 'Census',
+    'city': 'Austin', 'state': 'TX', 'block_geoid': '484530011001000',
+}
+
+
+@pytest.fixture
+def shared(tmp_path, monkeypatch):
+    """Fresh local and shared tiers for each test."""
+    cache = SQLiteCache(tmp_path / 'cache.db')
+    monkeypatch.setattr(geocode_cache, 'get_shared_cache', lambda: cache)
+    geocode_cache.clear_geocode_cache()
+    yield cache
+    geocode_cache.clear_geocode_cache()
+
+
+class TestGeocodeCache:
+
+    def test_spelling_variants_share_an_entry(self, shared):
+        geocode_cache.set_cached_geocode('123 Main Street, Austin, TX 78701', True, CENSUS_RESULT)
+        
+        hit, result = geocode_cache.get_cached_geocode('123 main st, austin, tx 78701', True)
+        assert hit
+        assert result['block_geoid'] == '484530011001000'
+    
+    def test_geography_result_answers_location_request(self, shared):
+        geocode_cache.set_cached_geocode('123 Main St, Austin, TX 78701', True, CENSUS_RESULT)
+        
+        assert geocode_cache.get_cached_geocode('123 Main St, Austin, TX 78701', False)[0]
+        # ...but not the other way round
+        geocode_cache.set_cached_geocode('9 Elm St, Austin, TX 78701', False, CENSUS_RESULT)
+        assert not geocode_cache.get_cached_geocode('9 Elm St, Austin, TX 78701', True)[0]
+    
+    def test_failures_are_cached_as_hits(self, shared):
+        geocode_cache.set_cached_geocode('nowhere', True, None)
+        
+        assert geocode_cache.get_cached_geocode('nowhere', True) == (True, None)
+    
+    def test_other_workers_see_entries(self, shared):
+        geocode_cache.set_cached_geocode('123 Main St, Austin, TX 78701', True, CENSUS_RESULT)
+        geocode_cache.clear_geocode_cache()
+        
+        hit, result = geocode_cache.get_cached_geocode('123 Main St, Austin, TX 78701', True)
+        assert hit and result['lat'] == 30.2672
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared pooled HTTP client.
+
+Run: pytest tests/test_http_client.py -v
+"""
+
+import os
+import sys
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import http_client
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Adapter that records what would be sent instead of sending it."""
+    
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+    
+    def send(self, request, **kwargs):
+        self.sent.append(kwargs)
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response._content = b'{}'
+        return response
+
+
+class TestHTTPClient:
+    
+    def test_session_is_shared(self):
+        assert http_client.get_session() is http_client.get_session()
+    
+    def test_default_timeout_applied(self):
+        session = http_client.create_session()
+        adapter = RecordingAdapter()
+        session.mount('https://', adapter)
+        
+        session.get('https://example.com/a')
+        session.get('https://example.com/b', timeout=2)
+        
+        assert adapter.sent[0]['timeout'] == http_client.DEFAULT_TIMEOUT
+        assert adapter.sent[1]['timeout'] == 2
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for per-type completion callbacks in utility_lookup_v1.
+
+Per-type lookups are faked, so these run offline.
+
+Run: pytest tests/test_lookup_callbacks.py -v
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utility_lookup_v1
+
+DELAYS = {'electric': 0.3, 'gas': 0.05, 'water': 0.15}
+
+
+def fake_single_type_lookup(address, selected_utilities=None, **kwargs):
+    utility = selected_utilities[0]
+    time.sleep(DELAYS[utility])
+    return {utility: {'NAME': f"{utility.title()} Co"}, 'location': {'state': 'TX'}}
+
+
+class TestLookupCallbacks:
+
+    def test_types_reported_in_completion_order(self, monkeypatch):
+        monkeypatch.setattr(utility_lookup_v1, 'lookup_utilities_by_address', fake_single_type_lookup)
+        reported = []
+        
+        merged = utility_lookup_v1._lookup_each_type(
+            "1 Main St, Austin, TX 78701", ['electric', 'gas', 'water'], {'lat': 1, 'lon': 2},
+            lambda utility, value: reported.append((utility, value['NAME']))
+        )
+        
+        assert reported == [('gas', 'Gas Co'), ('water', 'Water Co'), ('electric', 'Electric Co')]
+        assert merged['electric']['NAME'] == 'Electric Co'
+        assert merged['gas']['NAME'] == 'Gas Co'
+        assert merged['water']['NAME'] == 'Water Co'
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Fan-out tests for utility_lookup.lookup_utilities_by_address.
+
+Pipelines are replaced with fakes so these run offline.
+
+Run: pytest tests/test_lookup_fanout.py -v
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utility_lookup
+from pipeline.interfaces import UtilityType, PipelineResult
+
+
+FAKE_GEO = {
+    'lat': 30.27, 'lon': -97.74, 'city': 'Austin', 'county': 'Travis',
+    'state': 'TX', 'zip_code': '78701',
+}
+
+
+class FakePipeline:
+    """Stands in for LookupPipeline; sleeps, then returns a fixed name."""
+    
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self.delay = delay
+    
+    def _result(self, context):
+        return PipelineResult(
+            utility_name=self.name,
+            utility_type=context.utility_type,
+            confidence_score=90,
+            confidence_level='verified',
+            source='fake',
+        )
+    
+    def lookup(self, context):
+        time.sleep(self.delay)
+        return self._result(context)
+    
+    async def alookup(self, context):
+        await asyncio.sleep(self.delay)
+        return self._result(context)
+
+
+@pytest.fixture
+def fake_pipelines(monkeypatch):
+    monkeypatch.setattr(utility_lookup, 'geocode_address', lambda *a, **k: dict(FAKE_GEO))
+    
+    def install(delays):
+        config = {}
+        for name, delay in delays.items():
+            pipeline = FakePipeline(f"{name.title()} Co", delay)
+            config[name] = ((lambda p=pipeline: p), UtilityType(name))
+        monkeypatch.setattr(utility_lookup, 'UTILITY_PIPELINES', config)
+    
+    return install
+
+
+class TestFanout:
+
+    def test_parallel_pays_max_not_sum(self, fake_pipelines):
+        fake_pipelines({'electric': 0.3, 'gas': 0.3, 'water': 0.3})
+        start = time.time()
+        result = utility_lookup.lookup_utilities_by_address("1 Main St, Austin, TX 78701")
+        elapsed = time.time() - start
+        
+        assert elapsed < 0.8
+        assert result['electric']['NAME'] == 'Electric Co'
+        assert result['gas']['NAME'] == 'Gas Co'
+        assert result['water']['NAME'] == 'Water Co'
+        assert '_timed_out' not in result
+    
+    def test_sequential_mode_matches_parallel(self, fake_pipelines):
+        fake_pipelines({'electric': 0, 'gas': 0, 'water': 0})
+        address = "1 Main St, Austin, TX 78701"
+        parallel = utility_lookup.lookup_utilities_by_address(address)
+        sequential = utility_lookup.lookup_utilities_by_address(address, parallel=False)
+        
+        for utility in ('electric', 'gas', 'water'):
+            assert parallel[utility]['NAME'] == sequential[utility]['NAME']
+    
+    def test_deadline_returns_partial_results(self, fake_pipelines):
+        fake_pipelines({'electric': 0.05, 'gas': 1.5, 'water': 0.05})
+        result = utility_lookup.lookup_utilities_by_address(
+            "1 Main St, Austin, TX 78701", timeout=0.5
+        )
+        
+        assert result['electric']['NAME'] == 'Electric Co'
+        assert result['water']['NAME'] == 'Water Co'
+        assert result['gas'] is None
+        assert result['_timed_out'] == ['gas']
+        assert list(k for k in result if not k.startswith('_')) == ['electric', 'gas', 'water']
+    
+    def test_async_entry_point(self, fake_pipelines):
+        fake_pipelines({'electric': 0.05, 'gas': 0.05, 'water': 0.05})
+        result = asyncio.run(utility_lookup.async_lookup_utilities_by_address(
+            "1 Main St, Austin, TX 78701", selected_utilities=['Gas', 'electric']
+        ))
+        
+        assert list(k for k in result if not k.startswith('_')) == ['gas', 'electric']
+        assert result['gas']['NAME'] == 'Gas Co'
+    
+    def test_pre_resolved_geocode_is_not_repeated(self, fake_pipelines, monkeypatch):
+        fake_pipelines({'electric': 0, 'gas': 0, 'water': 0})
+        def no_geocode(*args, **kwargs):
+            raise AssertionError("geocoded again")
+        monkeypatch.setattr(utility_lookup, 'geocode_address', no_geocode)
+        
+        result = utility_lookup.lookup_utilities_by_address(
+            "1 Main St, Austin, TX 78701", geo_result=dict(FAKE_GEO)
+        )
+        
+        assert result['electric']['NAME'] == 'Electric Co'
+
+    def test_legacy_lookup_without_pipeline(self, monkeypatch):
+        monkeypatch.setattr(utility_lookup, 'geocode_address', lambda *a, **k: dict(FAKE_GEO))
+        monkeypatch.setattr(utility_lookup, 'PIPELINE_AVAILABLE', False)
+        # What the module is left with when the pipeline import fails
+        monkeypatch.delattr(utility_lookup, 'PipelineResult')
+        monkeypatch.setattr(utility_lookup, 'UTILITY_PIPELINES', {
+            name: (None, None) for name in ('electric', 'gas', 'water')
+        })
+        legacy = {'water': {'NAME': 'Austin Water', '_source': 'legacy_water_lookup'}}
+        monkeypatch.setattr(utility_lookup, '_legacy_lookup', lambda name, context: legacy.get(name))
+        
+        result = utility_lookup.lookup_utilities_by_address("1 Main St, Austin, TX 78701")
+        assert result['water']['NAME'] == 'Austin Water'
+        assert result['electric'] is None and result['gas'] is None
+
+
+class TestInternetGeocodeReuse:
+
+    @pytest.fixture
+    def bdc(self, monkeypatch):
+        import bdc_internet_lookup
+        import utility_lookup_v1
+        monkeypatch.delenv('DATABASE_URL', raising=False)
+        monkeypatch.setattr(bdc_internet_lookup, 'get_available_states', lambda: ['ALL'])
+        monkeypatch.setattr(bdc_internet_lookup, 'lookup_internet_by_block', lambda block_geoid: {
+            'providers': [{'name': 'AT&T', 'technology': 'Fiber', 'max_download_mbps': 1000}],
+            'provider_count': 1, 'block_geoid': block_geoid,
+        })
+        geocoded = []
+        def geocode(address, include_geography=False):
+            geocoded.append(address)
+            return dict(FAKE_GEO, block_geoid='484530011001000')
+        monkeypatch.setattr(utility_lookup_v1, 'geocode_address', geocode)
+        return utility_lookup_v1, geocoded
+    
+    def test_geocode_with_block_is_reused(self, bdc):
+        utility_lookup_v1, geocoded = bdc
+        result = utility_lookup_v1.lookup_internet_providers(
+            "1 Main St, Austin, TX 78701", geo_result=dict(FAKE_GEO, block_geoid='481130001001000')
+        )
+        assert result['_block_geoid'] == '481130001001000'
+        assert geocoded == []
+    
+    def test_result_without_block_is_geocoded(self, bdc):
+        utility_lookup_v1, geocoded = bdc
+        # e.g. a geocode made without geography, or a boundary-lookup dict
+        result = utility_lookup_v1.lookup_internet_providers(
+            "1 Main St, Austin, TX 78701", geo_result={'utility': 'Oncor', 'confidence': 0.9}
+        )
+        assert result['_block_geoid'] == '484530011001000'
+        assert geocoded == ["1 Main St, Austin, TX 78701"]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the fixed-bucket latency histograms and the Prometheus export.
+
+Run: pytest tests/test_metrics_histogram.py -v
+"""
+
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitoring.histogram import LatencyHistogram
+from monitoring.metrics import MetricsCollector
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_within_one_bucket(self):
+        hist = LatencyHistogram()
+        for ms in range(1, 1001):
+            hist.observe(ms)
+        
+        assert hist.count == 1000
+        assert 450 <= hist.percentile(0.50) <= 550
+        assert 900 <= hist.percentile(0.95) <= 1000
+        assert 900 <= hist.percentile(0.99) <= 1000
+        assert LatencyHistogram().percentile(0.99) == 0.0
+    
+    def test_merge_equals_single_histogram(self):
+        a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for ms in (5, 40, 900):
+            a.observe(ms)
+            both.observe(ms)
+        for ms in (12, 3000):
+            b.observe(ms)
+            both.observe(ms)
+        
+        merged = LatencyHistogram().merge(a).merge(b)
+        assert merged.counts == both.counts
+        assert merged.sum == both.sum
+    
+    def test_dict_round_trip(self):
+        hist = LatencyHistogram()
+        hist.observe(250)
+        
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(hist.to_dict())))
+        assert restored.counts == hist.counts
+        assert LatencyHistogram.from_dict({'counts': [1, 2], 'sum': 3}) is None
+
+
+class TestPrometheusExport:
+
+    def test_merges_other_workers(self, tmp_path, monkeypatch):
+        collector = MetricsCollector()
+        monkeypatch.setattr(collector, '_workers_dir', tmp_path)
+        monkeypatch.setattr(collector, '_histograms', {})
+        collector.observe_latency('gis', ('gis.example.com',), 120)
+        
+        other = LatencyHistogram()
+        other.observe(80)
+        with open(tmp_path / '999999.json', 'w') as f:
+            json.dump([{'kind': 'gis', 'labels': ['gis.example.com'], **other.to_dict()}], f)
+        
+        text = collector.render_prometheus()
+        assert '# TYPE utility_gis_request_duration_seconds histogram' in text
+        assert 'utility_gis_request_duration_seconds_bucket{endpoint="gis.example.com",le="+Inf"} 2' in text
+        assert 'utility_gis_request_duration_seconds_count{endpoint="gis.example.com"} 2' in text
+
+    def test_gis_layers_sharing_a_host_are_separate_series(self, monkeypatch):
+        import gis_utility_lookup
+        endpoints = []
+        monkeypatch.setattr(gis_utility_lookup, 'track_gis_latency', lambda endpoint, ms: endpoints.append(endpoint))
+        
+        for url in (
+            'https://services1.arcgis.com/OrgA/arcgis/rest/services/Electric/FeatureServer/0/query',
+            'https://services1.arcgis.com/OrgB/arcgis/rest/services/Gas/FeatureServer/2/query',
+        ):
+            gis_utility_lookup._track_gis_latency(url, 0)
+        
+        assert endpoints == [
+            'services1.arcgis.com/OrgA/arcgis/rest/services/Electric/FeatureServer/0',
+            'services1.arcgis.com/OrgB/arcgis/rest/services/Gas/FeatureServer/2',
+        ]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the municipal utility matching indexes.
+
+The indexes must give exactly what the original linear scans gave, so the
+main test replays ZIPs, cities and counties from municipal_utilities.json
+through both.
+
+Run: pytest tests/test_municipal_index.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import municipal_utilities
+from municipal_utilities import _SERVICE_SECTIONS, _SectionIndex, _get_section_index, _scan, _section_entries
+
+INDEX_METHODS = {
+    'zip': _SectionIndex.first_zip,
+    'name_within': _SectionIndex.first_name_within,
+    'name_equal': _SectionIndex.first_name_equal,
+    'name_overlap': _SectionIndex.first_name_overlapping,
+}
+
+
+def probes(entries, limit=40):
+    """ZIPs and names from a state's entries plus near-miss variants."""
+    step = max(1, len(entries) // limit)
+    for name, utility in entries[::step]:
+        for zip_code in utility.get('zip_codes', [])[:2]:
+            yield 'zip', zip_code
+        for value in (name, name.lower(), f"North {name}", f"{name} County", name[:4], name[1:]):
+            yield 'name_within', value
+            yield 'name_equal', value
+            yield 'name_overlap', value
+    yield 'zip', '00000'
+    yield 'name_within', 'Nowhere Springs'
+
+
+class TestMunicipalIndex:
+
+    def test_index_matches_scan_on_real_data(self):
+        data = municipal_utilities.load_municipal_data()
+        if not data.get('electric'):
+            pytest.skip("municipal_utilities.json not available")
+        
+        checked = 0
+        for section in ('electric', 'gas', 'water', 'county_electric', 'county_gas'):
+            for state in data.get(section, {}):
+                for service in _SERVICE_SECTIONS.get(section, (None,)):
+                    section_index = _get_section_index(data, section, state, service)
+                    entries = _section_entries(data, section, state, service)
+                    for kind, value in probes(entries):
+                        expected = _scan(kind, entries, value)
+                        assert INDEX_METHODS[kind](section_index, value) == expected, \
+                            (section, state, service, kind, value)
+                        checked += 1
+        assert checked > 1000
+    
+    def test_first_entry_in_file_order_wins(self):
+        entries = [
+            ('Springfield', {'name': 'Springfield Utilities', 'zip_codes': ['11111']}),
+            ('Field', {'name': 'Field Power', 'zip_codes': ['22222', '11111']}),
+            ('West Springfield', {'name': 'West Springfield Light'}),
+        ]
+        section_index = _SectionIndex(entries)
+        
+        assert section_index.first_zip('11111') == 0
+        assert section_index.first_zip('22222') == 1
+        # "FIELD" and "SPRINGFIELD" are both within the city - the earlier entry wins
+        assert section_index.first_name_within('West Springfield') == 0
+        assert section_index.first_name_within('Fieldston') == 1
+        # Partial county match works in both directions
+        assert section_index.first_name_overlapping('Spring') == 0
+        assert section_index.first_name_overlapping('Springfield Township') == 0
+        assert section_index.first_name_overlapping('Elsewhere') is None
+    
+    def test_lookups_agree_in_verify_mode(self, monkeypatch, capsys):
+        data = {
+            'electric': {'TX': {
+                'Denton': {'name': 'Denton Municipal Electric', 'zip_codes': ['76201'], 'services': ['electric', 'water']},
+                'Austin': {'name': 'Austin Energy', 'zip_codes': ['78701'], 'services': ['electric', 'water'],
+                           'water_provider': 'Austin Water'},
+            }},
+            'gas': {'TX': {'Austin': {'name': 'Texas Gas Service', 'zip_codes': ['78702']}}},
+            'water': {'TX': {}},
+            'county_electric': {'TX': {'Travis': {'name': 'Travis Co-op'}}},
+            'county_gas': {},
+        }
+        monkeypatch.setattr(municipal_utilities, '_municipal_data', data)
+        monkeypatch.setattr(municipal_utilities, 'MUNICIPAL_INDEX_MODE', 'verify')
+        monkeypatch.setattr(municipal_utilities, 'lookup_remaining_states_electric', lambda *a: None)
+        monkeypatch.setattr(municipal_utilities, 'lookup_remaining_states_water', lambda *a: None)
+        monkeypatch.setattr(municipal_utilities, 'lookup_dfw_water', lambda *a: None)
+        
+        electric = municipal_utilities.lookup_municipal_electric('TX', 'Lakeway', None, 'Travis County')
+        assert electric['name'] == 'Travis Co-op' and electric['confidence'] == 'low'
+        
+        # Gas section matches "Austin" by city before any electric entry
+        gas = municipal_utilities.lookup_municipal_gas('TX', 'Austin', '78701')
+        assert gas['name'] == 'Texas Gas Service' and gas['confidence'] == 'medium'
+        
+        water = municipal_utilities.lookup_municipal_water('TX', 'Austin', '78701')
+        assert water['name'] == 'Austin Water' and water['confidence'] == 'high'
+        
+        assert 'mismatch' not in capsys.readouterr().out
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the reference-table snapshot (reference_snapshot.py).
+
+Builds snapshots from small JSON files in a temp directory.
+
+Run: pytest tests/test_reference_snapshot.py -v
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import reference_snapshot
+from reference_snapshot import ReferenceSnapshot, SnapshotNode, build_snapshot
+
+REMAINING = {
+    '_description': 'Tenant-verified gas utilities',
+    'states': {
+        'TX': {'75201': {'name': 'Atmos Energy'}, '77002': {'name': 'CenterPoint Energy'}},
+        'OK': {'73102': {'name': 'Oklahoma Natural Gas'}},
+        'WY': {},
+    },
+}
+
+BOUNDARIES = {
+    'total_zips': 3,
+    'zip_analyses': [
+        {'zip_code': '75201', 'boundary': None},
+        {'zip_code': '75201', 'boundary': {'type': 'lat'}},
+        {'zip_code': '77002', 'boundary': {'type': 'lon'}},
+    ],
+}
+
+SOURCES = {
+    'remaining_states_gas': {'depth': 3},
+    'geographic_boundary_analysis_gas': {'depth': 1, 'list_index': ('zip_analyses', 'zip_code')},
+}
+
+
+def plain(value):
+    """Materialize a snapshot view as ordinary dicts."""
+    if isinstance(value, SnapshotNode):
+        return {key: plain(value[key]) for key in value}
+    return value
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    (tmp_path / 'remaining_states_gas.json').write_text(json.dumps(REMAINING))
+    (tmp_path / 'geographic_boundary_analysis_gas.json').write_text(json.dumps(BOUNDARIES))
+    build_snapshot(tmp_path / 'snapshot.db', SOURCES, tmp_path)
+    return tmp_path
+
+
+class TestReferenceSnapshot:
+
+    def test_view_matches_source_json(self, snapshot_dir):
+        snapshot = ReferenceSnapshot(snapshot_dir / 'snapshot.db')
+        table = snapshot.table('remaining_states_gas', str(snapshot_dir / 'remaining_states_gas.json'))
+        
+        assert table['states']['TX']['75201'] == {'name': 'Atmos Energy'}
+        assert 'OK' in table['states'] and 'CA' not in table['states']
+        assert table.get('states', {}).get('TX', {}).get('99999') is None
+        # Same keys, order and values as the JSON - including the empty object
+        assert plain(table) == REMAINING
+        assert list(table['states']) == ['TX', 'OK', 'WY']
+    
+    def test_list_index_groups_items_by_field(self, snapshot_dir):
+        snapshot = ReferenceSnapshot(snapshot_dir / 'snapshot.db')
+        table = snapshot.table('geographic_boundary_analysis_gas')
+        
+        assert table['total_zips'] == 3
+        assert [a['boundary'] for a in table['zip_analyses']['75201']] == [None, {'type': 'lat'}]
+        assert len(table['zip_analyses']) == 2
+    
+    def test_stale_table_falls_back_to_json(self, snapshot_dir, monkeypatch):
+        monkeypatch.setattr(reference_snapshot, 'SNAPSHOT_PATH', snapshot_dir / 'snapshot.db')
+        monkeypatch.setattr(reference_snapshot, '_snapshot', None)
+        source = snapshot_dir / 'remaining_states_gas.json'
+        
+        assert isinstance(reference_snapshot.load_reference('remaining_states_gas', str(source)), SnapshotNode)
+        
+        changed = dict(REMAINING, states={'TX': {'75201': {'name': 'Texas Gas Service'}}})
+        source.write_text(json.dumps(changed))
+        data = reference_snapshot.load_reference('remaining_states_gas', str(source))
+        assert data == changed and not isinstance(data, SnapshotNode)
+        
+        # Not in the snapshot at all
+        assert reference_snapshot.load_reference('municipal_utilities', str(snapshot_dir / 'missing.json'),
+                                                 default={'electric': {}}) == {'electric': {}}
+
+    def test_municipal_endpoint_serves_snapshot_data(self, tmp_path, monkeypatch):
+        import municipal_utilities
+        from api import app
+        municipal = {'electric': {'TX': {'Austin': {'name': 'Austin Energy', 'zip_codes': ['78701']}}}}
+        (tmp_path / 'municipal_utilities.json').write_text(json.dumps(municipal))
+        build_snapshot(tmp_path / 'snapshot.db', {'municipal_utilities': {'depth': 2}}, tmp_path)
+        table = ReferenceSnapshot(tmp_path / 'snapshot.db').table('municipal_utilities')
+        assert isinstance(table['electric'], SnapshotNode)
+        monkeypatch.setattr(municipal_utilities, '_municipal_data', table)
+        
+        client = app.test_client()
+        response = client.get('/api/municipal-utilities')
+        assert response.status_code == 200
+        assert response.get_json()['utilities'] == municipal['electric']
+        assert client.get('/api/municipal-utilities?state=tx').get_json()['utilities'] == {'electric': municipal['electric']['TX']}
+
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the address-level result store and its incremental refresh.
+
+Run: pytest tests/test_result_store.py -v
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import result_store
+from result_store import ResultStore, provenance
+
+RESULT = {
+    'electric': {'NAME': 'Austin Energy', '_source': 'municipal', '_confidence': 'high'},
+    'gas': {'NAME': 'Texas Gas Service', '_source': 'remaining_states', '_confidence': 'medium'},
+    'water': None,
+    'water_no_service': {'reason': 'private well'},
+}
+
+
+def response(name):
+    return {'address': '1 Main St, Austin, TX 78701', 'utilities': {'electric': [{'name': name}]}, 'status': 'success'}
+
+
+@pytest.fixture
+def reference_files(tmp_path, monkeypatch):
+    """Point the electric and gas reference lists at files we can change."""
+    (tmp_path / 'electric.json').write_text('{"v": 1}')
+    (tmp_path / 'gas.json').write_text('{"v": 1}')
+    monkeypatch.setattr(result_store, 'BASE_DIR', tmp_path)
+    monkeypatch.setattr(result_store, 'REFERENCE_FILES', {
+        'electric': ['electric.json'], 'gas': ['gas.json'], 'water': ['water_*.json'],
+    })
+    monkeypatch.setattr(result_store, 'VERSION_CHECK_SECONDS', 0)
+    monkeypatch.setattr(result_store, '_current_versions', {'checked_at': 0.0, 'versions': {}})
+    return tmp_path
+
+
+class TestResultStore:
+    def test_provenance_and_normalized_key(self, reference_files):
+        store = ResultStore(reference_files / 'store.db')
+        result_provenance = provenance(RESULT, ['electric', 'gas', 'water'])
+        assert result_provenance['sources'] == {
+            'electric': 'municipal', 'gas': 'remaining_states', 'water': 'no_service'
+        }
+        assert result_provenance['confidence'] == {'electric': 'high', 'gas': 'medium'}
+        assert set(result_provenance['data_versions']) == {'_lookup', 'electric.json', 'gas.json'}
+        
+        store.put('1 Main Street, Austin, TX 78701', 'electric,gas,water', response('Austin Energy'), result_provenance)
+        assert store.get('1 main st, austin, tx 78701', 'electric,gas,water') == response('Austin Energy')
+        assert store.get('1 Main St, Austin, TX 78701', 'electric') is None
+        assert store.provenance('1 Main St, Austin, TX 78701', 'electric,gas,water')['hits'] == 1
+    
+    def test_changed_reference_file_refreshes_only_affected_entries(self, reference_files):
+        store = ResultStore(reference_files / 'store.db')
+        store.put('1 Main St, Austin, TX', 'electric', response('Austin Energy'), provenance(RESULT, ['electric']))
+        store.put('2 Main St, Austin, TX', 'gas', response('Texas Gas'), provenance(RESULT, ['gas']))
+        
+        (reference_files / 'gas.json').write_text('{"v": 2}')
+        assert store.get('2 Main St, Austin, TX', 'gas') is None
+        assert store.get('1 Main St, Austin, TX', 'electric') is not None
+        
+        computed = []
+        def compute(address, utility_types):
+            computed.append((address, utility_types))
+            return response('CenterPoint'), provenance(RESULT, utility_types)
+        
+        counts = store.refresh_stale(compute)
+        assert computed == [('2 Main St, Austin, TX', ['gas'])]
+        assert counts == {'checked': 2, 'stale': 1, 'refreshed': 1, 'changed': 1, 'failed': 0}
+        assert store.get('2 Main St, Austin, TX', 'gas') == response('CenterPoint')
+        assert store.refresh_stale(compute)['stale'] == 0
+    
+    def test_old_entries_refresh_and_failures_keep_the_entry(self, reference_files, monkeypatch):
+        store = ResultStore(reference_files / 'store.db')
+        store.put('1 Main St, Austin, TX', 'electric', response('Austin Energy'), provenance(RESULT, ['electric']))
+        old = (datetime.now() - timedelta(days=result_store.RESULT_STORE_MAX_AGE_DAYS + 1)).isoformat()
+        store._connection().execute("UPDATE results SET refreshed_at = ?", (old,))
+        assert store.get('1 Main St, Austin, TX', 'electric') is None
+        
+        counts = store.refresh_stale(lambda address, utility_types: None)
+        assert counts['failed'] == 1
+        assert store.provenance('1 Main St, Austin, TX', 'electric')['refreshed_at'] == old
+        
+        monkeypatch.setattr(result_store, 'LOOKUP_VERSION', '2')
+        counts = store.refresh_stale(lambda a, u: (response('Austin Energy'), provenance(RESULT, u)))
+        assert counts['refreshed'] == 1 and counts['changed'] == 0
+        assert store.get('1 Main St, Austin, TX', 'electric') == response('Austin Energy')
+
+    def test_correction_invalidates_its_zip_and_type(self, reference_files, monkeypatch):
+        store = ResultStore(reference_files / 'store.db')
+        monkeypatch.setattr(result_store, 'RESULT_STORE_ENABLED', True)
+        monkeypatch.setattr(result_store, '_store', store)
+        def located(name, zip_code):
+            return dict(response(name), location={'state': 'TX', 'zip_code': zip_code})
+        store.put('1 Main St, Austin, TX 78701', 'electric,gas', located('Austin Energy', '78701'), provenance(RESULT, ['electric', 'gas']))
+        store.put('2 Main St, Austin, TX 78701', 'gas', located('Texas Gas', '78701'), provenance(RESULT, ['gas']))
+        store.put('3 Elm St, Austin, TX 78702', 'electric', located('Austin Energy', '78702'), provenance(RESULT, ['electric']))
+        
+        result_store.invalidate_results('electric', 'TX', '78701')
+        assert store.get('1 Main St, Austin, TX 78701', 'electric,gas') is None
+        assert store.get('2 Main St, Austin, TX 78701', 'gas') is not None
+        assert store.get('3 Elm St, Austin, TX 78702', 'electric') is not None
+        
+        # Without a ZIP the whole state's entries for the type go
+        assert store.invalidate('electric', 'tx') == 2
+        assert store.get('3 Elm St, Austin, TX 78702', 'electric') is None
+        assert store.refresh_stale(lambda a, u: (response('Austin Energy'), provenance(RESULT, u)))['stale'] == 2
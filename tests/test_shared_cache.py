@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the cross-worker shared cache (SQLite backend).
+
+Run: pytest tests/test_shared_cache.py -v
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import smart_selector
+from shared_cache import SQLiteCache, get_shared_cache
+
+
+class TestSQLiteCache:
+
+    def test_round_trip_json_values(self, tmp_path):
+        cache = SQLiteCache(tmp_path / 'cache.db')
+        cache.set('lookup', 'k', {'electric': {'NAME': 'Oncor'}, 'n': [1, 2]})
+        
+        assert cache.get('lookup', 'k') == {'electric': {'NAME': 'Oncor'}, 'n': [1, 2]}
+        assert cache.get('lookup', 'missing') is None
+    
+    def test_namespaces_are_separate(self, tmp_path):
+        cache = SQLiteCache(tmp_path / 'cache.db')
+        cache.set('gis', 'k', 1)
+        
+        assert cache.get('serp', 'k') is None
+    
+    def test_entries_expire(self, tmp_path):
+        cache = SQLiteCache(tmp_path / 'cache.db')
+        cache.set('gis', 'k', 'v', ttl=0.05)
+        time.sleep(0.1)
+        
+        assert cache.get('gis', 'k') is None
+    
+    def test_visible_to_other_instances(self, tmp_path):
+        # Each gunicorn worker opens its own instance on the same file
+        writer = SQLiteCache(tmp_path / 'cache.db')
+        reader = SQLiteCache(tmp_path / 'cache.db')
+        writer.set('lookup', 'k', {'water': None})
+        
+        assert reader.get('lookup', 'k') == {'water': None}
+        assert reader.stats()['namespaces']['lookup']['hits'] == 1
+
+
+class TestSharedCacheUsers:
+
+    def test_tests_get_a_temporary_cache(self, tmp_path):
+        assert get_shared_cache().path == tmp_path / 'shared_cache.db'
+    
+    def test_smart_selector_decisions_expire(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(smart_selector, 'CACHE_DIR', str(tmp_path / 'smart_selector_cache'))
+        selector = smart_selector.SmartSelector()
+        selector._store_decision('787:electric:abcd1234', {'utility_name': 'Austin Energy', 'timestamp': time.time()})
+        assert selector._get_cached_decision('787:electric:abcd1234')['utility_name'] == 'Austin Energy'
+        
+        # Older than the TTL in this process; the shared copy expired with it
+        selector.cache['787:electric:abcd1234']['timestamp'] -= smart_selector.SMART_SELECTOR_CACHE_TTL + 1
+        monkeypatch.setattr(get_shared_cache(), 'get', lambda namespace, key: None)
+        assert selector._get_cached_decision('787:electric:abcd1234') is None
+        assert '787:electric:abcd1234' not in selector.cache
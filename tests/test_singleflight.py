@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for request coalescing.
+
+Run: pytest tests/test_singleflight.py -v
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        
+        def slow(value):
+            calls.append(value)
+            started.set()
+            time.sleep(0.2)
+            return {'value': value}
+        
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            first = executor.submit(flight.do, 'k', slow, 1)
+            started.wait()
+            others = [executor.submit(flight.do, 'k', slow, 2) for _ in range(4)]
+            results = [first.result()] + [f.result() for f in others]
+        
+        assert calls == [1]
+        assert all(value == {'value': 1} for value, _ in results)
+        assert not results[0][1] and all(shared for _, shared in results[1:])
+        assert flight.stats()['coalesced'] == 4
+    
+    def test_error_is_shared_and_key_released(self):
+        flight = SingleFlight()
+        
+        def fail():
+            raise ValueError('upstream down')
+        
+        with pytest.raises(ValueError):
+            flight.do('k', fail)
+        assert flight.do('k', lambda: 42) == (42, False)
+
+
+class TestAsyncSingleFlight:
+
+    def test_concurrent_coroutines_share_one_call(self):
+        flight = AsyncSingleFlight()
+        calls = []
+        
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'answer'
+        
+        async def main():
+            return await asyncio.gather(*(flight.do('k', slow) for _ in range(3)))
+        
+        results = asyncio.run(main())
+        assert len(calls) == 1
+        assert [value for value, _ in results] == ['answer'] * 3
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the special-district spatial index.
+
+Run: pytest tests/test_special_districts.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import special_districts
+
+pytestmark = pytest.mark.skipif(not special_districts.SHAPELY_AVAILABLE, reason="shapely not installed")
+
+
+def square(district_id, x0, y0, size, services=('water', 'sewer')):
+    return {
+        'district_id': district_id,
+        'name': district_id,
+        'services': list(services),
+        'boundary': {'type': 'polygon', 'data': {
+            'type': 'Polygon',
+            'coordinates': [[[x0, y0], [x0 + size, y0], [x0 + size, y0 + size], [x0, y0 + size], [x0, y0]]]
+        }},
+    }
+
+
+@pytest.fixture
+def districts(monkeypatch):
+    state_districts = [
+        square('MUD-1', -95.5, 29.5, 0.2),
+        square('MUD-2', -95.4, 29.6, 0.2),             # overlaps MUD-1
+        square('MUD-3', -95.0, 29.5, 0.1, services=('sewer',)),
+        {'district_id': 'MUD-4', 'name': 'MUD-4', 'services': ['water'],
+         'boundary': {'type': 'zip_list', 'data': ['77001']}},
+    ]
+    monkeypatch.setattr(special_districts, '_districts_by_state', {'TX': state_districts})
+    monkeypatch.setattr(special_districts, '_district_indexes', {})
+    return state_districts
+
+
+class TestDistrictIndex:
+
+    def test_lookup_many_matches_point_lookups(self, districts):
+        points = [(29.55, -95.45), (29.65, -95.35), (29.75, -95.25), (29.55, -94.95), (40.0, -100.0)]
+        
+        found = special_districts.lookup_many(points, 'TX', 'water')
+        assert [d and d['district_id'] for d in found] == ['MUD-1', 'MUD-1', 'MUD-2', None, None]
+        assert found == [special_districts.lookup_by_coordinates(lat, lon, 'TX', 'water') for lat, lon in points]
+        
+        sewer = special_districts.lookup_many(points, 'TX', 'sewer')
+        assert sewer[3]['district_id'] == 'MUD-3'
+    
+    def test_index_built_once_per_state_and_service(self, districts):
+        index = special_districts.get_district_index('TX', 'water')
+        assert special_districts.get_district_index('TX', 'water') is index
+        # Only polygon districts offering the service are indexed
+        assert [d['district_id'] for d in index.districts] == ['MUD-1', 'MUD-2']
+        assert special_districts.lookup_many([], 'TX') == []
+    
+    def test_state_without_polygons(self, districts):
+        assert special_districts.lookup_many([(29.55, -95.45)], 'WY') == [None]
+        assert special_districts.lookup_special_district(29.55, -95.45, 'TX')['match_method'] == 'coordinates'
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the local territory index (territory_index.py).
+
+Builds small synthetic snapshots, so no network or ingest run is needed.
+
+Run: pytest tests/test_territory_index.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import territory_index
+
+if not territory_index.SHAPELY_AVAILABLE:
+    pytest.skip("shapely not installed", allow_module_level=True)
+
+from shapely.geometry import box
+
+import gis_utility_lookup
+from territory_index import LocalTerritoryIndex, esri_rings_to_geometry, write_layer_snapshot
+
+LAYER_URL = "https://services.example.com/arcgis/rest/services/Electric_Territories/FeatureServer/0/query"
+
+
+@pytest.fixture
+def index(tmp_path):
+    write_layer_snapshot(tmp_path, LAYER_URL, ['NAME', 'STATE', 'PHONE'], [
+        {'attributes': {'NAME': 'West Power', 'STATE': 'TX', 'PHONE': '111'}, 'geometry': box(-98, 30, -97, 31)},
+        {'attributes': {'NAME': 'East Power', 'STATE': 'TX', 'PHONE': '222'}, 'geometry': box(-97.5, 30, -96, 31)},
+    ])
+    return LocalTerritoryIndex(tmp_path)
+
+
+class TestLocalTerritoryIndex:
+    
+    def test_point_in_polygon(self, index):
+        assert index.covers(LAYER_URL)
+        assert index.query(LAYER_URL, 30.5, -97.8)['NAME'] == 'West Power'
+        assert index.query(LAYER_URL, 30.5, -96.2)['NAME'] == 'East Power'
+        assert index.query(LAYER_URL, 35.0, -97.8) is None
+    
+    def test_overlap_returns_first_feature_and_query_all_returns_both(self, index):
+        assert index.query(LAYER_URL, 30.5, -97.2)['NAME'] == 'West Power'
+        names = [a['NAME'] for a in index.query_all(LAYER_URL, 30.5, -97.2)]
+        assert names == ['West Power', 'East Power']
+    
+    def test_out_fields_are_case_insensitive(self, index):
+        assert index.query(LAYER_URL, 30.5, -97.8, "name,Phone") == {'NAME': 'West Power', 'PHONE': '111'}
+    
+    def test_unknown_layer_not_covered(self, index):
+        assert not index.covers("https://other.example.com/FeatureServer/0/query")
+    
+    def test_query_arcgis_point_answers_locally(self, index, monkeypatch):
+        monkeypatch.setattr(gis_utility_lookup, 'TERRITORY_INDEX_AVAILABLE', True)
+        monkeypatch.setattr(gis_utility_lookup, 'get_territory_index', lambda: index, raising=False)
+        
+        def no_network(*args, **kwargs):
+            raise AssertionError("live ArcGIS call for a snapshotted layer")
+        monkeypatch.setattr(gis_utility_lookup.http_client, 'get', no_network)
+        
+        result = gis_utility_lookup._query_arcgis_point(LAYER_URL, 30.5, -96.2, "NAME")
+        assert result == {'NAME': 'East Power'}
+
+
+def test_esri_rings_with_hole():
+    outer = [[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]  # clockwise
+    hole = [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]        # counter-clockwise
+    geometry = esri_rings_to_geometry([outer, hole])
+    
+    assert geometry.area == pytest.approx(96)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests for request tracing spans.
+
+Run: pytest tests/test_tracing.py -v
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitoring import tracing
+from monitoring.tracing import begin_trace, span, propagate
+from pipeline.interfaces import DataSource, LookupContext, SourceResult, UtilityType
+from pipeline.pipeline import LookupPipeline
+
+
+class FixedSource(DataSource):
+    """Returns one fixed utility name."""
+    
+    def __init__(self, name, utility_name):
+        self._name = name
+        self._utility_name = utility_name
+    
+    @property
+    def name(self):
+        return self._name
+    
+    @property
+    def supported_types(self):
+        return [UtilityType.ELECTRIC]
+    
+    @property
+    def base_confidence(self):
+        return 80
+    
+    def query(self, context):
+        return SourceResult(
+            source_name=self._name,
+            utility_name=self._utility_name,
+            confidence_score=80,
+            match_type='point'
+        )
+
+
+class TestSpans:
+
+    def test_nested_spans_and_attributes(self):
+        trace = begin_trace('request', force=True)
+        with span('geocode', tier='census') as s:
+            s.set_attribute('cached', False)
+            with span('geocode.census'):
+                pass
+        trace.finish()
+        
+        tree = trace.to_dict()
+        assert tree['name'] == 'request'
+        geocode = tree['children'][0]
+        assert geocode['attributes'] == {'tier': 'census', 'cached': False}
+        assert geocode['children'][0]['name'] == 'geocode.census'
+    
+    def test_inactive_without_trace(self, monkeypatch):
+        monkeypatch.setattr(tracing, 'TRACE_EXPORT', set())
+        trace = begin_trace('request')
+        with span('geocode') as s:
+            s.set_attribute('cached', True)
+        trace.finish()
+        
+        assert not trace.active
+        assert trace.to_dict() is None
+    
+    def test_propagates_into_thread_pool(self):
+        trace = begin_trace('request', force=True)
+        
+        def work(n):
+            with span('source.query', n=n):
+                return n
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(propagate(work), n) for n in range(3)]
+            [f.result() for f in futures]
+        trace.finish()
+        
+        assert len(trace.to_dict()['children']) == 3
+    
+    def test_json_export(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tracing, 'TRACE_EXPORT', {'json'})
+        monkeypatch.setattr(tracing, 'TRACE_FILE', tmp_path / 'traces.jsonl')
+        trace = begin_trace('request')
+        with span('enrich'):
+            pass
+        trace.finish()
+        
+        lines = (tmp_path / 'traces.jsonl').read_text().splitlines()
+        assert json.loads(lines[0])['children'][0]['name'] == 'enrich'
+
+
+class TestPipelineSpans:
+
+    def test_source_queries_and_stages(self):
+        pipeline = LookupPipeline([
+            FixedSource('state_gis', 'Oncor'),
+            FixedSource('eia_861', 'Oncor'),
+        ])
+        pipeline._ai_selector = None
+        pipeline.enable_serp_verification = False
+        context = LookupContext(
+            lat=32.78, lon=-96.8, address='1 Main St, Dallas, TX 75201', city='Dallas',
+            county='Dallas', state='TX', zip_code='75201', utility_type=UtilityType.ELECTRIC
+        )
+        
+        trace = begin_trace('request', force=True)
+        pipeline.lookup(context)
+        trace.finish()
+        
+        lookup = trace.to_dict()['children'][0]
+        names = [c['name'] for c in lookup['children']]
+        assert lookup['name'] == 'pipeline.lookup'
+        assert names.count('source.query') == 2
+        assert 'cross_validate' in names and 'enrich' in names
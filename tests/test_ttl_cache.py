@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for the LRU+TTL cache used by the API lookup cache.
+
+Run: pytest tests/test_ttl_cache.py -v
+"""
+
+import os
+import sys
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ttl_cache import TTLCache
+from address_normalization import address_cache_key
+
+
+class TestTTLCache:
+    
+    def test_lru_eviction_by_entries(self):
+        cache = TTLCache(max_entries=2, ttl=None)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')          # 'b' is now least recently used
+        cache.set('c', 3)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+    
+    def test_eviction_by_bytes(self):
+        cache = TTLCache(max_entries=100, max_bytes=10, ttl=None, sizeof=len)
+        cache.set('a', 'xxxxxx')
+        cache.set('b', 'yyyyyy')
+        
+        assert cache.get('a') is None
+        assert cache.get('b') == 'yyyyyy'
+        assert cache.stats()['bytes'] == 6
+    
+    def test_per_entry_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('ttl_cache.time.time', lambda: now[0])
+        cache = TTLCache(ttl=60)
+        cache.set('short', 1, ttl=5)
+        cache.set('default', 2)
+        
+        now[0] += 10
+        assert cache.get('short') is None
+        assert cache.get('default') == 2
+        assert cache.stats()['expirations'] == 1
+    
+    def test_stats_counts_hits_and_misses(self):
+        cache = TTLCache()
+        cache.set('k', 'v')
+        cache.get('k')
+        cache.get('missing')
+        
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+    
+    def test_concurrent_writers_stay_bounded(self):
+        cache = TTLCache(max_entries=50, ttl=None)
+        
+        def writer(n):
+            for i in range(500):
+                cache.set(f"{n}-{i}", i)
+                cache.get(f"{n}-{i // 2}")
+        
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(cache) == 50
+
+
+class TestAddressCacheKey:
+    
+    def test_spelling_variants_share_a_key(self):
+        assert address_cache_key("123 Main Street, Austin, Texas 78701") == \
+            address_cache_key("123  main st., austin, tx 78701")
+    
+    def test_different_addresses_differ(self):
+        assert address_cache_key("123 Main St, Austin, TX 78701") != \
+            address_cache_key("125 Main St, Austin, TX 78701")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the precomputed per-ZIP/tract answer table.
+
+Run: pytest tests/test_zip_answers.py -v
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import zip_answers
+from zip_answers import classify_area, get_uniform_answers, write_answer_table
+
+AUSTIN = {'NAME': 'Austin Energy', '_confidence': 'high'}
+ONCOR = {'NAME': 'Oncor', '_confidence': 'high'}
+
+
+@pytest.fixture
+def table_path(tmp_path, monkeypatch):
+    path = tmp_path / 'zip_answers.db'
+    monkeypatch.setattr(zip_answers, 'ZIP_ANSWERS_PATH', path)
+    monkeypatch.setattr(zip_answers, 'ZIP_ANSWERS_ENABLED', True)
+    monkeypatch.setattr(zip_answers, '_table', None)
+    monkeypatch.setattr(zip_answers, '_table_signature', None)
+    monkeypatch.setattr(zip_answers, '_table_usable', False)
+    monkeypatch.setattr(zip_answers, '_table_checked_at', 0.0)
+    monkeypatch.setattr(zip_answers, 'ZIP_ANSWERS_CHECK_SECONDS', -1)
+    return path
+
+
+@pytest.fixture
+def split_data(tmp_path, monkeypatch):
+    """Empty split sources in a temp data dir; tests add the files they need."""
+    data_dir = tmp_path / 'data'
+    (data_dir / 'districts').mkdir(parents=True)
+    monkeypatch.setattr(zip_answers, 'DATA_DIR', data_dir)
+    monkeypatch.setattr(zip_answers, 'SPLITS_FILE', data_dir / 'splits.json')
+    monkeypatch.setattr(zip_answers, 'STREET_RULES_FILE', data_dir / 'rules.json')
+    monkeypatch.setattr(zip_answers, 'TENANT_OVERRIDES_FILE', data_dir / 'tenant_hard_overrides.json')
+    monkeypatch.setattr(zip_answers, 'TENANT_ADDRESSES_FILE', data_dir / 'tenant_addresses_geocoded.json')
+    monkeypatch.setattr(zip_answers, 'DISTRICT_INDEX_DIR', data_dir / 'districts')
+    return data_dir
+
+
+class TestClassifyArea:
+    def test_uniform_split_and_unknown(self):
+        known = {'78702': {'gas'}}
+        samples = [(AUSTIN, None)] * 3
+        
+        status, provider, answer = classify_area('zip:78701', 'electric', samples, known)
+        assert (status, provider) == ('uniform', 'Austin Energy')
+        assert answer == {'value': AUSTIN, 'no_service': None}
+        
+        # Disagreeing samples, or a ZIP the 46K comparison found split
+        assert classify_area('zip:78701', 'electric', samples + [(ONCOR, None)], known)[0] == 'split'
+        assert classify_area('zip:78702', 'gas', samples, known)[0] == 'split'
+        assert classify_area('tract:48453001100', 'gas', samples, known, zip_codes={'78702'})[0] == 'split'
+        
+        # Unresolved and low-confidence samples don't count towards uniform
+        weak = [(dict(AUSTIN, _confidence='low'), None), (None, None)] * 3
+        assert classify_area('zip:78701', 'electric', samples[:2] + weak, known)[0] == 'unknown'
+        
+        no_gas = [(None, {'reason': 'no gas service'})] * 3
+        status, provider, answer = classify_area('zip:78701', 'gas', no_gas, known)
+        assert status == 'uniform' and provider is None
+        assert answer['no_service'] == {'reason': 'no gas service'}
+    
+    def test_address_level_sources_mark_zips_split(self, split_data):
+        (split_data / 'tenant_hard_overrides.json').write_text(json.dumps(
+            {'overrides': {'66502': {'laramie street 1': {'electric': 'Evergy', 'confidence': 0.9}}}}
+        ))
+        (split_data / 'geographic_boundary_analysis_gas.json').write_text(json.dumps(
+            {'zip_analyses': [{'zip_code': '60022', 'utilities': {'Nicor Gas': 3}, 'boundary': None}]}
+        ))
+        (split_data / 'districts' / 'fl_zip_to_district.json').write_text(json.dumps({'34747': ['FL-CDD-001']}))
+        
+        known = zip_answers.load_known_splits()
+        assert known == {'66502': {'electric'}, '60022': {'gas'}, '34747': {'water'}}
+        samples = [(AUSTIN, None)] * 3
+        assert classify_area('zip:66502', 'electric', samples, known)[0] == 'split'
+        assert classify_area('zip:66502', 'gas', samples, known)[0] == 'uniform'
+
+
+class TestAnswerTable:
+    def test_tract_answer_wins_over_zip(self, table_path):
+        write_answer_table(table_path, [
+            ('zip:78701', 'electric', 'uniform', 'Oncor', 5, {'value': ONCOR, 'no_service': None}),
+            ('tract:48453001100', 'electric', 'uniform', 'Austin Energy', 4, {'value': AUSTIN, 'no_service': None}),
+            ('zip:78701', 'gas', 'split', None, 5, None),
+        ], meta={'grid': 4})
+        
+        answers = get_uniform_answers('78701', '484530011001000', ['electric', 'gas', 'internet'])
+        assert set(answers) == {'electric'}
+        assert answers['electric']['value'] == AUSTIN
+        assert answers['electric']['area'] == 'tract:48453001100'
+        
+        # Another tract in the ZIP falls back to the ZIP answer
+        answers = get_uniform_answers('78701', '484530012001000', ['electric'])
+        assert answers['electric']['area'] == 'zip:78701'
+        assert get_uniform_answers('75201', None, ['electric']) == {}
+    
+    def test_stale_or_disabled_table_is_not_served(self, table_path, monkeypatch):
+        write_answer_table(table_path, [
+            ('zip:78701', 'electric', 'uniform', 'Austin Energy', 5, {'value': AUSTIN, 'no_service': None}),
+        ])
+        assert get_uniform_answers('78701', None, ['electric'])
+        
+        conn = sqlite3.connect(table_path)
+        old = (datetime.now() - timedelta(days=zip_answers.ZIP_ANSWERS_MAX_AGE_DAYS + 1)).isoformat()
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'built_at'", (f'"{old}"',))
+        conn.commit()
+        conn.close()
+        assert get_uniform_answers('78701', None, ['electric']) == {}
+        
+        monkeypatch.setattr(zip_answers, 'ZIP_ANSWERS_ENABLED', False)
+        assert get_uniform_answers('78701', None, ['electric']) == {}
+    
+    def test_rebuilt_table_is_reopened(self, table_path, split_data):
+        # Reads from a request thread that keeps its handle; rebuilds from this one
+        worker = ThreadPoolExecutor(max_workers=1)
+        electric = lambda: worker.submit(get_uniform_answers, '78701', None, ['electric']).result()
+        
+        write_answer_table(table_path, [
+            ('zip:78701', 'electric', 'uniform', 'Oncor', 5, {'value': ONCOR, 'no_service': None}),
+        ])
+        assert electric()['electric']['value'] == ONCOR
+        
+        write_answer_table(table_path, [
+            ('zip:78701', 'electric', 'uniform', 'Austin Energy', 5, {'value': AUSTIN, 'no_service': None}),
+        ])
+        assert electric()['electric']['value'] == AUSTIN
+        
+        # A split source changing after the build retires the table
+        (split_data / 'tenant_hard_overrides.json').write_text('{"overrides": {}}')
+        assert electric() == {}
+        worker.shutdown()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Bounded, thread-safe LRU cache with per-entry TTL.
+
+Used for in-process result caches that are hit from many request threads
+at once (e.g. the API's address lookup cache). Eviction is O(1): entries
+live in an OrderedDict in recency order and the least recently used entry
+is popped from the front when either the entry or byte limit is exceeded.
+
+Usage:
+    from ttl_cache import TTLCache
+    
+    cache = TTLCache(max_entries=10000, max_bytes=64 * 1024 * 1024, ttl=3600)
+    cache.set(key, value)
+    value = cache.get(key)       # None if missing or expired
+    cache.stats()                # hits, misses, evictions, size...
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a JSON-like value (serialized length)."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class TTLCache:
+    """
+    LRU cache bounded by entry count and approximate bytes, with TTL.
+    
+    All operations take a single lock and are O(1) apart from sizing the
+    value on set().
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = 3600,
+        sizeof: Callable[[Any], int] = estimate_size,
+        name: str = 'cache'
+    ):
+        """
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total estimated size of values (None = unbounded)
+            ttl: Default time-to-live in seconds (None = never expires)
+            sizeof: Function estimating a value's size in bytes
+            name: Label reported in stats()
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.name = name
+        self._sizeof = sizeof
+        
+        # key -> (value, expires_at, size); ordered least -> most recently used
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self._hits = 0
+        self._misses = 0
+        self._expirations = 0
+        self._evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            
+            value, expires_at, size = entry
+            if expires_at is not None and time.time() >= expires_at:
+                self._remove(key, size)
+                self._expirations += 1
+                self._misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: Value to cache (stored by reference - don't mutate it later)
+            ttl: Seconds until this entry expires (default: the cache's ttl)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        
+        # A single value larger than the whole budget is never cached
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+    
+    def delete(self, key: Hashable) -> bool:
+        """Remove an entry. Returns True if it was present."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            self._remove(key, entry[2])
+            return True
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def _remove(self, key: Hashable, size: int) -> None:
+        del self._entries[key]
+        self._bytes -= size
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'name': self.name,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'expirations': self._expirations,
+                'evictions': self._evictions,
+            }
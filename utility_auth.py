@@ -6,7 +6,7 @@ Integrates with Airtable for user management and usage logging.
 import os
 import jwt
 import bcrypt
-import requests
+import http_client
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import Blueprint, request, jsonify
@@ -40,11 +40,11 @@ def airtable_request(table: str, method: str = 'GET', record_id: str = None,
     }
     
     if method == 'GET':
-        response = requests.get(url, headers=headers, params=params)
+        response = http_client.get(url, headers=headers, params=params)
     elif method == 'POST':
-        response = requests.post(url, headers=headers, json=data)
+        response = http_client.post(url, headers=headers, json=data)
     elif method == 'PATCH':
-        response = requests.patch(url, headers=headers, json=data)
+        response = http_client.patch(url, headers=headers, json=data)
     else:
         raise ValueError(f"Unsupported method: {method}")
     
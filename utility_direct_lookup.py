@@ -7,7 +7,7 @@ This is the most authoritative source when available.
 
 import os
 import re
-import requests
+import http_client
 from typing import Dict, Optional, List
 from urllib.parse import quote
 
@@ -203,7 +203,7 @@ def _query_arcgis_service(url: str, params: Dict) -> Optional[bool]:
     Returns True if in area, False if not, None if error.
     """
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -16,11 +16,16 @@ USAGE:
     
     result = lookup_utilities_by_address("123 Main St, Austin, TX 78701")
     # Returns: { electric: {...}, gas: {...}, water: {...} }
+    
+    # From async code (same result shape)
+    result = await async_lookup_utilities_by_address("123 Main St, Austin, TX 78701")
 """
 
 import os
 import sys
 import time
+import asyncio
+import threading
 from typing import Optional, Dict, List, Any
 from pathlib import Path
 
@@ -72,6 +77,9 @@ except ImportError:
         def __exit__(self, *args): pass
         def set_result(self, *args, **kwargs): pass
 
+# Async engine: shared event loop + aiohttp session for GIS queries
+from async_lookup import run_blocking, run_sync
+
 # Import user corrections source (highest priority)
 try:
     from pipeline.sources.corrections import UserCorrectionSource
@@ -88,31 +96,41 @@ _pipeline_electric = None
 _pipeline_gas = None
 _pipeline_water = None
 
+# Pipelines are built lazily and may now be requested from several fan-out
+# threads at once; serialize construction so each is built exactly once.
+_pipeline_init_lock = threading.RLock()
+
+# Overall deadline (seconds) for a parallel multi-utility lookup
+FANOUT_TIMEOUT = float(os.getenv('LOOKUP_FANOUT_TIMEOUT', '25'))
+
 
 def _get_electric_pipeline() -> LookupPipeline:
     """Get or create the electric utility pipeline."""
     global _pipeline_electric
     if _pipeline_electric is None:
-        _pipeline_electric = LookupPipeline()
+        with _pipeline_init_lock:
+            if _pipeline_electric is None:
+                pipeline = LookupPipeline()
         
-        # Add sources in priority order (highest confidence first)
-        if USER_CORRECTIONS_AVAILABLE:
-            _pipeline_electric.add_source(UserCorrectionSource())
-        _pipeline_electric.add_source(MunicipalElectricSource())
-        _pipeline_electric.add_source(StateGISElectricSource())
-        _pipeline_electric.add_source(CoopSource())
+                # Add sources in priority order (highest confidence first)
+                if USER_CORRECTIONS_AVAILABLE:
+                    pipeline.add_source(UserCorrectionSource())
+                pipeline.add_source(MunicipalElectricSource())
+                pipeline.add_source(StateGISElectricSource())
+                pipeline.add_source(CoopSource())
         
-        # State-specific sources
-        try:
-            from pipeline.sources.georgia_emc import GeorgiaEMCSource
-            _pipeline_electric.add_source(GeorgiaEMCSource())
-        except ImportError:
-            pass
+                # State-specific sources
+                try:
+                    from pipeline.sources.georgia_emc import GeorgiaEMCSource
+                    pipeline.add_source(GeorgiaEMCSource())
+                except ImportError:
+                    pass
         
-        _pipeline_electric.add_source(TenantVerifiedElectricSource())  # Tenant-verified ZIP data
-        _pipeline_electric.add_source(EIASource())
-        _pipeline_electric.add_source(HIFLDElectricSource())
-        _pipeline_electric.add_source(CountyDefaultElectricSource())
+                pipeline.add_source(TenantVerifiedElectricSource())  # Tenant-verified ZIP data
+                pipeline.add_source(EIASource())
+                pipeline.add_source(HIFLDElectricSource())
+                pipeline.add_source(CountyDefaultElectricSource())
+                _pipeline_electric = pipeline
     
     return _pipeline_electric
 
@@ -121,19 +139,22 @@ def _get_gas_pipeline() -> LookupPipeline:
     """Get or create the gas utility pipeline."""
     global _pipeline_gas
     if _pipeline_gas is None:
-        _pipeline_gas = LookupPipeline()
+        with _pipeline_init_lock:
+            if _pipeline_gas is None:
+                pipeline = LookupPipeline()
         
-        # Add sources in priority order
-        # NOTE: ZIPMappingGasSource confidence has been lowered to 50
-        # so HIFLD and municipal sources win over coarse ZIP mapping
-        if USER_CORRECTIONS_AVAILABLE:
-            _pipeline_gas.add_source(UserCorrectionSource())
-        _pipeline_gas.add_source(MunicipalGasSource())
-        _pipeline_gas.add_source(StateGISGasSource())
-        _pipeline_gas.add_source(TenantVerifiedGasSource())  # Tenant-verified ZIP data
-        _pipeline_gas.add_source(ZIPMappingGasSource())  # Lowered confidence (50)
-        _pipeline_gas.add_source(HIFLDGasSource())
-        _pipeline_gas.add_source(CountyDefaultGasSource())
+                # Add sources in priority order
+                # NOTE: ZIPMappingGasSource confidence has been lowered to 50
+                # so HIFLD and municipal sources win over coarse ZIP mapping
+                if USER_CORRECTIONS_AVAILABLE:
+                    pipeline.add_source(UserCorrectionSource())
+                pipeline.add_source(MunicipalGasSource())
+                pipeline.add_source(StateGISGasSource())
+                pipeline.add_source(TenantVerifiedGasSource())  # Tenant-verified ZIP data
+                pipeline.add_source(ZIPMappingGasSource())  # Lowered confidence (50)
+                pipeline.add_source(HIFLDGasSource())
+                pipeline.add_source(CountyDefaultGasSource())
+                _pipeline_gas = pipeline
     
     return _pipeline_gas
 
@@ -142,37 +163,267 @@ def _get_water_pipeline() -> LookupPipeline:
     """Get or create the water utility pipeline."""
     global _pipeline_water
     if _pipeline_water is None:
-        _pipeline_water = LookupPipeline()
+        with _pipeline_init_lock:
+            if _pipeline_water is None:
+                pipeline = LookupPipeline()
         
-        # Import water sources
-        try:
-            from pipeline.sources.water import (
-                MunicipalWaterSource,
-                StateGISWaterSource,
-                SpecialDistrictWaterSource,
-                EPAWaterSource,
-                CountyDefaultWaterSource,
-                TenantVerifiedWaterSource,
-            )
-            WATER_SOURCES_AVAILABLE = True
-        except ImportError:
-            WATER_SOURCES_AVAILABLE = False
+                # Import water sources
+                try:
+                    from pipeline.sources.water import (
+                        MunicipalWaterSource,
+                        StateGISWaterSource,
+                        SpecialDistrictWaterSource,
+                        EPAWaterSource,
+                        CountyDefaultWaterSource,
+                        TenantVerifiedWaterSource,
+                    )
+                    WATER_SOURCES_AVAILABLE = True
+                except ImportError:
+                    WATER_SOURCES_AVAILABLE = False
         
-        # Add sources in priority order
-        if USER_CORRECTIONS_AVAILABLE:
-            _pipeline_water.add_source(UserCorrectionSource())
+                # Add sources in priority order
+                if USER_CORRECTIONS_AVAILABLE:
+                    pipeline.add_source(UserCorrectionSource())
         
-        if WATER_SOURCES_AVAILABLE:
-            _pipeline_water.add_source(MunicipalWaterSource())
-            _pipeline_water.add_source(StateGISWaterSource())
-            _pipeline_water.add_source(SpecialDistrictWaterSource())
-            _pipeline_water.add_source(TenantVerifiedWaterSource())  # Tenant-verified ZIP data
-            _pipeline_water.add_source(EPAWaterSource())
-            _pipeline_water.add_source(CountyDefaultWaterSource())
+                if WATER_SOURCES_AVAILABLE:
+                    pipeline.add_source(MunicipalWaterSource())
+                    pipeline.add_source(StateGISWaterSource())
+                    pipeline.add_source(SpecialDistrictWaterSource())
+                    pipeline.add_source(TenantVerifiedWaterSource())  # Tenant-verified ZIP data
+                    pipeline.add_source(EPAWaterSource())
+                    pipeline.add_source(CountyDefaultWaterSource())
+                _pipeline_water = pipeline
     
     return _pipeline_water
 
 
+# Map utility names to pipeline getters and types; without the pipeline
+# package every type goes to _legacy_lookup
+if PIPELINE_AVAILABLE:
+    UTILITY_PIPELINES = {
+        'electric': (_get_electric_pipeline, UtilityType.ELECTRIC),
+        'gas': (_get_gas_pipeline, UtilityType.GAS),
+        'water': (_get_water_pipeline, UtilityType.WATER),
+    }
+else:
+    UTILITY_PIPELINES = {name: (None, None) for name in ('electric', 'gas', 'water')}
+
+
+def _geocode_context(address: str, geo_result: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Build the base context shared by all utility types.
+    
+    Geocodes the address unless the caller already did (geo_result).
+    """
+    geo = geo_result if geo_result is not None else geocode_address(address, include_geography=True)
+    if not geo:
+        return None
+    
+    # Extract ZIP code from geocode result or original address
+    import re
+    zip_code = geo.get('zip') or geo.get('zip_code')
+    if not zip_code:
+        # Try to extract from matched_address or original address
+        for addr_str in [geo.get('matched_address', ''), address]:
+            zip_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', addr_str)
+            if zip_match:
+                zip_code = zip_match.group(1)
+                break
+    
+    return {
+        'lat': geo.get('lat'),
+        'lon': geo.get('lon'),
+        'address': address,
+        'city': geo.get('city'),
+        'county': geo.get('county'),
+        'state': geo.get('state'),
+        'zip_code': zip_code
+    }
+
+
+def _pipeline_context(utility_type: 'UtilityType', base_context: Dict) -> 'LookupContext':
+    """Create the LookupContext for one utility type from the base context."""
+    return LookupContext(
+        lat=base_context['lat'],
+        lon=base_context['lon'],
+        address=base_context['address'],
+        city=base_context['city'],
+        county=base_context['county'],
+        state=base_context['state'],
+        zip_code=base_context['zip_code'],
+        utility_type=utility_type
+    )
+
+
+def _lookup_utility_type(
+    utility_name: str,
+    base_context: Dict,
+    include_metadata: bool = True
+) -> Optional[Dict]:
+    """Run the pipeline for a single utility type and format it for the API."""
+    pipeline_getter, utility_type = UTILITY_PIPELINES[utility_name]
+    
+    # Track lookup timing
+    with LookupTimer(utility_name) as timer:
+        try:
+            if PIPELINE_AVAILABLE:
+                pipeline = pipeline_getter()
+                result = pipeline.lookup(_pipeline_context(utility_type, base_context))
+                timer.set_result(result.to_dict() if result else None)
+            else:
+                # Fallback to legacy lookup if pipeline unavailable
+                result = _legacy_lookup(utility_name, base_context)
+                timer.set_result(result)
+        except Exception as e:
+            result = None
+            timer.error = str(e)
+    
+    return _format_result(result, base_context, include_metadata)
+
+
+async def _alookup_utility_type(
+    utility_name: str,
+    base_context: Dict,
+    include_metadata: bool = True
+) -> Optional[Dict]:
+    """Async version of _lookup_utility_type()."""
+    pipeline_getter, utility_type = UTILITY_PIPELINES[utility_name]
+    
+    with LookupTimer(utility_name) as timer:
+        try:
+            if PIPELINE_AVAILABLE:
+                pipeline = pipeline_getter()
+                result = await pipeline.alookup(_pipeline_context(utility_type, base_context))
+                timer.set_result(result.to_dict() if result else None)
+            else:
+                result = await run_blocking(_legacy_lookup, utility_name, base_context)
+                timer.set_result(result)
+        except Exception as e:
+            result = None
+            timer.error = str(e)
+    
+    return _format_result(result, base_context, include_metadata)
+
+
+def _format_result(result: Any, base_context: Dict, include_metadata: bool = True) -> Optional[Dict]:
+    """Format a pipeline (or legacy) result for the API response."""
+    if result and PIPELINE_AVAILABLE and isinstance(result, PipelineResult) and result.utility_name:
+        formatted = {
+            'NAME': result.brand_name or result.utility_name,
+            'TELEPHONE': result.phone,
+            'WEBSITE': result.website,
+            'STATE': base_context['state'],
+            'CITY': base_context['city'],
+        }
+        
+        if include_metadata:
+            # Extract other providers from disagreeing sources
+            other_providers = []
+            selected_name = (result.brand_name or result.utility_name or '').upper()
+            lookup_state = base_context.get('state', '').upper()
+            
+            for sr in result.all_results:
+                if sr.utility_name and sr.source_name != result.source:
+                    sr_name = sr.utility_name.upper()
+                    raw = sr.raw_data or {}
+                    
+                    # Filter out providers from wrong states
+                    provider_state = (raw.get('state') or raw.get('STATE') or '').upper()
+                    if provider_state and lookup_state and provider_state != lookup_state:
+                        continue  # Skip providers from different states
+                    
+                    # Skip if name contains a different state name (e.g., "Pennsylvania Electric" for TX)
+                    wrong_state_names = ['PENNSYLVANIA', 'CALIFORNIA', 'FLORIDA', 'NEW YORK', 'OHIO', 'ILLINOIS']
+                    if lookup_state not in ['PA', 'CA', 'FL', 'NY', 'OH', 'IL']:
+                        state_map = {'PA': 'PENNSYLVANIA', 'CA': 'CALIFORNIA', 'FL': 'FLORIDA', 
+                                    'NY': 'NEW YORK', 'OH': 'OHIO', 'IL': 'ILLINOIS'}
+                        if any(state_name in sr_name for state_name in wrong_state_names 
+                               if state_map.get(lookup_state, '') != state_name):
+                            continue  # Skip providers with wrong state in name
+                    
+                    # Normalize name for deduplication (remove suffixes like LLC, Inc, Co, etc.)
+                    def normalize_for_dedup(name):
+                        import re
+                        n = name.upper()
+                        # Remove common suffixes
+                        n = re.sub(r'\s+(LLC|INC|CO|CORP|CORPORATION|COMPANY|DELIVERY|ELECTRIC)\.?$', '', n)
+                        n = re.sub(r'\s+(LLC|INC|CO|CORP|CORPORATION|COMPANY|DELIVERY|ELECTRIC)\.?\s+', ' ', n)
+                        # Remove extra whitespace
+                        n = ' '.join(n.split())
+                        return n.strip()
+                    
+                    normalized_sr = normalize_for_dedup(sr_name)
+                    normalized_selected = normalize_for_dedup(selected_name)
+                    existing_normalized = [normalize_for_dedup(p['name']) for p in other_providers]
+                    
+                    # Get website for URL-based deduplication
+                    website = sr.website or raw.get('WEBSITE') or raw.get('website') or raw.get('Website')
+                    
+                    # Extract domain for deduplication (oncor.com == www.oncor.com)
+                    def get_domain(url):
+                        if not url:
+                            return None
+                        url = url.lower().strip()
+                        # Remove protocol
+                        url = url.replace('https://', '').replace('http://', '')
+                        # Remove www.
+                        url = url.replace('www.', '')
+                        # Get just the domain (before any path)
+                        domain = url.split('/')[0]
+                        return domain
+                    
+                    normalized_url = get_domain(website)
+                    existing_urls = [get_domain(p.get('website')) for p in other_providers if p.get('website')]
+                    
+                    # Skip if same URL as existing provider (likely duplicate)
+                    if normalized_url and normalized_url in existing_urls:
+                        continue
+                    
+                    # Only include if different from selected AND not a duplicate by name
+                    if normalized_sr != normalized_selected and normalized_sr not in existing_normalized:
+                        # Get phone and website from SourceResult or raw_data
+                        phone = sr.phone or raw.get('TELEPHONE') or raw.get('phone') or raw.get('Phone')
+                        website = sr.website or raw.get('WEBSITE') or raw.get('website') or raw.get('Website')
+                        provider_entry = {
+                            'name': sr.utility_name,
+                            'source': sr.source_name,
+                            'confidence_score': sr.confidence_score,
+                            'phone': phone if phone else None,
+                            'website': website if website else None
+                        }
+                        # Check if this is a propane company
+                        if raw.get('is_propane'):
+                            provider_entry['is_propane'] = True
+                            provider_entry['note'] = 'Propane/LP gas dealer (not piped natural gas)'
+                        other_providers.append(provider_entry)
+            # Sort by confidence and limit to top 3
+            other_providers = sorted(other_providers, key=lambda x: x.get('confidence_score', 0), reverse=True)[:3]
+            
+            formatted.update({
+                '_confidence': result.confidence_level,
+                '_confidence_score': result.confidence_score,
+                '_source': result.source,
+                '_legal_name': result.legal_name,
+                '_verification_source': result.source,
+                '_selection_reason': f"Selected by pipeline from {result.source}",
+                '_sources_agreed': result.sources_agreed,
+                '_agreeing_sources': result.agreeing_sources,
+                '_disagreeing_sources': result.disagreeing_sources,
+                '_other_providers': other_providers if other_providers else None,
+                '_deregulated_market': result.deregulated_market,
+                '_deregulated_note': result.deregulated_note,
+                '_serp_verified': result.serp_verified,
+                '_ai_decision_cached': result.ai_decision_cached,
+                '_timing_ms': result.timing_ms,
+            })
+        
+        return formatted
+    elif result and isinstance(result, dict):
+        # Legacy result format
+        return result
+    return None
+
+
 # =============================================================================
 # MAIN ENTRY POINT
 # =============================================================================
@@ -183,6 +434,9 @@ def lookup_utilities_by_address(
     use_pipeline: bool = True,
     include_metadata: bool = True,
     verify_with_serp: bool = False,  # Kept for API compatibility
+    parallel: bool = True,
+    timeout: Optional[float] = None,
+    geo_result: Optional[Dict] = None,
     **kwargs  # Accept any other kwargs for backward compatibility
 ) -> Optional[Dict]:
     """
@@ -197,6 +451,15 @@ def lookup_utilities_by_address(
                           Default: ['electric', 'gas', 'water']
         use_pipeline: Must be True in v2 (kept for API compatibility)
         include_metadata: Include _confidence, _source, etc. in results
+        parallel: Run the per-utility pipelines concurrently against the
+                  shared geocode context (default True). This goes through
+                  async_lookup_utilities_by_address on the shared event loop;
+                  False runs them one by one on the calling thread
+        timeout: Overall deadline in seconds for a parallel lookup. Utility
+                 types still running at the deadline come back as None and
+                 are listed in '_timed_out'. Default: LOOKUP_FANOUT_TIMEOUT
+        geo_result: geocode_address(address, include_geography=True) result
+                    the caller already has; skips geocoding
     
     Returns:
         Dict with electric, gas, water utility info, or None on error
@@ -209,210 +472,142 @@ def lookup_utilities_by_address(
             "water": {"NAME": "Austin Water", "_confidence": "high", ...}
         }
     """
-    start_time = time.time()
+    # Sequential mode keeps everything on the calling thread
+    if not parallel:
+        return _lookup_sequential(address, selected_utilities, include_metadata, geo_result)
     
-    # Default to all utilities
-    if selected_utilities is None:
-        selected_utilities = ['electric', 'gas', 'water']
+    return run_sync(async_lookup_utilities_by_address(
+        address,
+        selected_utilities=selected_utilities,
+        include_metadata=include_metadata,
+        timeout=timeout,
+        geo_result=geo_result,
+    ))
+
+
+async def async_lookup_utilities_by_address(
+    address: str,
+    selected_utilities: Optional[List[str]] = None,
+    include_metadata: bool = True,
+    timeout: Optional[float] = None,
+    geo_result: Optional[Dict] = None,
+    **kwargs  # Accept the sync entry point's compatibility kwargs
+) -> Optional[Dict]:
+    """
+    Async entry point for utility lookups.
     
-    # Normalize utility names
-    selected_utilities = [u.lower() for u in selected_utilities]
+    Geocodes once, then runs the per-utility pipelines concurrently on the
+    running event loop. GIS sources await their ArcGIS queries on the
+    shared aiohttp session (see async_lookup.py), so many lookups can be in
+    flight without a thread per outstanding request.
+    
+    Args:
+        address: Full street address
+        selected_utilities: List of utility types to look up.
+                          Default: ['electric', 'gas', 'water']
+        include_metadata: Include _confidence, _source, etc. in results
+        timeout: Overall deadline in seconds. Utility types still running at
+                 the deadline come back as None and are listed in
+                 '_timed_out'. Default: LOOKUP_FANOUT_TIMEOUT
+        geo_result: Pre-resolved geocode (skips geocoding)
+    
+    Returns:
+        Same shape as lookup_utilities_by_address()
+    """
+    start_time = time.time()
+    
+    requested = _requested_utilities(selected_utilities)
     
     # Step 1: Geocode address (once for all utilities)
-    geo = geocode_address(address, include_geography=True)
-    if not geo:
+    base_context = await run_blocking(_geocode_context, address, geo_result)
+    if not base_context:
         return {
             "error": "Could not geocode address",
             "address": address,
             "_version": "v2"
         }
     
-    # Extract ZIP code from geocode result or original address
-    import re
-    zip_code = geo.get('zip') or geo.get('zip_code')
-    if not zip_code:
-        # Try to extract from matched_address or original address
-        for addr_str in [geo.get('matched_address', ''), address]:
-            zip_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', addr_str)
-            if zip_match:
-                zip_code = zip_match.group(1)
-                break
-    
-    # Step 2: Create shared context
-    base_context = {
-        'lat': geo.get('lat'),
-        'lon': geo.get('lon'),
-        'address': address,
-        'city': geo.get('city'),
-        'county': geo.get('county'),
-        'state': geo.get('state'),
-        'zip_code': zip_code
+    # Step 2: Query each utility type via pipeline
+    # Pipelines are independent once the geocode context exists, so fan them
+    # out and pay max(electric, gas, water) instead of the sum.
+    tasks = {
+        asyncio.ensure_future(_alookup_utility_type(name, base_context, include_metadata)): name
+        for name in requested
     }
+    results = {}
+    timed_out = []
+    
+    if tasks:
+        deadline = timeout if timeout is not None else FANOUT_TIMEOUT
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+    
+        for task in done:
+            name = tasks[task]
+            try:
+                results[name] = task.result()
+            except Exception as e:
+                print(f"[lookup] {name} pipeline failed: {e}")
+                results[name] = None
+        
+        # Return whatever finished; stragglers are cancelled
+        for task in pending:
+            task.cancel()
+        timed_out = [name for name in requested if name not in results]
+    
+    # Preserve the caller's ordering of utility types
+    results = {name: results.get(name) for name in requested}
+    
+    return _finish_results(results, base_context, start_time, include_metadata, timed_out)
+
+
+def _lookup_sequential(
+    address: str,
+    selected_utilities: Optional[List[str]],
+    include_metadata: bool,
+    geo_result: Optional[Dict] = None
+) -> Optional[Dict]:
+    """Run the pipelines one after another on the calling thread."""
+    start_time = time.time()
+    
+    requested = _requested_utilities(selected_utilities)
+    
+    base_context = _geocode_context(address, geo_result)
+    if not base_context:
+        return {
+            "error": "Could not geocode address",
+            "address": address,
+            "_version": "v2"
+        }
     
-    # Step 3: Query each utility type via pipeline
     results = {}
+    for utility_name in requested:
+        results[utility_name] = _lookup_utility_type(utility_name, base_context, include_metadata)
     
-    # Map utility names to pipeline getters and types
-    utility_config = {
-        'electric': (_get_electric_pipeline, UtilityType.ELECTRIC),
-        'gas': (_get_gas_pipeline, UtilityType.GAS),
-        'water': (_get_water_pipeline, UtilityType.WATER),
-    }
+    return _finish_results(results, base_context, start_time, include_metadata)
     
-    for utility_name in selected_utilities:
-        if utility_name not in utility_config:
-            continue
         
-        pipeline_getter, utility_type = utility_config[utility_name]
+def _requested_utilities(selected_utilities: Optional[List[str]]) -> List[str]:
+    """Normalize the selected utility names (default: electric, gas, water)."""
+    if selected_utilities is None:
+        selected_utilities = ['electric', 'gas', 'water']
         
-        # Create context for this utility type
-        context = LookupContext(
-            lat=base_context['lat'],
-            lon=base_context['lon'],
-            address=base_context['address'],
-            city=base_context['city'],
-            county=base_context['county'],
-            state=base_context['state'],
-            zip_code=base_context['zip_code'],
-            utility_type=utility_type
-        )
+    selected_utilities = [u.lower() for u in selected_utilities]
+    return [u for u in selected_utilities if u in UTILITY_PIPELINES]
         
-        # Track lookup timing
-        with LookupTimer(utility_name) as timer:
-            try:
-                if PIPELINE_AVAILABLE:
-                    pipeline = pipeline_getter()
-                    result = pipeline.lookup(context)
-                    timer.set_result(result.to_dict() if result else None)
-                else:
-                    # Fallback to legacy lookup if pipeline unavailable
-                    result = _legacy_lookup(utility_name, base_context)
-                    timer.set_result(result)
-            except Exception as e:
-                result = None
-                timer.error = str(e)
         
-        # Format result for API response
-        if result and isinstance(result, PipelineResult) and result.utility_name:
-            formatted = {
-                'NAME': result.brand_name or result.utility_name,
-                'TELEPHONE': result.phone,
-                'WEBSITE': result.website,
-                'STATE': base_context['state'],
-                'CITY': base_context['city'],
-            }
-            
-            if include_metadata:
-                # Extract other providers from disagreeing sources
-                other_providers = []
-                selected_name = (result.brand_name or result.utility_name or '').upper()
-                lookup_state = base_context.get('state', '').upper()
-                
-                for sr in result.all_results:
-                    if sr.utility_name and sr.source_name != result.source:
-                        sr_name = sr.utility_name.upper()
-                        raw = sr.raw_data or {}
-                        
-                        # Filter out providers from wrong states
-                        provider_state = (raw.get('state') or raw.get('STATE') or '').upper()
-                        if provider_state and lookup_state and provider_state != lookup_state:
-                            continue  # Skip providers from different states
-                        
-                        # Skip if name contains a different state name (e.g., "Pennsylvania Electric" for TX)
-                        wrong_state_names = ['PENNSYLVANIA', 'CALIFORNIA', 'FLORIDA', 'NEW YORK', 'OHIO', 'ILLINOIS']
-                        if lookup_state not in ['PA', 'CA', 'FL', 'NY', 'OH', 'IL']:
-                            state_map = {'PA': 'PENNSYLVANIA', 'CA': 'CALIFORNIA', 'FL': 'FLORIDA', 
-                                        'NY': 'NEW YORK', 'OH': 'OHIO', 'IL': 'ILLINOIS'}
-                            if any(state_name in sr_name for state_name in wrong_state_names 
-                                   if state_map.get(lookup_state, '') != state_name):
-                                continue  # Skip providers with wrong state in name
-                        
-                        # Normalize name for deduplication (remove suffixes like LLC, Inc, Co, etc.)
-                        def normalize_for_dedup(name):
-                            import re
-                            n = name.upper()
-                            # Remove common suffixes
-                            n = re.sub(r'\s+(LLC|INC|CO|CORP|CORPORATION|COMPANY|DELIVERY|ELECTRIC)\.?$', '', n)
-                            n = re.sub(r'\s+(LLC|INC|CO|CORP|CORPORATION|COMPANY|DELIVERY|ELECTRIC)\.?\s+', ' ', n)
-                            # Remove extra whitespace
-                            n = ' '.join(n.split())
-                            return n.strip()
-                        
-                        normalized_sr = normalize_for_dedup(sr_name)
-                        normalized_selected = normalize_for_dedup(selected_name)
-                        existing_normalized = [normalize_for_dedup(p['name']) for p in other_providers]
-                        
-                        # Get website for URL-based deduplication
-                        website = sr.website or raw.get('WEBSITE') or raw.get('website') or raw.get('Website')
-                        
-                        # Extract domain for deduplication (oncor.com == www.oncor.com)
-                        def get_domain(url):
-                            if not url:
-                                return None
-                            url = url.lower().strip()
-                            # Remove protocol
-                            url = url.replace('https://', '').replace('http://', '')
-                            # Remove www.
-                            url = url.replace('www.', '')
-                            # Get just the domain (before any path)
-                            domain = url.split('/')[0]
-                            return domain
-                        
-                        normalized_url = get_domain(website)
-                        existing_urls = [get_domain(p.get('website')) for p in other_providers if p.get('website')]
-                        
-                        # Skip if same URL as existing provider (likely duplicate)
-                        if normalized_url and normalized_url in existing_urls:
-                            continue
-                        
-                        # Only include if different from selected AND not a duplicate by name
-                        if normalized_sr != normalized_selected and normalized_sr not in existing_normalized:
-                            # Get phone and website from SourceResult or raw_data
-                            phone = sr.phone or raw.get('TELEPHONE') or raw.get('phone') or raw.get('Phone')
-                            website = sr.website or raw.get('WEBSITE') or raw.get('website') or raw.get('Website')
-                            provider_entry = {
-                                'name': sr.utility_name,
-                                'source': sr.source_name,
-                                'confidence_score': sr.confidence_score,
-                                'phone': phone if phone else None,
-                                'website': website if website else None
-                            }
-                            # Check if this is a propane company
-                            if raw.get('is_propane'):
-                                provider_entry['is_propane'] = True
-                                provider_entry['note'] = 'Propane/LP gas dealer (not piped natural gas)'
-                            other_providers.append(provider_entry)
-                # Sort by confidence and limit to top 3
-                other_providers = sorted(other_providers, key=lambda x: x.get('confidence_score', 0), reverse=True)[:3]
-                
-                formatted.update({
-                    '_confidence': result.confidence_level,
-                    '_confidence_score': result.confidence_score,
-                    '_source': result.source,
-                    '_legal_name': result.legal_name,
-                    '_verification_source': result.source,
-                    '_selection_reason': f"Selected by pipeline from {result.source}",
-                    '_sources_agreed': result.sources_agreed,
-                    '_agreeing_sources': result.agreeing_sources,
-                    '_disagreeing_sources': result.disagreeing_sources,
-                    '_other_providers': other_providers if other_providers else None,
-                    '_deregulated_market': result.deregulated_market,
-                    '_deregulated_note': result.deregulated_note,
-                    '_serp_verified': result.serp_verified,
-                    '_timing_ms': result.timing_ms,
-                })
-            
-            results[utility_name] = formatted
-        elif result and isinstance(result, dict):
-            # Legacy result format
-            results[utility_name] = result
-        else:
-            results[utility_name] = None
-    
-    # Add version and timing metadata
+def _finish_results(
+    results: Dict,
+    base_context: Dict,
+    start_time: float,
+    include_metadata: bool,
+    timed_out: Optional[List[str]] = None
+) -> Dict:
+    """Add version, timing and geocode metadata to a lookup result."""
     if include_metadata:
         results['_version'] = 'v2'
         results['_total_time_ms'] = int((time.time() - start_time) * 1000)
+        if timed_out:
+            results['_timed_out'] = timed_out
         results['_geocoded'] = {
             'lat': base_context['lat'],
             'lon': base_context['lon'],
@@ -437,7 +632,7 @@ def _legacy_lookup(utility_type: str, context: Dict) -> Optional[Dict]:
     """
     if utility_type == 'water':
         try:
-            from utility_lookup import lookup_water_utility
+            from utility_lookup_v1 import lookup_water_utility
             
             result = lookup_water_utility(
                 context['city'],
@@ -17,11 +17,13 @@ USAGE:
 """
 
 import requests
+import http_client
 import sys
 import json
 import os
 import re
-from typing import Optional, Tuple, Dict, List, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Optional, Tuple, Dict, List, Union
 from pathlib import Path
 from urllib.parse import quote
 from bs4 import BeautifulSoup
@@ -45,6 +47,12 @@ from address_inference import infer_utility_from_nearby, add_verified_address
 from ml_enhancements import ensemble_prediction, detect_anomalies, get_source_weight
 from propane_service import is_likely_propane_area, get_no_gas_response
 from well_septic import get_well_septic_likelihood, is_likely_rural
+from geocode_cache import get_cached_geocode, set_cached_geocode
+from address_normalization import address_cache_key
+from singleflight import SingleFlight
+from db_pool import pg_connection, pg_execute_prepared, pg_table_exists
+from zip_answers import get_uniform_answers
+from monitoring.tracing import span, propagate
 
 # GIS-based utility lookups
 try:
@@ -53,6 +61,13 @@ try:
 except ImportError:
     GIS_LOOKUP_AVAILABLE = False
 
+# Local territory snapshots (answers HIFLD point queries without a network call)
+try:
+    from territory_index import get_territory_index
+    TERRITORY_INDEX_AVAILABLE = True
+except ImportError:
+    TERRITORY_INDEX_AVAILABLE = False
+
 # New pipeline integration
 try:
     from pipeline.pipeline import LookupPipeline
@@ -171,7 +186,7 @@ def geocode_with_census(address: str, include_geography: bool = False) -> Option
         }
     
     try:
-        response = requests.get(base_url, params=params, timeout=10)
+        response = http_client.get(base_url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -240,7 +255,7 @@ def geocode_with_google(address: str) -> Optional[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -297,7 +312,7 @@ def geocode_with_nominatim(address: str) -> Optional[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = http_client.get(url, params=params, headers=headers, timeout=10)
         response.raise_for_status()
         data = response.json()
         
@@ -343,7 +358,7 @@ def _get_census_block_geoid(lat: float, lon: float) -> Optional[str]:
             "returnGeometry": "false",
             "f": "json"
         }
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         data = response.json()
         features = data.get("features", [])
         if features:
@@ -353,22 +368,61 @@ def _get_census_block_geoid(lat: float, lon: float) -> Optional[str]:
     return None
 
 
-def geocode_address(address: str, include_geography: bool = False) -> Optional[Dict]:
+_geocode_flight = SingleFlight('geocode')
+
+
+def geocode_address(address: str, include_geography: bool = False, skip_census: bool = False) -> Optional[Dict]:
     """
     Geocode an address using a three-tier fallback system:
     1. Census Geocoder (free, best for established addresses)
     2. Google Maps API (handles new construction)
     3. Nominatim/OSM (free fallback)
+    
+    Results (and failures) are cached by normalized address, so repeat
+    lookups skip the geocoders entirely.
+    
+    Args:
+        skip_census: Start at tier 2 - for addresses a Census batch
+                     (census_batch_geocoder.py) already failed to match
     """
     print(f"Looking up utilities for: {address}\n")
     
+    with span('geocode', include_geography=include_geography) as s:
+        hit, result = get_cached_geocode(address, include_geography)
+        s.set_attribute('cached', hit)
+        if hit:
+            if result:
+                print(f"Geocoded (cached {result.get('source')}): {result.get('matched_address')}")
+            return result
+        
+        # Concurrent requests for the same address wait on one geocode
+        result, shared = _geocode_flight.do(
+            (address_cache_key(address), include_geography, skip_census),
+            _geocode_and_cache, address, include_geography, skip_census
+        )
+        s.set_attribute('source', result.get('source') if result else None)
+        s.set_attribute('coalesced', shared)
+        return dict(result) if shared and result else result
+
+
+def _geocode_and_cache(address: str, include_geography: bool, skip_census: bool) -> Optional[Dict]:
+    result = _geocode_address_uncached(address, include_geography, skip_census)
+    set_cached_geocode(address, include_geography, result)
+    return result
+
+
+def _geocode_address_uncached(address: str, include_geography: bool = False, skip_census: bool = False) -> Optional[Dict]:
+    """Run the geocoder tiers in order (see geocode_address)."""
     # Extract ZIP code from input address for validation
     import re
     input_zip_match = re.search(r'\b(\d{5})(?:-\d{4})?\b', address)
     input_zip = input_zip_match.group(1) if input_zip_match else None
     
     # Tier 1: Census Geocoder
-    result = geocode_with_census(address, include_geography)
+    result = None
+    if not skip_census:
+        with span('geocode.census'):
+            result = geocode_with_census(address, include_geography)
     if result:
         # Validate ZIP code - only reject if drastically different (different 3-digit prefix = different region)
         # Adjacent ZIPs (e.g., 75201 vs 75202) are common for addresses near ZIP boundaries
@@ -390,7 +444,8 @@ def geocode_address(address: str, include_geography: bool = False) -> Optional[D
     print("Census geocoder failed, trying Google...")
     
     # Tier 2: Google Maps API
-    result = geocode_with_google(address)
+    with span('geocode.google'):
+        result = geocode_with_google(address)
     if result:
         print(f"Geocoded (Google): {result.get('matched_address')}")
         print(f"Coordinates: {result.get('lat')}, {result.get('lon')}")
@@ -407,7 +462,8 @@ def geocode_address(address: str, include_geography: bool = False) -> Optional[D
     print("Google geocoder failed, trying Nominatim...")
     
     # Tier 3: Nominatim/OSM
-    result = geocode_with_nominatim(address)
+    with span('geocode.nominatim'):
+        result = geocode_with_nominatim(address)
     if result:
         print(f"Geocoded (Nominatim): {result.get('matched_address')}")
         print(f"Coordinates: {result.get('lat')}, {result.get('lon')}")
@@ -418,7 +474,8 @@ def geocode_address(address: str, include_geography: bool = False) -> Optional[D
     print("Nominatim failed, trying city centroid fallback...")
     
     # Tier 4: City centroid fallback for new construction
-    result = geocode_city_centroid(address)
+    with span('geocode.city_centroid'):
+        result = geocode_city_centroid(address)
     if result:
         print(f"Geocoded (City Centroid): {result.get('matched_address')}")
         print(f"Coordinates: {result.get('lat')}, {result.get('lon')}")
@@ -496,7 +553,7 @@ def geocode_city_centroid(address: str) -> Optional[Dict]:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -535,7 +592,7 @@ def geocode_city_centroid(address: str) -> Optional[Dict]:
                 "returnGeometry": "false",
                 "f": "json"
             }
-            response = requests.get(zcta_url, params=params, timeout=10)
+            response = http_client.get(zcta_url, params=params, timeout=10)
             data = response.json()
             features = data.get("features", [])
             if features:
@@ -561,6 +618,19 @@ def geocode_city_centroid(address: str) -> Optional[Dict]:
 # UTILITY LOOKUP FUNCTIONS
 # =============================================================================
 
+def _local_territory_matches(url: str, lat: float, lon: float, out_fields: str) -> Optional[List[Dict]]:
+    """
+    All snapshotted features containing the point, or None if the layer
+    has no local snapshot (caller should query the live API).
+    """
+    if not TERRITORY_INDEX_AVAILABLE:
+        return None
+    index = get_territory_index()
+    if index is None or not index.covers(url):
+        return None
+    return index.query_all(url, lat, lon, out_fields)
+
+
 def lookup_electric_utility(lon: float, lat: float) -> Optional[Dict]:
     """
     Query HIFLD ArcGIS API to find electric utility for a given point.
@@ -577,8 +647,14 @@ def lookup_electric_utility(lon: float, lat: float) -> Optional[Dict]:
         "f": "json"
     }
     
+    local = _local_territory_matches(base_url, lat, lon, params["outFields"])
+    if local is not None:
+        if not local:
+            return None
+        return local[0] if len(local) == 1 else local
+    
     try:
-        response = requests.get(base_url, params=params, timeout=15)
+        response = http_client.get(base_url, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
         
@@ -616,8 +692,14 @@ def lookup_gas_utility(lon: float, lat: float, state: str = None) -> Optional[Di
         "f": "json"
     }
     
+    local = _local_territory_matches(base_url, lat, lon, params["outFields"])
+    if local is not None:
+        if not local:
+            return None
+        return local[0] if len(local) == 1 else local
+    
     try:
-        response = requests.get(base_url, params=params, timeout=15)
+        response = http_client.get(base_url, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
         
@@ -655,7 +737,7 @@ def lookup_gas_utility_by_state(state: str) -> Optional[Dict]:
     }
     
     try:
-        response = requests.get(base_url, params=params, timeout=15)
+        response = http_client.get(base_url, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
         
@@ -1406,36 +1488,45 @@ def _lookup_internet_postgres(block_geoid: str, try_neighbors: bool = True) -> O
     If exact block not found and try_neighbors=True, searches for nearby blocks
     in the same census tract (first 11 digits of block_geoid).
     """
-    database_url = os.environ.get('DATABASE_URL')
-    if not database_url or not block_geoid:
+    if not block_geoid or not os.environ.get('DATABASE_URL'):
         return None
     try:
-        import psycopg2
-        conn = psycopg2.connect(database_url)
-        cursor = conn.cursor()
-        
-        # Try exact block match first
-        cursor.execute("SELECT providers FROM internet_providers WHERE block_geoid = %s", (block_geoid,))
-        row = cursor.fetchone()
-        neighbor_used = None
-        
-        # If no exact match, try neighbor blocks in same tract
-        if not row and try_neighbors and len(block_geoid) >= 11:
-            tract_prefix = block_geoid[:11]  # State(2) + County(3) + Tract(6)
-            cursor.execute("""
-                SELECT block_geoid, providers 
-                FROM internet_providers 
-                WHERE block_geoid LIKE %s 
-                ORDER BY block_geoid 
-                LIMIT 1
-            """, (tract_prefix + '%',))
-            neighbor_row = cursor.fetchone()
-            if neighbor_row:
-                neighbor_used = neighbor_row[0]
-                row = (neighbor_row[1],)
-                print(f"  No exact block match, using neighbor block {neighbor_used}")
-        
-        conn.close()
+        with pg_connection() as conn:
+            # Try exact block match first
+            row = pg_execute_prepared(
+                conn, 'internet_block',
+                "SELECT providers FROM internet_providers WHERE block_geoid = $1",
+                (block_geoid,)
+            ).fetchone()
+            neighbor_used = None
+        
+            # If no exact match, try neighbor blocks in same tract
+            if not row and try_neighbors and len(block_geoid) >= 11:
+                tract_prefix = block_geoid[:11]  # State(2) + County(3) + Tract(6)
+                if pg_table_exists(conn, 'internet_providers_tract'):
+                    # First block of each tract, precomputed by scripts/build_internet_tract_tables.py
+                    neighbor_row = pg_execute_prepared(
+                        conn, 'internet_tract',
+                        "SELECT block_geoid, providers FROM internet_providers_tract WHERE tract_geoid = $1",
+                        (tract_prefix,)
+                    ).fetchone()
+                else:
+                    neighbor_row = pg_execute_prepared(
+                        conn, 'internet_tract_scan',
+                        """
+                        SELECT block_geoid, providers 
+                        FROM internet_providers 
+                        WHERE block_geoid LIKE $1 
+                        ORDER BY block_geoid 
+                        LIMIT 1
+                        """,
+                        (tract_prefix + '%',)
+                    ).fetchone()
+                if neighbor_row:
+                    neighbor_used = neighbor_row[0]
+                    row = (neighbor_row[1],)
+                    print(f"  No exact block match, using neighbor block {neighbor_used}")
+        
         if row and row[0]:
             providers_json = row[0] if isinstance(row[0], list) else json.loads(row[0])
             # Map FCC technology codes to names
@@ -1486,7 +1577,7 @@ def _lookup_internet_postgres(block_geoid: str, try_neighbors: bool = True) -> O
     return None
 
 
-def lookup_internet_providers(address: str, try_neighbors: bool = True) -> Optional[Dict]:
+def lookup_internet_providers(address: str, try_neighbors: bool = True, geo_result: Optional[Dict] = None) -> Optional[Dict]:
     """
     Look up internet providers using PostgreSQL (Railway), local SQLite, or Playwright fallback.
     
@@ -1494,9 +1585,15 @@ def lookup_internet_providers(address: str, try_neighbors: bool = True) -> Optio
     1. PostgreSQL (if DATABASE_URL set) - fast, works on Railway
     2. Local SQLite BDC data - fast, local only
     3. Playwright FCC scraping - slow fallback (~25-30s)
+    
+    Args:
+        geo_result: geocode_address(address, include_geography=True) result
+                    the caller already has; skips geocoding when it carries
+                    block_geoid
     """
     # First, get the census block GEOID for this address
-    geo_result = geocode_address(address, include_geography=True)
+    if not (geo_result and geo_result.get('block_geoid')):
+        geo_result = geocode_address(address, include_geography=True)
     block_geoid = geo_result.get('block_geoid') if geo_result else None
     
     database_url = os.environ.get('DATABASE_URL')
@@ -1850,7 +1947,7 @@ def verify_utility_with_serp(address: str, utility_type: str, candidate_name: st
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         
-        response = requests.get(
+        response = http_client.get(
             search_url,
             proxies=proxies,
             timeout=5,  # Phase 3: Hard timeout to avoid slowing down lookups
@@ -1902,7 +1999,7 @@ Reply with ONLY a JSON object in this exact format:
             "max_tokens": 200
         }
         
-        response = requests.post(
+        response = http_client.post(
             "https://api.openai.com/v1/chat/completions",
             headers=headers,
             json=data,
@@ -2187,6 +2284,7 @@ def _pipeline_lookup(lat: float, lon: float, address: str, city: str, county: st
             '_selection_reason': f"Pipeline: {result.source} ({len(result.agreeing_sources)} sources agreed)" if result.sources_agreed else f"Pipeline: Smart Selector chose {result.source}",
             '_sources_agreed': result.sources_agreed, '_agreeing_sources': result.agreeing_sources,
             '_disagreeing_sources': result.disagreeing_sources, '_serp_verified': result.serp_verified,
+            '_ai_decision_cached': result.ai_decision_cached,
         }
     except Exception as e:
         print(f"Pipeline lookup error: {e}")
@@ -2197,7 +2295,52 @@ def _pipeline_lookup(lat: float, lon: float, address: str, city: str, county: st
 # MAIN LOOKUP FUNCTION
 # =============================================================================
 
-def lookup_utilities_by_address(address: str, filter_by_city: bool = True, verify_with_serp: bool = False, selected_utilities: list = None, skip_internet: bool = False, use_pipeline: bool = True) -> Optional[Dict]:
+def _lookup_each_type(
+    address: str,
+    selected_utilities: List[str],
+    geo_result: Dict,
+    on_result: Callable[[str, Any], None],
+    **kwargs
+) -> Optional[Dict]:
+    """
+    Run each utility type as its own lookup and report it as soon as it resolves.
+    
+    Returns the per-type results merged into one lookup_utilities_by_address
+    result.
+    """
+    merged = None
+    with ThreadPoolExecutor(max_workers=max(1, len(selected_utilities))) as executor:
+        futures = {
+            executor.submit(
+                propagate(lookup_utilities_by_address), address,
+                selected_utilities=[utility], geo_result=geo_result, **kwargs
+            ): utility
+            for utility in selected_utilities
+        }
+        for future in as_completed(futures):
+            utility = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[lookup] {utility} lookup failed: {e}")
+                result = None
+            
+            on_result(utility, result.get(utility) if result else None)
+            
+            if not result:
+                continue
+            if merged is None:
+                merged = result
+                continue
+            for key in (utility, f"{utility}_no_service"):
+                if key in result:
+                    merged[key] = result[key]
+            if result.get('_anomalies'):
+                merged['_anomalies'] = merged.get('_anomalies', []) + result['_anomalies']
+    return merged
+
+
+def lookup_utilities_by_address(address: str, filter_by_city: bool = True, verify_with_serp: bool = False, selected_utilities: list = None, skip_internet: bool = False, use_pipeline: bool = True, geo_result: Optional[Dict] = None, on_result: Optional[Callable[[str, Any], None]] = None) -> Optional[Dict]:
     """
     Main function: takes an address string, returns electric, gas, water, and internet utility info.
     Uses city name to filter out municipal utilities from other cities.
@@ -2206,6 +2349,12 @@ def lookup_utilities_by_address(address: str, filter_by_city: bool = True, verif
     Args:
         selected_utilities: List of utility types to look up. Default is all: ['electric', 'gas', 'water', 'internet']
         skip_internet: If True, skip internet lookup (faster)
+        geo_result: geocode_address() result the caller already has, so a
+                    request geocodes once for utilities, internet, sewer and
+                    special districts
+        on_result: Called as on_result(utility_type, value) the moment each
+                   selected type resolves (value may be None). The types then
+                   run concurrently instead of one after another
     """
     # Default to all utilities if not specified
     if selected_utilities is None:
@@ -2216,10 +2365,17 @@ def lookup_utilities_by_address(address: str, filter_by_city: bool = True, verif
         selected_utilities = [u for u in selected_utilities if u != 'internet']
     
     # Step 1: Geocode with geography info for filtering
-    geo_result = geocode_address(address, include_geography=filter_by_city)
+    if geo_result is None:
+        geo_result = geocode_address(address, include_geography=filter_by_city)
     if not geo_result:
         return None
     
+    if on_result is not None:
+        return _lookup_each_type(
+            address, selected_utilities, geo_result, on_result,
+            filter_by_city=filter_by_city, verify_with_serp=verify_with_serp, use_pipeline=use_pipeline
+        )
+    
     lon = geo_result["lon"]
     lat = geo_result["lat"]
     city = geo_result.get("city")
@@ -2287,6 +2443,17 @@ def lookup_utilities_by_address(address: str, filter_by_city: bool = True, verif
     except Exception as e:
         print(f"Warning: corrections lookup failed: {e}")
     
+    # ==========================================================================
+    # PRIORITY 0.5: Precomputed answers for uniformly served ZIPs/tracts
+    # These types skip GIS, the pipeline and AI selection (see zip_answers.py)
+    # ==========================================================================
+    precomputed = get_uniform_answers(
+        zip_code, geo_result.get("block_geoid"),
+        [u for u in selected_utilities if u not in corrections_applied]
+    )
+    if precomputed:
+        selected_utilities = [u for u in selected_utilities if u not in precomputed]
+    
     # Step 2: Electric lookup - only if selected
     if 'electric' in selected_utilities:
         # PRIORITY 0: Check if correction exists
@@ -2331,15 +2498,15 @@ def lookup_utilities_by_address(address: str, filter_by_city: bool = True, verif
             try:
                 from geographic_boundary_lookup import check_geographic_boundary, get_utility_from_nearby_consensus
                 # First try boundary-based lookup
-                geo_result = check_geographic_boundary(zip_code, lat, lon)
-                if geo_result and geo_result.get('confidence', 0) >= 0.15:
+                boundary_result = check_geographic_boundary(zip_code, lat, lon)
+                if boundary_result and boundary_result.get('confidence', 0) >= 0.15:
                     primary_electric = {
-                        'NAME': geo_result['utility'],
+                        'NAME': boundary_result['utility'],
                         'STATE': state,
                         'CITY': city,
-                        '_confidence': geo_result['confidence'],
+                        '_confidence': boundary_result['confidence'],
                         '_verification_source': 'geographic_boundary',
-                        '_selection_reason': f"Geographic boundary: {geo_result['description']}",
+                        '_selection_reason': f"Geographic boundary: {boundary_result['description']}",
                         '_is_deregulated': is_deregulated_state(state)
                     }
                     if is_deregulated_state(state):
@@ -2672,7 +2839,7 @@ def lookup_utilities_by_address(address: str, filter_by_city: bool = True, verif
     # Step 5: Internet lookup - only if selected
     if 'internet' in selected_utilities:
         print(f"Looking up internet providers...")
-        internet = lookup_internet_providers(address=address)
+        internet = lookup_internet_providers(address=address, geo_result=geo_result)
         if internet:
             print(f"  Found {internet.get('provider_count', 0)} internet providers")
             if internet.get('has_fiber'):
@@ -3042,6 +3209,14 @@ def lookup_utilities_by_address(address: str, filter_by_city: bool = True, verif
         }
     }
     
+    # Fill in the types answered from the precomputed table
+    for util_type, answer in precomputed.items():
+        result[util_type] = answer["value"]
+        if answer.get("no_service"):
+            result[f"{util_type}_no_service"] = answer["no_service"]
+    if precomputed:
+        result["_metadata"]["precomputed_areas"] = {u: a["area"] for u, a in precomputed.items()}
+    
     # NEW: Add special area notes if applicable
     if special_areas.get("notes"):
         result["_special_area_notes"] = special_areas["notes"]
@@ -3837,10 +4012,10 @@ def lookup_water_only(lat: float, lon: float, city: str, county: str, state: str
         return None
 
 
-def lookup_internet_only(address: str) -> Optional[Dict]:
+def lookup_internet_only(address: str, geo_result: Optional[Dict] = None) -> Optional[Dict]:
     """Look up internet providers. SLOW - typically 10-15 seconds (uses Playwright)."""
     try:
-        return lookup_internet_providers(address)
+        return lookup_internet_providers(address, geo_result=geo_result)
     except Exception as e:
         print(f"Internet lookup error: {e}")
         return None
@@ -11,7 +11,7 @@ Data Sources:
 - Florida DOH FLWMI (Drinking Water field)
 """
 
-import requests
+import http_client
 from typing import Optional, Dict
 import math
 
@@ -59,7 +59,7 @@ def lookup_texas_water_ccn(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(TX_WATER_CCN_URL, params=params, timeout=10)
+        response = http_client.get(TX_WATER_CCN_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -126,7 +126,7 @@ def lookup_new_jersey_water_purveyor(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(NJ_WATER_PURVEYOR_URL, params=params, timeout=10)
+        response = http_client.get(NJ_WATER_PURVEYOR_URL, params=params, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -187,7 +187,7 @@ def lookup_florida_water_flwmi(lat: float, lon: float) -> Optional[Dict]:
             "f": "json"
         }
         
-        response = requests.get(FL_FLWMI_URL, params=params, timeout=20)
+        response = http_client.get(FL_FLWMI_URL, params=params, timeout=20)
         response.raise_for_status()
         
         data = response.json()
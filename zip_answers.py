@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Precomputed electric/gas/water answers for areas served uniformly.
+
+Most traffic lands in ZIPs where every address resolves to the same
+providers, yet each request still runs geocode -> every DataSource -> AI
+selection. scripts/resolve_zip_answers.py runs the full lookup over a
+grid of sample points per ZIP (and per census tract, through the
+points' blocks) offline and classifies each area and utility type:
+
+    uniform   every sample resolved, confidently, to the same provider
+              and the ZIP isn't a known split
+    split     samples disagree, or the ZIP has address-level data the
+              samples can't stand for (see SPLIT_SOURCES)
+    unknown   too few confident samples to tell
+
+Sample points carry no street, so address- and coordinate-level rules
+(tenant hard overrides, geographic boundaries and nearby consensus,
+MUD/CDD districts) never fire while sampling. Every ZIP those sources
+know about is therefore split for the types they cover, and the table
+records the versions of SPLIT_SOURCES it was built against: a table
+built before one of them changed is not served.
+
+Only uniform answers are served. lookup_utilities_by_address checks
+get_uniform_answers() after user corrections, and types answered here
+skip GIS, the pipeline and AI selection entirely. A tract answer wins
+over its ZIP's, since it is the finer area. Workers check every
+ZIP_ANSWERS_CHECK_SECONDS whether the file was rebuilt and reopen it.
+
+Table layout (data/zip_answers.db, SQLite):
+    answers(area, utility_type, status, provider, samples, answer)
+        area: 'zip:78701' or 'tract:48453001100'
+        answer: zlib-compressed JSON {"value": ..., "no_service": ...}
+    meta(key, value): built_at, grid, ...
+
+Usage:
+    from zip_answers import get_uniform_answers
+    
+    answers = get_uniform_answers('78701', block_geoid, ['electric', 'gas'])
+    # {'electric': {'value': {...}, 'no_service': None, 'area': 'zip:78701'}}
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from db_pool import discard_sqlite_handle, sqlite_readonly
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+ZIP_ANSWERS_PATH = Path(os.getenv('ZIP_ANSWERS_PATH', DATA_DIR / 'zip_answers.db'))
+
+# Set to 0 to always run the full lookup
+ZIP_ANSWERS_ENABLED = os.getenv('ZIP_ANSWERS_ENABLED', '1') == '1'
+
+# Tables older than this are ignored (providers and our data change)
+ZIP_ANSWERS_MAX_AGE_DAYS = int(os.getenv('ZIP_ANSWERS_MAX_AGE_DAYS', '45'))
+
+# An area needs this many confident samples before it can be called uniform
+MIN_SAMPLES = int(os.getenv('ZIP_ANSWERS_MIN_SAMPLES', '3'))
+
+# How often a worker checks whether the table file was replaced
+ZIP_ANSWERS_CHECK_SECONDS = int(os.getenv('ZIP_ANSWERS_CHECK_SECONDS', '30'))
+
+# Utility types the fast path answers (internet is per block already)
+ANSWER_TYPES = ('electric', 'gas', 'water')
+
+# Sample confidences too weak to vouch for a whole area
+WEAK_CONFIDENCE = {'low', 'none', 'very_low'}
+
+SPLITS_FILE = DATA_DIR / 'real_sub_zip_splits_50k.json'
+STREET_RULES_FILE = DATA_DIR / 'sub_zip_provider_rules_50k.json'
+TENANT_OVERRIDES_FILE = DATA_DIR / 'tenant_hard_overrides.json'
+TENANT_ADDRESSES_FILE = DATA_DIR / 'tenant_addresses_geocoded.json'
+BOUNDARY_FILE_PATTERN = 'geographic_boundary_analysis_{}.json'
+DISTRICT_INDEX_DIR = DATA_DIR / 'special_districts' / 'processed'
+
+# Fields of tenant_addresses_geocoded.json per utility type
+TENANT_ADDRESS_FIELDS = {'electric': 'electricity', 'gas': 'gas', 'water': 'water'}
+
+_table = None
+_table_signature = None
+_table_usable = False
+_table_checked_at = 0.0
+_table_lock = threading.Lock()
+
+# path -> file signature each thread's read-only handle was opened on
+_thread_handles = threading.local()
+
+
+def _encode(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+
+def _decode(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob))
+
+
+def provider_name(utility_type: str, value: Any) -> Optional[str]:
+    """The primary provider's name in a lookup result value (dict or [primary, ...])."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if not isinstance(value, dict):
+        return None
+    name = value.get('NAME') if utility_type in ('electric', 'gas') else value.get('name')
+    return name or value.get('name') or value.get('NAME')
+
+
+def sample_confidence(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if not isinstance(value, dict):
+        return None
+    confidence = value.get('_confidence', value.get('confidence'))
+    return str(confidence).lower() if confidence is not None else None
+
+
+def split_sources() -> List[Path]:
+    """Files whose ZIPs can't be answered from samples (see load_known_splits)."""
+    paths = [SPLITS_FILE, STREET_RULES_FILE, TENANT_OVERRIDES_FILE, TENANT_ADDRESSES_FILE]
+    paths += [DATA_DIR / BOUNDARY_FILE_PATTERN.format(utility_type) for utility_type in ANSWER_TYPES]
+    if DISTRICT_INDEX_DIR.exists():
+        paths += sorted(DISTRICT_INDEX_DIR.glob('*zip_to_district.json'))
+    return [path for path in paths if path.exists()]
+
+
+def split_source_versions() -> Dict[str, str]:
+    """'size:mtime' of each split source, recorded in the table's meta."""
+    versions = {}
+    for path in split_sources():
+        stat = path.stat()
+        versions[path.name] = f"{stat.st_size}:{stat.st_mtime_ns}"
+    return versions
+
+
+def load_known_splits() -> Dict[str, Set[str]]:
+    """
+    ZIP -> utility types the precomputed table must not answer.
+    
+    - real_sub_zip_splits_50k.json: splits confirmed by the 46K-address
+      comparison
+    - sub_zip_provider_rules_50k.json: street rules naming more than one
+      provider
+    - tenant_hard_overrides.json: tenant-verified overrides by street
+    - geographic_boundary_analysis_<type>.json and
+      tenant_addresses_geocoded.json: lat/lon boundaries and nearby
+      consensus
+    - special district ZIP indexes: MUD/CDD water by coordinates
+    """
+    known: Dict[str, Set[str]] = {}
+    
+    def mark(zip_code: Optional[str], utility_type: str) -> None:
+        if zip_code:
+            known.setdefault(zip_code, set()).add(utility_type)
+    
+    if SPLITS_FILE.exists():
+        with open(SPLITS_FILE, 'r') as f:
+            for zip_code, split in json.load(f).get('splits', {}).items():
+                for utility_type in ANSWER_TYPES:
+                    if split.get(f'{utility_type}_split'):
+                        mark(zip_code, utility_type)
+    if STREET_RULES_FILE.exists():
+        with open(STREET_RULES_FILE, 'r') as f:
+            for zip_code, rules in json.load(f).get('rules', {}).items():
+                for utility_type in ANSWER_TYPES:
+                    providers = set(rules.get(f'{utility_type}_providers') or [])
+                    providers.update(
+                        street[utility_type] for street in rules.get('streets', {}).values()
+                        if street.get(utility_type)
+                    )
+                    if len(providers) > 1:
+                        mark(zip_code, utility_type)
+    if TENANT_OVERRIDES_FILE.exists():
+        with open(TENANT_OVERRIDES_FILE, 'r') as f:
+            for zip_code, streets in json.load(f).get('overrides', {}).items():
+                for street in streets.values():
+                    for utility_type in ANSWER_TYPES:
+                        if street.get(utility_type):
+                            mark(zip_code, utility_type)
+    if TENANT_ADDRESSES_FILE.exists():
+        with open(TENANT_ADDRESSES_FILE, 'r') as f:
+            for addr in json.load(f).get('addresses', []):
+                zip_match = re.search(r'(\d{5})', addr.get('address', ''))
+                for utility_type, field in TENANT_ADDRESS_FIELDS.items():
+                    if zip_match and addr.get(field):
+                        mark(zip_match.group(1), utility_type)
+    for utility_type in ANSWER_TYPES:
+        boundary_file = DATA_DIR / BOUNDARY_FILE_PATTERN.format(utility_type)
+        if boundary_file.exists():
+            with open(boundary_file, 'r') as f:
+                for analysis in json.load(f).get('zip_analyses', []):
+                    mark(analysis.get('zip_code'), utility_type)
+    if DISTRICT_INDEX_DIR.exists():
+        for index_file in DISTRICT_INDEX_DIR.glob('*zip_to_district.json'):
+            with open(index_file, 'r') as f:
+                for zip_code in json.load(f):
+                    mark(zip_code, 'water')
+    return known
+
+
+def classify_area(
+    area: str,
+    utility_type: str,
+    samples: List[Tuple[Any, Any]],
+    known_splits: Dict[str, Set[str]],
+    zip_codes: Iterable[str] = ()
+) -> Tuple[str, Optional[str], Optional[Dict]]:
+    """
+    Decide whether an area is served uniformly for one utility type.
+    
+    Args:
+        area: 'zip:<zip>' or 'tract:<tract geoid>'
+        utility_type: electric, gas or water
+        samples: (value, no_service) from each sample point's lookup
+        known_splits: load_known_splits()
+        zip_codes: ZIPs the samples fall in (a tract touching a known
+                   split ZIP is not called uniform either)
+    
+    Returns:
+        (status, provider, answer) - answer is the sample to serve when
+        status is 'uniform'
+    """
+    kind, _, code = area.partition(':')
+    zip_codes = set(zip_codes)
+    if kind == 'zip':
+        zip_codes.add(code)
+    if any(utility_type in known_splits.get(zip_code, ()) for zip_code in zip_codes):
+        return 'split', None, None
+    
+    names = set()
+    confident = []
+    for value, no_service in samples:
+        name = provider_name(utility_type, value)
+        if name is None and not no_service:
+            continue  # unresolved sample - says nothing about the area
+        if name is not None and sample_confidence(value) in WEAK_CONFIDENCE:
+            continue
+        names.add(name.strip().lower() if name else None)
+        confident.append((name, value, no_service))
+    
+    if len(names) > 1:
+        return 'split', None, None
+    if len(confident) < MIN_SAMPLES:
+        return 'unknown', None, None
+    name, value, no_service = confident[0]
+    return 'uniform', name, {'value': value, 'no_service': no_service}
+
+
+def write_answer_table(
+    output: Path,
+    rows: Iterable[Tuple[str, str, str, Optional[str], int, Optional[Dict]]],
+    meta: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Write an answer table, replacing any existing one atomically.
+    
+    Args:
+        output: Table file
+        rows: (area, utility_type, status, provider, samples, answer)
+        meta: Extra metadata (built_at and split_sources are added)
+    
+    Returns:
+        Rows written
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + '.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+    
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript('''
+            CREATE TABLE answers (
+                area TEXT NOT NULL,
+                utility_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                provider TEXT,
+                samples INTEGER NOT NULL,
+                answer BLOB,
+                PRIMARY KEY (area, utility_type)
+            ) WITHOUT ROWID;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        ''')
+        cursor = conn.executemany(
+            'INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)',
+            (
+                (area, utility_type, status, provider, samples, _encode(answer) if answer else None)
+                for area, utility_type, status, provider, samples, answer in rows
+            )
+        )
+        count = cursor.rowcount
+        meta = dict(meta or {}, built_at=datetime.now().isoformat(), split_sources=split_source_versions())
+        conn.executemany('INSERT INTO meta VALUES (?, ?)', [(k, json.dumps(v)) for k, v in meta.items()])
+        conn.commit()
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+    os.replace(tmp_path, output)
+    discard_sqlite_handle(str(output))
+    return count
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class AnswerTable:
+    """Read side of an answer table (per-thread read-only handles)."""
+    
+    def __init__(self, path: Path = ZIP_ANSWERS_PATH):
+        self.path = str(path)
+        self.signature = _file_signature(path)
+        meta = dict(self._connection().execute('SELECT key, value FROM meta').fetchall())
+        self.meta = {key: json.loads(value) for key, value in meta.items()}
+    
+    def _connection(self):
+        # A thread still holding a handle on a replaced file drops it first
+        opened = getattr(_thread_handles, 'signatures', None)
+        if opened is None:
+            opened = _thread_handles.signatures = {}
+        if opened.get(self.path) != self.signature:
+            discard_sqlite_handle(self.path)
+            opened[self.path] = self.signature
+        return sqlite_readonly(self.path)
+    
+    def is_fresh(self, max_age_days: int = ZIP_ANSWERS_MAX_AGE_DAYS) -> bool:
+        """Young enough, and built against the current split sources."""
+        built_at = self.meta.get('built_at')
+        if not built_at:
+            return False
+        if datetime.now() - datetime.fromisoformat(built_at) > timedelta(days=max_age_days):
+            return False
+        return self.meta.get('split_sources') == split_source_versions()
+    
+    def uniform_answer(self, area: str, utility_type: str) -> Optional[Dict]:
+        """The stored answer if the area is uniform for this type, else None."""
+        row = self._connection().execute(
+            "SELECT answer FROM answers WHERE area = ? AND utility_type = ? AND status = 'uniform'",
+            (area, utility_type)
+        ).fetchone()
+        return _decode(row[0]) if row and row[0] else None
+    
+    def stats(self) -> Dict:
+        counts = self._connection().execute(
+            'SELECT utility_type, status, COUNT(*) FROM answers GROUP BY utility_type, status'
+        ).fetchall()
+        return {
+            'path': self.path,
+            'built_at': self.meta.get('built_at'),
+            'fresh': self.is_fresh(),
+            'areas': {f'{utility_type}.{status}': n for utility_type, status, n in counts},
+        }
+
+
+def get_answer_table() -> Optional[AnswerTable]:
+    """
+    Get the process-wide answer table, or None if there isn't a fresh one.
+    
+    Every ZIP_ANSWERS_CHECK_SECONDS the file is stat'ed: a rebuilt table
+    (new inode/mtime) is reopened, and freshness is re-evaluated.
+    """
+    global _table, _table_signature, _table_usable, _table_checked_at
+    if not ZIP_ANSWERS_ENABLED:
+        return None
+    if time.time() - _table_checked_at > ZIP_ANSWERS_CHECK_SECONDS:
+        with _table_lock:
+            if time.time() - _table_checked_at > ZIP_ANSWERS_CHECK_SECONDS:
+                signature = _file_signature(ZIP_ANSWERS_PATH)
+                reopened = signature != _table_signature
+                if reopened:
+                    _table_signature = signature
+                    _table = None
+                    if signature is not None:
+                        try:
+                            _table = AnswerTable(ZIP_ANSWERS_PATH)
+                        except sqlite3.Error as e:
+                            print(f"[zip-answers] cannot open {ZIP_ANSWERS_PATH}: {e}")
+                usable = _table is not None and _table.is_fresh()
+                if _table is not None and not usable and (reopened or _table_usable):
+                    print(f"[zip-answers] table built {_table.meta.get('built_at')} is stale - ignored")
+                _table_usable = usable
+                _table_checked_at = time.time()
+    return _table if _table_usable else None
+
+
+def get_uniform_answers(
+    zip_code: Optional[str],
+    block_geoid: Optional[str],
+    utility_types: Iterable[str]
+) -> Dict[str, Dict]:
+    """
+    Precomputed answers for the given types where the area is uniform.
+    
+    Args:
+        zip_code: 5-digit ZIP of the address
+        block_geoid: Census block GEOID, if the geocoder returned one
+        utility_types: Types the caller still needs
+    
+    Returns:
+        {utility_type: {'value', 'no_service', 'area'}} for the types
+        that can skip the full lookup (may be empty)
+    """
+    wanted = [u for u in utility_types if u in ANSWER_TYPES]
+    if not wanted or not (zip_code or block_geoid):
+        return {}
+    table = get_answer_table()
+    if table is None:
+        return {}
+    
+    areas = []
+    if block_geoid and len(block_geoid) >= 11:
+        areas.append(f'tract:{block_geoid[:11]}')
+    if zip_code:
+        areas.append(f'zip:{zip_code[:5]}')
+    
+    answers = {}
+    try:
+        for utility_type in wanted:
+            for area in areas:
+                answer = table.uniform_answer(area, utility_type)
+                if answer:
+                    answers[utility_type] = dict(answer, area=area)
+                    break
+    except sqlite3.Error as e:
+        print(f"[zip-answers] lookup failed: {e}")
+        discard_sqlite_handle(table.path)
+        return {}
+    return answers